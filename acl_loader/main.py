@@ -4,7 +4,7 @@ import click
 import ipaddress
 import json
 import syslog
-import operator
+from concurrent.futures import ThreadPoolExecutor
 
 import openconfig_acl
 import tabulate
@@ -13,6 +13,7 @@ from natsort import natsorted
 from sonic_py_common import multi_asic
 from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector
 from utilities_common.general import load_db_config
+from utilities_common import redis_pipeline
 
 def info(msg):
     click.echo(click.style("Info: ", fg='cyan') + click.style(str(msg), fg='green'))
@@ -122,6 +123,8 @@ class AclLoader(object):
         self.current_table = None
         self.tables_db_info = {}
         self.rules_db_info = {}
+        # Keys of the rules of rules_db_info which are only in APPL_DB
+        self.appl_db_rules = set()
         self.rules_info = {}
         self.tables_state_info = None
         self.rules_state_info = None
@@ -247,6 +250,7 @@ class AclLoader(object):
                 # Shouldn't be hit, table is either programmed to APPL or CONFIG DB
                 continue
             self.rules_db_info[(tid, rid)] = self.appldb.get_all(self.appldb.APPL_DB, app_acl_rule)
+            self.appl_db_rules.add((tid, rid))
 
     def get_rules_db_info(self):
         return self.rules_db_info
@@ -826,101 +830,57 @@ class AclLoader(object):
             if not self.is_table_egress(table_name):
                 deep_update(self.rules_info, self.deny_rule(table_name))
 
+    def update_rules(self, current_keys, new_rules):
+        """
+        Update the ACL rules current_keys of Config DB to new_rules: the rules
+        which are not in new_rules are removed, the new and changed rules are
+        written and the unchanged rules are left alone.
+        The writes to each config DB are pipelined in a single transaction, and
+        the config DBs of the host and of the front asic namespaces are
+        programmed concurrently.
+        :param current_keys: keys of rules_db_info to update
+        :param new_rules: rules in Config DB schema
+        :return: number of rules written or removed
+        """
+        # The global Config DB is the source of truth of the rules of all the namespaces
+        current_rules = {key: self.rules_db_info[key] for key in current_keys
+                         if key not in self.appl_db_rules}
+
+        # Program for per front asic namespace also if present
+        configdbs = [self.configdb] + list((self.per_npu_configdb or {}).values())
+        if len(configdbs) == 1:
+            return redis_pipeline.update_table_bulk(self.configdb, self.configdb.CONFIG_DB, self.ACL_RULE,
+                                                    current_rules, new_rules)
+
+        with ThreadPoolExecutor(max_workers=len(configdbs)) as executor:
+            futures = [executor.submit(redis_pipeline.update_table_bulk, configdb, configdb.CONFIG_DB,
+                                       self.ACL_RULE, current_rules, new_rules)
+                       for configdb in configdbs]
+            results = [future.result() for future in futures]
+        return results[0]
+
     def full_update(self):
         """
         Perform full update of ACL rules configuration. All existing rules
         will be removed. New rules loaded from file will be installed. If
         the current_table is not empty, only rules within that table will
         be removed and new rules in that table will be installed.
+        Rules which are the same in Config DB and in the file are not rewritten.
         :return:
         """
-        for key in self.rules_db_info:
-            if self.current_table is None or self.current_table == key[0]:
-                self.configdb.mod_entry(self.ACL_RULE, key, None)
-                # Program for per front asic namespace also if present
-                for namespace_configdb in self.per_npu_configdb.values():
-                    namespace_configdb.mod_entry(self.ACL_RULE, key, None)
-
-
-        self.configdb.mod_config({self.ACL_RULE: self.rules_info})
-        # Program for per front asic namespace also if present
-        for namespace_configdb in self.per_npu_configdb.values():
-            namespace_configdb.mod_config({self.ACL_RULE: self.rules_info})
+        current_keys = [key for key in self.rules_db_info
+                        if self.current_table is None or self.current_table == key[0]]
+        return self.update_rules(current_keys, self.rules_info)
 
     def incremental_update(self):
         """
         Perform incremental ACL rules configuration update. Get existing rules from
         Config DB. Compare with rules specified in file and perform corresponding
-        modifications.
+        modifications: only the added, removed and changed rules are written, for
+        control plane and dataplane ACLs alike.
         :return:
         """
-
-        # TODO: Until we test ASIC behavior, we cannot assume that we can insert
-        # dataplane ACLs and shift existing ACLs. Therefore, we perform a full
-        # update on dataplane ACLs, and only perform an incremental update on
-        # control plane ACLs.
-
-        new_rules = set(self.rules_info.keys())
-        new_dataplane_rules = set()
-        new_controlplane_rules = set()
-        current_rules = set(self.rules_db_info.keys())
-        current_dataplane_rules = set()
-        current_controlplane_rules = set()
-
-        for key in new_rules:
-            table_name = key[0]
-            if self.tables_db_info[table_name]['type'].upper() == self.ACL_TABLE_TYPE_CTRLPLANE:
-                new_controlplane_rules.add(key)
-            else:
-                new_dataplane_rules.add(key)
-
-        for key in current_rules:
-            table_name = key[0]
-            if self.tables_db_info[table_name]['type'].upper() == self.ACL_TABLE_TYPE_CTRLPLANE:
-                current_controlplane_rules.add(key)
-            else:
-                current_dataplane_rules.add(key)
-
-        # Remove all existing dataplane rules
-        for key in current_dataplane_rules:
-            self.configdb.mod_entry(self.ACL_RULE, key, None)
-            # Program for per-asic namespace also if present
-            for namespace_configdb in self.per_npu_configdb.values():
-                namespace_configdb.mod_entry(self.ACL_RULE, key, None)
-
-
-        # Add all new dataplane rules
-        for key in new_dataplane_rules:
-            self.configdb.mod_entry(self.ACL_RULE, key, self.rules_info[key])
-            # Program for per-asic namespace corresponding to front asic also if present.
-            for namespace_configdb in self.per_npu_configdb.values():
-                namespace_configdb.mod_entry(self.ACL_RULE, key, self.rules_info[key])
-
-        added_controlplane_rules = new_controlplane_rules.difference(current_controlplane_rules)
-        removed_controlplane_rules = current_controlplane_rules.difference(new_controlplane_rules)
-        existing_controlplane_rules = new_rules.intersection(current_controlplane_rules)
-
-        for key in added_controlplane_rules:
-            self.configdb.mod_entry(self.ACL_RULE, key, self.rules_info[key])
-            # Program for per-asic namespace corresponding to front asic also if present.
-            # For control plane ACL it's not needed but to keep all db in sync program everywhere
-            for namespace_configdb in self.per_npu_configdb.values():
-                namespace_configdb.mod_entry(self.ACL_RULE, key, self.rules_info[key])
-
-        for key in removed_controlplane_rules:
-            self.configdb.mod_entry(self.ACL_RULE, key, None)
-            # Program for per-asic namespace corresponding to front asic also if present.
-            # For control plane ACL it's not needed but to keep all db in sync program everywhere
-            for namespace_configdb in self.per_npu_configdb.values():
-                namespace_configdb.mod_entry(self.ACL_RULE, key, None)
-
-        for key in existing_controlplane_rules:
-            if not operator.eq(self.rules_info[key], self.rules_db_info[key]):
-                self.configdb.set_entry(self.ACL_RULE, key, self.rules_info[key])
-                # Program for per-asic namespace corresponding to front asic also if present.
-                # For control plane ACL it's not needed but to keep all db in sync program everywhere
-                for namespace_configdb in self.per_npu_configdb.values():
-                    namespace_configdb.set_entry(self.ACL_RULE, key, self.rules_info[key])
+        return self.update_rules(self.rules_db_info.keys(), self.rules_info)
 
     def delete(self, table=None, rule=None):
         """
@@ -928,13 +888,9 @@ class AclLoader(object):
         :param rule:
         :return:
         """
-        for key in self.rules_db_info:
-            if not table or table == key[0]:
-                if not rule or rule == key[1]:
-                    self.configdb.set_entry(self.ACL_RULE, key, None)
-                    # Program for per-asic namespace corresponding to front asic also if present.
-                    for namespace_configdb in self.per_npu_configdb.values():
-                        namespace_configdb.set_entry(self.ACL_RULE, key, None)
+        current_keys = [key for key in self.rules_db_info
+                        if (not table or table == key[0]) and (not rule or rule == key[1])]
+        return self.update_rules(current_keys, {})
 
     def show_table(self, table_name):
         """
@@ -1,15 +1,20 @@
 #!/usr/sbin/env python
 
 import click
+import concurrent.futures
+import contextlib
 import datetime
+import importlib
 import ipaddress
 import json
+import lazy_object_proxy
 import netaddr
 import netifaces
 import os
 import re
 import subprocess
 import sys
+import threading
 import time
 import itertools
 import copy
@@ -24,7 +29,6 @@ from generic_config_updater.gu_common import HOST_NAMESPACE
 from generic_config_updater.main import (
     apply_patch_from_file as _gcu_apply_patch_from_file
 )
-from minigraph import parse_device_desc_xml, minigraph_encoder
 from natsort import natsorted
 from portconfig import get_child_ports
 from socket import AF_INET, AF_INET6
@@ -38,6 +42,7 @@ from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector, ConfigDBP
 from utilities_common.db import Db
 from utilities_common.intf_filter import parse_interface_in_filter
 from utilities_common import bgp_util
+from utilities_common import redis_pipeline
 import utilities_common.cli as clicommon
 from utilities_common.helper import get_port_pbh_binding, get_port_acl_binding, update_config
 from utilities_common.general import load_db_config, load_module_from_source
@@ -48,28 +53,14 @@ from utilities_common import hft as hft_common
 
 from .utils import log
 
-from . import aaa
-from . import bmc
-from . import chassis_modules
-from . import console
-from . import feature
-from . import fabric
-from . import flow_counters
-from . import hft
-from . import kdump
-from . import kube
-from . import muxcable
-from . import nat
-from . import vlan
-from . import vxlan
 from . import plugins
 from .config_mgmt import ConfigMgmtDPB, ConfigMgmt, YANG_DIR
-from . import mclag
-from . import syslog
-from . import switchport
-from . import dns
 from . import bgp_cli
-from . import stp
+
+# minigraph is used by load_minigraph only, import it on first use
+minigraph = lazy_object_proxy.Proxy(lambda: importlib.import_module('minigraph'))
+parse_device_desc_xml = lazy_object_proxy.Proxy(lambda: minigraph.parse_device_desc_xml)
+minigraph_encoder = lazy_object_proxy.Proxy(lambda: minigraph.minigraph_encoder)
 
 # mock masic APIs for unit test
 try:
@@ -88,6 +79,36 @@ except KeyError:
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help', '-?'])
 
+# Manifest of the commands defined in the other modules, {name: "module:command"}.
+# The module of a command is imported when the command is invoked only.
+SUBCOMMANDS = {
+    'aaa': 'config.aaa:aaa',
+    'bmc': 'config.bmc:bmc',
+    'chassis': 'config.chassis_modules:chassis',
+    'console': 'config.console:console',
+    'dns': 'config.dns:dns',
+    'fabric': 'config.fabric:fabric',
+    'feature': 'config.feature:feature',
+    'flowcnt-route': 'config.flow_counters:flowcnt_route',
+    'kdump': 'config.kdump:kdump',
+    'kubernetes': 'config.kube:kubernetes',
+    'mclag': 'config.mclag:mclag',
+    'member': 'config.mclag:mclag_member',
+    'muxcable': 'config.muxcable:muxcable',
+    'nat': 'config.nat:nat',
+    'radius': 'config.aaa:radius',
+    'spanning-tree': 'config.stp:spanning_tree',
+    'switchport': 'config.switchport:switchport',
+    'syslog': 'config.syslog:syslog',
+    'tacacs': 'config.aaa:tacacs',
+    'unique-ip': 'config.mclag:mclag_unique_ip',
+    'vlan': 'config.vlan:vlan',
+    'vxlan': 'config.vxlan:vxlan',
+}
+
+# The modules of the subcommands are still reachable as attributes, e.g. config.main.vlan
+__getattr__ = clicommon.lazy_module_getattr(__name__, list(SUBCOMMANDS.values()) + ['config.hft:hft'])
+
 SONIC_GENERATED_SERVICE_PATH = '/etc/sonic/generated_services.conf'
 SONIC_CFGGEN_PATH = '/usr/local/bin/sonic-cfggen'
 VLAN_SUB_INTERFACE_SEPARATOR = '.'
@@ -1412,6 +1433,32 @@ def multiasic_save_to_singlefile(db, filename):
         os.fsync(file.fileno())
 
 
+def get_config_for_save(config_db):
+    """Read CONFIG_DB with pipelined reads, like `sonic-cfggen -d --print-data`
+       config_db: ConfigDBConnector to read
+       Returns the config sorted like the saved config files
+    """
+    client = redis_pipeline.get_pipeline_client(config_db, config_db.CONFIG_DB)
+    hashes = redis_pipeline.hgetall_hashes(config_db, config_db.CONFIG_DB, client.keys('*'))
+    separator = config_db.TABLE_NAME_SEPARATOR
+    data = {}
+    for key, fvs in hashes.items():
+        # Skip the keys which are not table entries
+        if separator not in key:
+            continue
+        table, row = key.split(separator, 1)
+        data.setdefault(table, {})[row] = config_db.raw_to_typed(fvs)
+    return sort_dict(sonic_cfggen.FormatConverter.to_serialized(data))
+
+
+def save_config_to_file(config_db, filename):
+    """Save CONFIG_DB to a file, in the format of the `sonic-cfggen -d --print-data` output after sort_dict
+    """
+    content = json.dumps(get_config_for_save(config_db), indent=4)
+    with open(filename, 'w') as config_db_file:
+        config_db_file.write(content)
+        config_db_file.flush()
+        os.fsync(config_db_file.fileno())
 
 
 def multiasic_validate_single_file(filename):
@@ -1440,6 +1487,71 @@ def load_sysinfo_if_missing(asic_config):
         return False
 
 
+class PhaseTimer(object):
+    """Wall time of the phases of a command, per namespace for the phases run in each namespace
+    """
+    def __init__(self, command):
+        self.command = command
+        self.start = time.monotonic()
+        # (start, phase, namespace, seconds)
+        self.phases = []
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name, namespace=None):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phases.append((start, name, namespace, time.monotonic() - start))
+
+    def get_phases(self):
+        phases = []
+        for _, name, namespace, elapsed in sorted(self.phases, key=lambda phase: phase[0]):
+            if namespace is not None:
+                name = "{} ({})".format(name, namespace or HOST_NAMESPACE)
+            phases.append((name, elapsed))
+        return phases
+
+    def report(self, display=False):
+        """Log the time of the phases, and display them if display is set
+        """
+        phases = self.get_phases()
+        total = time.monotonic() - self.start
+        log.log_notice("'{}' took {:.1f}s: {}".format(self.command, total, ", ".join(
+            "{} {:.1f}s".format(name, elapsed) for name, elapsed in phases)))
+        if display:
+            width = max([len(name) for name, _ in phases] + [len("Total")])
+            click.echo("{:<{}}  {:>9}".format("Phase", width, "Seconds"))
+            for name, elapsed in phases + [("Total", total)]:
+                click.echo("{:<{}}  {:9.1f}".format(name, width, elapsed))
+
+
+def run_in_namespaces(func, namespaces, max_workers=1):
+    """Call func(namespace) for the namespaces. The host namespace is handled first,
+       then the ASIC namespaces, max_workers of them concurrently.
+    """
+    namespaces = list(namespaces)
+    asic_namespaces = [namespace for namespace in namespaces if namespace != DEFAULT_NAMESPACE]
+    if max_workers <= 1 or len(asic_namespaces) <= 1:
+        for namespace in namespaces:
+            func(namespace)
+        return
+
+    # The host databases are loaded before the ones of the ASICs
+    if DEFAULT_NAMESPACE in namespaces:
+        func(DEFAULT_NAMESPACE)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(asic_namespaces)))
+    try:
+        futures = [executor.submit(func, namespace) for namespace in asic_namespaces]
+        # Raise the error of the first namespace which failed, like when handled in sequence
+        for future in futures:
+            future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def flush_configdb(namespace=DEFAULT_NAMESPACE):
     if namespace is DEFAULT_NAMESPACE:
         config_db = ConfigDBConnector()
@@ -1482,8 +1594,12 @@ def migrate_db_to_lastest(namespace=DEFAULT_NAMESPACE):
         clicommon.run_command(command, display_cmd=True)
 
 
-def multiasic_write_to_db(filename, load_sysinfo):
+def multiasic_write_to_db(filename, load_sysinfo, max_workers=1, timer=None):
+    if timer is None:
+        timer = PhaseTimer('load')
     file_input = read_json_file(filename)
+    # {namespace: (config, load_sysinfo, cfg_hwsku)}
+    asic_configs = {}
     for ns in [DEFAULT_NAMESPACE, *multi_asic.get_namespace_list()]:
         asic_name = HOST_NAMESPACE if ns == DEFAULT_NAMESPACE else ns
         asic_config = file_input[asic_name]
@@ -1492,6 +1608,7 @@ def multiasic_write_to_db(filename, load_sysinfo):
         if not asic_load_sysinfo:
             asic_load_sysinfo = load_sysinfo_if_missing(asic_config)
 
+        cfg_hwsku = None
         if asic_load_sysinfo:
             cfg_hwsku = asic_config.get("DEVICE_METADATA", {}).\
                 get("localhost", {}).get("hwsku")
@@ -1499,27 +1616,37 @@ def multiasic_write_to_db(filename, load_sysinfo):
                 click.secho("Could not get the HWSKU from config file,  Exiting!", fg='magenta')
                 sys.exit(1)
 
-        client, _ = flush_configdb(ns)
+        asic_configs[ns] = (asic_config, asic_load_sysinfo, cfg_hwsku)
+
+    def write_namespace(ns):
+        asic_config, asic_load_sysinfo, cfg_hwsku = asic_configs[ns]
+        with timer.phase('flush', ns):
+            client, _ = flush_configdb(ns)
 
         if asic_load_sysinfo:
             if ns is DEFAULT_NAMESPACE:
                 command = [str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '--write-to-db']
             else:
                 command = [str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '-n', str(ns), '--write-to-db']
-            clicommon.run_command(command, display_cmd=True)
+            with timer.phase('load sysinfo', ns):
+                clicommon.run_command(command, display_cmd=True)
 
-        if ns is DEFAULT_NAMESPACE:
-            config_db = ConfigDBPipeConnector(use_unix_socket_path=True)
-        else:
-            config_db = ConfigDBPipeConnector(use_unix_socket_path=True, namespace=ns)
+        with timer.phase('load', ns):
+            if ns is DEFAULT_NAMESPACE:
+                config_db = ConfigDBPipeConnector(use_unix_socket_path=True)
+            else:
+                config_db = ConfigDBPipeConnector(use_unix_socket_path=True, namespace=ns)
 
-        config_db.connect(False)
-        sonic_cfggen.FormatConverter.to_deserialized(asic_config)
-        data = sonic_cfggen.FormatConverter.output_to_db(asic_config)
-        config_db.mod_config(sonic_cfggen.FormatConverter.output_to_db(data))
-        client.set(config_db.INIT_INDICATOR, 1)
+            config_db.connect(False)
+            sonic_cfggen.FormatConverter.to_deserialized(asic_config)
+            data = sonic_cfggen.FormatConverter.output_to_db(asic_config)
+            config_db.mod_config(sonic_cfggen.FormatConverter.output_to_db(data))
+            client.set(config_db.INIT_INDICATOR, 1)
+
+        with timer.phase('migrate', ns):
+            migrate_db_to_lastest(ns)
 
-        migrate_db_to_lastest(ns)
+    run_in_namespaces(write_namespace, asic_configs, max_workers)
 
 
 def config_file_yang_validation(filename):
@@ -1576,7 +1703,7 @@ def check_dhcpv4_relay_dependencies(db, object_name, object_type):
 
 
 # This is our main entrypoint - the main 'config' command
-@click.group(cls=clicommon.AbbreviationGroup, context_settings=CONTEXT_SETTINGS)
+@click.group(cls=clicommon.LazyAbbreviationGroup, context_settings=CONTEXT_SETTINGS, lazy_commands=SUBCOMMANDS)
 @click.pass_context
 def config(ctx):
     """SONiC command line - 'config' command"""
@@ -1608,48 +1735,18 @@ def config(ctx):
     ctx.obj = Db()
 
 
-# Add groups from other modules
-config.add_command(aaa.aaa)
-config.add_command(aaa.tacacs)
-config.add_command(aaa.radius)
-config.add_command(bmc.bmc)
-config.add_command(chassis_modules.chassis)
-config.add_command(console.console)
-config.add_command(fabric.fabric)
-config.add_command(feature.feature)
-config.add_command(flow_counters.flowcnt_route)
+# Add groups from other modules, imported when invoked only
 if hft_common.is_supported_platform():
-    config.add_command(hft.hft)
-config.add_command(kdump.kdump)
-config.add_command(kube.kubernetes)
-config.add_command(muxcable.muxcable)
-config.add_command(nat.nat)
-config.add_command(vlan.vlan)
-config.add_command(vxlan.vxlan)
-
-# add stp commands
-config.add_command(stp.spanning_tree)
-
-# add mclag commands
-config.add_command(mclag.mclag)
-config.add_command(mclag.mclag_member)
-config.add_command(mclag.mclag_unique_ip)
-
-# syslog module
-config.add_command(syslog.syslog)
-
-# DNS module
-config.add_command(dns.dns)
-
-# Switchport module
-config.add_command(switchport.switchport)
+    config.add_lazy_command('hft', 'config.hft:hft')
 
 @config.command()
 @click.option('-y', '--yes', is_flag=True, callback=_abort_if_false,
                 expose_value=False, prompt='Existing files will be overwritten, continue?')
+@click.option('-p', '--parallel', is_flag=True,
+              help='Read the config DB of all the namespaces concurrently in-process, instead of with sonic-cfggen')
 @click.argument('filename', required=False)
 @clicommon.pass_db
-def save(db, filename):
+def save(db, filename, parallel):
     """Export current config DB to a file on disk.\n
        <filename> : Names of configuration file(s) to save, separated by comma with no spaces in between
     """
@@ -1674,6 +1771,8 @@ def save(db, filename):
             click.echo("Input {} config file(s) separated by comma for multiple files ".format(num_cfg_file))
             return
 
+    # (namespace, file) saved in-process
+    saves = []
     # In case of multi-asic mode we have additional config_db{NS}.json files for
     # various namespaces created per ASIC. {NS} is the namespace index.
     for inst in range(-1, num_cfg_file-1):
@@ -1692,6 +1791,10 @@ def save(db, filename):
             else:
                 file = "/etc/sonic/config_db{}.json".format(inst)
 
+        if parallel:
+            saves.append((DEFAULT_NAMESPACE if namespace is None else namespace, file))
+            continue
+
         if namespace is None:
             command = "{} -d --print-data > {}".format(SONIC_CFGGEN_PATH, file)
         else:
@@ -1706,6 +1809,23 @@ def save(db, filename):
             config_db_file.flush()
             os.fsync(config_db_file.fileno())
 
+    if saves:
+        log.log_info("'save' executing...")
+        failed = False
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(saves)) as executor:
+            futures = []
+            for namespace, file in saves:
+                click.echo("Saving config of {} to {}".format(namespace or HOST_NAMESPACE, file))
+                futures.append((file, executor.submit(save_config_to_file, db.cfgdb_clients[namespace], file)))
+            for file, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    click.echo("Failed to save {}: {}".format(file, e), err=True)
+                    failed = True
+        if failed:
+            sys.exit(1)
+
 @config.command()
 @click.option('-y', '--yes', is_flag=True)
 @click.argument('filename', required=False)
@@ -1970,10 +2090,13 @@ def list_checkpoints(ctx, time, verbose):
 @click.option('-f', '--force', default=False, is_flag=True, help='Force config reload without system checks')
 @click.option('-t', '--file_format', default='config_db',type=click.Choice(['config_yang', 'config_db']),show_default=True,help='specify the file format')
 @click.option('-b', '--bypass-lock', default=False, is_flag=True, help='Do reload without acquiring lock')
+@click.option('--max-workers', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Number of ASIC namespaces loaded concurrently')
+@click.option('--timing', default=False, is_flag=True, help='Display the time taken by each phase of the reload')
 @click.argument('filename', required=False)
 @clicommon.pass_db
 @try_lock(SYSTEM_RELOAD_LOCK, timeout=0)
-def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_format, bypass_lock):
+def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_format, bypass_lock, max_workers, timing):
     """Clear current configuration and import a previous saved config DB dump file.
        <filename> : Names of configuration file(s) to load, separated by comma with no spaces in between
     """
@@ -2019,22 +2142,28 @@ def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_form
             click.echo("Input {} config file(s) separated by comma for multiple files ".format(num_cfg_file))
             return
 
+    timer = PhaseTimer('reload')
     if filename is not None and filename != "/dev/stdin":
-        if multi_asic.is_multi_asic():
-            for cfg_file in cfg_files:
-                if cfg_file is not None:
-                    config_file_yang_validation(cfg_file)
-        else:
-            config_file_yang_validation(filename)
+        with timer.phase('validate'):
+            if multi_asic.is_multi_asic():
+                for cfg_file in cfg_files:
+                    if cfg_file is not None:
+                        config_file_yang_validation(cfg_file)
+            else:
+                config_file_yang_validation(filename)
 
     #Stop services before config push
     if not no_service_restart:
         log.log_notice("'reload' stopping services...")
-        _stop_services()
+        with timer.phase('stop services'):
+            _stop_services()
 
     if multiasic_single_file_mode:
-        multiasic_write_to_db(cfg_files[0], load_sysinfo)
+        with timer.phase('namespaces'):
+            multiasic_write_to_db(cfg_files[0], load_sysinfo, max_workers, timer)
     else:
+        # {namespace: (file, load_sysinfo, cfg_hwsku)}
+        reload_files = {}
         # In Single ASIC platforms we have single DB service. In multi-ASIC platforms we have a global DB
         # service running in the host + DB services running in each ASIC namespace created per ASIC.
         # In the below logic, we get all namespaces in this platform and add an empty namespace ''
@@ -2074,6 +2203,7 @@ def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_form
                 if not load_sysinfo:
                     load_sysinfo = load_sysinfo_if_missing(file_input)
 
+            cfg_hwsku = None
             if load_sysinfo:
                 try:
                     command = [SONIC_CFGGEN_PATH, "-j", file, '-v', "DEVICE_METADATA.localhost.hwsku"]
@@ -2093,60 +2223,82 @@ def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_form
 
                 cfg_hwsku = output.strip()
 
-            client, config_db = flush_configdb(namespace)
-            delete_transceiver_tables()
-            delete_bgp_peer_table()
+            reload_files[namespace] = (file, load_sysinfo, cfg_hwsku)
 
-            if load_sysinfo:
-                if namespace is DEFAULT_NAMESPACE:
-                    command = [
-                        str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '--write-to-db']
-                else:
-                    command = [
-                        str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '-n', str(namespace), '--write-to-db']
-                clicommon.run_command(command, display_cmd=True)
+        def reload_namespace(namespace):
+            file, load_sysinfo, cfg_hwsku = reload_files[namespace]
+            reload_config_file(namespace, file, file_format, load_sysinfo, cfg_hwsku, timer)
 
-            # For the database service running in linux host we use the file user gives as input
-            # or by default DEFAULT_CONFIG_DB_FILE. In the case of database service running in namespace,
-            # the default config_db<namespaceID>.json format is used.
+        with timer.phase('namespaces'):
+            run_in_namespaces(reload_namespace, reload_files, max_workers)
 
-            config_gen_opts = []
+    # Re-generate the environment variable in case config_db.json was edited
+    with timer.phase('update environment'):
+        update_sonic_environment()
 
-            if os.path.isfile(INIT_CFG_FILE):
-                config_gen_opts += ['-j', str(INIT_CFG_FILE)]
+    # We first run "systemctl reset-failed" to remove the "failed"
+    # status from all services before we attempt to restart them
+    if not no_service_restart:
+        with timer.phase('reset failed services'):
+            _reset_failed_services()
+        log.log_notice("'reload' restarting services...")
+        with timer.phase('restart services'):
+            _restart_services()
 
-            if file_format == 'config_db':
-                config_gen_opts += ['-j', str(file)]
-            else:
-                config_gen_opts += ['-Y', str(file)]
+    timer.report(display=timing)
 
-            if namespace is not DEFAULT_NAMESPACE:
-                config_gen_opts += ['-n', str(namespace)]
 
-            command = [SONIC_CFGGEN_PATH] + config_gen_opts + ['--write-to-db']
+def reload_config_file(namespace, file, file_format, load_sysinfo, cfg_hwsku, timer):
+    """Flush the config DB of a namespace, load the config file into it and migrate it
+    """
+    with timer.phase('flush', namespace):
+        client, config_db = flush_configdb(namespace)
+        delete_transceiver_tables()
+        delete_bgp_peer_table()
 
+    if load_sysinfo:
+        if namespace is DEFAULT_NAMESPACE:
+            command = [
+                str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '--write-to-db']
+        else:
+            command = [
+                str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '-n', str(namespace), '--write-to-db']
+        with timer.phase('load sysinfo', namespace):
             clicommon.run_command(command, display_cmd=True)
-            client.set(config_db.INIT_INDICATOR, 1)
 
-            if os.path.exists(file) and file.endswith("_configReloadStdin"):
-                # Remove tmpfile
-                try:
-                    os.remove(file)
-                except OSError as e:
-                    click.echo("An error occurred while removing the temporary file: {}".format(str(e)), err=True)
+    # For the database service running in linux host we use the file user gives as input
+    # or by default DEFAULT_CONFIG_DB_FILE. In the case of database service running in namespace,
+    # the default config_db<namespaceID>.json format is used.
 
-            # Migrate DB contents to latest version
-            migrate_db_to_lastest(namespace)
+    config_gen_opts = []
 
-    # Re-generate the environment variable in case config_db.json was edited
-    update_sonic_environment()
+    if os.path.isfile(INIT_CFG_FILE):
+        config_gen_opts += ['-j', str(INIT_CFG_FILE)]
 
-    # We first run "systemctl reset-failed" to remove the "failed"
-    # status from all services before we attempt to restart them
-    if not no_service_restart:
-        _reset_failed_services()
-        log.log_notice("'reload' restarting services...")
-        _restart_services()
+    if file_format == 'config_db':
+        config_gen_opts += ['-j', str(file)]
+    else:
+        config_gen_opts += ['-Y', str(file)]
+
+    if namespace is not DEFAULT_NAMESPACE:
+        config_gen_opts += ['-n', str(namespace)]
+
+    command = [SONIC_CFGGEN_PATH] + config_gen_opts + ['--write-to-db']
+
+    with timer.phase('load', namespace):
+        clicommon.run_command(command, display_cmd=True)
+        client.set(config_db.INIT_INDICATOR, 1)
+
+    if os.path.exists(file) and file.endswith("_configReloadStdin"):
+        # Remove tmpfile
+        try:
+            os.remove(file)
+        except OSError as e:
+            click.echo("An error occurred while removing the temporary file: {}".format(str(e)), err=True)
+
+    # Migrate DB contents to latest version
+    with timer.phase('migrate', namespace):
+        migrate_db_to_lastest(namespace)
 
 @config.command("load_mgmt_config")
 @click.option('-y', '--yes', is_flag=True, callback=_abort_if_false,
@@ -2198,12 +2350,17 @@ def load_mgmt_config(filename):
 @click.option('-o', '--override_config', default=False, is_flag=True, help='Enable config override. Proceed with default path.')
 @click.option('-p', '--golden_config_path', help='Provide golden config path to override. Use with --override_config')
 @click.option('-b', '--bypass-lock', default=False, is_flag=True, help='Do load minigraph without acquiring lock')
+@click.option('--max-workers', default=1, show_default=True, type=click.IntRange(min=1),
+              help='Number of ASIC namespaces loaded concurrently')
+@click.option('--timing', default=False, is_flag=True, help='Display the time taken by each phase of the load')
 @clicommon.pass_db
 @try_lock(SYSTEM_RELOAD_LOCK, timeout=0)
-def load_minigraph(db, no_service_restart, traffic_shift_away, override_config, golden_config_path, bypass_lock):
+def load_minigraph(db, no_service_restart, traffic_shift_away, override_config, golden_config_path, bypass_lock,
+                   max_workers, timing):
     """Reconfigure based on minigraph."""
     argv_str = ' '.join(['config', *sys.argv[1:]])
     log.log_notice(f"'load_minigraph' executing with command: {argv_str}")
+    timer = PhaseTimer('load_minigraph')
 
     # check if golden_config exists if override flag is set
     if override_config:
@@ -2232,9 +2389,10 @@ def load_minigraph(db, no_service_restart, traffic_shift_away, override_config,
     # Stop services before config push
     if not no_service_restart:
         log.log_notice("'load_minigraph' stopping services...")
-        delete_transceiver_tables()
-        delete_bgp_peer_table()
-        _stop_services()
+        with timer.phase('stop services'):
+            delete_transceiver_tables()
+            delete_bgp_peer_table()
+            _stop_services()
 
     # For Single Asic platform the namespace list has the empty string
     # for mulit Asic platform the empty string to generate the config
@@ -2244,39 +2402,47 @@ def load_minigraph(db, no_service_restart, traffic_shift_away, override_config,
     if num_npus > 1:
         namespace_list += multi_asic.get_namespaces_from_linux()
 
-    for namespace in namespace_list:
+    def load_namespace(namespace):
         if namespace is DEFAULT_NAMESPACE:
             config_db = ConfigDBConnector()
             cfggen_namespace_option = []
-            ns_cmd_prefix = ""
         else:
             config_db = ConfigDBConnector(use_unix_socket_path=True, namespace=namespace)
             cfggen_namespace_option = ['-n', str(namespace)]
-            ns_cmd_prefix = "sudo ip netns exec {} ".format(namespace)
-        config_db.connect()
-        client = config_db.get_redis_client(config_db.CONFIG_DB)
-        client.flushdb()
+        with timer.phase('flush', namespace):
+            config_db.connect()
+            client = config_db.get_redis_client(config_db.CONFIG_DB)
+            client.flushdb()
         if os.path.isfile('/etc/sonic/init_cfg.json'):
             command = [SONIC_CFGGEN_PATH, '-H', '-m', '-j', '/etc/sonic/init_cfg.json'] + cfggen_namespace_option + ['--write-to-db']
         else:
             command = [SONIC_CFGGEN_PATH, '-H', '-m', '--write-to-db'] + cfggen_namespace_option
-        clicommon.run_command(command, display_cmd=True)
-        client.set(config_db.INIT_INDICATOR, 1)
+        with timer.phase('load', namespace):
+            clicommon.run_command(command, display_cmd=True)
+            client.set(config_db.INIT_INDICATOR, 1)
+
+    with timer.phase('namespaces'):
+        run_in_namespaces(load_namespace, namespace_list, max_workers)
 
     # Update SONiC environment file
-    update_sonic_environment()
+    with timer.phase('update environment'):
+        update_sonic_environment()
 
     if os.path.isfile('/etc/sonic/acl.json'):
-        clicommon.run_command(['acl-loader', 'update', 'full', '/etc/sonic/acl.json', '--skip_action_validation'], display_cmd=True)
+        with timer.phase('acl'):
+            clicommon.run_command(['acl-loader', 'update', 'full', '/etc/sonic/acl.json', '--skip_action_validation'],
+                                  display_cmd=True)
 
     # Load port_config.json
     try:
-        load_port_config(db.cfgdb, '/etc/sonic/port_config.json')
+        with timer.phase('port config'):
+            load_port_config(db.cfgdb, '/etc/sonic/port_config.json')
     except Exception as e:
         click.secho("Failed to load port_config.json, Error: {}".format(str(e)), fg='magenta')
 
     # generate QoS and Buffer configs
-    clicommon.run_command(['config', 'qos', 'reload', '--no-dynamic-buffer', '--no-delay'], display_cmd=True)
+    with timer.phase('qos reload'):
+        clicommon.run_command(['config', 'qos', 'reload', '--no-dynamic-buffer', '--no-delay'], display_cmd=True)
 
     # get the device type
     device_type = _get_device_type()
@@ -2290,17 +2456,21 @@ def load_minigraph(db, no_service_restart, traffic_shift_away, override_config,
             if 'default_pfcwd_status' in override_metadata:
                 default_pfcwd_status = override_metadata['default_pfcwd_status'].lower()
         if default_pfcwd_status == 'enable':
-            clicommon.run_command(['pfcwd', 'start_default'], display_cmd=True)
+            with timer.phase('pfcwd'):
+                clicommon.run_command(['pfcwd', 'start_default'], display_cmd=True)
 
     # Write latest db version string into db
     db_migrator = '/usr/local/bin/db_migrator.py'
     if os.path.isfile(db_migrator) and os.access(db_migrator, os.X_OK):
-        for namespace in namespace_list:
+        def set_version(namespace):
             if namespace is DEFAULT_NAMESPACE:
                 cfggen_namespace_option = []
             else:
                 cfggen_namespace_option = ['-n', str(namespace)]
-            clicommon.run_command([db_migrator, '-o', 'set_version'] + cfggen_namespace_option)
+            with timer.phase('set version', namespace):
+                clicommon.run_command([db_migrator, '-o', 'set_version'] + cfggen_namespace_option)
+
+        run_in_namespaces(set_version, namespace_list, max_workers)
 
     # Keep device isolated with TSA
     if traffic_shift_away:
@@ -2311,7 +2481,8 @@ def load_minigraph(db, no_service_restart, traffic_shift_away, override_config,
 
     # Load golden_config_db.json
     if override_config:
-        override_config_by(golden_config_path)
+        with timer.phase('override config'):
+            override_config_by(golden_config_path)
 
     # Invoke platform script if available before starting the services
     platform_path, _ = device_info.get_paths_to_platform_and_hwsku_dirs()
@@ -2327,10 +2498,13 @@ def load_minigraph(db, no_service_restart, traffic_shift_away, override_config,
     # We first run "systemctl reset-failed" to remove the "failed"
     # status from all services before we attempt to restart them
     if not no_service_restart:
-        _reset_failed_services()
+        with timer.phase('reset failed services'):
+            _reset_failed_services()
         #FIXME: After config DB daemon is implemented, we'll no longer need to restart every service.
         log.log_notice("'load_minigraph' restarting services...")
-        _restart_services()
+        with timer.phase('restart services'):
+            _restart_services()
+    timer.report(display=timing)
     click.echo("Please note setting loaded from minigraph will be lost after system reboot. To preserve setting, run `config save`.")
 
 def load_port_config(config_db, port_config_path):
@@ -9366,9 +9540,9 @@ def smoothing_interval(interval, rates_type):
         counters_db.set('COUNTERS_DB', 'RATES:TRAP', 'TRAP_ALPHA', alpha)
 
 
-# Load plugins and register them
+# Load plugins and register them when a command may need them
 helper = util_base.UtilHelper()
-helper.load_and_register_plugins(plugins, config)
+config.add_lazy_plugins(lambda: helper.load_and_register_plugins(plugins, config))
 
 #
 # 'subinterface' group ('config subinterface ...')
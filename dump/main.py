@@ -6,7 +6,8 @@ import click
 from tabulate import tabulate
 from sonic_py_common import multi_asic
 from utilities_common.constants import DEFAULT_NAMESPACE
-from dump.match_infra import RedisSource, JsonSource, MatchEngine, CONN
+from dump.match_infra import JsonSource, MatchEngine, CONN
+from dump.helper import verbose_print
 from swsscommon.swsscommon import ConfigDBConnector, SonicDBConfig
 from dump import plugins
 
@@ -50,32 +51,101 @@ def dump(ctx):
               help="Prints any intermediate output to stdout useful for dev & troubleshooting")
 @click.option('--namespace', '-n', default=DEFAULT_NAMESPACE, type=str,
               show_default=True, help='Dump the redis-state for this namespace.')
-def state(ctx, module, identifier, db, table, key_map, verbose, namespace):
+@click.option('--snapshot-dir', '-S', default=None, type=click.Path(exists=True, file_okay=False),
+              help='Dump offline from the DB snapshots in this directory, Eg: the dump/ directory of a techsupport')
+@click.option('--output-dir', '-o', default=None, type=click.Path(file_okay=False),
+              help='Write the dump of each module and namespace to a file in this directory, '
+                   'required to dump all the modules or namespaces')
+def state(ctx, module, identifier, db, table, key_map, verbose, namespace, snapshot_dir, output_dir):
     """
     Dump the current state of the identifier for the specified module from Redis DB or CONFIG_FILE
+
+    With the "all" module and namespace, all the modules are dumped for all the namespaces in one run,
+    sharing the connections to the databases, to a file per module and namespace in the output directory
     """
-    if not multi_asic.is_multi_asic() and namespace != DEFAULT_NAMESPACE:
+    if not multi_asic.is_multi_asic() and namespace not in (DEFAULT_NAMESPACE, "all"):
         click.echo("Namespace option is not valid for a single-ASIC device")
         ctx.exit()
 
-    if multi_asic.is_multi_asic() and (namespace != DEFAULT_NAMESPACE and namespace not in multi_asic.get_namespace_list()):
+    if multi_asic.is_multi_asic() and (namespace not in (DEFAULT_NAMESPACE, "all") and
+                                       namespace not in multi_asic.get_namespace_list()):
         click.echo("Namespace option is not valid. Choose one of {}".format(multi_asic.get_namespace_list()))
         ctx.exit()
 
     if multi_asic.is_multi_asic() and not SonicDBConfig.isGlobalInit():
         SonicDBConfig.initializeGlobalConfig()
 
-    if module not in plugins.dump_modules:
+    if module != "all" and module not in plugins.dump_modules:
         click.echo("No Matching Plugin has been Implemented")
         ctx.exit()
 
+    modules = list(plugins.dump_modules) if module == "all" else [module]
+    namespaces = [namespace]
+    if namespace == "all":
+        namespaces = [DEFAULT_NAMESPACE]
+        if multi_asic.is_multi_asic():
+            namespaces += multi_asic.get_namespace_list()
+
+    if module == "all" and identifier != "all":
+        click.echo("Only the \"all\" identifier is valid for all the modules")
+        ctx.exit()
+
+    if (len(modules) > 1 or len(namespaces) > 1) and not output_dir:
+        click.echo("Output directory option is required to dump all the modules or namespaces")
+        ctx.exit()
+
     if verbose:
         os.environ["VERBOSE"] = "1"
     else:
         os.environ["VERBOSE"] = "0"
 
-    obj = plugins.dump_modules[module](ctx.obj)
+    match_engine = ctx.obj
+    if snapshot_dir:
+        match_engine = MatchEngine(ctx.obj.conn_pool, snapshot_dir=snapshot_dir)
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    failed = False
+    for mod in modules:
+        obj = plugins.dump_modules[mod](match_engine)
+        if snapshot_dir and obj.return_pb2_obj():
+            click.echo("Offline dump is not supported for the {} module".format(mod))
+            if len(modules) == 1:
+                ctx.exit()
+            continue
+
+        for ns in namespaces:
+            if not output_dir:
+                collected_info = dump_module_state(match_engine, obj, mod, identifier, db, key_map, ns)
+                print_dump(collected_info, table, mod, identifier, key_map)
+                continue
+
+            # Name the files like the dumps of the modules saved by generate_dump
+            file_name = os.path.join(output_dir, mod if ns == DEFAULT_NAMESPACE else "{}.{}".format(mod, ns))
+            try:
+                collected_info = dump_module_state(match_engine, obj, mod, identifier, db, key_map, ns)
+                with open(file_name, "w") as f:
+                    f.write(format_dump(collected_info, table, mod, identifier, key_map) + "\n")
+            except Exception as err:
+                # The other modules are dumped, like with a run of the command per module
+                click.echo("Failed to dump the {} module for namespace {}: {}".format(mod, ns or "default", err),
+                           err=True)
+                failed = True
+            else:
+                click.echo(file_name)
+
+    verbose_print(str(match_engine.conn_pool.snapshot_cache))
 
+    if failed:
+        ctx.exit(1)
+    return
+
+
+def dump_module_state(match_engine, obj, module, identifier, db, key_map, namespace):
+    """
+    Collect the state of the identifier, or of all the identifiers for "all", of a module in a namespace
+    """
     if identifier == "all":
         ids = obj.get_all_args(namespace)
     else:
@@ -94,24 +164,26 @@ def state(ctx, module, identifier, db, table, key_map, verbose, namespace):
     if len(db) > 0:
         collected_info = filter_out_dbs(db, collected_info)
 
-    vidtorid = extract_rid(collected_info, namespace, ctx.obj.conn_pool)
+    vidtorid = extract_rid(collected_info, namespace, match_engine)
 
     if not key_map:
-        collected_info = populate_fv(collected_info, module, namespace, ctx.obj.conn_pool, obj.return_pb2_obj())
+        collected_info = populate_fv(collected_info, module, namespace, match_engine, obj.return_pb2_obj())
 
     for id in vidtorid.keys():
         collected_info[id]["ASIC_DB"]["vidtorid"] = vidtorid[id]
 
-    print_dump(collected_info, table, module, identifier, key_map)
-
-    return
+    return collected_info
 
 
-def extract_rid(info, ns, conn_pool):
-    r = RedisSource(conn_pool)
-    r.connect("ASIC_DB", ns)
+def extract_rid(info, ns, match_engine):
+    r = match_engine.get_redis_source_adapter()
     vidtorid = {}
     vid_cache = {}  # Cache Entries to reduce number of Redis Calls
+    # Resolve the vids of all the args in one round trip
+    vids = sorted(set(vid for arg in info.keys() for vid in get_vids(info[arg])))
+    if not vids or not r.connect("ASIC_DB", ns):
+        return vidtorid
+    vid_cache.update(zip(vids, r.hmget("ASIC_DB", "VIDTORID", vids)))
     for arg in info.keys():
         mp = get_v_r_map(r, info[arg], vid_cache)
         if mp:
@@ -119,8 +191,8 @@ def extract_rid(info, ns, conn_pool):
     return vidtorid
 
 
-def get_v_r_map(r, single_dict, vid_cache):
-    v_r_map = {}
+def get_vids(single_dict):
+    vids = []
     asic_obj_ptrn = "ASIC_STATE:.*:oid:0x\w{1,14}"
 
     if "ASIC_DB" in single_dict and "keys" in single_dict["ASIC_DB"]:
@@ -128,13 +200,19 @@ def get_v_r_map(r, single_dict, vid_cache):
             if re.match(asic_obj_ptrn, redis_key):
                 matches = re.findall(r"oid:0x\w{1,14}", redis_key)
                 if matches:
-                    vid = matches[0]
-                    if vid in vid_cache:
-                        rid = vid_cache[vid]
-                    else:
-                        rid = r.hget("ASIC_DB", "VIDTORID", vid)
-                        vid_cache[vid] = rid
-                    v_r_map[vid] = rid if rid else "Real ID Not Found"
+                    vids.append(matches[0])
+    return vids
+
+
+def get_v_r_map(r, single_dict, vid_cache):
+    v_r_map = {}
+    for vid in get_vids(single_dict):
+        if vid in vid_cache:
+            rid = vid_cache[vid]
+        else:
+            rid = r.hget("ASIC_DB", "VIDTORID", vid)
+            vid_cache[vid] = rid
+        v_r_map[vid] = rid if rid else "Real ID Not Found"
     return v_r_map
 
 
@@ -149,22 +227,30 @@ def filter_out_dbs(db_list, collected_info):
     return collected_info
 
 
-def populate_fv(info, module, namespace, conn_pool, dash_object):
+def populate_fv(info, module, namespace, match_engine, dash_object):
+    conn_pool = match_engine.conn_pool
     all_dbs = set()
     for id in info.keys():
         for db_name in info[id].keys():
             all_dbs.add(db_name)
 
     db_cfg_file = JsonSource()
+    bulk_fv = {}
     for db_name in all_dbs:
         if db_name == "CONFIG_FILE":
             db_cfg_file.connect(plugins.dump_modules[module].CONFIG_FILE, namespace)
-        else:
-            conn_pool.get(db_name, namespace)
+        elif not (dash_object and db_name == "APPL_DB"):
+            # Fetch the field-value pairs of the keys of all the ids at once
+            keys = set(key for id in info.keys() if db_name in info[id] for key in info[id][db_name]["keys"])
+            src = match_engine.get_redis_source_adapter()
+            src.connect(db_name, namespace)
+            if src.BULK_FETCH:
+                bulk_fv[db_name] = conn_pool.snapshot_cache.hgetall_bulk(src, namespace, db_name, keys)
+            else:
+                bulk_fv[db_name] = src.hgetall_bulk(db_name, keys)
     if dash_object:
         conn_pool.get_dash_conn(namespace)
         redis_conn = conn_pool.cache.get(namespace, {}).get("DASH_"+CONN, None)
-    db_conn = conn_pool.cache.get(namespace, {}).get(CONN, None)
 
     final_info = {}
     for id in info.keys():
@@ -185,7 +271,7 @@ def populate_fv(info, module, namespace, conn_pool, dash_object):
                         print("Issue in importing dash module!")
                         return final_info
                 else:
-                    fv = db_conn.get_all(db_name, key)
+                    fv = bulk_fv[db_name][key]
                 final_info[id][db_name]["keys"].append({key: fv})
     return final_info
 
@@ -203,9 +289,13 @@ def get_dict_str(key_obj):
 
 # print dump
 def print_dump(collected_info, table, module, identifier, key_map):
+    click.echo(format_dump(collected_info, table, module, identifier, key_map))
+    return
+
+
+def format_dump(collected_info, table, module, identifier, key_map):
     if not table:
-        click.echo(json.dumps(collected_info, indent=4))
-        return
+        return json.dumps(collected_info, indent=4)
 
     top_header = [plugins.dump_modules[module].ARG_NAME, "DB_NAME", "DUMP"]
     final_collection = []
@@ -242,8 +332,7 @@ def print_dump(collected_info, table, module, identifier, key_map):
                 total_info += str(tabulate(temp, headers=["vid", "rid"], tablefmt="grid"))
             final_collection.append([ids, db, total_info])
 
-    click.echo(tabulate(final_collection, top_header, tablefmt="grid"))
-    return
+    return tabulate(final_collection, top_header, tablefmt="grid")
 
 
 if __name__ == '__main__':
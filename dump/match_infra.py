@@ -1,18 +1,25 @@
 import json
 import fnmatch
 import copy
+import gzip
+import os
 from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import OrderedDict
 from dump.helper import verbose_print
 from swsscommon.swsscommon import SonicV2Connector, SonicDBConfig
 from sonic_py_common import multi_asic
 from utilities_common.constants import DEFAULT_NAMESPACE
 from utilities_common.general import load_db_config
+from utilities_common import redis_pipeline
 import redis
 
 
 # Constants
 CONN = "conn"
 CONN_TO = "connected_to"
+SNAPSHOT_CACHE_SIZE = 100000  # Max number of key listings and objects cached
+GLOB_CHARS = "*?[\\"
 
 EXCEP_DICT = {
     "INV_REQ": "Argument should be of type MatchRequest",
@@ -28,7 +35,8 @@ EXCEP_DICT = {
     "BAD_FORMAT_RE_FIELDS": "Return Fields should be of list type",
     "NO_ENTRIES": "No Keys found after applying the filtering criteria",
     "FILE_R_EXEP": "Exception Caught While Reading the json cfg file provided",
-    "INV_NS": "Namespace is invalid"
+    "INV_NS": "Namespace is invalid",
+    "NO_SNAPSHOT": "No snapshot file found for the DB in the snapshot directory"
 }
 
 
@@ -138,6 +146,10 @@ class MatchRequest:
 class SourceAdapter(ABC):
     """ Source Adaptor offers unified interface to Data Sources """
 
+    # Whether hgetall_bulk fetches all the keys at once and the MatchEngine
+    # should filter and fill the templates from its snapshot
+    BULK_FETCH = False
+
     def __init__(self):
         pass
 
@@ -166,10 +178,20 @@ class SourceAdapter(ABC):
     def hgetall(self, db, key):
         raise NotImplementedError
 
+    def hgetall_bulk(self, db, keys):
+        """ Return the field-value pairs of all the keys, as a dict keyed by the key """
+        return {key: self.hgetall(db, key) for key in keys}
+
+    def hmget(self, db, key, fields):
+        """ Return the values of several fields of a hash """
+        return [self.hget(db, key, field) for field in fields]
+
 
 class RedisSource(SourceAdapter):
     """ Concrete Adaptor Class for connecting to Redis Data Sources """
 
+    BULK_FETCH = True
+
     def __init__(self, conn_pool):
         self.conn = None
         self.pool = conn_pool
@@ -197,6 +219,17 @@ class RedisSource(SourceAdapter):
     def hgetall(self, db, key):
         return self.conn.get_all(db, key)
 
+    def hgetall_bulk(self, db, keys):
+        """ Fetch the field-value pairs of all the keys with pipelined HGETALLs """
+        keys = list(keys)
+        return dict(zip(keys, redis_pipeline.hgetall_bulk(self.conn, db, keys)))
+
+    def hmget(self, db, key, fields):
+        """ Fetch several fields of a hash in one round trip """
+        if not fields:
+            return []
+        return redis_pipeline.get_pipeline_client(self.conn, db).hmget(key, fields)
+
 
 class RedisPySource(SourceAdapter):
     """ Concrete Adaptor Class for connecting to APPL_DB using Redis library"""
@@ -243,6 +276,82 @@ class RedisPySource(SourceAdapter):
         key_val = self.conn.hgetall(key)
         return self.get_decoded_value(self.pb_obj, key_val)
 
+
+class SnapshotIndex:
+    """
+    Key index over the objects of a DB snapshot loaded in memory
+    Keys are kept sorted, so a glob pattern is only matched against the keys sharing its literal prefix,
+    and exact keys are direct lookups
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.sorted_keys = sorted(data)
+
+    def keys(self, pattern):
+        """ Return the keys matching the redis glob-style pattern """
+        prefix_len = len(pattern)
+        for i, c in enumerate(pattern):
+            if c in GLOB_CHARS:
+                prefix_len = i
+                break
+        prefix = pattern[:prefix_len]
+        if prefix_len == len(pattern):
+            return [pattern] if pattern in self.data else []
+
+        lo = bisect_left(self.sorted_keys, prefix)
+        hi = len(self.sorted_keys)
+        if prefix:
+            hi = bisect_left(self.sorted_keys, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo)
+        if pattern == prefix + "*":
+            return self.sorted_keys[lo:hi]
+        # https://docs.python.org/3.7/library/fnmatch.html
+        kp = pattern.replace("[^", "[!")
+        return [key for key in self.sorted_keys[lo:hi] if fnmatch.fnmatchcase(key, kp)]
+
+    def get(self, key):
+        return self.data.get(key)
+
+
+# Snapshots loaded in this process, keyed by path, so every source reuses them
+_snapshot_indexes = {}
+
+
+def load_snapshot(path, sep=None):
+    """
+    Load a DB snapshot file once and index it.
+    Supports the sonic-db-dump/redis-dump format found in techsupport dumps, plain {key: {field: value}} dumps,
+    and, when sep is given, config files laid out as {table: {key: {field: value}}}. Files can be gzipped.
+    """
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cache_key = (path, sep)
+    if cache_key in _snapshot_indexes and _snapshot_indexes[cache_key][0] == version:
+        return _snapshot_indexes[cache_key][1]
+
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as f:
+        json_data = json.load(f)
+
+    data = {}
+    for key, value in json_data.items():
+        if not isinstance(value, dict):
+            continue
+        if sep is not None:
+            for sub_key, fv in value.items():
+                data[key + sep + sub_key] = fv
+        elif "type" in value and "value" in value and "ttl" in value and "expireat" in value:
+            # redis-dump format, only hashes are relevant
+            if value["type"] == "hash":
+                data[key] = value["value"]
+        else:
+            data[key] = value
+
+    index = SnapshotIndex(data)
+    _snapshot_indexes[cache_key] = (version, index)
+    return index
+
+
 class JsonSource(SourceAdapter):
     """ Concrete Adaptor Class for connecting to JSON Data Sources """
 
@@ -251,8 +360,7 @@ class JsonSource(SourceAdapter):
 
     def connect(self, db, ns):
         try:
-            with open(db) as f:
-                self.json_data = json.load(f)
+            self.json_data = load_snapshot(db, self.get_separator(db))
         except Exception as e:
             verbose_print("JsonSource: Loading the JSON file failed" + str(e))
             return False
@@ -262,33 +370,149 @@ class JsonSource(SourceAdapter):
         return SonicDBConfig.getSeparator("CONFIG_DB")
 
     def getKeys(self, db, table, key_pattern):
-        if table not in self.json_data:
-            return []
-        # https://docs.python.org/3.7/library/fnmatch.html
-        kp = key_pattern.replace("[^", "[!")
-        kys = fnmatch.filter(self.json_data[table].keys(), kp)
-        return [table + self.get_separator(db) + ky for ky in kys]
+        return self.json_data.keys(table + self.get_separator(db) + key_pattern)
 
     def get(self, db, key):
-        sep = self.get_separator(db)
-        table, key = key.split(sep, 1)
-        return self.json_data.get(table, {}).get(key, {})
+        return self.json_data.get(key) or {}
 
     def hget(self, db, key, field):
-        sep = self.get_separator(db)
-        table, key = key.split(sep, 1)
-        return self.json_data.get(table, "").get(key, "").get(field, "")
+        return (self.json_data.get(key) or {}).get(field, "")
 
     def hgetall(self, db, key):
-        sep = self.get_separator(db)
-        table, key = key.split(sep, 1)
-        return self.json_data.get(table, {}).get(key)
+        return self.json_data.get(key)
+
+
+class DbSnapshotSource(SourceAdapter):
+    """
+    Concrete Adaptor Class serving the DBs from the snapshot files of a techsupport dump directory,
+    Eg: <techsupport>/dump/APPL_DB.json and APPL_DB.json.<asic index> for the namespaces
+    """
+
+    def __init__(self, snapshot_dir):
+        self.snapshot_dir = snapshot_dir
+        self.index = None
+
+    def get_snapshot_file(self, db, ns):
+        suffix = ""
+        if ns and ns != DEFAULT_NAMESPACE:
+            suffix = ".{}".format(multi_asic.get_asic_id_from_name(ns))
+        for name in (db, db.lower()):
+            for ext in ("", ".gz"):
+                path = os.path.join(self.snapshot_dir, name + ".json" + suffix + ext)
+                if os.path.isfile(path):
+                    return path
+        return None
+
+    def connect(self, db, ns):
+        path = self.get_snapshot_file(db, ns)
+        if not path:
+            verbose_print("DbSnapshotSource: " + EXCEP_DICT["NO_SNAPSHOT"] + " " + db)
+            return False
+        try:
+            self.index = load_snapshot(path)
+        except Exception as e:
+            verbose_print("DbSnapshotSource: Loading the snapshot failed" + str(e))
+            return False
+        return True
+
+    def get_separator(self, db):
+        return SonicDBConfig.getSeparator(db)
+
+    def getKeys(self, db, table, key_pattern):
+        return self.index.keys(table + self.get_separator(db) + key_pattern)
+
+    def get(self, db, key):
+        return self.index.get(key) or {}
+
+    def hget(self, db, key, field):
+        return (self.index.get(key) or {}).get(field)
+
+    def hgetall(self, db, key):
+        return self.index.get(key) or {}
+
+
+class SnapshotCache:
+    """
+    LRU bounded cache of what was read from the redis sources, shared by all the users of a ConnectionPool
+    Holds the keys matched by (ns, db, table, key_pattern) and the field-value pairs of every object fetched,
+    so that each redis object is fetched at most once. The entries are never refreshed, every reader sees
+    the snapshot taken by the first fetch.
+    """
+
+    def __init__(self, max_size=SNAPSHOT_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __lookup(self, entry):
+        if entry in self.entries:
+            self.entries.move_to_end(entry)
+            self.hits += 1
+            return self.entries[entry]
+        self.misses += 1
+        return None
+
+    def __insert(self, entry, value):
+        self.entries[entry] = value
+        self.entries.move_to_end(entry)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def get_keys(self, ns, db, table, key_pattern, sep):
+        """ Return the cached keys matching the pattern, None when they are not known """
+        entry = ("keys", ns, db, table, key_pattern)
+        table_entry = ("keys", ns, db, table, "*")
+        key = table + sep + key_pattern
+        if entry in self.entries:
+            return self.__lookup(entry)
+        # Reuse the listing of the whole table, if any
+        if table_entry in self.entries:
+            kp = key.replace("[^", "[!")
+            return [k for k in self.__lookup(table_entry) if fnmatch.fnmatchcase(k, kp)]
+        # An exact key fetched earlier is known to exist
+        if not any(c in key_pattern for c in "*?[") and ("fv", ns, db, key) in self.entries:
+            self.hits += 1
+            return [key]
+        self.misses += 1
+        return None
+
+    def put_keys(self, ns, db, table, key_pattern, keys):
+        self.__insert(("keys", ns, db, table, key_pattern), keys)
+
+    def hgetall_bulk(self, src, ns, db, keys):
+        """ Return the field-value pairs of the keys, fetching the ones not cached yet through src """
+        fvs = {}
+        missing = []
+        for key in keys:
+            fv = self.__lookup(("fv", ns, db, key))
+            if fv is None:
+                missing.append(key)
+            else:
+                fvs[key] = fv
+        if missing:
+            for key, fv in src.hgetall_bulk(db, missing).items():
+                self.__insert(("fv", ns, db, key), fv)
+                fvs[key] = fv
+        return fvs
+
+    def clear(self, ns=None):
+        """ Drop the entries of the namespace ns, or every entry when ns is None """
+        if ns is None:
+            self.entries.clear()
+            return
+        for entry in [entry for entry in self.entries if entry[1] == ns]:
+            del self.entries[entry]
+
+    def __str__(self):
+        return "Snapshot Cache: {} hits, {} misses, {} entries".format(self.hits, self.misses, len(self.entries))
 
 
 class ConnectionPool:
     """ Caches SonicV2Connector objects for effective reuse """
     def __init__(self):
         self.cache = dict()  # Pool of SonicV2Connector objects
+        self.snapshot_cache = SnapshotCache()
 
     def initialize_connector(self, ns):
         load_db_config()
@@ -327,6 +551,7 @@ class ConnectionPool:
         return self.cache[ns]["DASH_"+CONN]
 
     def clear(self, namespace=None):
+        self.snapshot_cache.clear(namespace or None)
         if not namespace:
             self.cache.clear()
         elif namespace in self.cache:
@@ -334,6 +559,7 @@ class ConnectionPool:
 
     def fill(self, ns, conn, connected_to, dash_object=False):
         """ Update internal cache """
+        self.snapshot_cache.clear(ns)
         if ns not in self.cache:
             self.cache[ns] = {}
         if dash_object:
@@ -349,17 +575,28 @@ class MatchEngine:
     Usage Guidelines:
     1) Instantiate the class once for the entire execution,
                 to effectively use the caching of redis connection objects
+    2) With bulk_fetch, the field-value pairs of all the matched keys are fetched
+                in a single pipelined pass for the sources supporting it,
+                and the filtering and the templates are done from that snapshot
+    3) The keys and objects fetched in bulk are kept in the snapshot cache of the pool,
+                shared by every MatchEngine and plugin using the same pool
+    4) With snapshot_dir, the DBs are served offline from the snapshot files in that directory
+                instead of redis
     """
-    def __init__(self, pool=None):
+    def __init__(self, pool=None, bulk_fetch=True, snapshot_dir=None):
         if not isinstance(pool, ConnectionPool):
             self.conn_pool = ConnectionPool()
         else:
             self.conn_pool = pool
+        self.bulk_fetch = bulk_fetch
+        self.snapshot_dir = snapshot_dir
 
     def clear_cache(self, ns):
         self.conn_pool(ns)
 
     def get_redis_source_adapter(self):
+        if self.snapshot_dir:
+            return DbSnapshotSource(self.snapshot_dir)
         return RedisSource(self.conn_pool)
 
     def get_json_source_adapter(self):
@@ -391,14 +628,20 @@ class MatchEngine:
         verbose_print("MatchEngine: \n" + template['error'])
         return template
 
-    def __filter_out_keys(self, src, req, all_matched_keys):
+    def __needs_values(self, req):
+        return bool(req.field) or not req.just_keys or len(req.return_fields) > 0
+
+    def __filter_out_keys(self, src, req, all_matched_keys, snapshot=None):
         # TODO: Custom Callbacks for Complex Matching Criteria
         if not req.field:
             return all_matched_keys
 
         filtered_keys = []
         for key in all_matched_keys:
-            f_values = src.hget(req.db, key, req.field)
+            if snapshot is not None:
+                f_values = snapshot[key].get(req.field)
+            else:
+                f_values = src.hget(req.db, key, req.field)
             if not f_values:
                 continue
             if "," in f_values and not req.match_entire_list:
@@ -409,17 +652,20 @@ class MatchEngine:
                 filtered_keys.append(key)
         return filtered_keys
 
-    def __fill_template(self, src, req, filtered_keys, template):
+    def __fill_template(self, src, req, filtered_keys, template, snapshot=None):
         for key in filtered_keys:
             temp = {}
             if not req.just_keys:
-                temp[key] = src.get(req.db, key)
+                temp[key] = dict(snapshot[key]) if snapshot is not None else src.get(req.db, key)
                 template["keys"].append(temp)
             elif len(req.return_fields) > 0:
                 template["keys"].append(key)
                 template["return_values"][key] = {}
                 for field in req.return_fields:
-                    template["return_values"][key][field] = src.hget(req.db, key, field)
+                    if snapshot is not None:
+                        template["return_values"][key][field] = snapshot[key].get(field)
+                    else:
+                        template["return_values"][key][field] = src.hget(req.db, key, field)
             else:
                 template["keys"].append(key)
         verbose_print("Return Values:" + str(template["return_values"]))
@@ -440,15 +686,27 @@ class MatchEngine:
             return self.__display_error(EXCEP_DICT["CONN_ERR"])
 
         template = self.__create_template()
-        all_matched_keys = src.getKeys(req.db, req.table, req.key_pattern)
+        use_cache = self.bulk_fetch and src.BULK_FETCH
+        cache = self.conn_pool.snapshot_cache
+        all_matched_keys = None
+        if use_cache:
+            all_matched_keys = cache.get_keys(req.ns, req.db, req.table, req.key_pattern, src.get_separator(req.db))
+        if all_matched_keys is None:
+            all_matched_keys = src.getKeys(req.db, req.table, req.key_pattern)
+            if use_cache:
+                cache.put_keys(req.ns, req.db, req.table, req.key_pattern, all_matched_keys or [])
         if not all_matched_keys:
             return self.__display_error(EXCEP_DICT["NO_MATCHES"])
 
-        filtered_keys = self.__filter_out_keys(src, req, all_matched_keys)
+        snapshot = None
+        if use_cache and self.__needs_values(req):
+            snapshot = cache.hgetall_bulk(src, req.ns, req.db, all_matched_keys)
+
+        filtered_keys = self.__filter_out_keys(src, req, all_matched_keys, snapshot)
         verbose_print("Filtered Keys:" + str(filtered_keys))
         if not filtered_keys:
             return self.__display_error(EXCEP_DICT["NO_ENTRIES"])
-        return self.__fill_template(src, req, filtered_keys, template)
+        return self.__fill_template(src, req, filtered_keys, template, snapshot)
 
 
 class MatchRequestOptimizer():
@@ -18,6 +18,8 @@ SYSLOG_IDENTIFIER = "GenericConfigUpdater"
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 GCU_FIELD_OP_CONF_FILE = f"{SCRIPT_DIR}/gcu_field_operation_validators.conf.json"
 HOST_NAMESPACE = "localhost"
+# Above this number of changed ConfigDb rows, loading the whole config is cheaper than loading the delta
+MAX_INCREMENTAL_LOAD_ROWS = 1000
 
 
 class GenericConfigUpdaterError(Exception):
@@ -76,11 +78,140 @@ def get_config_db_as_text(scope=None):
     return text
 
 
+class SonicYangDataTree:
+    """
+    Keeps the libyang data tree of a sonic_yang object loaded with a ConfigDb config, and loads the following
+    configs as a delta from the previous one: only the ConfigDb rows which changed are removed from/added to the
+    data tree, then the data tree is validated. A config failing validation is rolled back, so the data tree
+    keeps holding the last valid config.
+    """
+    def __init__(self, sy):
+        self.sy = sy
+        # Own copy of the loaded config, so that callers updating their configs in place are not an issue
+        self.config = None
+        self.root = None
+
+    def load(self, config):
+        """
+        Loads config into the data tree. Raises sonic_yang.SonicYangException if config is not valid.
+        """
+        if self.config is None or self.sy.root is None or self.sy.root is not self.root:
+            return self._load_full(config)
+
+        rows = self._get_changed_rows(self.config, config)
+        if rows is None or len(rows) > MAX_INCREMENTAL_LOAD_ROWS:
+            return self._load_full(config)
+        if not rows:
+            return
+
+        try:
+            refs = self._apply_rows(self.config, config, rows, check_refs=True)
+            self._validate_refs(refs)
+            self.sy.validate_data_tree()
+        except Exception as ex:
+            self._rollback(config, rows)
+            if isinstance(ex, sonic_yang.SonicYangException):
+                raise
+            # Not a validation error, let the full load decide if config is valid
+            return self._load_full(config)
+
+        for table, key in rows:
+            if key in config.get(table, {}):
+                self.config.setdefault(table, {})[key] = copy.deepcopy(config[table][key])
+            else:
+                del self.config[table][key]
+
+    def _load_full(self, config):
+        self.config = None
+        self.sy.loadData(config)
+        self.config = copy.deepcopy(config)
+        self.root = self.sy.root
+
+    def _get_changed_rows(self, old_config, new_config):
+        rows = []
+        tables = list(old_config) + [table for table in new_config if table not in old_config]
+        for table in tables:
+            old_table = old_config.get(table, {})
+            new_table = new_config.get(table, {})
+            if old_table == new_table or table not in self.sy.confDbYangMap:
+                continue
+            if not isinstance(old_table, dict) or not isinstance(new_table, dict):
+                return None
+            for key in old_table:
+                if key not in new_table or old_table[key] != new_table[key]:
+                    rows.append((table, key))
+            for key in new_table:
+                if key not in old_table:
+                    rows.append((table, key))
+        return rows
+
+    def _apply_rows(self, old_config, new_config, rows, check_refs):
+        """
+        Replaces the data nodes of the given rows of old_config with the ones of new_config.
+        Returns the leaves of the removed data nodes referenced by other data nodes, if check_refs.
+        """
+        refs = {}
+        for table, key in rows:
+            if key not in old_config.get(table, {}):
+                continue
+            xpath = self.sy.configdb_path_to_xpath(self.sy.configdb_path_join([table, key]), configdb=old_config)
+            for node in self.sy.root.find_path(xpath).data():
+                if check_refs:
+                    refs.update(self._get_refs(node))
+                node.unlink()
+
+        added_rows = {}
+        for table, key in rows:
+            if key in new_config.get(table, {}):
+                added_rows.setdefault(table, {})[key] = new_config[table][key]
+        if added_rows:
+            sonic_yang_as_json = dict()
+            self.sy._xlateConfigDBtoYang(added_rows, sonic_yang_as_json)
+            # The rows alone are not a complete config, they are validated after merging into the data tree
+            data = self.sy.ctx.parse_data_mem(json.dumps(sonic_yang_as_json), ly.LYD_JSON,
+                                              ly.LYD_OPT_EDIT | ly.LYD_OPT_STRICT)
+            self.sy.root.merge(data, 0)
+
+        self.root = self.sy.root
+        return refs
+
+    def _get_refs(self, node):
+        refs = {}
+        for inner_node in node.tree_dfs():
+            if inner_node.schema().nodetype() != ly.LYS_LEAF:
+                continue
+            xpath = inner_node.path()
+            ref_xpaths = self.sy.find_data_dependencies(xpath)
+            if ref_xpaths:
+                refs[xpath] = (inner_node.subtype().value_str(), ref_xpaths)
+        return refs
+
+    def _validate_refs(self, refs):
+        """
+        Validating the data tree does not re-validate the leafrefs to removed data nodes, check them here.
+        """
+        for xpath, (value, ref_xpaths) in refs.items():
+            nodes = self.sy.root.find_path(xpath).data()
+            if nodes and nodes[0].subtype().value_str() == value:
+                continue
+            for ref_xpath in ref_xpaths:
+                if self.sy.root.find_path(ref_xpath).number():
+                    raise sonic_yang.SonicYangException(f"{ref_xpath} refers to {xpath} which does not exist")
+
+    def _rollback(self, config, rows):
+        try:
+            self._apply_rows(config, self.config, rows, check_refs=False)
+        except Exception:
+            # The data tree cannot be trusted anymore, next load will be a full one
+            self.config = None
+
+
 class ConfigWrapper:
     def __init__(self, yang_dir=YANG_DIR, scope=multi_asic.DEFAULT_NAMESPACE):
         self.scope = scope
         self.yang_dir = YANG_DIR
         self.sonic_yang_with_loaded_models = None
+        self.sonic_yang_data_tree = None
 
     def get_config_db_as_json(self):
         return get_config_db_as_json(self.scope)
@@ -137,7 +268,11 @@ class ConfigWrapper:
         except sonic_yang.SonicYangException as ex:
             return False, ex
 
-    def validate_config_db_config(self, config_db_as_json):
+    def validate_config_db_config(self, config_db_as_json, incremental: bool = False):
+        """
+        Validates config_db_as_json according to YANG models. If incremental, only the difference from the
+        previously validated config is loaded, see SonicYangDataTree.
+        """
         sy = self.create_sonic_yang_with_loaded_models()
 
         # TODO: Move these validators to YANG models
@@ -146,7 +281,10 @@ class ConfigWrapper:
 
         try:
             # Loading data automatically does full validation
-            sy.loadData(config_db_as_json)
+            if incremental:
+                self.get_sonic_yang_data_tree().load(config_db_as_json)
+            else:
+                sy.loadData(config_db_as_json)
             for supplemental_yang_validator in supplemental_yang_validators:
                 success, error = supplemental_yang_validator(config_db_as_json)
                 if not success:
@@ -357,6 +495,12 @@ class ConfigWrapper:
 
         return self.sonic_yang_with_loaded_models
 
+    def get_sonic_yang_data_tree(self):
+        if self.sonic_yang_data_tree is None:
+            self.sonic_yang_data_tree = SonicYangDataTree(self.create_sonic_yang_with_loaded_models())
+
+        return self.sonic_yang_data_tree
+
 class DryRunConfigWrapper(ConfigWrapper):
     # This class will simulate all read/write operations to ConfigDB on a virtual storage unit.
     def __init__(self, initial_imitated_config_db=None, scope=multi_asic.DEFAULT_NAMESPACE):
@@ -492,7 +636,7 @@ class PathAddressing:
     def _create_sonic_yang_with_loaded_models(self):
         return self.config_wrapper.create_sonic_yang_with_loaded_models()
 
-    def find_ref_paths(self, paths, config, reload_config: bool = True):
+    def find_ref_paths(self, paths, config, reload_config: bool = True, incremental: bool = False):
         """
         Finds the paths referencing any line under the given 'path' within the given 'config'.
         Example:
@@ -528,12 +672,17 @@ class PathAddressing:
             /ACL_TABLE/EVERFLOW/ports/0
             /ACL_TABLE/EVERFLOW6/ports/0
             /ACL_TABLE/EVERFLOW6/ports/1
+
+        If incremental, only the difference from the previously loaded config is loaded, see SonicYangDataTree.
         """
         # TODO: Also fetch references by must statement (check similar statements)
         sy = self._create_sonic_yang_with_loaded_models()
 
         if reload_config:
-            sy.loadData(config)
+            if incremental:
+                self.config_wrapper.get_sonic_yang_data_tree().load(config)
+            else:
+                sy.loadData(config)
 
         # Force to be a list
         if not isinstance(paths, list):
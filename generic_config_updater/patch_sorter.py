@@ -1,6 +1,7 @@
 import copy
 import json
 import jsonpatch
+import jsonpointer
 import sonic_yang
 from collections import deque, OrderedDict
 from enum import Enum
@@ -8,18 +9,85 @@ from typing import Any, IO, List, Optional, Tuple
 from .gu_common import OperationWrapper, OperationType, GenericConfigUpdaterError, \
                        JsonChange, PathAddressing, genericUpdaterLogging
 
+HASH_MASK = (1 << 64) - 1
+
+
+def _mix_hash(value):
+    """
+    Scramble a python hash (splitmix64 finalizer). Python tuple hashes are close to linear, which makes
+    sums of them collide easily e.g. the same field updated the same way on two different ports.
+    """
+    value &= HASH_MASK
+    value = ((value ^ (value >> 30)) * 0xbf58476d1ce4e5b9) & HASH_MASK
+    value = ((value ^ (value >> 27)) * 0x94d049bb133111eb) & HASH_MASK
+    return value ^ (value >> 31)
+
+
+def _config_hash(node, path=()):
+    """
+    Structural hash of a json node located at path. It is the sum of the hashes of all the nodes in the
+    sub-tree each combined with its own path, so it can be updated incrementally when only part of the
+    sub-tree changes: subtract the hash of the changed part before the change and add it back after.
+    """
+    if isinstance(node, dict):
+        node_hash = _mix_hash(hash((path, dict)))
+        for key, value in node.items():
+            node_hash += _config_hash(value, path + (key,))
+    elif isinstance(node, list):
+        node_hash = _mix_hash(hash((path, list)))
+        for index, value in enumerate(node):
+            node_hash += _config_hash(value, path + (index,))
+    else:
+        node_hash = _mix_hash(hash((path, type(node), node)))
+    return node_hash & HASH_MASK
+
+
+def _scope_hash(config, tokens):
+    """
+    Structural hash of the part of config affected by a JsonPatch operation on the path tokens.
+    The scope is the node at the path, or the closest list containing it since adding/removing a list
+    item shifts the items after it. A node that does not exist yet contributes nothing to the hash.
+    """
+    node = config
+    path = ()
+    for token in tokens:
+        if isinstance(node, list):
+            break
+        if not isinstance(node, dict) or token not in node:
+            return 0
+        path += (token,)
+        node = node[token]
+    return _config_hash(node, path)
+
+
 class Diff:
     """
     A class that contains the diff info between current and target configs.
+
+    The structural hashes of both configs are computed on first use, and afterwards maintained
+    incrementally by apply_move/undo_move, so that hashing a diff visited by the sorters does not
+    require serializing the whole configs.
     """
-    def __init__(self, current_config, target_config):
+    def __init__(self, current_config, target_config, current_hash=None, target_hash=None):
         self.current_config = current_config
         self.target_config = target_config
+        self._current_hash = current_hash
+        self._target_hash = target_hash
+
+    @property
+    def current_hash(self):
+        if self._current_hash is None:
+            self._current_hash = _config_hash(self.current_config)
+        return self._current_hash
+
+    @property
+    def target_hash(self):
+        if self._target_hash is None:
+            self._target_hash = _config_hash(self.target_config)
+        return self._target_hash
 
     def __hash__(self):
-        cc = json.dumps(self.current_config, sort_keys=True)
-        tc = json.dumps(self.target_config, sort_keys=True)
-        return hash((cc,tc))
+        return hash((self.current_hash, self.target_hash))
 
     def __eq__(self, other):
         """Overrides the default implementation"""
@@ -28,18 +96,42 @@ class Diff:
 
         return False
 
-    # TODO: Can be optimized to apply the move in place. JsonPatch supports that using the option 'in_place=True'
-    # Check: https://python-json-patch.readthedocs.io/en/latest/tutorial.html#applying-a-patch
-    # NOTE: in case move is applied in place, we will need to support `undo_move` as well.
     def apply_move(self, move, in_place: bool = False):
-        new_current_config = move.apply(self.current_config, in_place)
-        return Diff(new_current_config, self.target_config)
+        return self._update_move(move, in_place, undo=False)
 
     def undo_move(self, move, in_place: bool = False):
-        new_current_config = move.undo(self.current_config, in_place)
-        return Diff(new_current_config, self.target_config)
+        return self._update_move(move, in_place, undo=True)
+
+    def _update_move(self, move, in_place, undo):
+        if isinstance(move, JsonMoveGroup):
+            moves = list(reversed(move.patches)) if undo else move.patches
+        elif isinstance(move, JsonMove):
+            moves = [move]
+        else:
+            moves = None
+
+        if moves is None or self._current_hash is None:
+            # No hash to maintain, it is computed from scratch if it is ever needed
+            update = move.undo if undo else move.apply
+            return Diff(update(self.current_config, in_place), self.target_config, target_hash=self._target_hash)
+
+        # The moves of a group are applied one after the other, so the hash is updated per move
+        new_current_config = self.current_config
+        new_current_hash = self._current_hash
+        for single_move in moves:
+            update = single_move.undo if undo else single_move.apply
+            new_current_hash -= _scope_hash(new_current_config, single_move.patch_tokens)
+            new_current_config = update(new_current_config, in_place)
+            if new_current_config is None:
+                return Diff(None, self.target_config, target_hash=self._target_hash)
+            new_current_hash += _scope_hash(new_current_config, single_move.patch_tokens)
+
+        return Diff(new_current_config, self.target_config, new_current_hash & HASH_MASK, self._target_hash)
 
     def has_no_diff(self):
+        if self._current_hash is not None and self._target_hash is not None \
+                and self._current_hash != self._target_hash:
+            return False
         return self.current_config == self.target_config
 
     def __str__(self):
@@ -73,6 +165,7 @@ class JsonMove:
         self.op_type = operation[OperationWrapper.OP_KEYWORD]
         self.path = operation[OperationWrapper.PATH_KEYWORD]
         self.value = operation.get(OperationWrapper.VALUE_KEYWORD, None)
+        self.patch_tokens = jsonpointer.JsonPointer(self.path).parts
 
         self.op_type = op_type
         self.current_config_tokens = current_config_tokens
@@ -285,22 +378,81 @@ class JsonMove:
         if self.op_type == OperationType.REMOVE or self.op_type == OperationType.REPLACE:
             self.orig_value = JsonMove._get_value(config, sonic_yang.SonicYang.configdb_path_split(self.path))
 
-        return self.patch.apply(config, in_place=in_place)
+        return JsonMove._apply_operation(config, self.patch.patch[0], in_place)
 
     def undo(self, config, in_place: bool = False):
-        # Create new patch to undo previous application
+        # Create new operation to undo previous application
         if self.patch.patch[0]['op'] == 'add':
-            patch = jsonpatch.JsonPatch([{'op': 'remove', 'path': self.patch.patch[0]['path']}])
+            operation = {'op': 'remove', 'path': self.patch.patch[0]['path']}
         elif self.patch.patch[0]['op'] == 'replace':
-            patch = jsonpatch.JsonPatch([{
-                                        'op': 'replace',
-                                        'path': self.patch.patch[0]['path'],
-                                        'value': self.orig_value
-                                        }])
+            operation = {'op': 'replace', 'path': self.patch.patch[0]['path'], 'value': self.orig_value}
         elif self.patch.patch[0]['op'] == 'remove':
-            patch = jsonpatch.JsonPatch([{'op': 'add', 'path': self.patch.patch[0]['path'], 'value': self.orig_value}])
+            operation = {'op': 'add', 'path': self.patch.patch[0]['path'], 'value': self.orig_value}
+
+        return JsonMove._apply_operation(config, operation, in_place)
+
+    @staticmethod
+    def _apply_operation(config, operation, in_place):
+        """
+        Apply a single JsonPatch operation to config.
+
+        Unless in_place is requested, the config is updated copy-on-write: only the containers along the
+        operation path are copied, and the rest of the new config is shared with the original one instead
+        of deep-copying the whole config per move. Anything out of the ordinary e.g. a path that does not
+        exist, is left to JsonPatch so the same errors are raised.
+        """
+        if not in_place:
+            new_config = JsonMove._copy_on_write(config, operation)
+            if new_config is not None:
+                return new_config
 
-        return patch.apply(config, in_place=in_place)
+        return jsonpatch.JsonPatch([operation]).apply(config, in_place=in_place)
+
+    @staticmethod
+    def _copy_on_write(config, operation):
+        op = operation['op']
+        tokens = jsonpointer.JsonPointer(operation['path']).parts
+        if not tokens or op not in ('add', 'remove', 'replace'):
+            return None
+
+        new_config = copy.copy(config)
+        parent = new_config
+        for token in tokens[:-1]:
+            index = JsonMove._get_index(parent, token)
+            if index is None:
+                return None
+            parent[index] = copy.copy(parent[index])
+            parent = parent[index]
+
+        token = tokens[-1]
+        if isinstance(parent, list) and op == 'add' and token == '-':
+            parent.append(copy.deepcopy(operation['value']))
+            return new_config
+
+        index = JsonMove._get_index(parent, token, op == 'add')
+        if index is None:
+            return None
+        if op == 'remove':
+            del parent[index]
+        elif op == 'add' and isinstance(parent, list):
+            parent.insert(index, copy.deepcopy(operation['value']))
+        else:
+            parent[index] = copy.deepcopy(operation['value'])
+        return new_config
+
+    @staticmethod
+    def _get_index(container, token, allow_new=False):
+        """
+        Get the key/index of the existing element of container referred to by token, or the position of a new
+        element if allow_new. Returns None if the token does not refer to one.
+        """
+        if isinstance(container, dict):
+            return token if allow_new or token in container else None
+        if isinstance(container, list) and token.isdigit() and (token == '0' or not token.startswith('0')):
+            index = int(token)
+            size = len(container) + 1 if allow_new else len(container)
+            return index if index < size else None
+        return None
 
     def __str__(self):
         return str(self.patch)
@@ -331,11 +483,11 @@ class JsonMoveGroup:
     def append(self, move: JsonMove):
         self.patches.append(move)
 
+    # NOTE: the moves after the first one cannot be applied in place on the update of the first one, since
+    #       unless in_place is requested, the update shares with config all the nodes the move did not touch.
     def apply(self, config, in_place: bool = False):
         update = config
-        for i, patch in enumerate(self.patches):
-            if i != 0:
-                in_place = True
+        for patch in self.patches:
             update = patch.apply(update, in_place=in_place)
             if update is None:
                 return None
@@ -343,9 +495,7 @@ class JsonMoveGroup:
 
     def undo(self, config, in_place: bool = False):
         update = config
-        for i, patch in enumerate(reversed(self.patches)):
-            if i != 0:
-                in_place = True
+        for patch in reversed(self.patches):
             update = patch.undo(update, in_place=in_place)
             if update is None:
                 return None
@@ -822,7 +972,8 @@ class RemoveCreateOnlyDependencyMoveValidator:
                 return False
 
         member_path = f"/{table_to_check}/{member_name}"
-        for ref_path in self.path_addressing.find_ref_paths(member_path, simulated_config, reload_config=reload_config):
+        for ref_path in self.path_addressing.find_ref_paths(member_path, simulated_config, reload_config=reload_config,
+                                                            incremental=True):
             if not self.path_addressing.has_path(current_config, ref_path):
                 return False
 
@@ -849,7 +1000,7 @@ class FullConfigMoveValidator:
         self.config_wrapper = config_wrapper
 
     def validate(self, move, diff, simulated_config) -> Tuple[bool, Optional[str]]:
-        is_valid, error = self.config_wrapper.validate_config_db_config(simulated_config)
+        is_valid, error = self.config_wrapper.validate_config_db_config(simulated_config, incremental=True)
         return is_valid, error
 
 class CreateOnlyMoveValidator:
@@ -1104,7 +1255,7 @@ class NoDependencyMoveValidator:
         """
         validates all config under paths do not have config and its references
         """
-        refs = self.path_addressing.find_ref_paths(paths, config, reload_config=reload_config)
+        refs = self.path_addressing.find_ref_paths(paths, config, reload_config=reload_config, incremental=True)
         for ref in refs:
             for path in paths:
                 if ref.startswith(path):
@@ -1651,7 +1802,7 @@ class RemoveCreateOnlyDependencyMoveGenerator:
 
         config = diff.current_config
         path = self.path_addressing.create_path(tokens)
-        ref_paths = self.path_addressing.find_ref_paths(path, config, reload_config)
+        ref_paths = self.path_addressing.find_ref_paths(path, config, reload_config, incremental=True)
         for ref in ref_paths:
             ref_tokens = self.path_addressing.get_path_tokens(ref)
             if remove_parent:
@@ -2051,7 +2202,8 @@ class DeleteRefsMoveExtender:
         if operation_type != OperationType.REMOVE:
             return
 
-        for ref_path in self.path_addressing.find_ref_paths(move.path, diff.current_config, reload_config=True):
+        for ref_path in self.path_addressing.find_ref_paths(move.path, diff.current_config, reload_config=True,
+                                                            incremental=True):
             yield JsonMove(diff, OperationType.REMOVE, self.path_addressing.get_path_tokens(ref_path))
 
 
@@ -6,11 +6,13 @@ import json
 import sys
 import traceback
 import re
+import time
 
 from sonic_py_common import device_info, logger
 from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector, SonicDBConfig
 from minigraph import parse_xml
 from utilities_common.helper import update_config
+from utilities_common.db_snapshot import DBSnapshot
 
 INIT_CFG_FILE = '/etc/sonic/init_cfg.json'
 MINIGRAPH_FILE = '/etc/sonic/minigraph.xml'
@@ -39,7 +41,7 @@ log = logger.Logger(SYSLOG_IDENTIFIER)
 
 
 class DBMigrator():
-    def __init__(self, namespace, socket=None):
+    def __init__(self, namespace, socket=None, in_memory=False):
         """
         Version string format (202305 and above):
             version_<branch>_<build>
@@ -57,6 +59,9 @@ class DBMigrator():
                      github public branches. These private branches shall use
                      none-zero values.
               build: sequentially increase within a minor version domain.
+
+        With in_memory, CONFIG_DB and APPL_DB are loaded once and the migration
+        runs against the in-memory copies, which commit() writes back.
         """
         self.CURRENT_VERSION = 'version_202605_01'
 
@@ -85,6 +90,13 @@ class DBMigrator():
             self.appDB = ConfigDBConnector(use_unix_socket_path=True, namespace=namespace, **db_kwargs)
         self.appDB.db_connect('APPL_DB')
 
+        # Wall time of the migration steps, as (step, seconds)
+        self.step_times = []
+        self.in_memory = in_memory
+        if in_memory:
+            self.configDB = self.run_step('load CONFIG_DB', DBSnapshot, self.configDB, self.configDB.CONFIG_DB)
+            self.appDB = self.run_step('load APPL_DB', DBSnapshot, self.appDB, self.appDB.APPL_DB)
+
         self.stateDB = SonicV2Connector(host='127.0.0.1')
         if self.stateDB is not None:
             self.stateDB.connect(self.stateDB.STATE_DB)
@@ -1492,16 +1504,39 @@ class DBMigrator():
         self.migrate_tacplus()
         self.migrate_aaa()
 
+    def run_step(self, step, func, *args):
+        start = time.monotonic()
+        result = func(*args)
+        elapsed = time.monotonic() - start
+        self.step_times.append((step, elapsed))
+        log.log_info('{} took {:.3f}s'.format(step, elapsed))
+        return result
+
+    def commit(self):
+        """
+        Write the changes of the in-memory databases back, each in one transaction.
+        CONFIG_DB, holding the version, is written last.
+        """
+        if not self.in_memory:
+            return
+        for db in (self.appDB, self.configDB):
+            count = self.run_step('commit ' + db.db_name, db.commit)
+            log.log_info('{} keys of {} changed'.format(count, db.db_name))
+
     def migrate(self):
+        start = time.monotonic()
         version = self.get_version()
         log.log_info('Upgrading from version ' + version)
         while version:
-            next_version = getattr(self, version)()
+            next_version = self.run_step(version, getattr(self, version))
             if next_version == version:
                 raise Exception('Version migrate from %s stuck in same version' % version)
             version = next_version
         # Perform common migration ops
-        self.common_migration_ops()
+        self.run_step('common_migration_ops', self.common_migration_ops)
+        self.commit()
+        log.log_notice('Migration took {:.3f}s: {}'.format(time.monotonic() - start, ', '.join(
+            '{} {:.3f}s'.format(step, elapsed) for step, elapsed in self.step_times)))
 
 def main():
     try:
@@ -1529,10 +1564,16 @@ def main():
                         required = False,
                         help = 'The asic namespace whose DB instance we need to connect',
                         default = None )
+        parser.add_argument('-m',
+                            dest='in_memory',
+                            action='store_true',
+                            help='run the operation on in-memory copies of CONFIG_DB and APPL_DB, '
+                                 'written back in one transaction each')
         args = parser.parse_args()
         operation = args.operation
         socket_path = args.socket
         namespace = args.namespace
+        in_memory = args.in_memory
 
         # Can't load global config base on the result of is_multi_asic(), because on multi-asic device, when db_migrate.py
         # run on the local database, ASIC instance will have not created the /var/run/redis0/sonic-db/database-config.json
@@ -1544,11 +1585,14 @@ def main():
                 SonicDBConfig.initialize()
 
         if socket_path:
-            dbmgtr = DBMigrator(namespace, socket=socket_path)
+            dbmgtr = DBMigrator(namespace, socket=socket_path, in_memory=in_memory)
         else:
-            dbmgtr = DBMigrator(namespace)
+            dbmgtr = DBMigrator(namespace, in_memory=in_memory)
 
         result = getattr(dbmgtr, operation)()
+        # migrate commits its changes itself, before logging the time of its steps
+        if operation != 'migrate':
+            dbmgtr.commit()
         if result:
             print(str(result))
 
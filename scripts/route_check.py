@@ -83,6 +83,18 @@ FRR_WAIT_TIME = 15
 
 REDIS_TIMEOUT_MSECS = 0
 
+DEFAULT_ROUTES = {'0.0.0.0/0', '::/0'}
+LINK_LOCAL_V4_PREFIX = '169.254.'
+LINK_LOCAL_V6_HEXTETS = ('fe8', 'fe9', 'fea', 'feb')
+
+# Daemon mode: a prefix is reported only if it stays out of sync for this long
+DEFAULT_GRACE_SECS = 30
+DAEMON_SELECT_TIMEOUT_MSECS = 1000
+# Tables read by the filters; any update to them re-runs the filters on the ignored prefixes
+FILTER_APPL_TABLES = ['NEIGH_TABLE', 'VNET_ROUTE_TABLE', 'VNET_ROUTE_TUNNEL_TABLE']
+FILTER_CONFIG_TABLES = ['DEVICE_METADATA', 'MUX_CABLE']
+ROUTE_CHECK_STATUS_FILE = '/var/run/route_check_status.json'
+
 
 class Level(Enum):
     ERR = 'ERR'
@@ -173,11 +185,15 @@ def add_prefix_ifnot(ip):
 def is_local(ip):
     """
     helper to check if this IP qualify as link local
+    (169.254.0.0/16 or fe80::/10), w/o parsing the address.
     :param ip: IP to check as string
     :return True if link local, else False
     """
-    t = ipaddress.ip_address(ip.split("/")[0])
-    return t.is_link_local
+    addr = ip.split(PREFIX_SEPARATOR, 1)[0]
+    if addr.find(IPV6_SEPARATOR) == -1:
+        return addr.startswith(LINK_LOCAL_V4_PREFIX)
+    hextet = addr.split(IPV6_SEPARATOR, 1)[0].lower()
+    return len(hextet) == 4 and hextet[:3] in LINK_LOCAL_V6_HEXTETS
 
 
 def is_default_route(ip):
@@ -238,6 +254,41 @@ def diff_sorted_lists(t1, t2):
     return t1_miss, t2_miss
 
 
+def filter_out(lst, excluded):
+    """
+    helper to drop the entries present in excluded, preserving order.
+    :param lst: list to filter
+    :param excluded: set of entries to drop
+    :return filtered list.
+    """
+    return [e for e in lst if e not in excluded]
+
+
+class PrefixIndex(object):
+    """
+    Prefix index of a single namespace, built once per check.
+    Normalized prefixes of APPL-DB routes, ASIC-DB routes and APPL-DB
+    interfaces are kept as sets, so the diffs between them are set
+    operations instead of sorting the tables and merging them.
+    """
+
+    def __init__(self, appl_routes, asic_routes, intfs):
+        self.appl = set(appl_routes)
+        self.asic = set(asic_routes)
+        self.intf = set(intfs)
+
+    def diff(self):
+        """
+        :return (<APPL-DB routes missing in ASIC-DB>,
+                 <ASIC-DB routes in neither APPL-DB routes nor interfaces>,
+                 <APPL-DB interfaces missing in ASIC-DB>) as sorted lists
+        """
+        rt_appl_miss = sorted(self.appl - self.asic)
+        rt_asic_miss = sorted(self.asic - self.appl - self.intf)
+        intf_appl_miss = sorted(self.intf - self.asic)
+        return rt_appl_miss, rt_asic_miss, intf_appl_miss
+
+
 def checkout_rt_entry(k):
     """
     helper to filter out correct keys and strip out IP alone.
@@ -286,52 +337,83 @@ def is_vrf(k):
     return k.startswith("Vrf")
 
 
+def checkout_appl_rt_entry(k):
+    """
+    helper to strip VRF out of APPL-DB:ROUTE_TABLE key and normalize the prefix.
+    :param k: key to check as string
+    :return (True, prefix) or (False, None) for link local routes
+    """
+    if (is_vrf(k)):
+        k = k.split(":", 1)[1]
+
+    if is_local(k):
+        return False, None
+    return True, add_prefix_ifnot(k.lower())
+
+
+def checkout_intf_entry(k):
+    """
+    helper to get host prefix of the IP out of APPL-DB:INTF_TABLE key.
+    :param k: key to check as string
+    :return (True, prefix) or (False, None) for keys w/o IP and link local IPs
+    """
+    lst = re.split(':', k.lower(), maxsplit=1)
+    if len(lst) == 1:
+        # No IP address in key; ignore
+        return False, None
+
+    ip = add_prefix(lst[1].split("/", -1)[0])
+    if is_local(ip):
+        return False, None
+    return True, ip
+
+
 def get_appdb_routes(namespace):
     """
     helper to read route table from APPL-DB.
-    :return list of sorted routes with prefix ensured
+    :return set of routes with prefix ensured
     """
     db = swsscommon.DBConnector(APPL_DB_NAME, REDIS_TIMEOUT_MSECS, True, namespace)
     print_message(syslog.LOG_DEBUG, "APPL DB connected for routes")
     tbl = swsscommon.Table(db, 'ROUTE_TABLE')
     keys = tbl.getKeys()
 
-    valid_rt = []
+    valid_rt = set()
     for k in keys:
-        if (is_vrf(k)):
-            k = k.split(":", 1)[1]
-
-        if not is_local(k):
-            valid_rt.append(add_prefix_ifnot(k.lower()))
+        res, e = checkout_appl_rt_entry(k)
+        if res:
+            valid_rt.add(e)
 
-    print_message(syslog.LOG_DEBUG, json.dumps({"ROUTE_TABLE": sorted(valid_rt)}, indent=4))
-    return sorted(valid_rt)
+    if report_level >= syslog.LOG_DEBUG:
+        print_message(syslog.LOG_DEBUG, json.dumps({"ROUTE_TABLE": sorted(valid_rt)}, indent=4))
+    return valid_rt
 
 
 def get_asicdb_routes(namespace):
     """
     helper to read present route entries from ASIC-DB and
     as well initiate selector for ASIC-DB:ASIC-state updates.
-    :return (selector,  subscriber, <list of sorted routes>)
+    :return (selector,  subscriber, <set of routes>)
     """
     db = swsscommon.DBConnector(ASIC_DB_NAME, REDIS_TIMEOUT_MSECS, True, namespace)
     subs = swsscommon.SubscriberStateTable(db, ASIC_TABLE_NAME)
     print_message(syslog.LOG_DEBUG, "ASIC DB {} connected".format(namespace))
 
-    rt = []
+    rt = set()
     while True:
         k, _, _ = subs.pop()
         if not k:
             break
         res, e = checkout_rt_entry(k)
         if res:
-            rt.append(e)
+            rt.add(e)
 
-    print_message(syslog.LOG_DEBUG, json.dumps({"ASIC_ROUTE_ENTRY": sorted(rt)}, indent=4))
+    if report_level >= syslog.LOG_DEBUG:
+        print_message(syslog.LOG_DEBUG, json.dumps({"ASIC_ROUTE_ENTRY": sorted(rt)}, indent=4))
 
     selector = swsscommon.Select()
     selector.addSelectable(subs)
-    return (selector, subs, sorted(rt))
+    return (selector, subs, rt)
 
 
 def get_appdb_sids(namespace):
@@ -486,26 +568,22 @@ def get_frr_routes_parallel(namespace):
 def get_interfaces(namespace):
     """
     helper to read interface table from APPL-DB.
-    :return sorted list of IP addresses with added prefix
+    :return set of IP addresses with added prefix
     """
     db = swsscommon.DBConnector(APPL_DB_NAME, REDIS_TIMEOUT_MSECS, True, namespace)
     print_message(syslog.LOG_DEBUG, "APPL DB connected for interfaces")
     tbl = swsscommon.Table(db, 'INTF_TABLE')
     keys = tbl.getKeys()
 
-    intf = []
+    intf = set()
     for k in keys:
-        lst = re.split(':', k.lower(), maxsplit=1)
-        if len(lst) == 1:
-            # No IP address in key; ignore
-            continue
+        res, ip = checkout_intf_entry(k)
+        if res:
+            intf.add(ip)
 
-        ip = add_prefix(lst[1].split("/", -1)[0])
-        if not is_local(ip):
-            intf.append(ip)
-
-    print_message(syslog.LOG_DEBUG, json.dumps({"APPL_DB_INTF": sorted(intf)}, indent=4))
-    return sorted(intf)
+    if report_level >= syslog.LOG_DEBUG:
+        print_message(syslog.LOG_DEBUG, json.dumps({"APPL_DB_INTF": sorted(intf)}, indent=4))
+    return intf
 
 
 def is_point_to_point_prefix(prefix):
@@ -556,15 +634,7 @@ def filter_out_local_p2p_ips(namespace, keys):
     :param keys: APPL-DB:ROUTE_TABLE Routes to check.
     :return keys filtered out of local
     """
-    rt = []
-    if_tbl_ips = set(get_local_p2p_ips(namespace))
-
-    for k in keys:
-        if k in if_tbl_ips:
-            continue
-        rt.append(k)
-
-    return rt
+    return filter_out(keys, set(get_local_p2p_ips(namespace)))
 
 
 def filter_out_local_interfaces(namespace, keys):
@@ -637,13 +707,7 @@ def filter_out_default_routes(lst):
     :param lst: list to filter
     :return filtered list.
     """
-    upd = []
-
-    for rt in lst:
-        if not is_default_route(rt):
-            upd.append(rt)
-
-    return upd
+    return filter_out(lst, DEFAULT_ROUTES)
 
 
 def filter_out_vnet_routes(namespace, routes):
@@ -659,20 +723,14 @@ def filter_out_vnet_routes(namespace, routes):
 
     vnet_routes_db_keys = vnet_route_table.getKeys() + vnet_route_tunnel_table.getKeys()
 
-    vnet_routes = []
+    vnet_routes = set()
 
     for vnet_route_db_key in vnet_routes_db_keys:
         vnet_route_attrs = vnet_route_db_key.split(':', 1)
         vnet_route = vnet_route_attrs[1]
-        vnet_routes.append(vnet_route)
-
-    updated_routes = []
+        vnet_routes.add(vnet_route)
 
-    for route in routes:
-        if not (route in vnet_routes):
-            updated_routes.append(route)
-
-    return updated_routes
+    return filter_out(routes, vnet_routes)
 
 
 def is_dualtor(config_db):
@@ -691,31 +749,23 @@ def filter_out_standalone_tunnel_routes(namespace, routes):
     app_db = swsscommon.DBConnector('APPL_DB', REDIS_TIMEOUT_MSECS, True, namespace)
     neigh_table = swsscommon.Table(app_db, 'NEIGH_TABLE')
     neigh_keys = neigh_table.getKeys()
-    standalone_tunnel_route_ips = []
-    updated_routes = []
+    standalone_tunnel_routes = set()
 
     for neigh in neigh_keys:
         _, mac = neigh_table.hget(neigh, 'neigh')
         if mac == '00:00:00:00:00:00':
             # remove preceding 'VlanXXXX' to get just the neighbor IP
             neigh_ip = ':'.join(neigh.split(':')[1:])
-            standalone_tunnel_route_ips.append(neigh_ip)
+            # only the host route of the neighbor is a standalone tunnel route
+            if neigh_ip.find(IPV6_SEPARATOR) == -1:
+                standalone_tunnel_routes.add(neigh_ip + PREFIX_SEPARATOR + '32')
+            else:
+                standalone_tunnel_routes.add(neigh_ip + PREFIX_SEPARATOR + '128')
 
-    if not standalone_tunnel_route_ips:
+    if not standalone_tunnel_routes:
         return routes
 
-    for route in routes:
-        ip, subnet = route.split('/')
-        ip_version = ipaddress.ip_address(ip).version
-
-        # we want to keep the route if it is not a standalone tunnel route.
-        # if the route subnet contains more than one address, it is not a
-        # standalone tunnel route
-        if (ip not in standalone_tunnel_route_ips) or \
-           ((ip_version == 6 and subnet != '128') or (ip_version == 4 and subnet != '32')):
-            updated_routes.append(route)
-
-    return updated_routes
+    return filter_out(routes, standalone_tunnel_routes)
 
 
 def is_feature_bgp_enabled(namespace):
@@ -803,17 +853,12 @@ def filter_out_soc_ip_routes(namespace, routes):
     if not is_dualtor(config_db):
         return routes
 
-    soc_ips = get_soc_ips(config_db)
+    soc_ips = set(get_soc_ips(config_db))
 
     if not soc_ips:
         return routes
 
-    updated_routes = []
-    for route in routes:
-        if route not in soc_ips:
-            updated_routes.append(route)
-
-    return updated_routes
+    return filter_out(routes, soc_ips)
 
 
 def get_vlan_neighbors(namespace):
@@ -838,14 +883,7 @@ def filter_out_vlan_neigh_route_miss(namespace, rt_appl_miss, rt_asic_miss):
     """Ignore any route miss for vlan neighbor IPs."""
 
     def _filter_out_neigh_route(routes, neighs):
-        updated_routes = []
-        ignored_routes = []
-        for route in routes:
-            if route in neighs:
-                ignored_routes.append(route)
-            else:
-                updated_routes.append(route)
-        return updated_routes, ignored_routes
+        return filter_out(routes, neighs), [route for route in routes if route in neighs]
 
     config_db = multi_asic.connect_config_db_for_ns(namespace)
 
@@ -894,19 +932,17 @@ def check_routes_for_namespace(namespace):
     rt_appl = get_appdb_routes(namespace)
     intf_appl = get_interfaces(namespace)
 
-    # Diff APPL-DB routes & ASIC-DB routes
-    rt_appl_miss, rt_asic_miss = diff_sorted_lists(rt_appl, rt_asic)
+    # Diff APPL-DB routes & ASIC-DB routes, with missed ASIC routes
+    # checked against APPL-DB INTF_TABLE and APPL-DB INTF_TABLE checked
+    # with ASIC table route entries
+    index = PrefixIndex(rt_appl, rt_asic, intf_appl)
+    rt_appl_miss, rt_asic_miss, intf_appl_miss = index.diff()
 
-    # Check missed ASIC routes against APPL-DB INTF_TABLE
-    _, rt_asic_miss = diff_sorted_lists(intf_appl, rt_asic_miss)
     rt_asic_miss = filter_out_default_routes(rt_asic_miss)
     rt_asic_miss = filter_out_vnet_routes(namespace, rt_asic_miss)
     rt_asic_miss = filter_out_standalone_tunnel_routes(namespace, rt_asic_miss)
     rt_asic_miss = filter_out_soc_ip_routes(namespace, rt_asic_miss)
 
-    # Check APPL-DB INTF_TABLE with ASIC table route entries
-    intf_appl_miss, _ = diff_sorted_lists(intf_appl, rt_asic)
-
     if rt_appl_miss:
         rt_appl_miss = filter_out_local_interfaces(namespace, rt_appl_miss)
 
@@ -928,10 +964,10 @@ def check_routes_for_namespace(namespace):
     del selector
 
     # Drop all those for which SET received
-    rt_appl_miss, _ = diff_sorted_lists(rt_appl_miss, adds)
+    rt_appl_miss = filter_out(rt_appl_miss, set(adds))
 
     # Drop all those for which DEL received
-    rt_asic_miss, _ = diff_sorted_lists(rt_asic_miss, deletes)
+    rt_asic_miss = filter_out(rt_asic_miss, set(deletes))
 
     # Filter local p2p IPs if any that are reported as missing in APPL_DB
     if rt_appl_miss:
@@ -1078,6 +1114,297 @@ def check_sids(namespace):
         return 0, None
 
 
+class RouteIndex(object):
+    """
+    Route index of a single namespace for the daemon mode.
+    APPL-DB ROUTE_TABLE, APPL-DB INTF_TABLE & ASIC-DB route entries are seeded
+    once from the initial subscriber dump and then kept current from the
+    subscribe updates, so no full table scan is needed per check.
+    A prefix out of sync is reported only if it stays out of sync past the
+    grace window.
+    The tables read by the filters are subscribed too, and the prefixes
+    already justified by the filters are checked again whenever they change.
+    """
+
+    def __init__(self, namespace, grace_secs=DEFAULT_GRACE_SECS):
+        self.namespace = namespace
+        self.grace_secs = grace_secs
+
+        # key -> normalized prefix, and prefix -> number of keys, per table
+        self.appl_keys = {}
+        self.intf_keys = {}
+        self.asic_keys = {}
+        self.appl_routes = {}
+        self.intf_routes = {}
+        self.asic_routes = {}
+
+        # prefix -> time it was first seen out of sync
+        self.out_of_sync = {}
+        # out of sync prefixes already justified by the filters
+        self.ignored = set()
+        self.results = {}
+
+        appl_db = swsscommon.DBConnector(APPL_DB_NAME, REDIS_TIMEOUT_MSECS, True, namespace)
+        asic_db = swsscommon.DBConnector(ASIC_DB_NAME, REDIS_TIMEOUT_MSECS, True, namespace)
+        self.subscribers = [
+            (swsscommon.SubscriberStateTable(appl_db, 'ROUTE_TABLE'),
+             checkout_appl_rt_entry, self.appl_keys, self.appl_routes),
+            (swsscommon.SubscriberStateTable(appl_db, 'INTF_TABLE'),
+             checkout_intf_entry, self.intf_keys, self.intf_routes),
+            (swsscommon.SubscriberStateTable(asic_db, ASIC_TABLE_NAME),
+             checkout_rt_entry, self.asic_keys, self.asic_routes),
+        ]
+        config_db = swsscommon.DBConnector('CONFIG_DB', REDIS_TIMEOUT_MSECS, True, namespace)
+        self.filter_subscribers = [swsscommon.SubscriberStateTable(appl_db, tbl) for tbl in FILTER_APPL_TABLES]
+        self.filter_subscribers += [swsscommon.SubscriberStateTable(config_db, tbl) for tbl in FILTER_CONFIG_TABLES]
+        print_message(syslog.LOG_DEBUG, "Route index for namespace {} subscribed".format(namespace))
+
+    def selectables(self):
+        return self.filter_subscribers + [subs for subs, _, _, _ in self.subscribers]
+
+    def drain(self):
+        """
+        Pop all pending subscribe messages and update the index.
+        :return number of messages processed
+        """
+        now = time.time()
+        changed = set()
+        cnt = 0
+        filters_changed = False
+        for subs in self.filter_subscribers:
+            while True:
+                key, _, _ = subs.pop()
+                if not key:
+                    break
+                cnt += 1
+                filters_changed = True
+
+        for subs, checkout, keys, routes in self.subscribers:
+            while True:
+                key, op, _ = subs.pop()
+                if not key:
+                    break
+                cnt += 1
+                res, e = checkout(key)
+                if not res:
+                    continue
+                if op == "SET" and key not in keys:
+                    keys[key] = e
+                    routes[e] = routes.get(e, 0) + 1
+                    changed.add(e)
+                elif op == "SET":
+                    # Same prefix, but the fields the filters look at may have changed
+                    self.ignored.discard(e)
+                elif op == "DEL" and key in keys:
+                    del keys[key]
+                    routes[e] -= 1
+                    if not routes[e]:
+                        del routes[e]
+                    changed.add(e)
+                else:
+                    continue
+                # The local point to point IPs filtered out come from the interfaces
+                if keys is self.intf_keys:
+                    filters_changed = True
+
+        if filters_changed:
+            self.ignored.clear()
+
+        for prefix in changed:
+            self.ignored.discard(prefix)
+            if self.is_in_sync(prefix):
+                self.out_of_sync.pop(prefix, None)
+            else:
+                self.out_of_sync.setdefault(prefix, now)
+
+        return cnt
+
+    def is_in_sync(self, prefix):
+        in_appl = prefix in self.appl_routes
+        in_asic = prefix in self.asic_routes
+        in_intf = prefix in self.intf_routes
+        if in_appl or in_intf:
+            return in_asic
+        return not in_asic
+
+    def check(self):
+        """
+        Run the filters on the prefixes out of sync past the grace window.
+        Prefixes justified by the filters are remembered until they or the
+        tables the filters read change, so they do not cost any DB access
+        on subsequent checks.
+        The FRR routes not offloaded are checked and mitigated as in
+        check_routes_for_namespace.
+        :return results as in check_routes_for_namespace
+        """
+        now = time.time()
+        expired = sorted(p for p, since in self.out_of_sync.items()
+                         if p not in self.ignored and now - since >= self.grace_secs)
+
+        rt_appl_miss = [p for p in expired if p in self.appl_routes and p not in self.asic_routes]
+        intf_appl_miss = [p for p in expired if p in self.intf_routes and p not in self.asic_routes]
+        rt_asic_miss = [p for p in expired if p in self.asic_routes and
+                        p not in self.appl_routes and p not in self.intf_routes]
+
+        if rt_asic_miss:
+            rt_asic_miss = filter_out_default_routes(rt_asic_miss)
+            rt_asic_miss = filter_out_vnet_routes(self.namespace, rt_asic_miss)
+            rt_asic_miss = filter_out_standalone_tunnel_routes(self.namespace, rt_asic_miss)
+            rt_asic_miss = filter_out_soc_ip_routes(self.namespace, rt_asic_miss)
+
+        if rt_appl_miss:
+            rt_appl_miss = filter_out_local_interfaces(self.namespace, rt_appl_miss)
+
+        if rt_appl_miss:
+            rt_appl_miss = filter_out_voq_neigh_routes(self.namespace, rt_appl_miss)
+
+        if rt_appl_miss or rt_asic_miss:
+            rt_appl_miss, rt_asic_miss = filter_out_vlan_neigh_route_miss(self.namespace, rt_appl_miss, rt_asic_miss)
+
+        if rt_appl_miss:
+            rt_appl_miss = filter_out_local_p2p_ips(self.namespace, rt_appl_miss)
+
+        reported = set(rt_appl_miss) | set(intf_appl_miss) | set(rt_asic_miss)
+        self.ignored.update(p for p in expired if p not in reported)
+
+        results = {}
+        if rt_appl_miss:
+            results["missed_ROUTE_TABLE_routes"] = rt_appl_miss
+
+        if intf_appl_miss:
+            results["missed_INTF_TABLE_entries"] = intf_appl_miss
+
+        if rt_asic_miss:
+            results["Unaccounted_ROUTE_ENTRY_TABLE_entries"] = rt_asic_miss
+
+        rt_frr_miss, rt_frr_failed = check_frr_pending_routes(self.namespace)
+
+        if rt_frr_miss:
+            results["missed_FRR_routes"] = rt_frr_miss
+
+        if rt_frr_failed:
+            results["failed_FRR_routes"] = rt_frr_failed
+
+        if rt_frr_miss and not rt_appl_miss and not rt_asic_miss:
+            print_message(syslog.LOG_ERR, "Some routes are not set offloaded in FRR{} \
+                          but all routes in APPL_DB and ASIC_DB are in sync".format(self.namespace))
+            if is_suppress_fib_pending_enabled(self.namespace):
+                mitigate_installed_not_offloaded_frr_routes(self.namespace, rt_frr_miss, self.appl_routes)
+        if rt_frr_failed:
+            print_message(syslog.LOG_ERR, "Some routes have failed state in FRR {} \
+                          : {}".format(self.namespace, rt_frr_failed))
+
+        self.results = results
+        return results
+
+    def get_status(self):
+        """
+        :return cheap summary of the index, without any DB access.
+        """
+        return {
+            "routes_appl": len(self.appl_routes),
+            "routes_asic": len(self.asic_routes),
+            "interfaces": len(self.intf_routes),
+            "out_of_sync": len(self.out_of_sync),
+            "results": self.results
+        }
+
+
+def write_status(indexes):
+    """
+    helper to atomically publish the daemon status for --status queries.
+    :param indexes: list of RouteIndex objects
+    :return the status written
+    """
+    status = {
+        "timestamp": int(time.time()),
+        "namespaces": {idx.namespace: idx.get_status() for idx in indexes}
+    }
+    tmp_path = ROUTE_CHECK_STATUS_FILE + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(status, f, indent=4)
+    os.replace(tmp_path, ROUTE_CHECK_STATUS_FILE)
+    return status
+
+
+def show_status():
+    """
+    Print the status published by a running route_check daemon.
+    :return (0, None) if all good, else (-1, results)
+    """
+    try:
+        with open(ROUTE_CHECK_STATUS_FILE) as f:
+            status = json.load(f)
+    except (OSError, ValueError) as e:
+        print_message(syslog.LOG_ERR, "Failed to read route_check daemon status: {}".format(e))
+        return -1, None
+
+    print(json.dumps(status, indent=4))
+    results = {ns: st["results"] for ns, st in status.get("namespaces", {}).items() if st.get("results")}
+    if results:
+        return -1, results
+    return 0, None
+
+
+def run_daemon(namespace, grace_secs, interval):
+    """
+    Long running route check. Seeds a route index per namespace once and
+    keeps it current from APPL-DB & ASIC-DB subscriptions. Every interval,
+    prefixes out of sync past grace_secs are filtered and reported along with
+    the FRR and SID checks of the periodic mode, under the same timeout, and
+    the status is published for --status queries.
+    :return same as check_routes; only returns when UNIT_TESTING
+    """
+    namespace_list = []
+    if namespace is not multi_asic.DEFAULT_NAMESPACE and namespace in multi_asic.get_namespace_list():
+        namespace_list.append(namespace)
+    else:
+        namespace_list = multi_asic.get_namespace_list()
+        print_message(syslog.LOG_INFO, "Watching routes for namespaces: ", namespace_list)
+
+    indexes = [RouteIndex(ns, grace_secs) for ns in namespace_list]
+    selector = swsscommon.Select()
+    for idx in indexes:
+        for subs in idx.selectables():
+            selector.addSelectable(subs)
+
+    reported = None
+    next_check = 0
+    while True:
+        for idx in indexes:
+            idx.drain()
+
+        if time.time() >= next_check:
+            signal.alarm(TIMEOUT_SECONDS)
+            results = {}
+            for idx in indexes:
+                result = idx.check()
+                if result:
+                    results[idx.namespace] = result
+            ret, sid_results = check_sids(namespace)
+            signal.alarm(0)
+            for idx in indexes:
+                sid_result = (sid_results or {}).get(idx.namespace)
+                if sid_result:
+                    idx.results.update(sid_result)
+                    results[idx.namespace] = idx.results
+            write_status(indexes)
+
+            if results != reported:
+                if results:
+                    print_message(syslog.LOG_WARNING, "Failure results: {",  json.dumps(results, indent=4), "}")
+                    print_message(syslog.LOG_WARNING, "Failed. Look at reported mismatches above")
+                else:
+                    print_message(syslog.LOG_INFO, "All good!")
+                reported = results
+            next_check = time.time() + interval
+
+            if UNIT_TESTING:
+                return (-1, results) if results or ret else (0, None)
+
+        selector.select(DAEMON_SELECT_TIMEOUT_MSECS)
+
+
 def main():
     """
     main entry point, which mainly parses the args and call check_routes
@@ -1112,6 +1439,21 @@ def main():
                         type=int,
                         default=TIMEOUT_SECONDS,
                         help='Timeout in secs')
+    parser.add_argument('-d',
+                        '--daemon',
+                        action='store_true',
+                        default=False,
+                        help='Keep running and check routes incrementally from DB subscriptions; '
+                             'the FRR and SID checks still run in full every interval')
+    parser.add_argument('-g',
+                        '--grace',
+                        type=int,
+                        default=DEFAULT_GRACE_SECS,
+                        help='Daemon mode: report prefixes out of sync for longer than this, in secs')
+    parser.add_argument('--status',
+                        action='store_true',
+                        default=False,
+                        help='Show the status published by the running daemon')
     args = parser.parse_args()
 
     namespace = args.namespace
@@ -1128,6 +1470,9 @@ def main():
 
     set_level(args.mode, args.log_to_syslog)
 
+    if args.status:
+        return show_status()
+
     if args.interval:
         if (args.interval < MIN_SCAN_INTERVAL):
             interval = MIN_SCAN_INTERVAL
@@ -1145,6 +1490,9 @@ def main():
         print_message(syslog.LOG_INFO, "BGP feature is disabled, exiting without checking routes!!")
         return 0, None
 
+    if args.daemon:
+        return run_daemon(namespace, args.grace, interval if interval else MIN_SCAN_INTERVAL)
+
     while True:
         signal.alarm(TIMEOUT_SECONDS)
         ret1, res1 = check_routes(namespace)
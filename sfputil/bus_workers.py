@@ -0,0 +1,186 @@
+"""
+Run the operations of several transceivers concurrently.
+
+The transceivers behind the same I2C bus or mux can't be accessed concurrently,
+so the ports are grouped by bus: the ports of a group are handled one after the
+other by one worker, the groups concurrently by a bounded number of workers.
+
+The platform declares the ports sharing a bus in its platform.json, as lists of
+physical port indexes:
+
+    "transceiver_bus_groups": [[1, 2, 3, 4], [5, 6, 7, 8]]
+
+Ports which are not in a group are on their own bus. A platform which declares
+no group may still have ports sharing buses, so by default its ports are handled
+one after the other: they are handled concurrently only if the user gives the
+maximum number of workers.
+
+A port may be given a timeout: a port which doesn't complete in time is reported
+as timed out, and the other ports of its bus are skipped since the bus is likely
+stuck. The worker stuck on the port is abandoned, and replaced by a new worker
+for the other buses. When the ports are handled one after the other because no
+group is declared, the bus of the stuck port is unknown: only that port is timed
+out, and the new worker goes on with the ports after it.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from sonic_py_common import device_info
+
+PLATFORM_JSON = 'platform.json'
+BUS_GROUPS_KEY = 'transceiver_bus_groups'
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def load_bus_groups():
+    """
+    Load the groups of physical ports sharing a bus declared by the platform
+    :return list of lists of physical port indexes, empty if none is declared
+    """
+    if not device_info.get_platform():
+        return []
+    platform_dir = device_info.get_path_to_platform_dir()
+    if not platform_dir:
+        return []
+    platform_json = os.path.join(platform_dir, PLATFORM_JSON)
+    if not os.path.isfile(platform_json):
+        return []
+    with open(platform_json) as f:
+        return json.load(f).get(BUS_GROUPS_KEY, [])
+
+
+class PortTimeout(Exception):
+    """The operation of a port didn't complete in time, or was skipped because of another port of its bus"""
+    pass
+
+
+class PortResult(object):
+    """Result of the operation of a port, error is the exception it raised if any"""
+    def __init__(self):
+        self.value = None
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def timed_out(self):
+        return isinstance(self.error, PortTimeout)
+
+
+class BusWorkerPool(object):
+    def __init__(self, bus_groups=None, max_workers=None):
+        """
+        :param bus_groups: lists of the physical ports sharing a bus, see load_bus_groups
+        :param max_workers: maximum number of buses handled concurrently, None for
+                            DEFAULT_MAX_WORKERS if bus groups are declared, else all
+                            the ports are handled one after the other
+        """
+        self.bus_of = {}
+        for index, group in enumerate(bus_groups or []):
+            for physical_port in group:
+                self.bus_of[physical_port] = index
+        self.serial = max_workers is None and not self.bus_of
+        self.max_workers = max(1, DEFAULT_MAX_WORKERS if max_workers is None else max_workers)
+
+    def group(self, ports, physical_port_of):
+        """
+        Group the ports by bus, keeping their order
+        :param physical_port_of: function returning the physical port index of a port
+        """
+        groups = OrderedDict()
+        for port in ports:
+            physical_port = physical_port_of(port)
+            if self.serial:
+                key = ('bus', None)
+            elif physical_port in self.bus_of:
+                key = ('bus', self.bus_of[physical_port])
+            else:
+                key = ('port', physical_port)
+            groups.setdefault(key, []).append(port)
+        return list(groups.values())
+
+    def run(self, func, ports, physical_port_of, timeout=None):
+        """
+        Call func(port) for each port, concurrently for the ports on different buses
+        :param timeout: seconds a port is given to complete, None to wait forever
+        :return OrderedDict {port: PortResult} in the order of ports
+        """
+        results = OrderedDict((port, PortResult()) for port in ports)
+        groups = queue.Queue()
+        for group in self.group(ports, physical_port_of):
+            groups.put(group)
+
+        cond = threading.Condition()
+        workers = set()
+        # {worker: (ports of its group left, deadline of the first one)}
+        running = {}
+
+        def worker():
+            me = threading.current_thread()
+            try:
+                while True:
+                    try:
+                        group = groups.get_nowait()
+                    except queue.Empty:
+                        return
+                    for index, port in enumerate(group):
+                        with cond:
+                            if me not in workers:
+                                return
+                            deadline = None if timeout is None else time.monotonic() + timeout
+                            running[me] = (group[index:], deadline)
+                            cond.notify()
+                        value = error = None
+                        try:
+                            value = func(port)
+                        except BaseException as e:
+                            # sys.exit() of the operations ends the port only
+                            error = e
+                        with cond:
+                            if me not in workers:
+                                # Abandoned, the port is already reported as timed out
+                                return
+                            results[port].value = value
+                            results[port].error = error
+            finally:
+                with cond:
+                    workers.discard(me)
+                    running.pop(me, None)
+                    cond.notify()
+
+        def start_worker():
+            thread = threading.Thread(target=worker, daemon=True)
+            workers.add(thread)
+            thread.start()
+
+        with cond:
+            for _ in range(min(self.max_workers, groups.qsize())):
+                start_worker()
+            while workers:
+                deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+                cond.wait(max(0, min(deadlines) - time.monotonic()) if deadlines else None)
+                now = time.monotonic()
+                for thread, (pending, deadline) in list(running.items()):
+                    if deadline is None or deadline > now:
+                        continue
+                    workers.discard(thread)
+                    del running[thread]
+                    results[pending[0]].error = PortTimeout("Timed out after {}s".format(timeout))
+                    if self.serial:
+                        # The other ports are not known to share the bus of the stuck one
+                        if pending[1:]:
+                            groups.put(pending[1:])
+                    else:
+                        for port in pending[1:]:
+                            results[port].error = PortTimeout("Skipped, another port of the bus timed out")
+                    if not groups.empty():
+                        start_worker()
+        return results
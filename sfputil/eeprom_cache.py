@@ -0,0 +1,102 @@
+"""
+Short-lived cache of the raw EEPROM pages read from the transceivers.
+
+Reading a page over a slow I2C bus takes long, and the same pages are read again
+and again when the EEPROM of the ports is dumped repeatedly. The pages read are
+kept in a file per physical port in the user cache directory, with the time they
+were read, and are used again for ttl seconds.
+
+A page is identified by its offset in the flat memory of the module, and its size.
+"""
+
+import json
+import os
+import time
+
+from utilities_common.cli import UserCache
+
+CACHE_APP_NAME = 'sfputil'
+CACHE_TAG = 'eeprom'
+
+
+class EepromCache(object):
+    def __init__(self, ttl, cache_dir=None):
+        """
+        :param ttl: seconds a page is used for
+        :param cache_dir: directory of the cache files, the user cache directory by default
+        """
+        self.ttl = ttl
+        if cache_dir is None:
+            cache_dir = UserCache(app_name=CACHE_APP_NAME, tag=CACHE_TAG).get_directory()
+        self.cache_dir = cache_dir
+
+    @classmethod
+    def get_existing(cls, ttl=0):
+        """
+        The cache of the user if its directory exists, None otherwise: unlike
+        UserCache, doesn't create the directory of a cache never used
+        """
+        cache_dir = os.path.join(UserCache.CACHE_DIR, CACHE_APP_NAME, '{}-{}'.format(os.getuid(), CACHE_TAG))
+        if not os.path.isdir(cache_dir):
+            return None
+        return cls(ttl, cache_dir)
+
+    def get_file(self, physical_port):
+        return os.path.join(self.cache_dir, 'port{}'.format(physical_port))
+
+    def load(self, physical_port):
+        try:
+            with open(self.get_file(physical_port)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def get_key(flat_offset, size):
+        return '{}:{}'.format(flat_offset, size)
+
+    def get(self, physical_port, flat_offset, size):
+        """
+        :return the bytearray of the page, None if it is not cached or too old
+        """
+        entry = self.load(physical_port).get(self.get_key(flat_offset, size))
+        if entry is None:
+            return None
+        read_time, data = entry
+        if not 0 <= time.time() - read_time < self.ttl:
+            return None
+        return bytearray.fromhex(data)
+
+    def set(self, physical_port, flat_offset, size, data):
+        pages = self.load(physical_port)
+        now = time.time()
+        # Drop the pages too old to be used
+        pages = {key: entry for key, entry in pages.items() if 0 <= now - entry[0] < self.ttl}
+        pages[self.get_key(flat_offset, size)] = [now, bytes(data).hex()]
+
+        # A port is handled by one worker at a time, replace the file atomically
+        # for the concurrent readers
+        path = self.get_file(physical_port)
+        tmp_path = '{}.{}'.format(path, os.getpid())
+        with open(tmp_path, 'w') as f:
+            json.dump(pages, f)
+        os.replace(tmp_path, path)
+
+    def remove(self, physical_port):
+        """Remove the pages of a port, after its EEPROM is written"""
+        try:
+            os.remove(self.get_file(physical_port))
+        except FileNotFoundError:
+            pass
+
+    def read_eeprom(self, sfp, physical_port, flat_offset, size):
+        """
+        Read a page from the cache, or from the transceiver if not cached
+        :return the bytearray of the page, None if it can't be read
+        """
+        data = self.get(physical_port, flat_offset, size)
+        if data is None:
+            data = sfp.read_eeprom(flat_offset, size)
+            if data is not None:
+                self.set(physical_port, flat_offset, size, data)
+        return data
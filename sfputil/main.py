@@ -5,11 +5,14 @@
 # Command-line utility for interacting with SFP transceivers within SONiC
 #
 
+import contextlib
 import copy
+import mmap
 import os
 import sys
 import natsort
 import ast
+import threading
 import time
 import datetime
 
@@ -17,6 +20,8 @@ import subprocess
 import click
 import sonic_platform
 import sonic_platform_base.sonic_sfp.sfputilhelper
+from sfputil.bus_workers import BusWorkerPool, load_bus_groups
+from sfputil.eeprom_cache import EepromCache
 from sfputil.debug import debug
 from sonic_platform_base.sfp_base import SfpBase
 from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector
@@ -31,6 +36,7 @@ from utilities_common.sfp_helper import QSFP_DATA_MAP
 from utilities_common.sfp_helper import is_transceiver_cmis, get_data_map_sort_key
 from tabulate import tabulate
 from utilities_common.general import load_db_config
+from utilities_common.intf_filter import parse_interface_in_filter, SONIC_BACK_PORT_NAME_PREFIX
 
 VERSION = '3.0'
 
@@ -49,6 +55,8 @@ ERROR_NOT_IMPLEMENTED = 5
 ERROR_INVALID_PORT = 6
 ERROR_INVALID_PAGE = 7
 SMBUS_BLOCK_WRITE_SIZE = 32
+# Seconds a transceiver is given to respond when the ports are scanned
+DEFAULT_SCAN_TIMEOUT = 30
 # Default host password as per CMIS spec:
 # http://www.qsfp-dd.com/wp-content/uploads/2021/05/CMIS5p0.pdf
 CDB_DEFAULT_HOST_PASSWORD = 0x00001011
@@ -284,6 +292,9 @@ platform_chassis = None
 # Global platform-specific sfputil class instance
 platform_sfputil = None
 
+# Global cache of the EEPROM pages read, None if the pages are not cached
+eeprom_cache = None
+
 # Global logger instance
 log = logger.Logger(SYSLOG_IDENTIFIER)
 
@@ -590,6 +601,43 @@ def load_port_config():
 
     return True
 
+
+class SfpScanError(Exception):
+    """Ends a scan of the ports: message is displayed, after the output of the port so far if any"""
+    def __init__(self, message, output=None):
+        super().__init__(message)
+        self.message = message
+        self.output = output
+
+
+def scan_ports(func, ports, max_workers=None, timeout=DEFAULT_SCAN_TIMEOUT, physical_port_of=None):
+    """
+    Call func(port) for the ports concurrently, the ports sharing a bus one after the other
+    Args:
+        ports: the ports, physical port indexes unless physical_port_of is given
+        max_workers: maximum number of ports read concurrently, None to read them one
+                     after the other unless the platform declares its bus groups
+        timeout: seconds a port is given to complete, 0 to wait forever
+        physical_port_of: function returning the physical port index of a port
+    Returns:
+        OrderedDict {port: PortResult} in the order of ports, duplicates removed
+    """
+    if physical_port_of is None:
+        def physical_port_of(port):
+            return port
+    pool = BusWorkerPool(load_bus_groups(), max_workers)
+    return pool.run(func, list(dict.fromkeys(ports)), physical_port_of, timeout=timeout or None)
+
+
+def scan_options(func):
+    """Options of the commands scanning the ports"""
+    func = click.option('--timeout', type=click.IntRange(0), default=DEFAULT_SCAN_TIMEOUT, show_default=True,
+                        help="Seconds a transceiver is given to respond, 0 to wait forever")(func)
+    func = click.option('--max-workers', type=click.IntRange(1, 128), default=None,
+                        help="Maximum number of transceivers read concurrently  [default: one at a time, "
+                             "unless the platform declares its transceiver buses]")(func)
+    return func
+
 # ==================== CLI commands and groups ====================
 
 
@@ -634,7 +682,8 @@ def show():
 @click.option('-p', '--port', metavar='<port_name>', help="Display SFP EEPROM data for port <port_name> only")
 @click.option('-d', '--dom', 'dump_dom', is_flag=True, help="Also display Digital Optical Monitoring (DOM) data")
 @click.option('-n', '--namespace', default=None, help="Display interfaces for specific namespace")
-def eeprom(port, dump_dom, namespace):
+@scan_options
+def eeprom(port, dump_dom, namespace, max_workers, timeout):
     """Display EEPROM data of SFP transceiver(s)"""
     logical_port_list = []
     output = ""
@@ -650,6 +699,8 @@ def eeprom(port, dump_dom, namespace):
 
         logical_port_list = [port]
 
+    # (port name, physical port index or None for a RJ45 port)
+    port_list = []
     for logical_port_name in logical_port_list:
         ganged = False
         i = 1
@@ -666,70 +717,105 @@ def eeprom(port, dump_dom, namespace):
             port_name = get_physical_port_name(logical_port_name, i, ganged)
 
             if is_port_type_rj45(port_name):
-                output += "{}: SFP EEPROM is not applicable for RJ45 port\n".format(port_name)
-                output += '\n'
-                continue
+                port_list.append((port_name, None))
+            else:
+                port_list.append((port_name, physical_port))
 
-            try:
-                presence = platform_chassis.get_sfp(physical_port).get_presence()
-            except NotImplementedError:
-                click.echo("Sfp.get_presence() is currently not implemented for this platform")
-                sys.exit(ERROR_NOT_IMPLEMENTED)
+    results = scan_ports(lambda physical_port: get_eeprom_output(physical_port, dump_dom),
+                         [physical_port for _, physical_port in port_list if physical_port is not None],
+                         max_workers, timeout)
 
-            if not presence:
-                output += "{}: SFP EEPROM not detected\n".format(port_name)
+    for port_name, physical_port in port_list:
+        if physical_port is None:
+            output += "{}: SFP EEPROM is not applicable for RJ45 port\n".format(port_name)
+            output += '\n'
+            continue
+
+        result = results[physical_port]
+        if result.timed_out:
+            output += "{}: {}\n".format(port_name, result.error)
+        elif isinstance(result.error, SfpScanError):
+            if result.error.output is None:
+                click.echo(result.error.message)
             else:
-                output += "{}: SFP EEPROM detected\n".format(port_name)
+                click.echo(output + "{}: {}{}".format(port_name, result.error.output, result.error.message))
+            sys.exit(ERROR_NOT_IMPLEMENTED)
+        elif not result.ok:
+            raise result.error
+        else:
+            output += "{}: {}".format(port_name, result.value)
 
-                try:
-                    xcvr_info = platform_chassis.get_sfp(physical_port).get_transceiver_info()
-                    is_sfp_cmis = is_transceiver_cmis(xcvr_info)
-                except NotImplementedError:
-                    click.echo("Sfp.get_transceiver_info() is currently not implemented for this platform")
-                    sys.exit(ERROR_NOT_IMPLEMENTED)
+        output += '\n'
 
-                output += convert_sfp_info_to_output_string(xcvr_info)
-
-                if dump_dom:
-                    try:
-                        api = platform_chassis.get_sfp(physical_port).get_xcvr_api()
-                    except NotImplementedError:
-                        output += "API is currently not implemented for this platform\n"
-                        click.echo(output)
-                        sys.exit(ERROR_NOT_IMPLEMENTED)
-                    if api is None:
-                        output += "API is none while getting DOM info!\n"
-                        click.echo(output)
-                        sys.exit(ERROR_NOT_IMPLEMENTED)
-                    try:
-                        xcvr_dom_info = platform_chassis.get_sfp(physical_port).get_transceiver_dom_real_value()
-                    except NotImplementedError:
-                        click.echo("Sfp.get_transceiver_dom_real_value() is currently not implemented "
-                                   "for this platform")
-                        sys.exit(ERROR_NOT_IMPLEMENTED)
-
-                    try:
-                        xcvr_dom_threshold_info = platform_chassis.get_sfp(physical_port).get_transceiver_threshold_info()
-                        if xcvr_dom_threshold_info:
-                            xcvr_dom_info.update(xcvr_dom_threshold_info)
-                    except NotImplementedError:
-                        click.echo("Sfp.get_transceiver_threshold_info() is currently not implemented for this platform")
-                        sys.exit(ERROR_NOT_IMPLEMENTED)
-
-                    output += convert_dom_to_output_string(xcvr_info['type'],
-                                                           is_sfp_cmis, xcvr_dom_info)
+    click.echo(output)
 
-            output += '\n'
 
-    click.echo(output)
+def get_eeprom_output(physical_port, dump_dom):
+    """
+    Read the EEPROM data of a transceiver
+    Args:
+        physical_port: physical port index
+        dump_dom: True to also read the DOM data
+    Returns:
+        The output of the transceiver without the port name,
+        raises SfpScanError if the platform doesn't support an operation
+    """
+    sfp = platform_chassis.get_sfp(physical_port)
+    try:
+        presence = sfp.get_presence()
+    except NotImplementedError:
+        raise SfpScanError("Sfp.get_presence() is currently not implemented for this platform")
+
+    if not presence:
+        return "SFP EEPROM not detected\n"
+
+    output = "SFP EEPROM detected\n"
+
+    try:
+        xcvr_info = sfp.get_transceiver_info()
+        is_sfp_cmis = is_transceiver_cmis(xcvr_info)
+    except NotImplementedError:
+        raise SfpScanError("Sfp.get_transceiver_info() is currently not implemented for this platform")
+
+    output += convert_sfp_info_to_output_string(xcvr_info)
+
+    if dump_dom:
+        try:
+            api = sfp.get_xcvr_api()
+        except NotImplementedError:
+            raise SfpScanError("API is currently not implemented for this platform\n", output)
+        if api is None:
+            raise SfpScanError("API is none while getting DOM info!\n", output)
+        try:
+            xcvr_dom_info = sfp.get_transceiver_dom_real_value()
+        except NotImplementedError:
+            raise SfpScanError("Sfp.get_transceiver_dom_real_value() is currently not implemented "
+                               "for this platform")
+
+        try:
+            xcvr_dom_threshold_info = sfp.get_transceiver_threshold_info()
+            if xcvr_dom_threshold_info:
+                xcvr_dom_info.update(xcvr_dom_threshold_info)
+        except NotImplementedError:
+            raise SfpScanError("Sfp.get_transceiver_threshold_info() is currently not implemented for this platform")
+
+        output += convert_dom_to_output_string(xcvr_info['type'], is_sfp_cmis, xcvr_dom_info)
+
+    return output
 
 
 # 'eeprom-hexdump' subcommand
 @show.command()
 @click.option('-p', '--port', metavar='<port_name>', help="Display SFP EEPROM hexdump for port <port_name>")
 @click.option('-n', '--page', metavar='<page_number>', help="Display SFP EEPROM hexdump for <page_number_in_hex>")
-def eeprom_hexdump(port, page):
+@click.option('--cache-ttl', type=click.IntRange(0), default=0, show_default=True,
+              help="Seconds the EEPROM pages read are cached for, 0 to always read the transceiver")
+@scan_options
+def eeprom_hexdump(port, page, cache_ttl, max_workers, timeout):
     """Display EEPROM hexdump of SFP transceiver(s)"""
+    global eeprom_cache
+    eeprom_cache = EepromCache(cache_ttl) if cache_ttl else None
+
     if port:
         if page is None:
             page = 0
@@ -742,9 +828,16 @@ def eeprom_hexdump(port, page):
         if page is not None:
             page = validate_eeprom_page(page)
         logical_port_list = natsorted(platform_sfputil.logical)
+        results = scan_ports(lambda logical_port_name: eeprom_hexdump_single_port(logical_port_name, page),
+                             logical_port_list, max_workers, timeout, logical_port_to_physical_port_index)
         lines = []
-        for logical_port_name in logical_port_list:
-            return_code, output = eeprom_hexdump_single_port(logical_port_name, page)
+        for logical_port_name, result in results.items():
+            if result.timed_out:
+                return_code, output = EXIT_FAIL, str(result.error)
+            elif not result.ok:
+                raise result.error
+            else:
+                return_code, output = result.value
             if return_code != 0:
                 lines.append(f'EEPROM hexdump for port {logical_port_name}')
                 lines.append(f'{EEPROM_DUMP_INDENT}{output}\n')
@@ -950,7 +1043,10 @@ def eeprom_dump_general(physical_port, page, flat_offset, size, page_offset, no_
         tuple(0, dump string) if success else tuple(error_code, error_message)
     """
     sfp = platform_chassis.get_sfp(physical_port)
-    page_dump = sfp.read_eeprom(flat_offset, size)
+    if eeprom_cache is not None:
+        page_dump = eeprom_cache.read_eeprom(sfp, physical_port, flat_offset, size)
+    else:
+        page_dump = sfp.read_eeprom(flat_offset, size)
     if page_dump is None:
         return ERROR_NOT_IMPLEMENTED, f'Error: Failed to read EEPROM for page {page:x}h, flat_offset {flat_offset}, page_offset {page_offset}, size {size}!'
     if not no_format:
@@ -999,7 +1095,8 @@ def hexdump(indent, data, mem_address, start_newline=True):
 # 'presence' subcommand
 @show.command()
 @click.option('-p', '--port', metavar='<port_name>', help="Display SFP presence for port <port_name> only")
-def presence(port):
+@scan_options
+def presence(port, max_workers, timeout):
     """Display presence of SFP transceiver(s)"""
     logical_port_list = []
     output_table = []
@@ -1016,6 +1113,8 @@ def presence(port):
 
         logical_port_list = [port]
 
+    # (port name, physical port index)
+    port_list = []
     logical_port_list = natsort.natsorted(logical_port_list)
     for logical_port_name in logical_port_list:
         ganged = False
@@ -1030,28 +1129,36 @@ def presence(port):
             ganged = True
 
         for physical_port in physical_port_list:
-            port_name = get_physical_port_name(logical_port_name, i, ganged)
-
-            try:
-                presence = platform_chassis.get_sfp(physical_port).get_presence()
-            except NotImplementedError:
-                click.echo("This functionality is currently not implemented for this platform")
-                sys.exit(ERROR_NOT_IMPLEMENTED)
+            port_list.append((get_physical_port_name(logical_port_name, i, ganged), physical_port))
+            i += 1
 
-            status_string = "Present" if presence else "Not present"
-            output_table.append([port_name, status_string])
+    results = scan_ports(lambda physical_port: platform_chassis.get_sfp(physical_port).get_presence(),
+                         [physical_port for _, physical_port in port_list], max_workers, timeout)
 
-            i += 1
+    for port_name, physical_port in port_list:
+        result = results[physical_port]
+        if result.timed_out:
+            status_string = str(result.error)
+        elif isinstance(result.error, NotImplementedError):
+            click.echo("This functionality is currently not implemented for this platform")
+            sys.exit(ERROR_NOT_IMPLEMENTED)
+        elif not result.ok:
+            raise result.error
+        else:
+            status_string = "Present" if result.value else "Not present"
+        output_table.append([port_name, status_string])
 
     click.echo(tabulate(output_table, table_header, tablefmt="simple"))
 
 
 # 'error-status' subcommand
-def fetch_error_status_from_platform_api(port):
+def fetch_error_status_from_platform_api(port, max_workers=None, timeout=DEFAULT_SCAN_TIMEOUT):
     """Fetch the error status from platform API and return the output as a string
     Args:
         port: the port whose error status will be fetched.
               None represents for all ports.
+        max_workers: maximum number of ports fetched concurrently
+        timeout: seconds a port is given to respond, 0 to wait forever
     Returns:
         A string consisting of the error status of each port.
     """
@@ -1060,19 +1167,26 @@ def fetch_error_status_from_platform_api(port):
     else:
         logical_port_list = [port]
 
-    output = []
-    for logical_port_name in logical_port_list:
+    def get_error_description(logical_port_name):
+        if is_port_type_rj45(logical_port_name):
+            return "N/A"
         physical_port = logical_port_to_physical_port_index(logical_port_name)
+        return platform_chassis.get_sfp(physical_port).get_error_description()
 
-        if is_port_type_rj45(logical_port_name):
-            output.append([logical_port_name, "N/A"])
+    results = scan_ports(get_error_description, logical_port_list, max_workers, timeout,
+                         logical_port_to_physical_port_index)
+
+    output = []
+    for logical_port_name, result in results.items():
+        if result.timed_out:
+            output.append([logical_port_name, str(result.error)])
+        elif isinstance(result.error, NotImplementedError):
+            click.echo("get_error_description NOT implemented for port {}".format(logical_port_name))
+            sys.exit(ERROR_NOT_IMPLEMENTED)
+        elif not result.ok:
+            raise result.error
         else:
-            try:
-                error_description = platform_chassis.get_sfp(physical_port).get_error_description()
-                output.append([logical_port_name, error_description])
-            except NotImplementedError:
-                click.echo("get_error_description NOT implemented for port {}".format(logical_port_name))
-                sys.exit(ERROR_NOT_IMPLEMENTED)
+            output.append([logical_port_name, result.value])
 
     return output
 
@@ -1115,7 +1229,8 @@ def fetch_error_status_from_state_db(port, state_db):
 @show.command()
 @click.option('-p', '--port', metavar='<port_name>', help="Display SFP error status for port <port_name> only")
 @click.option('-hw', '--fetch-from-hardware', 'fetch_from_hardware', is_flag=True, default=False, help="Fetch the error status from hardware directly")
-def error_status(port, fetch_from_hardware):
+@scan_options
+def error_status(port, fetch_from_hardware, max_workers, timeout):
     """Display error status of SFP transceiver(s)"""
     output_table = []
     table_header = ["Port", "Error Status"]
@@ -1127,7 +1242,7 @@ def error_status(port, fetch_from_hardware):
         sys.exit(ERROR_INVALID_PORT)
 
     if fetch_from_hardware:
-        output_table = fetch_error_status_from_platform_api(port)
+        output_table = fetch_error_status_from_platform_api(port, max_workers, timeout)
     else:
         namespaces = multi_asic.get_front_end_namespaces()
         for namespace in namespaces:
@@ -1204,9 +1319,9 @@ def show_firmware_version(physical_port):
         sfp = platform_chassis.get_sfp(physical_port)
         api = sfp.get_xcvr_api()
         out = api.get_module_fw_info()
-        click.echo(out['info'])
+        firmware_echo(out['info'])
     except NotImplementedError:
-        click.echo("This functionality is currently not implemented for this platform")
+        firmware_echo("This functionality is currently not implemented for this platform")
         sys.exit(ERROR_NOT_IMPLEMENTED)
 
 # 'fwversion' subcommand
@@ -1402,10 +1517,151 @@ def enable(port_name):
     set_power(port_name, True)
 
 
+class FirmwareImageReader(object):
+    """Reader of a firmware image shared by several downloads, without copying it"""
+    def __init__(self, image):
+        self.view = memoryview(image)
+        self.offset = 0
+
+    def read(self, size):
+        data = bytes(self.view[self.offset:self.offset + size])
+        self.offset += len(data)
+        return data
+
+
+class FirmwareProgress(object):
+    """Progress bar like object reporting the downloaded bytes to a function"""
+    def __init__(self, progress):
+        self.progress = progress
+
+    def update(self, count):
+        self.progress(count)
+
+
+# Logical port handled by the current thread when the firmware of several ports
+# is handled concurrently, to tell their messages apart
+firmware_port = threading.local()
+firmware_echo_lock = threading.Lock()
+
+
+def firmware_echo(message):
+    port_name = getattr(firmware_port, 'name', None)
+    if port_name is not None:
+        message = '\n'.join('{}: {}'.format(port_name, line) for line in str(message).split('\n'))
+    with firmware_echo_lock:
+        click.echo(message)
+
+
+def parse_firmware_ports(port_name):
+    """
+    Parse the port argument of the firmware commands, a port or a list of ports
+    and ranges of ports like Ethernet0,Ethernet8-16
+    :return list of the logical ports, one per transceiver, None for a single port
+    """
+    if ',' not in port_name and '-' not in port_name.replace(SONIC_BACK_PORT_NAME_PREFIX, ''):
+        return None
+
+    ports = set()
+    for item in port_name.split(','):
+        if '-' in item.replace(SONIC_BACK_PORT_NAME_PREFIX, ''):
+            # Only the logical ports of a range are taken, e.g. Ethernet0-12 is Ethernet0,Ethernet4,...
+            ports.update(port for port in parse_interface_in_filter(item) if platform_sfputil.is_logical_port(port))
+        elif platform_sfputil.is_logical_port(item):
+            ports.add(item)
+        else:
+            click.echo("Error: invalid port '{}'\n".format(item))
+            print_all_valid_port_values()
+            sys.exit(ERROR_INVALID_PORT)
+
+    if not ports:
+        click.echo("Error: no valid port in '{}'\n".format(port_name))
+        print_all_valid_port_values()
+        sys.exit(ERROR_INVALID_PORT)
+
+    # The subports of a breakout port share the transceiver, which is updated once with the first subport
+    port_of_transceiver = {}
+    for port in natsorted(ports):
+        port_of_transceiver.setdefault(logical_port_to_physical_port_index(port), port)
+    return list(port_of_transceiver.values())
+
+
+def check_firmware_ports(ports):
+    """
+    Skip the ports which are RJ45 or without transceiver
+    """
+    valid_ports = []
+    for port_name in ports:
+        if is_port_type_rj45(port_name):
+            click.echo("{}: This functionality is not applicable for RJ45 port, skipping".format(port_name))
+        elif not is_sfp_present(port_name):
+            click.echo("{}: SFP EEPROM not detected, skipping".format(port_name))
+        else:
+            valid_ports.append(port_name)
+    if not valid_ports:
+        sys.exit(EXIT_FAIL)
+    return valid_ports
+
+
+def run_firmware_on_ports(func, ports, filepath, max_workers=None):
+    """
+    Run func(port_name, filepath, image, progress) on the ports concurrently, the
+    ports sharing a bus one after the other, see BusWorkerPool for max_workers.
+    The firmware image is read once, and shared by all the ports.
+    Exits with EXIT_FAIL if it fails on a port.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            image = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        click.echo("Firmware file {} NOT found or empty".format(filepath))
+        sys.exit(EXIT_FAIL)
+
+    file_size = len(image)
+
+    def run_port(port_name):
+        firmware_port.name = port_name
+        downloaded = [0, 0]
+
+        def progress(count):
+            # Report every 10%
+            downloaded[0] += count
+            percent = downloaded[0] * 100 // file_size // 10 * 10
+            if percent > downloaded[1]:
+                downloaded[1] = percent
+                firmware_echo("Downloaded {}%".format(percent))
+
+        return func(port_name, filepath, image, progress)
+
+    start = time.time()
+    pool = BusWorkerPool(load_bus_groups(), max_workers)
+    results = pool.run(run_port, ports, logical_port_to_physical_port_index)
+    end = time.time()
+
+    table = []
+    failed = False
+    for port_name, result in results.items():
+        if result.ok and result.value == 1:
+            table.append([port_name, "OK"])
+        elif result.ok:
+            table.append([port_name, "Failed, status {}".format(result.value)])
+            failed = True
+        elif isinstance(result.error, SystemExit):
+            table.append([port_name, "Failed, exit code {}".format(result.error.code)])
+            failed = True
+        else:
+            table.append([port_name, "Failed, {}".format(repr(result.error))])
+            failed = True
+
+    click.echo(tabulate(table, ["Port", "Result"], tablefmt='simple'))
+    click.echo("Total Time: {}".format(str(datetime.timedelta(seconds=end-start))))
+    if failed:
+        sys.exit(EXIT_FAIL)
+
+
 def update_firmware_info_to_state_db(port_name):
     first_subport = get_first_subport(port_name)
     if first_subport is None:
-        click.echo("Error: Unable to get first subport for {} while updating FW info to DB".format(port_name))
+        firmware_echo("Error: Unable to get first subport for {} while updating FW info to DB".format(port_name))
         return
     physical_port = logical_port_to_physical_port_index(first_subport)
 
@@ -1439,25 +1695,25 @@ def run_firmware(port_name, mode):
     try:
         api = sfp.get_xcvr_api()
     except NotImplementedError:
-        click.echo("This functionality is currently not implemented for this platform")
+        firmware_echo("This functionality is currently not implemented for this platform")
         sys.exit(ERROR_NOT_IMPLEMENTED)
 
     if mode == 0:
-        click.echo("Running firmware: Non-hitless Reset to Inactive Image")
+        firmware_echo("Running firmware: Non-hitless Reset to Inactive Image")
     elif mode == 1:
-        click.echo("Running firmware: Hitless Reset to Inactive Image")
+        firmware_echo("Running firmware: Hitless Reset to Inactive Image")
     elif mode == 2:
-        click.echo("Running firmware: Attempt non-hitless Reset to Running Image")
+        firmware_echo("Running firmware: Attempt non-hitless Reset to Running Image")
     elif mode == 3:
-        click.echo("Running firmware: Attempt Hitless Reset to Running Image")
+        firmware_echo("Running firmware: Attempt Hitless Reset to Running Image")
     else:
-        click.echo("Running firmware: Unknown mode {}".format(mode))
+        firmware_echo("Running firmware: Unknown mode {}".format(mode))
         sys.exit(EXIT_FAIL)
 
     try:
         status = api.cdb_run_firmware(mode)
     except NotImplementedError:
-        click.echo("This functionality is not applicable for this transceiver")
+        firmware_echo("This functionality is not applicable for this transceiver")
         sys.exit(EXIT_FAIL)
 
     return status
@@ -1475,7 +1731,7 @@ def is_fw_switch_done(port_name):
     try:
         api = sfp.get_xcvr_api()
     except NotImplementedError:
-        click.echo("This functionality is currently not implemented for this platform")
+        firmware_echo("This functionality is currently not implemented for this platform")
         sys.exit(ERROR_NOT_IMPLEMENTED)
 
     try:
@@ -1492,26 +1748,26 @@ def is_fw_switch_done(port_name):
              ImageB, ImageBRunning, ImageBCommitted, ImageBInvalid, _, _) = fw_info['result']
 
             if (ImageARunning == 1) and (ImageAInvalid == 1):       # ImageA is running, but also invalid.
-                click.echo("FW info error : ImageA shows running, but also shows invalid!")
+                firmware_echo("FW info error : ImageA shows running, but also shows invalid!")
                 status = -1 # Abnormal status.
             elif (ImageBRunning == 1) and (ImageBInvalid == 1):     # ImageB is running, but also invalid.
-                click.echo("FW info error : ImageB shows running, but also shows invalid!")
+                firmware_echo("FW info error : ImageB shows running, but also shows invalid!")
                 status = -1 # Abnormal status.
             elif (ImageARunning == 1) and (ImageACommitted == 0):   # ImageA is running, but not committed.
-                click.echo("FW images switch successful : ImageA is running")
+                firmware_echo("FW images switch successful : ImageA is running")
                 status = 1  # run_firmware is done. 
             elif (ImageBRunning == 1) and (ImageBCommitted == 0):   # ImageB is running, but not committed.
-                click.echo("FW images switch successful : ImageB is running")
+                firmware_echo("FW images switch successful : ImageB is running")
                 status = 1  # run_firmware is done. 
             else:                                                   # No image is running, or running and committed image is same.
-                click.echo("FW info error : Failed to switch into uncommitted image!")
+                firmware_echo("FW info error : Failed to switch into uncommitted image!")
                 status = -1 # Failure for Switching images.
         else:
-            click.echo("FW switch : Timeout!")
+            firmware_echo("FW switch : Timeout!")
             status = -1     # Timeout or check code error or CDB not supported.
 
     except NotImplementedError:
-        click.echo("This functionality is not applicable for this transceiver")
+        firmware_echo("This functionality is not applicable for this transceiver")
 
     return status
 
@@ -1523,33 +1779,42 @@ def commit_firmware(port_name):
     try:
         api = sfp.get_xcvr_api()
     except NotImplementedError:
-        click.echo("This functionality is currently not implemented for this platform")
+        firmware_echo("This functionality is currently not implemented for this platform")
         sys.exit(ERROR_NOT_IMPLEMENTED)
 
     try:
         status = api.cdb_commit_firmware()
     except NotImplementedError:
-        click.echo("This functionality is not applicable for this transceiver")
+        firmware_echo("This functionality is not applicable for this transceiver")
 
     return status
 
-def download_firmware(port_name, filepath):
-    """Download firmware on the transceiver"""
-    try:
-        fd = open(filepath, 'rb')
-        fd.seek(0, 2)
-        file_size = fd.tell()
-        fd.seek(0, 0)
-    except FileNotFoundError:
-        click.echo("Firmware file {} NOT found".format(filepath))
-        sys.exit(EXIT_FAIL)
+def download_firmware(port_name, filepath, image=None, progress=None):
+    """Download firmware on the transceiver
+       @image: the firmware image in memory, shared by the downloads to several ports.
+               filepath is not read when given
+       @progress: function called with the number of bytes written, instead of
+                  displaying a progress bar
+    """
+    if image is not None:
+        fd = FirmwareImageReader(image)
+        file_size = len(image)
+    else:
+        try:
+            fd = open(filepath, 'rb')
+            fd.seek(0, 2)
+            file_size = fd.tell()
+            fd.seek(0, 0)
+        except FileNotFoundError:
+            firmware_echo("Firmware file {} NOT found".format(filepath))
+            sys.exit(EXIT_FAIL)
 
     physical_port = logical_port_to_physical_port_index(port_name)
     sfp = platform_chassis.get_sfp(physical_port)
     try:
         api = sfp.get_xcvr_api()
     except NotImplementedError:
-        click.echo("This functionality is NOT applicable to this platform")
+        firmware_echo("This functionality is NOT applicable to this platform")
         sys.exit(ERROR_NOT_IMPLEMENTED)
 
     try:
@@ -1557,26 +1822,30 @@ def download_firmware(port_name, filepath):
         if fwinfo['status'] == True:
             startLPLsize, maxblocksize, lplonly_flag, autopaging_flag, writelength = fwinfo['feature']
         else:
-            click.echo("Failed to fetch CDB Firmware management features")
+            firmware_echo("Failed to fetch CDB Firmware management features")
             sys.exit(EXIT_FAIL)
     except NotImplementedError:
-        click.echo("This functionality is NOT applicable for this transceiver")
+        firmware_echo("This functionality is NOT applicable for this transceiver")
         sys.exit(ERROR_NOT_IMPLEMENTED)
 
-    click.echo('CDB: Starting firmware download')
+    firmware_echo('CDB: Starting firmware download')
     startdata = fd.read(startLPLsize)
     status = api.cdb_start_firmware_download(startLPLsize, startdata, file_size)
     if status != 1:
-        click.echo('CDB: Start firmware download failed - status {}'.format(status))
+        firmware_echo('CDB: Start firmware download failed - status {}'.format(status))
         sys.exit(EXIT_FAIL)
 
     # Increase the optoe driver's write max to speed up firmware download
     try:
         sfp.set_optoe_write_max(SMBUS_BLOCK_WRITE_SIZE)
     except NotImplementedError:
-        click.echo("Platform doesn't implement optoe write max change. Skipping value increase.")
+        firmware_echo("Platform doesn't implement optoe write max change. Skipping value increase.")
 
-    with click.progressbar(length=file_size, label="Downloading ...") as bar:
+    if progress is not None:
+        bar = contextlib.nullcontext(FirmwareProgress(progress))
+    else:
+        bar = click.progressbar(length=file_size, label="Downloading ...")
+    with bar as bar:
         address = 0
         if lplonly_flag:
             BLOCK_SIZE = min(MAX_LPL_FIRMWARE_BLOCK_SIZE, maxblocksize)
@@ -1587,7 +1856,7 @@ def download_firmware(port_name, filepath):
             count = BLOCK_SIZE if remaining >= BLOCK_SIZE else remaining
             data = fd.read(count)
             if len(data) != count:
-                click.echo("Firmware file read failed!")
+                firmware_echo("Firmware file read failed!")
                 sys.exit(EXIT_FAIL)
 
             if lplonly_flag:
@@ -1595,7 +1864,7 @@ def download_firmware(port_name, filepath):
             else:
                 status = api.cdb_epl_block_write(address, data, autopaging_flag, writelength)
             if (status != 1):
-                click.echo("CDB: firmware download failed! - status {}".format(status))
+                firmware_echo("CDB: firmware download failed! - status {}".format(status))
                 sys.exit(EXIT_FAIL)
 
             bar.update(count)
@@ -1606,11 +1875,11 @@ def download_firmware(port_name, filepath):
     try:
         sfp.set_optoe_write_max(1)
     except NotImplementedError:
-        click.echo("Platform doesn't implement optoe write max change. Skipping value restore!")
+        firmware_echo("Platform doesn't implement optoe write max change. Skipping value restore!")
 
     status = api.cdb_firmware_download_complete()
     update_firmware_info_to_state_db(port_name)
-    click.echo('CDB: firmware download complete')
+    firmware_echo('CDB: firmware download complete')
     return status
 
 # 'run' subcommand
@@ -1627,16 +1896,16 @@ def run(port_name, mode, delay):
     """Run the firmware with default mode=0"""
 
     if is_port_type_rj45(port_name):
-        click.echo("This functionality is not applicable for RJ45 port {}.".format(port_name))
+        firmware_echo("This functionality is not applicable for RJ45 port {}.".format(port_name))
         sys.exit(EXIT_FAIL)
 
     if not is_sfp_present(port_name):
-        click.echo("{}: SFP EEPROM not detected\n".format(port_name))
+        firmware_echo("{}: SFP EEPROM not detected\n".format(port_name))
         sys.exit(EXIT_FAIL)
 
     status = run_firmware(port_name, int(mode))
     if status != 1:
-        click.echo('Failed to run firmware in mode={}! CDB status: {}'.format(mode, status))
+        firmware_echo('Failed to run firmware in mode={}! CDB status: {}'.format(mode, status))
         sys.exit(EXIT_FAIL)
 
     # The cable firmware can be still under initialization immediately after run_firmware
@@ -1645,7 +1914,7 @@ def run(port_name, mode, delay):
         time.sleep(delay)
 
     update_firmware_info_to_state_db(port_name)
-    click.echo("Firmware run in mode={} success".format(mode))
+    firmware_echo("Firmware run in mode={} success".format(mode))
 
 # 'commit' subcommand
 @firmware.command()
@@ -1654,72 +1923,96 @@ def commit(port_name):
     """Commit the running firmware"""
 
     if is_port_type_rj45(port_name):
-        click.echo("This functionality is not applicable for RJ45 port {}.".format(port_name))
+        firmware_echo("This functionality is not applicable for RJ45 port {}.".format(port_name))
         sys.exit(EXIT_FAIL)
 
     if not is_sfp_present(port_name):
-        click.echo("{}: SFP EEPROM not detected\n".format(port_name))
+        firmware_echo("{}: SFP EEPROM not detected\n".format(port_name))
         sys.exit(EXIT_FAIL)
 
     status = commit_firmware(port_name)
     if status != 1:
-        click.echo('Failed to commit firmware! CDB status: {}'.format(status))
+        firmware_echo('Failed to commit firmware! CDB status: {}'.format(status))
         sys.exit(EXIT_FAIL)
 
     update_firmware_info_to_state_db(port_name)
-    click.echo("Firmware commit successful")
-
-# 'upgrade' subcommand
-@firmware.command()
-@click.argument('port_name', required=True, default=None)
-@click.argument('filepath', required=True, default=None)
-def upgrade(port_name, filepath):
-    """Upgrade firmware on the transceiver"""
+    firmware_echo("Firmware commit successful")
 
+def upgrade_firmware(port_name, filepath, image=None, progress=None):
+    """Download, run and commit the firmware on the transceiver"""
     physical_port = logical_port_to_physical_port_index(port_name)
-
-    if is_port_type_rj45(port_name):
-        click.echo("This functionality is not applicable for RJ45 port {}.".format(port_name))
-        sys.exit(EXIT_FAIL)
-
-    if not is_sfp_present(port_name):
-        click.echo("{}: SFP EEPROM not detected\n".format(port_name))
-        sys.exit(EXIT_FAIL)
-
     show_firmware_version(physical_port)
 
-    status = download_firmware(port_name, filepath)
+    status = download_firmware(port_name, filepath, image, progress)
     if status == 1:
-        click.echo("Firmware download complete success")
+        firmware_echo("Firmware download complete success")
     else:
-        click.echo("Firmware download complete failed! CDB status = {}".format(status))
+        firmware_echo("Firmware download complete failed! CDB status = {}".format(status))
         sys.exit(EXIT_FAIL)
 
     default_mode = 0
     status = run_firmware(port_name, default_mode)
     if status != 1:
-        click.echo('Failed to run firmware in mode={} ! CDB status: {}'.format(default_mode, status))
+        firmware_echo('Failed to run firmware in mode={} ! CDB status: {}'.format(default_mode, status))
         sys.exit(EXIT_FAIL)
 
-    click.echo("Firmware run in mode {} successful".format(default_mode))
+    firmware_echo("Firmware run in mode {} successful".format(default_mode))
 
     if is_fw_switch_done(port_name) != 1:
-        click.echo('Failed to switch firmware images!')
+        firmware_echo('Failed to switch firmware images!')
         sys.exit(EXIT_FAIL)
 
     status = commit_firmware(port_name)
     if status != 1:
-        click.echo('Failed to commit firmware! CDB status: {}'.format(status))
+        firmware_echo('Failed to commit firmware! CDB status: {}'.format(status))
         sys.exit(EXIT_FAIL)
 
-    click.echo("Firmware commit successful")
+    firmware_echo("Firmware commit successful")
+    return status
+
+# 'upgrade' subcommand
+@firmware.command()
+@click.argument('port_name', required=True, default=None)
+@click.argument('filepath', required=True, default=None)
+@click.option('--max-workers', type=click.IntRange(1, 128), default=None,
+              help="Maximum number of ports upgraded concurrently, when several ports are given "
+                   "[default: one at a time, unless the platform declares its transceiver buses]")
+def upgrade(port_name, filepath, max_workers):
+    """Upgrade firmware on the transceiver
+
+    PORT_NAME is a port, or a list of ports and ranges of ports like Ethernet0,Ethernet8-16
+    """
+    ports = parse_firmware_ports(port_name)
+    if ports is not None:
+        run_firmware_on_ports(upgrade_firmware, check_firmware_ports(ports), filepath, max_workers)
+        return
+
+    if is_port_type_rj45(port_name):
+        click.echo("This functionality is not applicable for RJ45 port {}.".format(port_name))
+        sys.exit(EXIT_FAIL)
+
+    if not is_sfp_present(port_name):
+        click.echo("{}: SFP EEPROM not detected\n".format(port_name))
+        sys.exit(EXIT_FAIL)
+
+    upgrade_firmware(port_name, filepath)
 
 # 'download' subcommand
 @firmware.command()
 @click.argument('port_name', required=True, default=None)
 @click.argument('filepath', required=True, default=None)
-def download(port_name, filepath):
-    """Download firmware on the transceiver"""
+@click.option('--max-workers', type=click.IntRange(1, 128), default=None,
+              help="Maximum number of ports downloaded concurrently, when several ports are given "
+                   "[default: one at a time, unless the platform declares its transceiver buses]")
+def download(port_name, filepath, max_workers):
+    """Download firmware on the transceiver
+
+    PORT_NAME is a port, or a list of ports and ranges of ports like Ethernet0,Ethernet8-16
+    """
+    ports = parse_firmware_ports(port_name)
+    if ports is not None:
+        run_firmware_on_ports(download_firmware, check_firmware_ports(ports), filepath, max_workers)
+        return
 
     if is_port_type_rj45(port_name):
         click.echo("This functionality is not applicable for RJ45 port {}.".format(port_name))
@@ -1915,6 +2208,10 @@ def write_eeprom(port, page, offset, data, wire_addr, verify):
         else:
             overall_offset = get_overall_offset_sff8472(api, page, offset, len(bytes), wire_addr)
         success = sfp.write_eeprom(overall_offset, len(bytes), bytes)
+        # The pages cached by eeprom-hexdump are stale now
+        eeprom_cache = EepromCache.get_existing()
+        if eeprom_cache is not None:
+            eeprom_cache.remove(physical_port)
         if not success:
             click.echo("Error: Failed to write EEPROM!")
             sys.exit(ERROR_NOT_IMPLEMENTED)
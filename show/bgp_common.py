@@ -1,7 +1,10 @@
 import copy
 import ipaddress
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
+import utilities_common.cli as clicommon
 import utilities_common.multi_asic as multi_asic_util
 from sonic_py_common import device_info, multi_asic
 from utilities_common import constants
@@ -252,48 +255,105 @@ def merge_to_combined_route(combined_route, route, new_info_l):
     else:
         combined_route[route] = new_info_l
 
-def process_route_info(route_info, device, filter_back_end, print_ns_str, asic_cnt, ns_str, combined_route, back_end_intf_set):
-    new_route = {}
-    for route, info in route_info.items():
-        new_info_l = []
-        new_info_cnt = 0
-        while len(info):
-            new_info = info.pop()
-            new_nhop_l = []
-            del_cnt = 0
-            while len(new_info['nexthops']):
-                nh = new_info['nexthops'].pop()
-                if filter_back_end and back_end_intf_set != None and "interfaceName" in nh:
-                    if nh['interfaceName'] in back_end_intf_set or nh['interfaceName'].startswith('Ethernet-IB'):
-                        del_cnt += 1
-                    else:
-                        new_nhop_l.append(copy.deepcopy(nh))
-                else:
-                    new_nhop_l.append(copy.deepcopy(nh))
-            # use the new filtered nhop list if it is not empty. if empty nexthop , this route is filtered out completely
-            if len(new_nhop_l) > 0:
-                new_info['nexthops'] = copy.deepcopy(new_nhop_l)
-                new_info_cnt += 1
-                # in case there are any nexthop that were deleted, we will need to adjust the nexhopt counts as well
-                if del_cnt > 0:
-                    internalNextHopNum = new_info['internalNextHopNum'] - del_cnt
-                    new_info['internalNextHopNum'] = internalNextHopNum
-                    internalNextHopActiveNum = new_info['internalNextHopActiveNum'] - del_cnt
-                    new_info['internalNextHopActiveNum'] = internalNextHopActiveNum
-                new_info_l.append(copy.deepcopy(new_info))
-        if new_info_cnt:
-            if asic_cnt > 1:
-                if filter_back_end:
-                    merge_to_combined_route(combined_route, route, new_info_l)
+
+def filter_route_info(info, filter_back_end, back_end_intf_set):
+    """
+    Pop the entries of the route info, removing their back end nexthops if filter_back_end
+    :return list of the entries left with nexthops
+    """
+    new_info_l = []
+    while len(info):
+        new_info = info.pop()
+        new_nhop_l = []
+        del_cnt = 0
+        while len(new_info['nexthops']):
+            nh = new_info['nexthops'].pop()
+            if filter_back_end and back_end_intf_set is not None and "interfaceName" in nh:
+                if nh['interfaceName'] in back_end_intf_set or nh['interfaceName'].startswith('Ethernet-IB'):
+                    del_cnt += 1
                 else:
-                    new_route[route] = copy.deepcopy(new_info_l)
+                    new_nhop_l.append(nh)
             else:
-                new_route[route] = copy.deepcopy(new_info_l)
-    if new_route:
+                new_nhop_l.append(nh)
+        # use the new filtered nhop list if it is not empty. if empty nexthop , this route is filtered out completely
+        if len(new_nhop_l) > 0:
+            new_info['nexthops'] = new_nhop_l
+            # in case there are any nexthop that were deleted, we will need to adjust the nexhopt counts as well
+            if del_cnt > 0:
+                internalNextHopNum = new_info['internalNextHopNum'] - del_cnt
+                new_info['internalNextHopNum'] = internalNextHopNum
+                internalNextHopActiveNum = new_info['internalNextHopActiveNum'] - del_cnt
+                new_info['internalNextHopActiveNum'] = internalNextHopActiveNum
+            new_info_l.append(new_info)
+    return new_info_l
+
+
+def add_to_combined_route(new_route, filter_back_end, print_ns_str, asic_cnt, ns_str, combined_route):
+    if asic_cnt > 1 and filter_back_end:
+        for route, new_info_l in new_route.items():
+            merge_to_combined_route(combined_route, route, new_info_l)
+    elif new_route:
         if print_ns_str:
-            combined_route['{}'.format(ns_str)] = copy.deepcopy(new_route)
+            combined_route['{}'.format(ns_str)] = new_route
+        else:
+            combined_route.update(new_route)
+
+
+def get_route_info(cmd, ns, filter_routes, filter_back_end, back_end_intf_set, iface_alias_converter):
+    """
+    Run the show ip(v6) route json command cmd in the namespace ns and parse its
+    output route by route, as vtysh produces it
+    :param filter_routes: True to filter the route entries with filter_route_info
+    :return (routes, output, return code): routes is the dict of the route
+            entries by prefix, or None if the output is not a JSON object
+    """
+    import ijson
+    import utilities_common.bgp_util as bgp_util
+
+    routes = None
+    output = None
+    with bgp_util.open_bgp_show_command(cmd, ns) as proc:
+        if proc.stdout.peek(1).lstrip()[:1] != b'{':
+            # empty output or error from FRR, which start with character "%"
+            output = proc.stdout.read().decode()
         else:
-            combined_route.update(copy.deepcopy(new_route))
+            routes = {}
+            for route, info in ijson.kvitems(proc.stdout, '', use_float=True):
+                if iface_alias_converter is not None:
+                    bgp_util.route_nexthops_to_alias(info, iface_alias_converter)
+                if filter_routes:
+                    info = filter_route_info(info, filter_back_end, back_end_intf_set)
+                    if not info:
+                        continue
+                routes[route] = info
+    return routes, output, proc.returncode
+
+
+def print_json_sorted(data, depth, level=0):
+    """
+    Print data like json.dumps(data, sort_keys=True, indent=4), key by key down
+    to depth levels of dicts, without building the whole output string
+    """
+    if depth == 0 or not isinstance(data, dict) or not data:
+        print(json.dumps(data, sort_keys=True, indent=4).replace('\n', '\n' + ' ' * 4 * level), end='')
+        return
+    separator = '{'
+    for key in sorted(data):
+        print('{}\n{}{}: '.format(separator, ' ' * 4 * (level + 1), json.dumps(key)), end='')
+        print_json_sorted(data[key], depth - 1, level + 1)
+        separator = ','
+    print('\n{}}}'.format(' ' * 4 * level), end='')
+
+
+def print_route_error(output):
+    # remove the "json" keyword that was added by this handler to show original cmd user specified
+    json_str = output[-5:-1]
+    if json_str == "json":
+        error_msg = output[:-5]
+    else:
+        error_msg = output
+    print(error_msg)
+
 
 def print_show_ip_route_hdr():
     # This prints out the show ip route header based on FRR 7.2 version.
@@ -383,37 +443,61 @@ def show_routes(args, namespace, display, verbose, ipver):
     if not found_json and not found_other_parms:
         arg_strg += "json"
 
+    cmd = "show {} route {}".format(ipver, arg_strg)
+    # Multi-asic show ip route with additional parms are handled by going to FRR directly and get those outputs
+    # from each namespace
+    stream_routes = found_json or not found_other_parms
+    filter_routes = filter_back_end or print_ns_str
+    iface_alias_converter = None
+    executor = None
+    if stream_routes:
+        if clicommon.get_interface_naming_mode() == "alias":
+            iface_alias_converter = clicommon.InterfaceAliasConverter()
+        if len(ns_l) > 1:
+            # query all the namespaces at once, their routes are still combined in the order of ns_l
+            executor = ThreadPoolExecutor(max_workers=len(ns_l))
+            futures = [executor.submit(get_route_info, cmd, ns, filter_routes, filter_back_end,
+                                       back_end_intf_set, iface_alias_converter) for ns in ns_l]
+
     combined_route = {}
-    for ns in ns_l:
-        # Need to add "ns" to form bgpX so it is sent to the correct bgpX docker to handle the request
-        cmd = "show {} route {}".format(ipver, arg_strg)
-        output = bgp_util.run_bgp_show_command(cmd, ns)
-        # in case no output or something went wrong with user specified cmd argument(s) error it out
-        # error from FRR always start with character "%"
-        if output == "":
-            return
-        if output[0] == "%":
-            # remove the "json" keyword that was added by this handler to show original cmd user specified 
-            json_str = output[-5:-1]
-            if json_str == "json":
-                error_msg = output[:-5]
-            else:
-                error_msg = output
-            print(error_msg)
-            return
+    try:
+        for i, ns in enumerate(ns_l):
+            if not stream_routes:
+                # Need to add "ns" to form bgpX so it is sent to the correct bgpX docker to handle the request
+                output = bgp_util.run_bgp_show_command(cmd, ns)
+                # in case no output or something went wrong with user specified cmd argument(s) error it out
+                # error from FRR always start with character "%"
+                if output == "":
+                    return
+                if output[0] == "%":
+                    print_route_error(output)
+                    return
+                print("{}:".format(ns))
+                print(output)
+                continue
 
-        # Multi-asic show ip route with additional parms are handled by going to FRR directly and get those outputs from each namespace
-        if found_other_parms and not found_json:
-            print("{}:".format(ns))
-            print(output)
-            continue
+            if executor is not None:
+                routes, output, returncode = futures[i].result()
+            else:
+                routes, output, returncode = get_route_info(cmd, ns, filter_routes, filter_back_end,
+                                                            back_end_intf_set, iface_alias_converter)
+            if returncode != 0:
+                if output:
+                    print(output.rstrip('\n'))
+                sys.exit(returncode)
+            if routes is None:
+                if output.strip():
+                    print_route_error(output)
+                return
 
-        route_info = json.loads(output)
-        if filter_back_end or print_ns_str:
-            # clean up the dictionary to remove all the nexthops that are back-end interface
-            process_route_info(route_info, device, filter_back_end, print_ns_str, asic_cnt, ns, combined_route, back_end_intf_set)
-        else:
-            combined_route = route_info
+            if filter_routes:
+                # the nexthops that are back-end interface were removed by get_route_info
+                add_to_combined_route(routes, filter_back_end, print_ns_str, asic_cnt, ns, combined_route)
+            else:
+                combined_route = routes
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     if not found_json:
         if len(combined_route) == 0:
@@ -429,8 +513,9 @@ def show_routes(args, namespace, display, verbose, ipver):
         else:
             print_ip_routes(combined_route, filter_by_ip)
     else:
-        new_string = json.dumps(combined_route, sort_keys=True, indent=4)
-        print(new_string)
+        # print the routes one by one rather than building the whole output at once
+        print_json_sorted(combined_route, 2 if print_ns_str else 1)
+        print()
 
 '''
  show ip(v6) route helper methods end
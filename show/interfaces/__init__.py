@@ -6,6 +6,7 @@ import click
 from utilities_common import constants
 import utilities_common.cli as clicommon
 import utilities_common.multi_asic as multi_asic_util
+from utilities_common import redis_pipeline
 from natsort import natsorted
 from tabulate import tabulate
 from sonic_py_common import multi_asic
@@ -22,6 +23,9 @@ HWSKU_JSON = 'hwsku.json'
 
 REDIS_HOSTIP = "127.0.0.1"
 
+# Bins of the FEC histogram, of codewords by number of symbol errors
+FEC_HISTOGRAM_BINS = 16
+
 # Read given JSON file
 def readJsonFile(fileName):
 
@@ -869,7 +873,13 @@ def get_port_oid_mapping(db, namespace):
     return port_oid_map
 
 
-def fetch_fec_histogram(db, namespace, port_oid_map, target_port):
+def get_fec_histogram(counters):
+    ''' Returns the FEC histogram bins of a port from its counters in COUNTERS_DB. '''
+    return OrderedDict((f'BIN{i}', counters.get(f'SAI_PORT_STAT_IF_IN_FEC_CODEWORD_ERRORS_S{i}', '0'))
+                       for i in range(FEC_HISTOGRAM_BINS))
+
+
+def fetch_fec_histogram(db, namespace, port_oid_map, target_port, json_fmt=False):
     ''' Fetch and display FEC histogram for the given port. '''
 
     if target_port not in port_oid_map:
@@ -881,8 +891,15 @@ def fetch_fec_histogram(db, namespace, port_oid_map, target_port):
 
     if asic_db_kvp is not None:
 
-        fec_errors = {f'BIN{i}': asic_db_kvp.get
-                      (f'SAI_PORT_STAT_IF_IN_FEC_CODEWORD_ERRORS_S{i}', '0') for i in range(16)}
+        fec_errors = get_fec_histogram(asic_db_kvp)
+
+        if json_fmt:
+            # Same format as the histograms of all the ports
+            name = target_port
+            if clicommon.get_interface_naming_mode() == "alias":
+                name = clicommon.iface_alias_translator.name_to_alias(target_port)
+            click.echo(json.dumps({name: fec_errors}, indent=4))
+            return
 
         # Prepare the data for tabulation
         table_data = [(bin_label, error_value) for bin_label, error_value in fec_errors.items()]
@@ -897,14 +914,46 @@ def fetch_fec_histogram(db, namespace, port_oid_map, target_port):
         raise click.Abort()
 
 
+def fetch_all_fec_histograms(db, namespace, display, json_fmt):
+    ''' Fetch and display the FEC histograms of all the ports, with one pipelined pass over
+        COUNTERS_DB per namespace. '''
+
+    masic = multi_asic_util.MultiAsic(display_option=display, namespace_option=namespace)
+    histograms = {}
+    for ns in masic.get_ns_list_based_on_options():
+        masic.current_namespace = ns
+        port_oid_map = get_port_oid_mapping(db, ns) or {}
+        ports = [port for port in port_oid_map if not masic.skip_display(constants.PORT_OBJ, port)]
+        counters_keys = ['COUNTERS:{}'.format(port_oid_map[port]) for port in ports]
+        counters = redis_pipeline.hgetall_bulk(db.db_clients[ns], db.db.COUNTERS_DB, counters_keys)
+        for port, port_counters in zip(ports, counters):
+            histograms[port] = get_fec_histogram(port_counters)
+
+    ports = natsorted(histograms)
+    names = ports
+    if clicommon.get_interface_naming_mode() == "alias":
+        names = [row[0] for row in clicommon.iface_alias_translator.translate_rows([[port] for port in ports])]
+
+    if json_fmt:
+        click.echo(json.dumps(OrderedDict((name, histograms[port]) for name, port in zip(names, ports)), indent=4))
+    else:
+        table_data = [[name] + list(histograms[port].values()) for name, port in zip(names, ports)]
+        headers = ["IFACE"] + [f'BIN{i}' for i in range(FEC_HISTOGRAM_BINS)]
+        click.echo(tabulate(table_data, headers=headers))
+
 
 # 'fec-histogram' subcommand ("show interfaces counters fec-histogram")
 @counters.command('fec-histogram')
 @multi_asic_util.multi_asic_click_options
-@click.argument('interfacename', required=True)
+@click.argument('interfacename', required=False)
+@click.option('-j', '--json', 'json_fmt', is_flag=True, help="Print in JSON format")
 @clicommon.pass_db
-def fec_histogram(db, interfacename, namespace, display):
-    """Show interface counters fec-histogram"""
+def fec_histogram(db, interfacename, namespace, display, json_fmt):
+    """Show interface counters fec-histogram, of all the interfaces if none is given"""
+
+    if interfacename is None:
+        fetch_all_fec_histograms(db, namespace, display, json_fmt)
+        return
 
     if namespace is None:
         namespace = constants.DEFAULT_NAMESPACE
@@ -915,7 +964,7 @@ def fec_histogram(db, interfacename, namespace, display):
     interfacename = try_convert_interfacename_from_alias(click.get_current_context(), interfacename)
 
     # Fetch and display the FEC histogram
-    fetch_fec_histogram(db, namespace, port_oid_map, interfacename)
+    fetch_fec_histogram(db, namespace, port_oid_map, interfacename, json_fmt)
 
 
 # 'rates' subcommand ("show interfaces counters rates")
@@ -39,40 +39,9 @@ try:
 except KeyError:
     pass
 
-from . import acl
 from . import bgp_common
-from . import chassis_modules
-from . import dropcounters
-from . import fabric
-from . import feature
-from . import fgnhg
-from . import flow_counters
-from . import hft
-from . import gearbox
-from . import interfaces
-from . import kdump
-from . import kube
-from . import muxcable
-from . import nat
 from . import platform
-from . import p4_table
-from . import processes
-from . import reboot_cause
-from . import sflow
-from . import vlan
-from . import vnet
-from . import vxlan
-from . import system_health
-from . import warm_restart
 from . import plugins
-from . import syslog
-from . import dns
-from . import bgp_cli
-from . import stp
-from . import srv6
-from . import switch
-from . import icmp
-from . import copp
 
 # Global Variables
 PLATFORM_JSON = 'platform.json'
@@ -130,6 +99,17 @@ def run_command(command, display_cmd=False, return_cmd=False, shell=False):
         clicommon.run_command_in_alias_mode(command, shell=shell)
         raise sys.exit(0)
 
+    result = None if shell else clicommon.call_stat_command(command)
+    if result is not None:
+        output, rc = result
+        if return_cmd:
+            return output
+        if output:
+            click.echo(output if output.endswith('\n') else output + '\n', nl=False)
+        if rc != 0:
+            sys.exit(rc)
+        return
+
     proc = subprocess.Popen(command, shell=shell, text=True, stdout=subprocess.PIPE)
 
     while True:
@@ -286,13 +266,53 @@ def is_gearbox_configured():
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help', '-?'])
 
+# Manifest of the commands defined in the other modules, {name: "module:command"}.
+# The module of a command is imported when the command is invoked only.
+SUBCOMMANDS = {
+    'acl': 'show.acl:acl',
+    'bgp': 'show.bgp_cli:BGP',
+    'chassis': 'show.chassis_modules:chassis',
+    'copp': 'show.copp:copp',
+    'dns': 'show.dns:dns',
+    'dropcounters': 'show.dropcounters:dropcounters',
+    'fabric': 'show.fabric:fabric',
+    'feature': 'show.feature:feature',
+    'fgnhg': 'show.fgnhg:fgnhg',
+    'flowcnt-route': 'show.flow_counters:flowcnt_route',
+    'flowcnt-trap': 'show.flow_counters:flowcnt_trap',
+    'icmp': 'show.icmp:icmp',
+    'interfaces': 'show.interfaces:interfaces',
+    'kdump': 'show.kdump:kdump',
+    'kubernetes': 'show.kube:kubernetes',
+    'muxcable': 'show.muxcable:muxcable',
+    'nat': 'show.nat:nat',
+    'p4-table': 'show.p4_table:p4_table',
+    'platform': 'show.platform:platform',
+    'processes': 'show.processes:processes',
+    'reboot-cause': 'show.reboot_cause:reboot_cause',
+    'sflow': 'show.sflow:sflow',
+    'spanning-tree': 'show.stp:spanning_tree',
+    'srv6': 'show.srv6:srv6',
+    'switch': 'show.switch:switch',
+    'syslog': 'show.syslog:syslog',
+    'system-health': 'show.system_health:system_health',
+    'vlan': 'show.vlan:vlan',
+    'vnet': 'show.vnet:vnet',
+    'vxlan': 'show.vxlan:vxlan',
+    'warm_restart': 'show.warm_restart:warm_restart',
+}
+
+# The modules of the subcommands are still reachable as attributes, e.g. show.main.vlan
+__getattr__ = clicommon.lazy_module_getattr(__name__, list(SUBCOMMANDS.values()) +
+                                            ['show.hft:hft', 'show.gearbox:gearbox'])
+
 #
 # 'cli' group (root group)
 #
 
 # This is our entrypoint - the main "show" command
 # TODO: Consider changing function name to 'show' for better understandability
-@click.group(cls=clicommon.AliasedGroup, context_settings=CONTEXT_SETTINGS)
+@click.group(cls=clicommon.LazyAliasedGroup, context_settings=CONTEXT_SETTINGS, lazy_commands=SUBCOMMANDS)
 @click.pass_context
 def cli(ctx):
     """SONiC command line - 'show' command"""
@@ -301,49 +321,13 @@ def cli(ctx):
     load_db_config()
     ctx.obj = Db()
 
-# Add groups from other modules
-cli.add_command(acl.acl)
-cli.add_command(chassis_modules.chassis)
-cli.add_command(dropcounters.dropcounters)
-cli.add_command(fabric.fabric)
-cli.add_command(feature.feature)
-cli.add_command(fgnhg.fgnhg)
-cli.add_command(flow_counters.flowcnt_route)
-cli.add_command(flow_counters.flowcnt_trap)
+# Add groups from other modules, imported when invoked only
 if hft_common.is_supported_platform():
-    cli.add_command(hft.hft)
-cli.add_command(kdump.kdump)
-cli.add_command(interfaces.interfaces)
-cli.add_command(kdump.kdump)
-cli.add_command(kube.kubernetes)
-cli.add_command(muxcable.muxcable)
-cli.add_command(nat.nat)
-cli.add_command(platform.platform)
-cli.add_command(p4_table.p4_table)
-cli.add_command(processes.processes)
-cli.add_command(reboot_cause.reboot_cause)
-cli.add_command(sflow.sflow)
-cli.add_command(vlan.vlan)
-cli.add_command(vnet.vnet)
-cli.add_command(vxlan.vxlan)
-cli.add_command(system_health.system_health)
-cli.add_command(warm_restart.warm_restart)
-cli.add_command(dns.dns)
-cli.add_command(stp.spanning_tree)
-cli.add_command(srv6.srv6)
-cli.add_command(switch.switch)
-cli.add_command(icmp.icmp)
-cli.add_command(copp.copp)
-
-# syslog module
-cli.add_command(syslog.syslog)
+    cli.add_lazy_command('hft', 'show.hft:hft')
 
 # Add greabox commands only if GEARBOX is configured
 if is_gearbox_configured():
-    cli.add_command(gearbox.gearbox)
-
-# bgp module
-cli.add_command(bgp_cli.BGP)
+    cli.add_lazy_command('gearbox', 'show.gearbox:gearbox')
 
 #
 # 'vrf' command ("show vrf")
@@ -2943,9 +2927,9 @@ def show_fast_linkup_global(db, json_output):
     click.echo(tabulate(rows, headers=['Field', 'Value'], tablefmt='grid'))
 
 
-# Load plugins and register them
+# Load plugins and register them when a command may need them
 helper = util_base.UtilHelper()
-helper.load_and_register_plugins(plugins, cli)
+cli.add_lazy_plugins(lambda: helper.load_and_register_plugins(plugins, cli))
 
 if __name__ == '__main__':
     cli()
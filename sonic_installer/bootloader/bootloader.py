@@ -11,6 +11,7 @@ from ..common import (
    IMAGE_PREFIX,
    ROOTFS_NAME,
 )
+from ..image_stream import download_image
 
 class Bootloader(object):
 
@@ -37,6 +38,10 @@ class Bootloader(object):
         """set next image to boot from"""
         raise NotImplementedError
 
+    def download_image(self, url, image_path, reporthook=None):
+        """download new image, resuming an interrupted download"""
+        download_image(url, image_path, reporthook)
+
     def install_image(self, image_path):
         """install new image"""
         raise NotImplementedError
@@ -16,9 +16,9 @@ from ..common import (
    run_command,
    default_sigpipe,
 )
+from ..image_stream import PLATFORMS_ASIC
 from .onie import OnieInstallerBootloader
 
-PLATFORMS_ASIC = "installer/platforms_asic"
 BOOT_PARAMETER_PREFIX_LINUX = "linux "
 BOOT_PARAMETER_PREFIX_LINUXEFI = "linuxefi "
 LEN_BOOT_PARAMETER_PREFIX_LINUX = len(BOOT_PARAMETER_PREFIX_LINUX)
@@ -160,6 +160,11 @@ class GrubBootloader(OnieInstallerBootloader):
         # Get running platform
         platform = device_info.get_platform()
 
+        # Use the platforms list found when the image was downloaded or its version read
+        image_info = self.get_image_info(image_path)
+        if image_info is not None and image_info.payload_parsed:
+            return image_info.platforms is None or platform in image_info.platforms
+
         # Check if platform is inside image's target platforms
         return self.platform_in_platforms_asic(platform, image_path)
 
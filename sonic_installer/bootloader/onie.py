@@ -6,17 +6,53 @@ import os
 import re
 import subprocess
 
+import click
+
 from ..common import (
    IMAGE_DIR_PREFIX,
    IMAGE_PREFIX,
    default_sigpipe,
 )
+from ..image_stream import ImageInspector, download_image, inspect_image
 from .bootloader import Bootloader
 
 class OnieInstallerBootloader(Bootloader): # pylint: disable=abstract-method
 
     DEFAULT_IMAGE_PATH = '/tmp/sonic_image'
 
+    def __init__(self):
+        super().__init__()
+        # ImageInfo of the last image inspected, and the path, size and mtime it is for
+        self.image_info = None
+        self.image_info_key = None
+
+    def get_image_info_key(self, image_path):
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        return (image_path, stat.st_size, stat.st_mtime_ns)
+
+    def get_image_info(self, image_path):
+        """
+        returns the ImageInfo of the image, which is read once for all the checks,
+        None if the image doesn't exist
+        """
+        key = self.get_image_info_key(image_path)
+        if key is None:
+            return None
+        if key != self.image_info_key:
+            self.image_info = inspect_image(image_path)
+            self.image_info_key = key
+        return self.image_info
+
+    def download_image(self, url, image_path, reporthook=None):
+        """download new image, inspecting it in the same pass"""
+        self.image_info = download_image(url, image_path, reporthook, ImageInspector())
+        self.image_info_key = self.get_image_info_key(image_path)
+        click.echo('')
+        click.echo('Image SHA256 digest: {}'.format(self.image_info.sha256))
+
     def get_current_image(self):
         cmdline = open('/proc/cmdline', 'r')
         current = re.search(r"loop=(\S+)/fs.squashfs", cmdline.read()).group(1)
@@ -28,6 +64,10 @@ class OnieInstallerBootloader(Bootloader): # pylint: disable=abstract-method
 
     def get_binary_image_version(self, image_path):
         """returns the version of the image"""
+        image_info = self.get_image_info(image_path)
+        if image_info is not None and image_info.version:
+            return IMAGE_PREFIX + image_info.version
+
         p1 = subprocess.Popen(["cat", "-v", image_path], stdout=subprocess.PIPE, preexec_fn=default_sigpipe)
         p2 = subprocess.Popen(["grep", "-m 1", "^image_version"], stdin=p1.stdout, stdout=subprocess.PIPE, preexec_fn=default_sigpipe)
         p3 = subprocess.Popen(["sed", "-n", r"s/^image_version=\"\(.*\)\"$/\1/p"], stdin=p2.stdout, stdout=subprocess.PIPE, preexec_fn=default_sigpipe, text=True)
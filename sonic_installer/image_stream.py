@@ -0,0 +1,319 @@
+"""
+Single pass download and inspection of SONiC installer images
+
+An ONIE installer image is a shell script header, holding the image version,
+followed by a line "exit_marker" and a tar archive, holding the list of the
+platforms supported by the image. The inspector gets the version, the platforms
+and the SHA256 digest of the image from the data as it is downloaded or read, so
+the image doesn't have to be read again for each of them.
+
+Downloads are resumed with a ranged request when they are interrupted, in the
+same run or a previous one, if the server supports it and the image didn't
+change on the server.
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import re
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+PLATFORMS_ASIC = "installer/platforms_asic"
+
+CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_STATE_SUFFIX = '.download'
+
+EXIT_MARKER = b'exit_marker'
+# The header is much smaller, give up on binary files without header
+MAX_HEADER_SIZE = 1024 * 1024
+IMAGE_VERSION_RE = re.compile(rb'^image_version="(.*)"$')
+
+TAR_BLOCK_SIZE = 512
+
+
+class ImageInfo(object):
+    """What the inspector found in an image"""
+    def __init__(self):
+        # Value of image_version in the header, None if not found
+        self.version = None
+        # Lines of the platforms list, None if the image has no platforms list
+        self.platforms = None
+        # False if the archive couldn't be read to find the platforms list
+        self.payload_parsed = False
+        # Digest of the whole image, None if it was not read to the end
+        self.sha256 = None
+
+
+class ImageInspector(object):
+    """
+    Inspects an ONIE installer image fed by chunks
+    """
+    def __init__(self, platforms_member=PLATFORMS_ASIC):
+        self.platforms_member = platforms_member
+        self.reset()
+
+    def reset(self):
+        """Start again from the beginning of the image"""
+        self.info = ImageInfo()
+        self.digest = hashlib.sha256()
+        self.state = self.feed_header
+        self.line = bytearray()
+        self.header_size = 0
+        self.version_found = False
+        self.block = bytearray()
+        self.skip = 0
+        self.capture = None
+        self.capture_size = 0
+        self.capture_padding = 0
+        self.capture_done = None
+        self.long_name = None
+
+    def feed(self, data):
+        self.digest.update(data)
+        data = memoryview(data)
+        while data and self.state is not None:
+            data = self.state(data)
+
+    @property
+    def done(self):
+        """True when the version and platforms list are found, or can't be"""
+        return self.state is None
+
+    def close(self):
+        """
+        :return ImageInfo of the image fed
+        """
+        self.info.sha256 = self.digest.hexdigest()
+        return self.info
+
+    def feed_header(self, data):
+        data = bytes(data)
+        start = 0
+        while True:
+            end = data.find(b'\n', start)
+            if end < 0:
+                self.line += data[start:]
+                self.header_size += len(data) - start
+                if self.header_size > MAX_HEADER_SIZE:
+                    self.state = None
+                return memoryview(b'')
+
+            self.line += data[start:end]
+            self.header_size += end + 1 - start
+            start = end + 1
+            line = bytes(self.line)
+            self.line = bytearray()
+            if line == EXIT_MARKER:
+                self.state = self.feed_tar_header
+                return memoryview(data)[start:]
+            if not self.version_found and line.startswith(b'image_version'):
+                # The first image_version line only, like grep -m 1
+                self.version_found = True
+                match = IMAGE_VERSION_RE.match(line)
+                if match:
+                    self.info.version = match.group(1).decode('utf-8', 'replace')
+            if self.header_size > MAX_HEADER_SIZE:
+                self.state = None
+                return memoryview(b'')
+
+    def feed_tar_header(self, data):
+        if self.skip:
+            count = min(self.skip, len(data))
+            self.skip -= count
+            return data[count:]
+
+        count = min(TAR_BLOCK_SIZE - len(self.block), len(data))
+        self.block += data[:count]
+        if len(self.block) == TAR_BLOCK_SIZE:
+            block = bytes(self.block)
+            self.block = bytearray()
+            self.parse_tar_header(block)
+        return data[count:]
+
+    def parse_tar_header(self, block):
+        if block == bytes(TAR_BLOCK_SIZE):
+            # End of the archive
+            self.info.payload_parsed = True
+            self.state = None
+            return
+
+        checksum = sum(block[:148]) + sum(block[156:]) + 8 * ord(' ')
+        try:
+            if checksum != int(block[148:156].strip(b' \0') or b'0', 8):
+                raise ValueError
+            if block[124] & 0x80:
+                size = int.from_bytes(block[125:136], 'big')
+            else:
+                size = int(block[124:136].strip(b' \0') or b'0', 8)
+        except ValueError:
+            # Not a tar archive
+            self.state = None
+            return
+
+        name = block[:100].split(b'\0', 1)[0]
+        if block[257:262] == b'ustar':
+            prefix = block[345:500].split(b'\0', 1)[0]
+            if prefix:
+                name = prefix + b'/' + name
+        if self.long_name is not None:
+            name = self.long_name
+            self.long_name = None
+        name = name.decode('utf-8', 'replace')
+
+        member_type = block[156:157]
+        padding = -size % TAR_BLOCK_SIZE
+        if member_type == b'L':
+            self.start_capture(size, padding, self.set_long_name)
+        elif name == self.platforms_member and member_type in (b'0', b'\0'):
+            self.start_capture(size, padding, self.set_platforms)
+        else:
+            self.skip = size + padding
+
+    def start_capture(self, size, padding, done):
+        self.capture = bytearray()
+        self.capture_size = size
+        self.capture_padding = padding
+        self.capture_done = done
+        self.state = self.feed_capture
+
+    def feed_capture(self, data):
+        count = min(self.capture_size - len(self.capture), len(data))
+        self.capture += data[:count]
+        if len(self.capture) == self.capture_size:
+            self.skip = self.capture_padding
+            self.state = self.feed_tar_header
+            self.capture_done(bytes(self.capture))
+        return data[count:]
+
+    def set_long_name(self, data):
+        self.long_name = data.split(b'\0', 1)[0]
+
+    def set_platforms(self, data):
+        self.info.platforms = data.decode('utf-8', 'replace').splitlines()
+        self.info.payload_parsed = True
+        self.state = None
+
+
+def inspect_image(image_path, inspector=None):
+    """
+    Read a local image up to its platforms list
+    :return ImageInfo of the image, without digest unless the image was read to the end
+    """
+    if inspector is None:
+        inspector = ImageInspector()
+    complete = True
+    with open(image_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            inspector.feed(chunk)
+            if inspector.done:
+                complete = f.read(1) == b''
+                break
+    info = inspector.close()
+    if not complete:
+        info.sha256 = None
+    return info
+
+
+def load_download_state(image_path):
+    try:
+        with open(image_path + DOWNLOAD_STATE_SUFFIX) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_download_state(image_path, state):
+    with open(image_path + DOWNLOAD_STATE_SUFFIX, 'w') as f:
+        json.dump(state, f)
+
+
+def remove_download_state(image_path):
+    try:
+        os.remove(image_path + DOWNLOAD_STATE_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+def download_image(url, image_path, reporthook=None, inspector=None, retries=DOWNLOAD_RETRIES):
+    """
+    Download the image at url to image_path, feeding the inspector with the data
+    in the same pass
+
+    :param reporthook: called like the reporthook of urlretrieve, with a block size of 1
+    :param retries: number of times an interrupted download is resumed
+    :return ImageInfo of the image if an inspector is given
+    """
+    state = load_download_state(image_path)
+    offset = 0
+    if state.get('url') == url and state.get('validator') and os.path.isfile(image_path):
+        offset = os.path.getsize(image_path)
+    # Bytes of the image given to the inspector
+    inspected = 0
+
+    while True:
+        request = Request(url)
+        if offset:
+            # The server sends the whole image if it changed
+            request.add_header('Range', 'bytes={}-'.format(offset))
+            request.add_header('If-Range', state['validator'])
+
+        try:
+            with urlopen(request) as response:
+                resumed = offset > 0 and response.getcode() == 206
+                if not resumed:
+                    offset = 0
+                    validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+                    state = {'url': url, 'validator': validator}
+                    save_download_state(image_path, state)
+                length = response.headers.get('Content-Length')
+                total_size = offset + int(length) if length is not None else -1
+
+                if inspector is not None:
+                    if inspected > offset:
+                        inspector.reset()
+                        inspected = 0
+                    if inspected < offset:
+                        # The start of the image was downloaded by a previous run
+                        with open(image_path, 'rb') as f:
+                            f.seek(inspected)
+                            while inspected < offset:
+                                chunk = f.read(min(CHUNK_SIZE, offset - inspected))
+                                inspector.feed(chunk)
+                                inspected += len(chunk)
+
+                with open(image_path, 'ab' if resumed else 'wb') as f:
+                    if reporthook:
+                        reporthook(0, 1, total_size)
+                    for chunk in iter(lambda: response.read(CHUNK_SIZE), b''):
+                        f.write(chunk)
+                        offset += len(chunk)
+                        if inspector is not None:
+                            inspector.feed(chunk)
+                            inspected = offset
+                        if reporthook:
+                            reporthook(offset, 1, total_size)
+
+                if total_size >= 0 and offset != total_size:
+                    raise http.client.IncompleteRead(b'', total_size - offset)
+            break
+        except HTTPError as e:
+            # The partial image left by a previous run is not part of the image
+            if e.code != 416 or not offset or retries <= 0:
+                raise
+            retries -= 1
+            offset = 0
+        except (OSError, http.client.HTTPException):
+            if retries <= 0:
+                raise
+            retries -= 1
+            if not state.get('validator'):
+                # The server doesn't tell if the image changed, download it again
+                offset = 0
+
+    remove_download_state(image_path)
+    if inspector is not None:
+        return inspector.close()
+    return None
@@ -6,7 +6,7 @@ import subprocess
 import sys
 import time
 import utilities_common.cli as clicommon
-from urllib.request import urlopen, urlretrieve
+from urllib.request import urlopen
 
 import click
 from sonic_py_common import logger
@@ -21,6 +21,7 @@ from .common import (
     DOCKERDIR_NAME,
 )
 from .exception import SonicRuntimeException
+from .image_stream import download_image
 
 SYSLOG_IDENTIFIER = "sonic-installer"
 LOG_ERR = logger.Logger.LOG_PRIORITY_ERROR
@@ -556,7 +557,7 @@ def install(url, force, skip_platform_check=False, skip_migration=False, skip_pa
         echo_and_log('Downloading image...')
         validate_url_or_abort(url)
         try:
-            urlretrieve(url, bootloader.DEFAULT_IMAGE_PATH, reporthook)
+            bootloader.download_image(url, bootloader.DEFAULT_IMAGE_PATH, reporthook)
             click.echo('')
         except Exception as e:
             echo_and_log("Download error", e)
@@ -819,7 +820,7 @@ def upgrade_docker(container_name, url, cleanup_image, skip_check, tag, warm):
         echo_and_log('Downloading image...')
         validate_url_or_abort(url)
         try:
-            urlretrieve(url, DEFAULT_IMAGE_PATH, reporthook)
+            download_image(url, DEFAULT_IMAGE_PATH, reporthook)
         except Exception as e:
             echo_and_log("Download error: {}".format(e), LOG_ERR)
             raise click.Abort()
@@ -324,6 +324,37 @@ class TestAclLoader(object):
         acl_loader.incremental_update()
         assert acl_loader.rules_info[(('NTP_ACL', 'RULE_1'))]["PACKET_ACTION"] == "DROP"
 
+    def test_update_writes_changed_rules_only(self):
+        acl_loader = AclLoader()
+        acl_loader.tables_db_info['NTP_ACL'] = {
+            "stage": "INGRESS",
+            "type": "CTRLPLANE"
+        }
+        acl_loader.set_table_name('NTP_ACL')
+        acl_loader.load_rules_from_file(os.path.join(test_path, 'acl_input/incremental_1.json'))
+        new_rules = len(acl_loader.rules_info)
+        assert acl_loader.full_update() == new_rules
+        acl_loader.read_rules_info()
+        assert acl_loader.rules_db_info[('NTP_ACL', 'RULE_1')]["PACKET_ACTION"] == "ACCEPT"
+        assert ('DATAACL', 'RULE_1') in acl_loader.rules_db_info
+        # Nothing is written when the rules didn't change
+        assert acl_loader.full_update() == 0
+
+        acl_loader.current_table = None
+        acl_loader.rules_info = {}
+        acl_loader.load_rules_from_file(os.path.join(test_path, 'acl_input/incremental_2.json'))
+        current_rules = set(acl_loader.rules_db_info)
+        removed_rules = current_rules - set(acl_loader.rules_info) - acl_loader.appl_db_rules
+        # RULE_1 changed and the rules of the other tables are removed, but not the APPL_DB ones
+        assert acl_loader.incremental_update() == 1 + len(removed_rules)
+        acl_loader.read_rules_info()
+        assert set(acl_loader.rules_db_info) == set(acl_loader.rules_info) | acl_loader.appl_db_rules
+        assert acl_loader.rules_db_info[('NTP_ACL', 'RULE_1')]["PACKET_ACTION"] == "DROP"
+
+        assert acl_loader.delete('NTP_ACL', 'RULE_1') == 1
+        acl_loader.read_rules_info()
+        assert ('NTP_ACL', 'RULE_1') not in acl_loader.rules_db_info
+
 
 
 class TestMasicAclLoader(object):
@@ -0,0 +1,81 @@
+import sys
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+import utilities_common.cli as clicommon
+
+PORTS = {
+    'Ethernet0': {'alias': 'etp1'},
+    'Ethernet4': {'alias': 'etp2'},
+    'Ethernet40': {'alias': 'etp11'},
+    'Ethernet100': {'alias': 'fortyGigE0/100'},
+}
+
+
+@pytest.fixture
+def translator():
+    converter = SimpleNamespace(port_dict=PORTS, alias_max_length=len('fortyGigE0/100'))
+    translator = clicommon.AliasTranslator(converter)
+    with mock.patch.object(clicommon, 'iface_alias_translator', translator):
+        yield translator
+
+
+def test_translate(translator):
+    text = ("Ethernet0 is up\n"
+            "members: Ethernet4, Ethernet40 Ethernet0\n"
+            "Ethernet4:1 Ethernet400 Ethernet0,Ethernet4 xEthernet0\n"
+            "Ethernet100")
+    assert translator.translate(text) == ("etp1 is up\n"
+                                          "members: etp2, etp11 etp1\n"
+                                          "Ethernet4:1 Ethernet400 Ethernet0,Ethernet4 xEthernet0\n"
+                                          "fortyGigE0/100")
+
+
+def test_translate_column(translator):
+    assert translator.translate_column("-----  ------", 0) == "--------------  ------"
+    assert translator.translate_column("Ethernet4:  up", 0) == "          etp2:  up"
+    assert translator.translate_column("Ethernet8  up", 0) == "Ethernet8  up"
+    assert translator.translate_column("1  Vlan1000  Ethernet40  Dynamic", 2) == \
+        "1  Vlan1000           etp11  Dynamic"
+    assert translator.translate_column("", 0) == ""
+
+
+def test_name_to_alias(translator):
+    assert translator.name_to_alias('Ethernet100') == 'fortyGigE0/100'
+    assert translator.name_to_alias('Ethernet0.10') == 'etp1.10'
+    assert translator.name_to_alias('Ethernet8') == 'Ethernet8'
+    assert translator.name_to_alias('Ethernet8.10') == 'Ethernet8.10'
+    assert translator.name_to_alias(None) is None
+    assert translator.translate_rows([('Ethernet0', 'up'), ('Ethernet8', 'down')]) == \
+        [['etp1', 'up'], ['Ethernet8', 'down']]
+
+
+def test_run_command_in_alias_mode(translator, capsys):
+    script = "import sys; sys.stdout.write('Ethernet0 is up\\nEthernet4, Ethernet100 are down')"
+    clicommon.run_command_in_alias_mode([sys.executable, '-c', script])
+    assert capsys.readouterr().out == "etp1 is up\netp2, fortyGigE0/100 are down\n"
+
+    with mock.patch.object(clicommon, 'ALIAS_MODE_READ_SIZE', 3):
+        clicommon.run_command_in_alias_mode([sys.executable, '-c', script])
+    assert capsys.readouterr().out == "etp1 is up\netp2, fortyGigE0/100 are down\n"
+
+    with pytest.raises(SystemExit) as e:
+        clicommon.run_command_in_alias_mode([sys.executable, '-c', 'import sys; sys.exit(3)'])
+    assert e.value.code == 3
+
+
+def test_alias_mode_line_translator(translator):
+    translate_line = clicommon.get_alias_mode_line_translator('portstat -j')
+    assert translate_line("  IFACE  STATE\n") == "         IFACE  STATE\n"
+    assert translate_line("-------  -----\n") == "--------------  -----"
+    assert translate_line("Ethernet40      U\n") == "         etp11      U\n"
+
+    translate_line = clicommon.get_alias_mode_line_translator('fdbshow')
+    assert translate_line("No.    Vlan  MacAddress         Port       Type\n") == \
+        "  No.    Vlan  MacAddress         Port             Type\n"
+    assert translate_line("1    1000  7C:FE:90:80:9F:05  Ethernet0  Dynamic\n") == \
+        "    1    1000  7C:FE:90:80:9F:05            etp1  Dynamic\n"
+
+    assert clicommon.get_alias_mode_line_translator('show interfaces status') is None
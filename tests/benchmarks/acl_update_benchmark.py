@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Update of a large ACL in CONFIG_DB by acl-loader:
+  legacy: a DEL of every current rule, then an HMSET of every new rule
+  diff:   the added, removed and changed rules only, pipelined in one transaction
+
+A mockredis instance stands in for CONFIG_DB, with a simulated round trip time
+added to every command and every pipeline execution. The ACL is updated to the
+same rules, to rules of which some changed, and to new rules.
+
+Not collected by pytest; run it directly on a SONiC build environment:
+    python3 tests/benchmarks/acl_update_benchmark.py [-n RULES] [-c CHANGED] [-r RTT_USECS] [-o ACL_FILE]
+
+With -o, the ACL is also written in openconfig format, to be loaded on a device
+with "acl-loader update full ACL_FILE" or "acl-loader update incremental ACL_FILE".
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import mockredis
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from swsscommon.swsscommon import ConfigDBConnector  # noqa: E402
+from utilities_common.redis_pipeline import update_table_bulk  # noqa: E402
+
+ACL_RULE = "ACL_RULE"
+TABLE_NAME = "DATAACL"
+MAX_PRIORITY = 30000
+
+
+class RemoteRedis(mockredis.MockRedis):
+    """mockredis paying a round trip per command"""
+    rtt = 0
+    round_trips = 0
+
+    def _wait(self):
+        RemoteRedis.round_trips += 1
+        deadline = time.perf_counter() + self.rtt
+        while time.perf_counter() < deadline:
+            pass
+
+    def delete(self, *args):
+        self._wait()
+        return super(RemoteRedis, self).delete(*args)
+
+    def hmset(self, *args):
+        self._wait()
+        return super(RemoteRedis, self).hmset(*args)
+
+    def hset(self, *args):
+        self._wait()
+        return super(RemoteRedis, self).hset(*args)
+
+    def hdel(self, *args):
+        self._wait()
+        return super(RemoteRedis, self).hdel(*args)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super(RemoteRedis, self).pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def timed_execute():
+            self._wait()
+            # the queued commands are served within the one round trip
+            rtt, round_trips = RemoteRedis.rtt, RemoteRedis.round_trips
+            RemoteRedis.rtt = 0
+            try:
+                return execute()
+            finally:
+                RemoteRedis.rtt, RemoteRedis.round_trips = rtt, round_trips
+        pipe.execute = timed_execute
+        return pipe
+
+
+class Connector(object):
+    """ConfigDBConnector of the mockredis CONFIG_DB"""
+    CONFIG_DB = "CONFIG_DB"
+    namespace = ""
+
+    def __init__(self, client):
+        self.client = client
+        self.configdb = ConfigDBConnector()
+
+    def get_redis_client(self, db_name):
+        return self.client
+
+    def get_db_separator(self, db_name):
+        return "|"
+
+    def serialize_key(self, key):
+        return self.configdb.serialize_key(key)
+
+    def typed_to_raw(self, typed_data):
+        return self.configdb.typed_to_raw(typed_data)
+
+
+def make_rules(count, changed=0, generation=0):
+    """
+    Rules in Config DB schema, like acl-loader converts them. The PACKET_ACTION
+    of the first changed rules depends on the generation.
+    """
+    rules = {}
+    for i in range(count):
+        action = "FORWARD" if i >= changed or generation % 2 == 0 else "DROP"
+        rules[(TABLE_NAME, "RULE_{}".format(i + 1))] = {
+            "PRIORITY": str(MAX_PRIORITY - i - 1),
+            "PACKET_ACTION": action,
+            "SRC_IP": "10.{}.{}.0/24".format(i >> 8, i & 0xff),
+            "IP_PROTOCOL": "6",
+            "L4_DST_PORT": str(1024 + i % 60000),
+        }
+    rules[(TABLE_NAME, "DEFAULT_RULE")] = {"PRIORITY": "1", "PACKET_ACTION": "DROP", "ETHER_TYPE": "2048"}
+    return rules
+
+
+def write_openconfig(path, rules):
+    entries = {}
+    for (_, rule_name), rule in rules.items():
+        if rule_name == "DEFAULT_RULE":
+            continue
+        seq = MAX_PRIORITY - int(rule["PRIORITY"])
+        entries[str(seq)] = {
+            "config": {"sequence-id": seq},
+            "actions": {"config": {"forwarding-action": "ACCEPT" if rule["PACKET_ACTION"] == "FORWARD" else "DROP"}},
+            "ip": {"config": {"protocol": int(rule["IP_PROTOCOL"]), "source-ip-address": rule["SRC_IP"]}},
+            "transport": {"config": {"destination-port": int(rule["L4_DST_PORT"])}},
+        }
+    acl = {"acl": {"acl-sets": {"acl-set": {TABLE_NAME.lower(): {
+        "config": {"name": TABLE_NAME.lower()},
+        "acl-entries": {"acl-entry": entries},
+    }}}}}
+    with open(path, "w") as f:
+        json.dump(acl, f, indent=4)
+
+
+def legacy(db, current, new):
+    configdb = db.configdb
+    for key in current:
+        db.client.delete("{}|{}".format(ACL_RULE, configdb.serialize_key(key)))
+    for key, rule in new.items():
+        db.client.hmset("{}|{}".format(ACL_RULE, configdb.serialize_key(key)), configdb.typed_to_raw(rule))
+
+
+def diff(db, current, new):
+    update_table_bulk(db, db.CONFIG_DB, ACL_RULE, current, new)
+
+
+def measure(name, func, current, new):
+    client = RemoteRedis(strict=True, decode_responses=True)
+    db = Connector(client)
+    rtt = RemoteRedis.rtt
+    RemoteRedis.rtt = 0
+    legacy(db, {}, current)
+    RemoteRedis.rtt = rtt
+
+    RemoteRedis.round_trips = 0
+    start = time.perf_counter()
+    func(db, current, new)
+    return time.perf_counter() - start, RemoteRedis.round_trips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-n', '--rules', type=int, default=20000, help='Number of rules of the ACL')
+    parser.add_argument('-c', '--changed', type=int, default=200, help='Number of rules changed by the update')
+    parser.add_argument('-r', '--rtt', type=int, default=50, help='Simulated round trip time in usecs')
+    parser.add_argument('-o', '--output', help='Write the ACL in openconfig format to this file')
+    args = parser.parse_args()
+
+    current = make_rules(args.rules, args.changed)
+    if args.output:
+        write_openconfig(args.output, current)
+
+    updates = (
+        ('unchanged', make_rules(args.rules, args.changed)),
+        ('{} changed'.format(args.changed), make_rules(args.rules, args.changed, generation=1)),
+        ('new rules', {(TABLE_NAME + "_2", rule_name): rule for (_, rule_name), rule in current.items()}),
+    )
+
+    RemoteRedis.rtt = args.rtt / 1000000.0
+    print("{:<12} {:>8} {:>12} {:>8} {:>12}".format('update', 'legacy', 'round trips', 'diff', 'round trips'))
+    for name, new in updates:
+        legacy_secs, legacy_round_trips = measure(name, legacy, current, new)
+        diff_secs, diff_round_trips = measure(name, diff, current, new)
+        print("{:<12} {:8.3f} {:12} {:8.3f} {:12}".format(
+            name, legacy_secs, legacy_round_trips, diff_secs, diff_round_trips))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Translation of the output of commands run in alias mode, for a synthetic port
+table and output:
+  legacy:     natsorted scan of the ports for each table line, and one pattern
+              per port for each line of free-form output
+  translator: precompiled maps and a single pattern over whole blocks
+
+Not collected by pytest; run it directly on a SONiC build environment:
+    python3 tests/benchmarks/alias_mode_benchmark.py [-p PORTS] [-l LINES]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+from natsort import natsorted
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from utilities_common.cli import AliasTranslator  # noqa: E402
+
+
+def legacy_column(converter, output, index):
+    alias_name = ""
+    interface_name = ""
+    word = output.split()
+    if word:
+        interface_name = word[index].replace(':', '')
+    for port_name in natsorted(list(converter.port_dict.keys())):
+        if interface_name == port_name:
+            alias_name = converter.port_dict[port_name]['alias']
+    if alias_name:
+        output = output.replace(interface_name, alias_name.rjust(converter.alias_max_length), 1)
+    return output.rstrip('\n')
+
+
+def legacy_text(converter, output):
+    for port_name in converter.port_dict:
+        output = re.sub(r"(^|\s){}($|,{{0,1}}\s)".format(port_name),
+                        r"\1{}\2".format(converter.port_dict[port_name]['alias']), output)
+    return output.rstrip('\n')
+
+
+def measure(func, lines):
+    start = time.perf_counter()
+    func(lines)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-p', '--ports', type=int, default=256, help='Number of ports')
+    parser.add_argument('-l', '--lines', type=int, default=2000, help='Number of lines of output')
+    args = parser.parse_args()
+
+    port_dict = {'Ethernet{}'.format(i * 4): {'alias': 'etp{}'.format(i + 1)} for i in range(args.ports)}
+    converter = SimpleNamespace(port_dict=port_dict, alias_max_length=len('etp{}'.format(args.ports)))
+    names = list(port_dict)
+    table = ['{}  U  1,234  0.00 B/s  0.00%\n'.format(names[i % len(names)]) for i in range(args.lines)]
+    text = ['{} is a member of PortChannel1, {} is not\n'.format(names[i % len(names)], names[-1 - i % len(names)])
+            for i in range(args.lines)]
+
+    translator = AliasTranslator(converter)
+    results = (
+        ('table', measure(lambda lines: [legacy_column(converter, line, 0) for line in lines], table),
+         measure(lambda lines: [translator.translate_column(line, 0) for line in lines], table)),
+        ('text', measure(lambda lines: [legacy_text(converter, line) for line in lines], text),
+         measure(lambda lines: translator.translate(''.join(lines)), text)),
+    )
+
+    print("{:<8} {:>10} {:>12}".format('output', 'legacy', 'translator'))
+    for name, legacy_secs, translator_secs in results:
+        print("{:<8} {:10.3f} {:12.3f}".format(name, legacy_secs, translator_secs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Startup time of the show and config CLIs per top-level command: each command is
+run with --help in a fresh interpreter, which measures the imports and the click
+parsing only. The modules imported by the command are counted as well.
+
+Not collected by pytest; run it directly on a SONiC device or build environment:
+    python3 tests/benchmarks/cli_startup_benchmark.py [-c show|config] [-r RUNS] [--max-ms MS]
+
+With --max-ms, exits with an error if a command takes longer than MS to start, to
+catch a command pulling the whole CLI tree again.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+
+CLIS = {
+    'show': 'show.main:cli',
+    'config': 'config.main:config',
+}
+
+RUN_COMMAND = """
+import sys
+from {module} import {attr} as cli
+try:
+    cli(sys.argv[1:])
+except SystemExit:
+    pass
+sys.stderr.write('modules={{}}\\n'.format(len(sys.modules)))
+"""
+
+LIST_COMMANDS = """
+from {module} import {attr} as cli
+for name in sorted(cli.list_commands(None)):
+    print(name)
+"""
+
+
+def run(code, args=()):
+    return subprocess.run([sys.executable, '-c', code] + list(args), cwd=REPO_PATH,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+
+def measure(code, command, runs):
+    elapsed = []
+    modules = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run(code, [command, '--help'])
+        elapsed.append(time.perf_counter() - start)
+        for line in result.stderr.splitlines():
+            if line.startswith('modules='):
+                modules = int(line.split('=')[1])
+    return statistics.median(elapsed), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-c', '--cli', choices=list(CLIS), action='append', help='CLI to measure (default: all)')
+    parser.add_argument('-r', '--runs', type=int, default=5, help='Runs per command, the median is reported')
+    parser.add_argument('--max-ms', type=float, default=None, help='Fail if a command takes longer to start')
+    args = parser.parse_args()
+
+    slow = []
+    for name in args.cli or list(CLIS):
+        module, attr = CLIS[name].split(':')
+        commands = run(LIST_COMMANDS.format(module=module, attr=attr)).stdout.split()
+        code = RUN_COMMAND.format(module=module, attr=attr)
+        print("{:<40} {:>10} {:>8}".format(name, 'ms', 'modules'))
+        for command in commands:
+            elapsed, modules = measure(code, command, args.runs)
+            print("{:<40} {:10.1f} {:8}".format(name + ' ' + command, elapsed * 1000, modules))
+            if args.max_ms is not None and elapsed * 1000 > args.max_ms:
+                slow.append(name + ' ' + command)
+        print()
+
+    if slow:
+        sys.exit("Slower than {} ms: {}".format(args.max_ms, ', '.join(slow)))
+
+
+if __name__ == "__main__":
+    main()
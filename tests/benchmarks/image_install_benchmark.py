@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Throughput of the download and checks of a SONiC image by sonic-installer, with
+a synthetic ONIE image served by a local HTTP server:
+  legacy: urlretrieve, then one read of the image for each of the version,
+          the platforms list and the digest
+  stream: single pass download, version, platforms list and digest
+
+Not collected by pytest; run it directly on a SONiC device or build environment:
+    python3 tests/benchmarks/image_install_benchmark.py [-s SIZE_MB] [-r RUNS] [--drop-caches]
+
+With --drop-caches (root only), the page cache is dropped before each read of
+the image, to measure the reads from the disk like on a device with slow flash.
+"""
+
+import argparse
+import hashlib
+import http.server
+import io
+import os
+import statistics
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from urllib.request import urlretrieve
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from sonic_installer import image_stream  # noqa: E402
+from sonic_installer.bootloader.grub import GrubBootloader  # noqa: E402
+
+PLATFORM = 'x86_64-kvm_x86_64-r0'
+
+
+def make_image(path, size_mb):
+    with open(path, 'wb') as f:
+        f.write(b'#!/bin/sh\nimage_version="benchmark"\nexit 0\nexit_marker\n')
+        with tarfile.open(fileobj=f, mode='w') as tar:
+            data = io.BytesIO(os.urandom(1024 * 1024) * size_mb)
+            info = tarfile.TarInfo('installer/fs.zip')
+            info.size = len(data.getvalue())
+            tar.addfile(info, data)
+            platforms = (PLATFORM + '\n').encode()
+            info = tarfile.TarInfo(image_stream.PLATFORMS_ASIC)
+            info.size = len(platforms)
+            tar.addfile(info, io.BytesIO(platforms))
+
+
+class ImageRequestHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def drop_caches(enabled):
+    if enabled:
+        os.sync()
+        with open('/proc/sys/vm/drop_caches', 'w') as f:
+            f.write('3\n')
+
+
+def run_legacy(url, image_path, args):
+    phases = {}
+    start = time.perf_counter()
+    urlretrieve(url, image_path)
+    phases['download'] = time.perf_counter() - start
+
+    bootloader = GrubBootloader()
+    # Read the image with the shell pipelines, like before the single pass inspection
+    bootloader.get_image_info = lambda image_path: None
+
+    drop_caches(args.drop_caches)
+    start = time.perf_counter()
+    assert bootloader.get_binary_image_version(image_path)
+    phases['version'] = time.perf_counter() - start
+
+    drop_caches(args.drop_caches)
+    start = time.perf_counter()
+    assert bootloader.platform_in_platforms_asic(PLATFORM, image_path)
+    phases['platforms'] = time.perf_counter() - start
+
+    drop_caches(args.drop_caches)
+    start = time.perf_counter()
+    digest = hashlib.sha256()
+    with open(image_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(image_stream.CHUNK_SIZE), b''):
+            digest.update(chunk)
+    phases['digest'] = time.perf_counter() - start
+    return phases
+
+
+def run_stream(url, image_path, args):
+    phases = {}
+    start = time.perf_counter()
+    info = image_stream.download_image(url, image_path, inspector=image_stream.ImageInspector())
+    assert info.version and PLATFORM in info.platforms and info.sha256
+    phases['download'] = time.perf_counter() - start
+    return phases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-s', '--size', type=int, default=256, help='Size of the image in MB')
+    parser.add_argument('-r', '--runs', type=int, default=3, help='Runs per mode, the median is reported')
+    parser.add_argument('--drop-caches', action='store_true', help='Drop the page cache before each read')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        serve_dir = os.path.join(tmp_dir, 'serve')
+        os.mkdir(serve_dir)
+        make_image(os.path.join(serve_dir, 'sonic.bin'), args.size)
+
+        handler = lambda *a, **kw: ImageRequestHandler(*a, directory=serve_dir, **kw)  # noqa: E731
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = 'http://127.0.0.1:{}/sonic.bin'.format(server.server_address[1])
+        image_path = os.path.join(tmp_dir, 'sonic_image')
+
+        print("{:<8} {:>10} {:>10}  {}".format('mode', 'seconds', 'MB/s', 'phases'))
+        for name, run in (('legacy', run_legacy), ('stream', run_stream)):
+            totals = []
+            phases = None
+            for _ in range(args.runs):
+                if os.path.exists(image_path):
+                    os.remove(image_path)
+                phases = run(url, image_path, args)
+                totals.append(sum(phases.values()))
+            total = statistics.median(totals)
+            print("{:<8} {:10.2f} {:10.1f}  {}".format(name, total, args.size / total, ', '.join(
+                '{} {:.2f}s'.format(phase, elapsed) for phase, elapsed in phases.items())))
+
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Per-visit cost of the GCU patch sorter (simulating a move and hashing the resulting diff)
+on a synthetic ConfigDB, comparing the legacy deep-copy/json.dumps scheme with the
+copy-on-write configs and incremental hashes of generic_config_updater.patch_sorter.Diff.
+
+Not collected by pytest; run it directly on a SONiC build environment:
+    python3 tests/benchmarks/patch_sorter_benchmark.py [-p PORTS] [-r RULES] [-m MOVES]
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+import jsonpatch
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+import generic_config_updater.patch_sorter as ps  # noqa: E402
+
+
+def gen_config(ports, rules):
+    port_names = ["Ethernet{}".format(i * 4) for i in range(ports)]
+    config = {
+        "PORT": {name: {"admin_status": "up", "alias": "etp{}".format(i), "lanes": str(i * 4), "mtu": "9100",
+                        "speed": "100000"} for i, name in enumerate(port_names)},
+        "ACL_TABLE": {"DATAACL": {"policy_desc": "DATAACL", "ports": port_names, "stage": "ingress",
+                                  "type": "L3"}},
+        "ACL_RULE": {"DATAACL|RULE_{}".format(i): {"PACKET_ACTION": "FORWARD", "PRIORITY": str(9999 - i),
+                                                   "SRC_IP": "10.{}.{}.0/24".format(i >> 8, i & 0xff)}
+                     for i in range(rules)},
+    }
+    return config
+
+
+def gen_patch_set(config, moves):
+    """Mix of leaf replaces, rule removals/additions and ACL port list updates"""
+    operations = []
+    port_names = list(config["PORT"])
+    rule_names = list(config["ACL_RULE"])
+    for i in range(moves):
+        kind = i % 4
+        if kind == 0:
+            operations.append({"op": "replace", "path": "/PORT/{}/mtu".format(port_names[i % len(port_names)]),
+                               "value": "1500"})
+        elif kind == 1:
+            operations.append({"op": "remove", "path": "/ACL_RULE/{}".format(rule_names[i % len(rule_names)])})
+        elif kind == 2:
+            operations.append({"op": "add", "path": "/ACL_RULE/DATAACL|NEW_{}".format(i),
+                               "value": {"PACKET_ACTION": "DROP", "PRIORITY": "1"}})
+        else:
+            operations.append({"op": "add", "path": "/ACL_TABLE/DATAACL/ports/0", "value": "Ethernet9999"})
+    return operations
+
+
+def legacy_visits(config, target, operations):
+    hashes = []
+    for operation in operations:
+        new_config = jsonpatch.JsonPatch([operation]).apply(config)
+        hashes.append(hash((json.dumps(new_config, sort_keys=True), json.dumps(target, sort_keys=True))))
+    return hashes
+
+
+def cow_visits(config, target, operations):
+    diff = ps.Diff(config, target)
+    hash(diff)
+    moves = [ps.JsonMove.from_operation(operation) for operation in operations]
+    hashes = []
+    for move in moves:
+        hashes.append(hash(diff.apply_move(move)))
+    return hashes
+
+
+def measure(name, func, *args):
+    start = time.perf_counter()
+    res = func(*args)
+    elapsed = time.perf_counter() - start
+    print("{:<10} {:8.3f} secs".format(name, elapsed))
+    return res, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-p', '--ports', type=int, default=512, help='Number of ports')
+    parser.add_argument('-r', '--rules', type=int, default=10000, help='Number of ACL rules')
+    parser.add_argument('-m', '--moves', type=int, default=200, help='Number of simulated moves')
+    args = parser.parse_args()
+
+    config = gen_config(args.ports, args.rules)
+    target = copy.deepcopy(config)
+    target["PORT"]["Ethernet0"]["description"] = "uplink"
+    operations = gen_patch_set(config, args.moves)
+
+    legacy, legacy_time = measure("legacy", legacy_visits, config, target, operations)
+    cow, cow_time = measure("cow", cow_visits, config, target, operations)
+    assert len(set(legacy)) == len(set(cow)), "hashes do not tell the same diffs apart"
+    print("speedup    {:8.1f}x".format(legacy_time / cow_time))
+
+
+if __name__ == "__main__":
+    main()
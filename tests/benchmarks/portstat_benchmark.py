@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Per-field vs pipelined collection of port counters and rates.
+
+A mockredis instance stands in for COUNTERS_DB, with a simulated round
+trip time added to every command and every pipeline execution.
+
+Not collected by pytest; run it directly on a SONiC build environment:
+    python3 tests/benchmarks/portstat_benchmark.py [-p PORTS] [-r RTT_USECS]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import mockredis
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from utilities_common import portstat  # noqa: E402
+from utilities_common.redis_pipeline import hgetall_bulk  # noqa: E402
+
+
+class RemoteRedis(mockredis.MockRedis):
+    """mockredis paying a round trip per command"""
+    rtt = 0
+    round_trips = 0
+
+    def _wait(self):
+        RemoteRedis.round_trips += 1
+        deadline = time.perf_counter() + self.rtt
+        while time.perf_counter() < deadline:
+            pass
+
+    def hget(self, *args):
+        self._wait()
+        return super(RemoteRedis, self).hget(*args)
+
+    def hgetall(self, *args):
+        self._wait()
+        return super(RemoteRedis, self).hgetall(*args)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super(RemoteRedis, self).pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def timed_execute():
+            self._wait()
+            # the queued commands are served within the one round trip
+            rtt, round_trips = RemoteRedis.rtt, RemoteRedis.round_trips
+            RemoteRedis.rtt = 0
+            try:
+                return execute()
+            finally:
+                RemoteRedis.rtt, RemoteRedis.round_trips = rtt, round_trips
+        pipe.execute = timed_execute
+        return pipe
+
+
+class Connector(object):
+    COUNTERS_DB = "COUNTERS_DB"
+    namespace = ""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get_redis_client(self, db_name):
+        return self.client
+
+
+def per_field(client, oids):
+    for oid in oids:
+        client.hgetall(portstat.COUNTER_TABLE_PREFIX + oid)
+        for name in portstat.rates_key_list:
+            client.hget(portstat.RATES_TABLE_PREFIX + oid, name)
+
+
+def pipelined(client, oids):
+    db = Connector(client)
+    keys = [portstat.COUNTER_TABLE_PREFIX + oid for oid in oids] + \
+           [portstat.RATES_TABLE_PREFIX + oid for oid in oids]
+    hgetall_bulk(db, db.COUNTERS_DB, keys)
+
+
+def measure(name, func, client, oids):
+    RemoteRedis.round_trips = 0
+    start = time.perf_counter()
+    func(client, oids)
+    print("{:<10} {:8.3f} secs {:8} round trips".format(name, time.perf_counter() - start, RemoteRedis.round_trips))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-p', '--ports', type=int, default=512, help='Number of ports')
+    parser.add_argument('-r', '--rtt', type=int, default=50, help='Simulated round trip time in usecs')
+    args = parser.parse_args()
+
+    client = RemoteRedis(strict=True, decode_responses=True)
+    oids = ["oid:0x1000000{:06x}".format(i) for i in range(args.ports)]
+    for oid in oids:
+        for pos, counters in portstat.counter_bucket_dict.items():
+            for counter in counters:
+                client.hset(portstat.COUNTER_TABLE_PREFIX + oid, counter, str(pos))
+        for name in portstat.rates_key_list:
+            client.hset(portstat.RATES_TABLE_PREFIX + oid, name, "1.0")
+
+    RemoteRedis.rtt = args.rtt / 1000000.0
+    measure("per-field", per_field, client, oids)
+    measure("pipelined", pipelined, client, oids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Per-scan cost of the route_check diff engine on synthetic route tables.
+
+Not collected by pytest; run it directly on a SONiC build environment:
+    python3 tests/benchmarks/route_check_benchmark.py [-r ROUTES] [-m MISSES]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts"))
+import route_check  # noqa: E402
+
+
+def gen_routes(count):
+    """Half IPv4 /24s, half IPv6 /64s, as normalized prefixes"""
+    v4 = count // 2
+    routes = ["{}.{}.{}.0/24".format(10 + (i >> 16), (i >> 8) & 0xff, i & 0xff) for i in range(v4)]
+    routes += ["2001:db8:{:x}:{:x}::/64".format(i >> 16, i & 0xffff) for i in range(count - v4)]
+    return routes
+
+
+def legacy_scan(rt_appl, rt_asic, intf_appl):
+    rt_appl = sorted(rt_appl)
+    rt_asic = sorted(rt_asic)
+    rt_appl_miss, rt_asic_miss = route_check.diff_sorted_lists(rt_appl, rt_asic)
+    _, rt_asic_miss = route_check.diff_sorted_lists(intf_appl, rt_asic_miss)
+    rt_asic_miss = [rt for rt in rt_asic_miss if not route_check.is_default_route(rt)]
+    intf_appl_miss, _ = route_check.diff_sorted_lists(intf_appl, rt_asic)
+    return rt_appl_miss, rt_asic_miss, intf_appl_miss
+
+
+def index_scan(rt_appl, rt_asic, intf_appl):
+    rt_appl_miss, rt_asic_miss, intf_appl_miss = route_check.PrefixIndex(rt_appl, rt_asic, intf_appl).diff()
+    rt_asic_miss = route_check.filter_out_default_routes(rt_asic_miss)
+    return rt_appl_miss, rt_asic_miss, intf_appl_miss
+
+
+def measure(name, func, *args):
+    start = time.perf_counter()
+    res = func(*args)
+    print("{:<10} {:8.3f} secs".format(name, time.perf_counter() - start))
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-r', '--routes', type=int, default=1000000, help='Number of routes')
+    parser.add_argument('-m', '--misses', type=int, default=100, help='Number of routes out of sync')
+    args = parser.parse_args()
+
+    routes = gen_routes(args.routes + args.misses)
+    rt_appl = routes[:args.routes] + ["0.0.0.0/0"]
+    rt_asic = routes[args.misses:] + ["0.0.0.0/0", "::/0"]
+    intf_appl = sorted(["10.0.0.1/32", "2001:db8::1/128"])
+
+    keys = ["SAI_OBJECT_TYPE_ROUTE_ENTRY:{\"dest\":\"" + rt + "\",\"switch_id\":\"oid:0x21000000000000\"}"
+            for rt in rt_asic]
+    measure("checkout", lambda: [route_check.checkout_rt_entry(k) for k in keys])
+
+    legacy = measure("legacy", legacy_scan, rt_appl, rt_asic, intf_appl)
+    index = measure("index", index_scan, rt_appl, rt_asic, intf_appl)
+    assert legacy == index, "diff engines disagree"
+
+
+if __name__ == "__main__":
+    main()
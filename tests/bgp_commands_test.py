@@ -4,6 +4,8 @@ import os
 import pytest
 import importlib
 import mock
+import subprocess
+import sys
 
 from click.testing import CliRunner
 
@@ -436,6 +438,33 @@ class TestBgpCommandsSingleAsic(object):
         from .mock_tables import dbconnector
         dbconnector.load_namespace_config()
 
+    def test_open_bgp_show_command(self):
+        popen = subprocess.Popen
+        cmds = []
+
+        def mock_popen(cmd, **kwargs):
+            # Stands for vtysh, with an output larger than the pipe buffer
+            cmds.append(cmd)
+            script = "import sys; sys.stdout.write('{\"10.0.0.0/24\": [], ' * 10000 + '}'); sys.exit(2)"
+            return popen([sys.executable, '-c', script], **kwargs)
+
+        with patch('utilities_common.bgp_util.subprocess.Popen', side_effect=mock_popen):
+            with bgp_util.open_bgp_show_command('show ip route json') as proc:
+                assert proc.stdout.peek(1)[:1] == b'{'
+                assert proc.returncode is None
+                output = proc.stdout.read()
+            assert output.endswith(b'[], }')
+            assert proc.returncode == 2
+            assert cmds[-1] == ['sudo', constants.RVTYSH_COMMAND, '-c', 'show ip route json']
+
+            # vtysh exits when its output is not read to the end
+            with patch('utilities_common.bgp_util.multi_asic.get_asic_id_from_name', return_value=1):
+                with bgp_util.open_bgp_show_command('show ip route json', 'asic1') as proc:
+                    assert proc.stdout.read(2) == b'{"'
+            assert proc.returncode is not None
+            assert proc.stdout.closed
+            assert cmds[-1] == ['sudo', constants.RVTYSH_COMMAND, '-n', '1', '-c', 'show ip route json']
+
     @pytest.mark.parametrize('setup_single_bgp_instance',
                              ['v4'], indirect=['setup_single_bgp_instance'])
     def test_bgp_summary_v4(
@@ -641,6 +641,29 @@ class TestConfigSaveMasic(object):
 
             assert "Input 3 config file(s) separated by comma for multiple files" in result.output
 
+    def test_config_save_parallel_masic(self, tmp_path):
+        files = [str(tmp_path / name) for name in ("config_db.json", "config_db0.json", "config_db1.json")]
+        runner = CliRunner()
+        db = Db()
+        result = runner.invoke(config.config.commands["save"], ["-y", "-p", ",".join(files)], obj=db)
+
+        print(result.exit_code)
+        print(result.output)
+        traceback.print_tb(result.exc_info[2])
+
+        assert result.exit_code == 0
+        assert result.output == (
+            "Saving config of localhost to {}\n"
+            "Saving config of asic0 to {}\n"
+            "Saving config of asic1 to {}\n").format(*files)
+        for namespace, file in zip(["", "asic0", "asic1"], files):
+            # Same as the output of sonic-cfggen -d --print-data, sorted by config save
+            config_db = db.cfgdb_clients[namespace]
+            cfggen_output = json.dumps(config.sonic_cfggen.FormatConverter.to_serialized(config_db.get_config()),
+                                       indent=4)
+            with open(file) as f:
+                assert f.read() == json.dumps(config.sort_dict(json.loads(cfggen_output)), indent=4)
+
     def test_config_save_onefile_masic(self):
         def get_config_side_effect():
             return {}
@@ -1028,6 +1051,39 @@ class TestConfigReloadMasic(object):
                 [li.rstrip() for li in result.output.split('\n')]
             ) == reload_config_masic_onefile_gen_sysinfo_output.format(config.SYSTEM_RELOAD_LOCK)
 
+    def test_config_reload_onefile_concurrent_masic(self):
+        def read_json_file_side_effect(filename):
+            return {
+                asic_name: {"DEVICE_METADATA": {"localhost": {"hwsku": "multi_asic"}}}
+                for asic_name in ["localhost", "asic0", "asic1"]
+            }
+
+        with mock.patch("utilities_common.cli.run_command",
+                        mock.MagicMock(side_effect=mock_run_command_side_effect)), \
+                mock.patch('config.main.read_json_file',
+                           mock.MagicMock(side_effect=read_json_file_side_effect)):
+
+            runner = CliRunner()
+
+            result = runner.invoke(config.config.commands["reload"],
+                                   ["-y", "-f", "--max-workers", "2", "--timing", "all_config_db.json"])
+
+            print(result.exit_code)
+            print(result.output)
+            traceback.print_tb(result.exc_info[2])
+
+            assert result.exit_code == 0
+            lines = [li.rstrip() for li in result.output.split('\n')]
+            # The host is loaded first, the ASICs in any order
+            commands = [li for li in lines if li.startswith("Running command: /usr/local/bin/sonic-cfggen")]
+            assert commands[0] == "Running command: /usr/local/bin/sonic-cfggen -H -k multi_asic --write-to-db"
+            assert sorted(commands[1:]) == [
+                "Running command: /usr/local/bin/sonic-cfggen -H -k multi_asic -n asic0 --write-to-db",
+                "Running command: /usr/local/bin/sonic-cfggen -H -k multi_asic -n asic1 --write-to-db"]
+            for phase in ["Phase", "stop services", "namespaces", "flush (localhost)", "flush (asic0)",
+                          "load sysinfo (asic1)", "load (asic1)", "migrate (asic1)", "restart services", "Total"]:
+                assert any(li.startswith(phase + "  ") for li in lines)
+
     def test_config_reload_onefile_bad_format_masic(self):
         def read_json_file_side_effect(filename):
             return {
@@ -1,9 +1,12 @@
+import contextlib
 import importlib
+import io
 import json
 import os
 import re
 import sys
 import unittest
+from types import SimpleNamespace
 from unittest import mock
 
 import pytest
@@ -71,6 +74,19 @@ def setup_env():
     if "PYTHONPATH" not in os.environ:
         os.environ["PYTHONPATH"] = os.getcwd()
 
+@pytest.fixture
+def mock_open_bgp_show_command():
+    # The streamed vtysh show commands of the route tests are served by the mocked bgp_util.run_bgp_command
+    import utilities_common.bgp_util as bgp_util
+
+    @contextlib.contextmanager
+    def open_bgp_show_command(vtysh_cmd, bgp_namespace=multi_asic.DEFAULT_NAMESPACE):
+        output = bgp_util.run_bgp_command(vtysh_cmd, bgp_namespace, constants.RVTYSH_COMMAND)
+        yield SimpleNamespace(stdout=io.BufferedReader(io.BytesIO((output or "").encode())), returncode=0)
+
+    with mock.patch.object(bgp_util, 'open_bgp_show_command', open_bgp_show_command):
+        yield
+
 @pytest.fixture
 def get_cmd_module():
     import config.main as config
@@ -172,7 +188,7 @@ def setup_t1_topo():
 
 
 @pytest.fixture
-def setup_single_bgp_instance(request):
+def setup_single_bgp_instance(request, mock_open_bgp_show_command):
     import utilities_common.bgp_util as bgp_util
     if request.param == 'v4':
         bgp_mocked_json = os.path.join(
@@ -287,7 +303,7 @@ def setup_single_bgp_instance(request):
 
 
 @pytest.fixture
-def setup_multi_asic_bgp_instance(request):
+def setup_multi_asic_bgp_instance(request, mock_open_bgp_show_command):
     import utilities_common.bgp_util as bgp_util
 
     if request.param == 'ip_route':
@@ -0,0 +1,57 @@
+import datetime
+import json
+import os
+import sys
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+sys.path.insert(0, modules_path)
+
+from utilities_common import counter_snapshot  # noqa: E402
+
+
+class TestCounterSnapshot(object):
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "portstat")
+        cnstat_dict = {
+            'time': datetime.datetime(2024, 1, 1),
+            'Ethernet0': {'rx_ok': '10', 'rx_err': 'N/A', 'tx_ok': 18446744073709551615},
+            'Ethernet4': {'rx_ok': '007', 'tx_ok': 3},
+            ('Ethernet8', 'UC0'): ['1', 'N/A', 2],
+        }
+        counter_snapshot.dump(cnstat_dict, path)
+
+        snapshot = counter_snapshot.load(path)
+        assert isinstance(snapshot, counter_snapshot.CounterSnapshot)
+        assert snapshot['time'] == '2024-01-01T00:00:00'
+        assert snapshot['Ethernet0'] == cnstat_dict['Ethernet0']
+        assert snapshot['Ethernet4'] == cnstat_dict['Ethernet4']
+        assert snapshot[('Ethernet8', 'UC0')] == cnstat_dict[('Ethernet8', 'UC0')]
+        assert list(snapshot) == list(cnstat_dict)
+        assert ('Ethernet8', 'UC0') in snapshot
+        assert 'Ethernet12' not in snapshot
+        assert len(snapshot) == 4
+
+    def test_column(self, tmp_path):
+        path = str(tmp_path / "dropstat")
+        cnstat_dict = {
+            'Ethernet0': {'RX_DROPS': '10', 'TX_DROPS': 'N/A'},
+            'Ethernet4': {'RX_DROPS': '20'},
+        }
+        counter_snapshot.dump(cnstat_dict, path)
+        names = ['Ethernet4', 'Ethernet0', 'Ethernet8']
+
+        snapshot = counter_snapshot.load(path)
+        assert counter_snapshot.column(snapshot, 'RX_DROPS', names) == [20, 10, 0]
+        assert counter_snapshot.column(snapshot, 'TX_DROPS', names) == [0, 0, 0]
+        assert counter_snapshot.column(snapshot, 'SWITCH_DROPS', names) == [0, 0, 0]
+
+    def test_load_json_baseline(self, tmp_path):
+        path = str(tmp_path / "dropstat")
+        cnstat_dict = {'Ethernet0': {'RX_DROPS': 10}}
+        with open(path, 'w') as f:
+            json.dump(cnstat_dict, f)
+
+        baseline = counter_snapshot.load(path)
+        assert baseline == cnstat_dict
+        assert counter_snapshot.column(baseline, 'RX_DROPS', ['Ethernet0', 'Ethernet4']) == [10, 0]
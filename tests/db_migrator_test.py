@@ -345,6 +345,53 @@ class TestInitConfigMigrator(object):
 
         assert not expected_db.cfgdb.get_table('CONTAINER_FEATURE')
 
+
+class TestInMemoryMigrator(object):
+    @classmethod
+    def setup_class(cls):
+        os.environ['UTILITIES_UNIT_TESTING'] = "2"
+
+    @classmethod
+    def teardown_class(cls):
+        os.environ['UTILITIES_UNIT_TESTING'] = "0"
+        dbconnector.dedicated_dbs['CONFIG_DB'] = None
+
+    def test_in_memory_migration(self):
+        dbconnector.dedicated_dbs['CONFIG_DB'] = os.path.join(mock_db_path, 'config_db', 'feature-input')
+        import db_migrator
+        dbmgtr = db_migrator.DBMigrator(None, in_memory=True)
+        dbmgtr.migrate()
+        dbconnector.dedicated_dbs['CONFIG_DB'] = os.path.join(mock_db_path, 'config_db', 'feature-expected')
+        expected_db = Db()
+
+        # The changes are written to the database
+        resulting_table = dbmgtr.configDB.db.get_table('FEATURE')
+        expected_table = expected_db.cfgdb.get_table('FEATURE')
+        diff = DeepDiff(resulting_table, expected_table, ignore_order=True)
+        assert not diff
+        assert dbmgtr.configDB.db.get_entry('VERSIONS', 'DATABASE') == {'VERSION': dbmgtr.CURRENT_VERSION}
+        assert not dbmgtr.configDB.get_changed_keys()
+
+        steps = [step for step, _ in dbmgtr.step_times]
+        assert steps[:2] == ['load CONFIG_DB', 'load APPL_DB']
+        assert 'common_migration_ops' in steps
+        assert steps[-2:] == ['commit APPL_DB', 'commit CONFIG_DB']
+
+    def test_in_memory_migration_failure(self):
+        dbconnector.dedicated_dbs['CONFIG_DB'] = os.path.join(mock_db_path, 'config_db', 'feature-input')
+        import db_migrator
+        dbmgtr = db_migrator.DBMigrator(None, in_memory=True)
+        input_table = dbmgtr.configDB.db.get_table('FEATURE')
+        with mock.patch.object(dbmgtr, 'common_migration_ops', side_effect=Exception('failed')):
+            with pytest.raises(Exception):
+                dbmgtr.migrate()
+
+        # Nothing is written to the database
+        assert dbmgtr.configDB.get_entry('VERSIONS', 'DATABASE') == {'VERSION': dbmgtr.CURRENT_VERSION}
+        assert not dbmgtr.configDB.db.get_entry('VERSIONS', 'DATABASE')
+        assert dbmgtr.configDB.db.get_table('FEATURE') == input_table
+
+
 class TestLacpKeyMigrator(object):
     @classmethod
     def setup_class(cls):
@@ -902,7 +949,8 @@ class TestMain(object):
 
     @mock.patch('argparse.ArgumentParser.parse_args')
     def test_init(self, mock_args):
-        mock_args.return_value=argparse.Namespace(namespace=None, operation='get_version', socket=None)
+        mock_args.return_value = argparse.Namespace(namespace=None, operation='get_version', socket=None,
+                                                    in_memory=False)
         import db_migrator
         db_migrator.main()
 
@@ -910,7 +958,8 @@ class TestMain(object):
     @mock.patch('swsscommon.swsscommon.SonicDBConfig.isInit', mock.MagicMock(return_value=False))
     @mock.patch('swsscommon.swsscommon.SonicDBConfig.initialize', mock.MagicMock())
     def test_init_no_namespace(self, mock_args):
-        mock_args.return_value = argparse.Namespace(namespace=None, operation='version_202411_02', socket=None)
+        mock_args.return_value = argparse.Namespace(namespace=None, operation='version_202411_02', socket=None,
+                                                    in_memory=False)
         import db_migrator
         db_migrator.main()
 
@@ -918,10 +967,32 @@ class TestMain(object):
     @mock.patch('swsscommon.swsscommon.SonicDBConfig.isGlobalInit', mock.MagicMock(return_value=False))
     @mock.patch('swsscommon.swsscommon.SonicDBConfig.initializeGlobalConfig', mock.MagicMock())
     def test_init_namespace(self, mock_args):
-        mock_args.return_value = argparse.Namespace(namespace="asic0", operation='version_202411_02', socket=None)
+        mock_args.return_value = argparse.Namespace(namespace="asic0", operation='version_202411_02', socket=None,
+                                                    in_memory=False)
         import db_migrator
         db_migrator.main()
 
+    @mock.patch('argparse.ArgumentParser.parse_args')
+    def test_init_in_memory(self, mock_args):
+        mock_args.return_value = argparse.Namespace(namespace=None, operation='set_version', socket=None,
+                                                    in_memory=True)
+        import db_migrator
+        with mock.patch.object(db_migrator.DBMigrator, 'commit') as mock_commit:
+            db_migrator.main()
+        mock_commit.assert_called_once()
+
+    @mock.patch('argparse.ArgumentParser.parse_args')
+    def test_init_in_memory_migrate(self, mock_args):
+        mock_args.return_value = argparse.Namespace(namespace=None, operation='migrate', socket=None,
+                                                    in_memory=True)
+        import db_migrator
+        # The changes are committed once, by migrate
+        with mock.patch.object(db_migrator.DBMigrator, 'migrate') as mock_migrate, \
+                mock.patch.object(db_migrator.DBMigrator, 'commit') as mock_commit:
+            db_migrator.main()
+        mock_migrate.assert_called_once()
+        mock_commit.assert_not_called()
+
 
 class TestGNMIMigrator(object):
     @classmethod
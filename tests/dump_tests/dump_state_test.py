@@ -156,6 +156,17 @@ class TestDumpState:
         ddiff = compare_json_output(expected, result.output)
         assert not ddiff, ddiff
 
+    def test_offline_snapshot(self, match_engine):
+        runner = CliRunner()
+        online = runner.invoke(dump.state, ["port", "Ethernet0,Ethernet4"], obj=match_engine)
+        snapshot_dir = os.path.join(os.path.dirname(__file__), "../dump_input/dump/default")
+        offline = runner.invoke(dump.state, ["port", "Ethernet0,Ethernet4", "--snapshot-dir", snapshot_dir],
+                                obj=MatchEngine(ConnectionPool()))
+        assert offline.exit_code == 0, "exit code: {}, Exception: {}, Traceback: {}".format(
+            offline.exit_code, offline.exception, offline.exc_info)
+        ddiff = DeepDiff(json.loads(online.output), json.loads(offline.output), ignore_order=True)
+        assert not ddiff, ddiff
+
     def test_identifier_multiple(self, match_engine):
         runner = CliRunner()
         result = runner.invoke(dump.state, ["port", "Ethernet0,Ethernet4"], obj=match_engine)
@@ -337,6 +348,24 @@ class TestDumpStateMultiAsic(object):
         result = runner.invoke(dump.state, ["port", "Ethernet0", "--namespace", "asic3"], obj=match_engine_masic)
         assert result.output == "Namespace option is not valid. Choose one of ['asic0', 'asic1']\n", result
 
+    def test_all_namespaces(self, match_engine_masic, tmp_path):
+        runner = CliRunner()
+        result = runner.invoke(dump.state, ["port", "all", "--key-map", "--namespace", "all"], obj=match_engine_masic)
+        assert result.output == "Output directory option is required to dump all the modules or namespaces\n", result
+
+        with mock.patch.dict(dump.plugins.dump_modules, {"port": dump.plugins.dump_modules["port"]}, clear=True):
+            result = runner.invoke(dump.state, ["all", "all", "--key-map", "--namespace", "all",
+                                                "--output-dir", str(tmp_path)], obj=match_engine_masic)
+        assert result.exit_code == 0, "exit code: {}, Exception: {}, Output: {}".format(
+            result.exit_code, result.exception, result.output)
+        assert result.output.split() == [str(tmp_path / name) for name in ("port", "port.asic0", "port.asic1")]
+        with open(str(tmp_path / "port")) as f:
+            assert "Ethernet0" in json.load(f)
+        with open(str(tmp_path / "port.asic0")) as f:
+            assert json.load(f)["Ethernet0"]["CONFIG_DB"]["keys"] == ["PORT|Ethernet0"]
+        with open(str(tmp_path / "port.asic1")) as f:
+            assert "Ethernet-BP256" in json.load(f)
+
 
 class TestMultiAsicInit:
     """Test multi-asic initialization in dump command group"""
@@ -2,7 +2,8 @@ import os
 import sys
 import unittest
 import pytest
-from dump.match_infra import MatchEngine, EXCEP_DICT, MatchRequest, MatchRequestOptimizer, ConnectionPool, CONN
+from dump.match_infra import (MatchEngine, EXCEP_DICT, MatchRequest, MatchRequestOptimizer, ConnectionPool, CONN,
+                              SnapshotCache)
 from utilities_common.constants import DEFAULT_NAMESPACE
 from dump.helper import populate_mock
 from unittest.mock import MagicMock
@@ -214,6 +215,21 @@ class TestMatchEngine:
         ddiff = DeepDiff(exp_dict, recv_dict)
         assert not ddiff, ddiff
 
+    def test_bulk_fetch_same_as_per_key(self, match_engine):
+        per_key_engine = MatchEngine(match_engine.conn_pool, bulk_fetch=False)
+        reqs = [
+            dict(db="STATE_DB", table="VXLAN_TUNNEL_TABLE", field="operstatus", value="down", return_fields=["src_ip"]),
+            dict(db="APPL_DB", table="PORT_TABLE", field="lanes", value="202"),
+            dict(db="CONFIG_DB", table="ACL_RULE", just_keys=False),
+            dict(db="STATE_DB", table="REBOOT_CAUSE", return_fields=["cause", "missing_field"]),
+        ]
+        for req in reqs:
+            ret = match_engine.fetch(MatchRequest(**req))
+            exp = per_key_engine.fetch(MatchRequest(**req))
+            assert ret["error"] == ""
+            ddiff = DeepDiff(exp, ret, ignore_order=True)
+            assert not ddiff, ddiff
+
     def test_file_source(self, match_engine):
         file = os.path.join(dump_test_input, "copp_cfg.json")
         req = MatchRequest(file=file, table="COPP_TRAP", field="trap_ids", value="arp_req")
@@ -303,3 +319,49 @@ class TestMatchEngineOptimizer:
         # missing filed should not cause an excpetion in the optimizer
         assert "whatever" in ret["return_values"]["COPP_GROUP|queue4_group2"]
         assert not  ret["return_values"]["COPP_GROUP|queue4_group2"]["whatever"]
+
+
+class TestSnapshotCache:
+
+    def test_pattern_and_key_reuse(self, match_engine):
+        cache = match_engine.conn_pool.snapshot_cache
+        cache.clear()
+        req = MatchRequest(db="STATE_DB", table="REBOOT_CAUSE", return_fields=["cause"])
+        ret = match_engine.fetch(req)
+        assert ret["error"] == ""
+        assert len(ret["keys"]) == 2
+        hits = cache.hits
+
+        # Narrower pattern is served from the listing of the whole table
+        req = MatchRequest(db="STATE_DB", table="REBOOT_CAUSE", key_pattern="2020_10_09_02*", return_fields=["cause"])
+        ret = match_engine.fetch(req)
+        assert ret["keys"] == ["REBOOT_CAUSE|2020_10_09_02_33_06"]
+        assert "reboot" == ret["return_values"]["REBOOT_CAUSE|2020_10_09_02_33_06"]["cause"]
+
+        # Exact key is served from the cached object
+        req = MatchRequest(db="STATE_DB", table="REBOOT_CAUSE", key_pattern="2020_10_09_04_53_58", just_keys=False)
+        ret = match_engine.fetch(req)
+        assert ret["keys"][0]["REBOOT_CAUSE|2020_10_09_04_53_58"]["cause"] == "warm-reboot"
+        assert cache.hits == hits + 4
+
+    def test_lru_bound(self):
+        src = MagicMock()
+        src.hgetall_bulk.side_effect = lambda db, keys: {key: {"f": key} for key in keys}
+        cache = SnapshotCache(max_size=2)
+        cache.hgetall_bulk(src, "", "APPL_DB", ["a", "b", "c"])
+        assert len(cache.entries) == 2
+        assert cache.hgetall_bulk(src, "", "APPL_DB", ["c"]) == {"c": {"f": "c"}}
+        assert cache.hits == 1
+        assert cache.misses == 3
+
+    def test_fill_clears_namespace(self):
+        src = MagicMock()
+        src.hgetall_bulk.side_effect = lambda db, keys: {key: {"f": key} for key in keys}
+        pool = ConnectionPool()
+        pool.snapshot_cache.hgetall_bulk(src, "asic0", "APPL_DB", ["a"])
+        pool.snapshot_cache.hgetall_bulk(src, "asic1", "APPL_DB", ["a"])
+        pool.snapshot_cache.put_keys("asic1", "APPL_DB", "PORT_TABLE", "*", ["PORT_TABLE:Ethernet0"])
+        pool.fill("asic1", MagicMock(), ["APPL_DB"])
+        assert list(pool.snapshot_cache.entries) == [("fv", "asic0", "APPL_DB", "a")]
+        pool.clear()
+        assert not pool.snapshot_cache.entries
@@ -221,6 +221,21 @@ class TestConfigWrapper(unittest.TestCase):
         self.assertEqual(expected, actual)
         self.assertIsNotNone(error)
 
+    def test_validate_config_db_config__incremental__same_as_full_load(self):
+        # Arrange
+        config_wrapper = gu_common.ConfigWrapper()
+        full_config_wrapper = gu_common.ConfigWrapper()
+        configs = [Files.CONFIG_DB_AS_JSON, Files.CONFIG_DB_AS_JSON_INVALID, Files.CONFIG_DB_AS_JSON,
+                   Files.CROPPED_CONFIG_DB_AS_JSON, Files.CONFIG_DB_AS_JSON]
+
+        for config in configs:
+            # Act
+            expected, _ = full_config_wrapper.validate_config_db_config(config)
+            actual, _ = config_wrapper.validate_config_db_config(config, incremental=True)
+
+            # Assert
+            self.assertEqual(expected, actual)
+
     def test_validate_bgp_peer_group__valid_non_intersecting_ip_ranges__returns_true(self):
         # Arrange
         config_wrapper = gu_common.ConfigWrapper()
@@ -487,6 +502,57 @@ class TestConfigWrapper(unittest.TestCase):
         self.assertDictEqual({"any_table": {"key": "value"}}, actual)
 
 
+class TestSonicYangDataTree(unittest.TestCase):
+    def setUp(self):
+        self.sy = MagicMock()
+        self.sy.confDbYangMap = {"PORT": {}, "VLAN": {}}
+        self.sy.root.find_path.return_value.data.return_value = []
+        self.data_tree = gu_common.SonicYangDataTree(self.sy)
+        self.config = {"PORT": {"Ethernet0": {"mtu": "9100"}, "Ethernet4": {"mtu": "9100"}},
+                       "TABLE_WITHOUT_YANG": {"key": {}}}
+        self.data_tree.load(self.config)
+
+    def test_load__first_load__loads_whole_config(self):
+        # Assert
+        self.sy.loadData.assert_called_once_with(self.config)
+
+    def test_load__changed_row__loads_only_changed_row(self):
+        # Arrange
+        config = copy.deepcopy(self.config)
+        config["PORT"]["Ethernet4"]["mtu"] = "1500"
+        config["TABLE_WITHOUT_YANG"]["key"]["any"] = "value"
+
+        # Act
+        self.data_tree.load(config)
+
+        # Assert
+        self.sy.loadData.assert_called_once()
+        self.sy._xlateConfigDBtoYang.assert_called_once_with({"PORT": {"Ethernet4": {"mtu": "1500"}}}, {})
+        self.sy.validate_data_tree.assert_called_once()
+
+    def test_load__updated_in_place__loads_changed_row(self):
+        # Act
+        self.config["PORT"]["Ethernet0"]["mtu"] = "1500"
+        self.data_tree.load(self.config)
+
+        # Assert
+        self.sy.loadData.assert_called_once()
+        self.sy._xlateConfigDBtoYang.assert_called_once_with({"PORT": {"Ethernet0": {"mtu": "1500"}}}, {})
+
+    def test_load__invalid_config__rolls_back(self):
+        # Arrange
+        config = copy.deepcopy(self.config)
+        config["VLAN"] = {"Vlan1000": {"vlanid": "1000"}}
+        self.sy.validate_data_tree.side_effect = sonic_yang.SonicYangException("invalid")
+
+        # Act and assert
+        self.assertRaises(sonic_yang.SonicYangException, self.data_tree.load, config)
+        self.assertEqual(self.config, self.data_tree.config)
+        self.data_tree.load(self.config)
+        self.sy.loadData.assert_called_once()
+        self.sy.validate_data_tree.assert_called_once()
+
+
 class TestPatchWrapper(unittest.TestCase):
     def setUp(self):
         self.config_wrapper_mock = gu_common.ConfigWrapper()
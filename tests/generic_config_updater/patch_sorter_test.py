@@ -84,6 +84,41 @@ class TestDiff(unittest.TestCase):
         # Assert
         self.assertNotEqual(hash1, hash2)
 
+    def test_hash__apply_and_undo_move__same_as_new_diff(self):
+        # Arrange
+        current_config = {"ACL_TABLE": {"T1": {"ports": ["Ethernet0", "Ethernet4"]}}, "PORT": {"Ethernet0": {}}}
+        target_config = {"ACL_TABLE": {"T1": {"ports": ["Ethernet0", "Ethernet8", "Ethernet4"]}}}
+        diff = ps.Diff(current_config, target_config)
+        hash(diff)
+        group = JsonMoveGroup("", ps.JsonMove.from_operation(
+            {"op": "add", "path": "/ACL_TABLE/T1/ports/1", "value": "Ethernet8"}))
+        group.append(ps.JsonMove.from_operation({"op": "remove", "path": "/PORT"}))
+
+        # Act
+        applied = diff.apply_move(group)
+        undone = applied.undo_move(group)
+
+        # Assert
+        self.assertEqual(target_config, applied.current_config)
+        self.assertEqual(hash(ps.Diff(target_config, target_config)), hash(applied))
+        self.assertTrue(applied.has_no_diff())
+        self.assertEqual(current_config, undone.current_config)
+        self.assertEqual(hash(diff), hash(undone))
+
+    def test_apply_move__current_config_not_modified(self):
+        # Arrange
+        current_config = {"ACL_TABLE": {"T1": {"ports": ["Ethernet0"], "stage": "ingress"}}, "PORT": {"Ethernet0": {}}}
+        expected = {"ACL_TABLE": {"T1": {"ports": ["Ethernet0"], "stage": "ingress"}}, "PORT": {"Ethernet0": {}}}
+        diff = ps.Diff(current_config, {})
+        move = ps.JsonMove.from_operation({"op": "add", "path": "/ACL_TABLE/T1/ports/-", "value": "Ethernet4"})
+
+        # Act
+        actual = diff.apply_move(move)
+
+        # Assert
+        self.assertEqual(expected, current_config)
+        self.assertEqual(["Ethernet0", "Ethernet4"], actual.current_config["ACL_TABLE"]["T1"]["ports"])
+
     def test_eq__different_current_config__returns_false(self):
         # Arrange
         diff = ps.Diff(Files.ANY_CONFIG_DB, Files.ANY_CONFIG_DB)
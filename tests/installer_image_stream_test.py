@@ -0,0 +1,205 @@
+import hashlib
+import http.server
+import io
+import os
+import tarfile
+import threading
+from unittest.mock import patch
+
+import pytest
+
+import sonic_installer.image_stream as image_stream
+from sonic_installer.bootloader.grub import GrubBootloader
+
+IMAGE_VERSION = 'master.0-dirty-20240101.000000'
+PLATFORMS = ['x86_64-kvm_x86_64-r0', 'x86_64-mlnx_msn2700-r0']
+
+
+def make_image(platforms=PLATFORMS, platforms_first=False, payload_size=3 * 1024 * 1024):
+    """ONIE installer image: shell header, exit_marker, tar archive"""
+    header = ('#!/bin/sh\n'
+              'image_version="{}"\n'
+              'echo "Installing SONiC"\n'
+              'exit 0\n'
+              'exit_marker\n').format(IMAGE_VERSION).encode()
+
+    members = [('installer/fs.zip', os.urandom(payload_size))]
+    if platforms is not None:
+        member = ('installer/platforms_asic', '\n'.join(platforms).encode() + b'\n')
+        members.insert(0 if platforms_first else 1, member)
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode='w', format=tarfile.GNU_FORMAT) as tar:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return header + archive.getvalue()
+
+
+def inspect(image, chunk_size):
+    inspector = image_stream.ImageInspector()
+    for offset in range(0, len(image), chunk_size):
+        inspector.feed(image[offset:offset + chunk_size])
+    return inspector.close()
+
+
+class ImageRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the image, with ranged requests, dropping the first connection in the middle"""
+    image = b''
+    etag = '"1"'
+    drop_after = None
+    requests = []
+
+    def do_GET(self):
+        ImageRequestHandler.requests.append(dict(self.headers))
+        start = 0
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range') == self.etag:
+            start = int(range_header[len('bytes='):].rstrip('-'))
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {}-{}/{}'.format(start, len(self.image) - 1, len(self.image)))
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(self.image) - start))
+        self.send_header('ETag', self.etag)
+        self.end_headers()
+
+        data = self.image[start:]
+        if ImageRequestHandler.drop_after is not None:
+            data = data[:ImageRequestHandler.drop_after]
+            ImageRequestHandler.drop_after = None
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def image_server():
+    ImageRequestHandler.requests = []
+    ImageRequestHandler.drop_after = None
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), ImageRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}/sonic.bin'.format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 511, 4096, 1024 * 1024])
+def test_inspector(chunk_size):
+    image = make_image(payload_size=64 * 1024)
+    info = inspect(image, chunk_size)
+    assert info.version == IMAGE_VERSION
+    assert info.platforms == PLATFORMS
+    assert info.payload_parsed
+    assert info.sha256 == hashlib.sha256(image).hexdigest()
+
+
+def test_inspector_no_platforms():
+    info = inspect(make_image(platforms=None), 4096)
+    assert info.version == IMAGE_VERSION
+    assert info.platforms is None
+    assert info.payload_parsed
+
+
+def test_inspector_not_an_image():
+    info = inspect(b'\x1f\x8b' + os.urandom(64 * 1024), 4096)
+    assert info.version is None
+    assert not info.payload_parsed
+
+    image = make_image()
+    marker = image.index(b'exit_marker\n') + len(b'exit_marker\n')
+    info = inspect(image[:marker] + b'\x1f\x8b' + os.urandom(1024), 4096)
+    assert info.version == IMAGE_VERSION
+    assert not info.payload_parsed
+
+
+def test_inspect_image(tmp_path):
+    image_path = str(tmp_path / 'sonic.bin')
+    image = make_image(platforms_first=True)
+    with open(image_path, 'wb') as f:
+        f.write(image)
+
+    # The platforms list is found before the end of the image, which is not read
+    info = image_stream.inspect_image(image_path)
+    assert info.platforms == PLATFORMS
+    assert info.sha256 is None
+
+    image = make_image(platforms_first=False)
+    with open(image_path, 'wb') as f:
+        f.write(image)
+    info = image_stream.inspect_image(image_path)
+    assert info.platforms == PLATFORMS
+    assert info.sha256 == hashlib.sha256(image).hexdigest()
+
+
+def test_download_image(tmp_path, image_server):
+    image_path = str(tmp_path / 'sonic_image')
+    ImageRequestHandler.image = make_image()
+    progress = []
+
+    info = image_stream.download_image(image_server, image_path, lambda count, size, total: progress.append(count),
+                                       image_stream.ImageInspector())
+    with open(image_path, 'rb') as f:
+        assert f.read() == ImageRequestHandler.image
+    assert info.version == IMAGE_VERSION
+    assert info.platforms == PLATFORMS
+    assert info.sha256 == hashlib.sha256(ImageRequestHandler.image).hexdigest()
+    assert progress[0] == 0 and progress[-1] == len(ImageRequestHandler.image)
+    assert not os.path.exists(image_path + image_stream.DOWNLOAD_STATE_SUFFIX)
+
+
+def test_download_image_resume(tmp_path, image_server):
+    image_path = str(tmp_path / 'sonic_image')
+    ImageRequestHandler.image = make_image()
+    ImageRequestHandler.drop_after = 1024 * 1024 + 100
+
+    info = image_stream.download_image(image_server, image_path, inspector=image_stream.ImageInspector())
+    with open(image_path, 'rb') as f:
+        assert f.read() == ImageRequestHandler.image
+    assert info.sha256 == hashlib.sha256(ImageRequestHandler.image).hexdigest()
+    assert len(ImageRequestHandler.requests) == 2
+    assert ImageRequestHandler.requests[1]['Range'] == 'bytes={}-'.format(1024 * 1024 + 100)
+
+
+def test_download_image_resume_previous_run(tmp_path, image_server):
+    image_path = str(tmp_path / 'sonic_image')
+    ImageRequestHandler.image = make_image()
+    with open(image_path, 'wb') as f:
+        f.write(ImageRequestHandler.image[:5000])
+    image_stream.save_download_state(image_path, {'url': image_server, 'validator': ImageRequestHandler.etag})
+
+    info = image_stream.download_image(image_server, image_path, inspector=image_stream.ImageInspector())
+    with open(image_path, 'rb') as f:
+        assert f.read() == ImageRequestHandler.image
+    assert info.version == IMAGE_VERSION
+    assert info.sha256 == hashlib.sha256(ImageRequestHandler.image).hexdigest()
+    assert ImageRequestHandler.requests[0]['Range'] == 'bytes=5000-'
+
+    # The image changed on the server, it is downloaded again
+    with open(image_path, 'wb') as f:
+        f.write(b'old image')
+    image_stream.save_download_state(image_path, {'url': image_server, 'validator': '"0"'})
+    image_stream.download_image(image_server, image_path)
+    with open(image_path, 'rb') as f:
+        assert f.read() == ImageRequestHandler.image
+
+
+@patch('sonic_installer.bootloader.grub.device_info.get_platform')
+@patch('sonic_installer.bootloader.grub.GrubBootloader.platform_in_platforms_asic')
+@patch('sonic_installer.bootloader.onie.subprocess.Popen')
+def test_grub_single_pass(popen, platform_in_platforms_asic, get_platform, tmp_path):
+    image_path = str(tmp_path / 'sonic.bin')
+    with open(image_path, 'wb') as f:
+        f.write(make_image())
+
+    bootloader = GrubBootloader()
+    assert bootloader.get_binary_image_version(image_path) == 'SONiC-OS-' + IMAGE_VERSION
+    get_platform.return_value = PLATFORMS[1]
+    assert bootloader.verify_image_platform(image_path)
+    get_platform.return_value = 'x86_64-unknown-r0'
+    assert not bootloader.verify_image_platform(image_path)
+    # The image is not read by the shell pipelines
+    popen.assert_not_called()
+    platform_in_platforms_asic.assert_not_called()
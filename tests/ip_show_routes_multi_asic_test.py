@@ -1,3 +1,4 @@
+import json
 import os
 from importlib import reload
 import pytest
@@ -50,6 +51,23 @@ class TestMultiAiscShowIpRouteDisplayAllCommands(object):
         assert result.exit_code == 0
         assert result.output == show_ip_route_common.show_ip_route_multi_asic_display_all_expected_output
 
+    @pytest.mark.parametrize('setup_multi_asic_bgp_instance',
+                             ['ip_route'], indirect=['setup_multi_asic_bgp_instance'])
+    def test_show_multi_asic_ip_route_all_json(
+            self,
+            setup_ip_route_commands,
+            setup_multi_asic_bgp_instance):
+        show = setup_ip_route_commands
+        runner = CliRunner()
+        result = runner.invoke(
+            show.cli.commands["ip"].commands["route"], ["-dall", "json"])
+        print("{}".format(result.output))
+        assert result.exit_code == 0
+        # The routes of all the namespaces, printed prefix by prefix like json.dumps would
+        routes = json.loads(result.output)
+        assert len(routes) > 1
+        assert result.output == json.dumps(routes, sort_keys=True, indent=4) + "\n"
+
     @pytest.mark.parametrize('setup_multi_asic_bgp_instance',
                              ['ip_specific_route'], indirect=['setup_multi_asic_bgp_instance'])
     def test_show_multi_asic_ip_route_specific(
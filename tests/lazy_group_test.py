@@ -0,0 +1,104 @@
+import importlib
+import sys
+from unittest import mock
+
+import click
+import pytest
+from click.testing import CliRunner
+
+import utilities_common.cli as clicommon
+
+
+@click.command()
+def lazy_command():
+    """Command registered through the manifest"""
+    click.echo("lazy")
+
+
+@click.group()
+def lazy_group():
+    """Group registered through the manifest"""
+    pass
+
+
+def plugin_command():
+    """Command registered by the plugins"""
+    pass
+
+
+def make_cli(plugins_loader=None):
+    @click.group(cls=clicommon.LazyAliasedGroup, lazy_commands={
+        'lazy-command': __name__ + ':lazy_command',
+        'lazy-group': __name__ + ':lazy_group',
+        'missing': 'lazy_group_test_missing_module:missing',
+    })
+    def cli():
+        pass
+
+    @cli.command()
+    def version():
+        click.echo("version")
+
+    if plugins_loader is not None:
+        cli.add_lazy_plugins(plugins_loader)
+    return cli
+
+
+def test_lazy_command_import_on_invoke():
+    cli = make_cli()
+    # The module of the command is not imported to list its name
+    assert 'missing' in cli.commands
+    assert sorted(cli.list_commands(None)) == ['lazy-command', 'lazy-group', 'missing', 'version']
+
+    result = CliRunner().invoke(cli, ['lazy-command'])
+    assert result.exit_code == 0
+    assert result.output == "lazy\n"
+    assert cli.commands['lazy-command'] is lazy_command
+    assert 'lazy_group_test_missing_module' not in sys.modules
+
+
+def test_lazy_command_abbreviation():
+    result = CliRunner().invoke(make_cli(), ['lazy-c'])
+    assert result.exit_code == 0
+    assert result.output == "lazy\n"
+
+
+def test_lazy_plugins():
+    plugins_loader = mock.MagicMock()
+    cli = make_cli(plugins_loader)
+
+    # Plugins are not needed by a command which is not a group
+    result = CliRunner().invoke(cli, ['version'])
+    assert result.exit_code == 0
+    plugins_loader.assert_not_called()
+
+    # Plugins may add subcommands to a group
+    ctx = click.Context(cli)
+    assert cli.get_command(ctx, 'lazy-group') is lazy_group
+    plugins_loader.assert_called_once_with()
+
+
+def test_lazy_plugins_unknown_command():
+    cli = make_cli()
+    cli.add_lazy_plugins(lambda: cli.add_command(click.command('plugin')(plugin_command)))
+    assert cli.commands['plugin'].name == 'plugin'
+
+
+def test_manifests():
+    import show.main as show
+    import config.main as config
+    for manifest in (show.SUBCOMMANDS, config.SUBCOMMANDS):
+        for name, target in manifest.items():
+            module_name, attr = target.split(':')
+            assert getattr(importlib.import_module(module_name), attr).name == name
+
+
+def test_subcommand_modules_as_attributes():
+    import show.main as show
+    import config.main as config
+    assert config.vlan is importlib.import_module('config.vlan')
+    assert config.hft is importlib.import_module('config.hft')
+    assert show.vlan is importlib.import_module('show.vlan')
+    for module in (show, config):
+        with pytest.raises(AttributeError):
+            module.no_such_module
@@ -276,6 +276,15 @@ class TestQueueMultiAsic(object):
         print(result)
         assert result == show_queue_counters_all_asics
 
+    def test_queue_counters_json(self):
+        return_code, result = get_result_and_return_code(['queuestat', '--json', '-n', 'asic0'])
+        assert return_code == 0
+        json_output = json.loads(result)
+        assert list(json_output.keys()) == sorted(json_output.keys())
+        assert "UC0" in json_output["Ethernet0"]
+        # The streamed output is identical to a single json_dump of the table
+        assert result == json_dump(json_output) + "\n"
+
     @classmethod
     def teardown_class(cls):
         os.environ["PATH"] = os.pathsep.join(os.environ["PATH"].split(os.pathsep)[:-1])
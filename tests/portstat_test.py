@@ -1,6 +1,8 @@
+import json
 import pytest
 import logging
 import os
+from unittest import mock
 
 import clear.main as clear
 import show.main as show
@@ -82,6 +84,15 @@ BIN14                                   0
 BIN15                                   0
 """
 
+intf_fec_counters_fec_hist_all = """\
+IFACE         BIN0    BIN1    BIN2    BIN3    BIN4    BIN5    BIN6    BIN7    BIN8    BIN9    BIN10    BIN11    BIN12    BIN13    BIN14    BIN15
+---------  -------  ------  ------  ------  ------  ------  ------  ------  ------  ------  -------  -------  -------  -------  -------  -------
+Ethernet0  1000000  900000  800000  700000  600000  500000  400000  300000       0       0        0        0        0        0        0        0
+Ethernet4        0       0       0       0       0       0       0       0       0       0        0        0        0        0        0        0
+Ethernet8        0       0       0       0       0       0       0       0       0       0        0        0        0        0        0        0
+Ethernet9        0       0       0       0       0       0       0       0       0       0        0        0        0        0        0        0
+"""  # noqa: E501
+
 intf_fec_counters_period = """\
 The rates are calculated within 3 seconds period
     IFACE    STATE    FEC_CORR    FEC_UNCORR    FEC_SYMBOL_ERR    FEC_PRE_BER    FEC_POST_BER    FEC_PRE_BER_MAX    FLR(O)    FLR(P) (Accuracy)    FEC_MAX_T
@@ -442,6 +453,19 @@ class TestPortStat(object):
         assert return_code == 0
         assert result == intf_counters_before_clear
 
+    def test_show_intf_counters_in_process(self):
+        # Without the mock databases of the scripts, portstat is called in the show process
+        with mock.patch.dict(os.environ, {"UTILITIES_UNIT_TESTING": "1"}), \
+                mock.patch('utilities_common.cli.subprocess.Popen') as mock_popen:
+            runner = CliRunner()
+            result = runner.invoke(
+                show.cli.commands["interfaces"].commands["counters"], [])
+        print(result.exit_code)
+        print(result.output)
+        assert result.exit_code == 0
+        assert result.output == intf_counters_before_clear
+        mock_popen.assert_not_called()
+
     def test_show_intf_counters_ethernet4(self):
         runner = CliRunner()
         result = runner.invoke(
@@ -497,6 +521,34 @@ class TestPortStat(object):
         assert result.exit_code == 0
         assert result.output == intf_fec_counters_fec_hist
 
+        result = runner.invoke(
+            show.cli.commands["interfaces"].commands["counters"].commands["fec-histogram"], ["Ethernet0", "--json"])
+        print(result.exit_code)
+        print(result.output)
+        assert result.exit_code == 0
+        assert json.loads(result.output) == {"Ethernet0": dict(
+            (line.split()[0], line.split()[1]) for line in intf_fec_counters_fec_hist.splitlines()[2:])}
+
+    def test_show_intf_counters_fec_histogram_all(self):
+        runner = CliRunner()
+        result = runner.invoke(
+            show.cli.commands["interfaces"].commands["counters"].commands["fec-histogram"], [])
+        print(result.exit_code)
+        print(result.output)
+        assert result.exit_code == 0
+        assert result.output == intf_fec_counters_fec_hist_all
+
+        result = runner.invoke(
+            show.cli.commands["interfaces"].commands["counters"].commands["fec-histogram"], ["--json"])
+        print(result.exit_code)
+        print(result.output)
+        assert result.exit_code == 0
+        histograms = json.loads(result.output)
+        assert list(histograms) == ["Ethernet0", "Ethernet4", "Ethernet8", "Ethernet9"]
+        assert list(histograms["Ethernet0"].items()) == \
+            [(line.split()[0], line.split()[1]) for line in intf_fec_counters_fec_hist.splitlines()[2:]]
+        assert set(histograms["Ethernet4"].values()) == {"0"}
+
     def test_show_intf_fec_counters_period(self):
         runner = CliRunner()
         result = runner.invoke(show.cli.commands["interfaces"].commands["counters"].commands["fec-stats"],
@@ -1196,3 +1248,30 @@ class TestPortstatGetDbClient(object):
             assert result_asic1 == mock_db_client_asic1
             assert portstat.db_clients['asic0'] == mock_db_client_asic0
             assert portstat.db_clients['asic1'] == mock_db_client_asic1
+
+    def test_is_gearbox_configured_cached(self):
+        """Test that the gearbox port name map is looked up once per namespace, without KEYS"""
+        from unittest import mock
+        from utilities_common.portstat import Portstat
+        from utilities_common.constants import DEFAULT_NAMESPACE
+
+        portstat = Portstat(namespace=DEFAULT_NAMESPACE, display_option='')
+
+        portstat.db = mock.MagicMock(namespace='asic0')
+        portstat.db.get_db_list.return_value = ['APPL_DB', 'COUNTERS_DB', 'GB_COUNTERS_DB']
+        portstat.db.exists.return_value = True
+        assert portstat.is_gearbox_configured()
+        assert portstat.is_gearbox_configured()
+        portstat.db.exists.assert_called_once_with('GB_COUNTERS_DB', 'COUNTERS_PORT_NAME_MAP')
+        portstat.db.keys.assert_not_called()
+
+        portstat.db = mock.MagicMock(namespace='asic1')
+        portstat.db.get_db_list.return_value = ['APPL_DB', 'COUNTERS_DB', 'GB_COUNTERS_DB']
+        portstat.db.exists.return_value = False
+        assert not portstat.is_gearbox_configured()
+
+        # No gearbox counters DB at all
+        portstat.db = mock.MagicMock(namespace='asic2')
+        portstat.db.get_db_list.return_value = ['APPL_DB', 'COUNTERS_DB']
+        assert not portstat.is_gearbox_configured()
+        portstat.db.exists.assert_not_called()
@@ -3,13 +3,14 @@ import pytest
 import os
 import json
 import logging
+from unittest import mock
 
 import show.main as show
 
 from click.testing import CliRunner
 
 from utilities_common.cli import UserCache
-from utilities_common.cli import json_dump
+from utilities_common.cli import json_dump, json_serial
 
 from .utils import get_result_and_return_code
 from .queuestat_input import assert_show_output
@@ -105,6 +106,55 @@ class TestQueueStat(object):
         assert result == output[format]
         assert return_code == SUCCESS
 
+    def test_queue_counters_fetched_by_port_batch(self, capsys):
+        import utilities_common.queuestat as queuestat
+
+        stat = queuestat.Queuestat(None, None)
+        stat.fetch_all_counters()
+        stat.get_print_all_stat(True, False)
+        expected = remove_timestamp(capsys.readouterr().out)
+
+        batches = []
+        with mock.patch.object(queuestat, 'PORT_FETCH_BATCH_SIZE', 2):
+            stat = queuestat.Queuestat(None, None)
+            fetch_port_batch_counters = stat.fetch_port_batch_counters
+
+            def fetch(ports):
+                fetch_port_batch_counters(ports)
+                batches.append((ports, set(stat.queue_counters)))
+
+            with mock.patch.object(stat, 'fetch_port_batch_counters', fetch):
+                stat.get_print_all_stat(True, False)
+        assert remove_timestamp(capsys.readouterr().out) == expected
+
+        # Only the counters of the queues of a batch are kept in memory
+        assert len(batches) == (len(stat.counter_port_name_map) + 1) // 2
+        for ports, table_ids in batches:
+            assert len(ports) <= 2
+            assert table_ids == {table_id for port in ports for table_id in stat.port_queues_map[port].values()}
+
+    def test_cached_stats_of_previous_version(self, tmp_path, capsys):
+        import utilities_common.queuestat as queuestat
+
+        stat = queuestat.Queuestat(None, None)
+        cnstat_dict = stat.get_cnstat(stat.port_queues_map['Ethernet0'])
+        # The previous versions saved one JSON file per port
+        with open(str(tmp_path / 'queuestatEthernet0'), 'w') as f:
+            json.dump(cnstat_dict, f, default=json_serial)
+
+        with mock.patch.object(queuestat, 'cnstat_fqn_file', str(tmp_path / 'queuestat')):
+            cached = stat.get_cached_stats('Ethernet0')
+            assert cached == json.loads(json.dumps(cnstat_dict, default=json_serial))
+            assert stat.get_cached_stats('Ethernet4') is None
+
+            # Once the namespace is cleared, the files of the ports are ignored
+            stat.save_fresh_stats()
+            capsys.readouterr()
+            stat = queuestat.Queuestat(None, None)
+            cached = stat.get_cached_stats('Ethernet4')
+            assert cached is not None
+            assert stat.get_cached_stats('Ethernet0')['time'] == cached['time']
+
 
 class TestQueueTrimStat(object):
     @classmethod
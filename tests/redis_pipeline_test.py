@@ -0,0 +1,36 @@
+import os
+import sys
+
+from .mock_tables import dbconnector  # noqa: F401
+from swsscommon.swsscommon import SonicV2Connector
+
+test_path = os.path.dirname(os.path.abspath(__file__))
+modules_path = os.path.dirname(test_path)
+sys.path.insert(0, modules_path)
+
+from utilities_common.redis_pipeline import hgetall_bulk, hget_bulk, delete_bulk  # noqa: E402
+
+
+class TestRedisPipeline(object):
+    def setup_method(self):
+        self.db = SonicV2Connector(use_unix_socket_path=False)
+        self.db.connect(self.db.COUNTERS_DB)
+
+    def test_hgetall_bulk(self):
+        keys = ["RATES:oid:0x1000000000012", "RATES:oid:0xdeadbeef", "COUNTERS:oid:0x1000000000012"]
+        fvs_list = hgetall_bulk(self.db, self.db.COUNTERS_DB, keys, batch_size=2)
+        assert len(fvs_list) == 3
+        assert fvs_list[0]["RX_BPS"] == "2.e9"
+        assert fvs_list[1] == {}
+        assert fvs_list[2] == self.db.get_all(self.db.COUNTERS_DB, keys[2])
+
+    def test_hget_bulk(self):
+        keys = ["RATES:oid:0x1000000000012", "RATES:oid:0xdeadbeef"]
+        assert hget_bulk(self.db, self.db.COUNTERS_DB, keys, "RX_PPS") == ["247.e3", None]
+
+    def test_delete_bulk(self):
+        self.db.set(self.db.COUNTERS_DB, "TEST_TABLE:1", "f", "v")
+        self.db.set(self.db.COUNTERS_DB, "TEST_TABLE:2", "f", "v")
+        keys = ["TEST_TABLE:1", "TEST_TABLE:2", "TEST_TABLE:3"]
+        assert delete_bulk(self.db, self.db.COUNTERS_DB, keys) == 2
+        assert not self.db.keys(self.db.COUNTERS_DB, "TEST_TABLE:*")
@@ -168,6 +168,11 @@ class MockSubscriber:
 
 def subscriber_side_effect(db, tbl):
     global subscribers_returned
+    if isinstance(db, ConfigDB):
+        # CONFIG_DB is static in the test data, so nothing to pop
+        subs = MagicMock()
+        subs.pop.return_value = ("", "", None)
+        return subs
     key = "db_{}_{}_tbl_{}".format(db["namespace"], db["name"], tbl)
     if key not in subscribers_returned:
         subscribers_returned[key] = MockSubscriber(db, tbl)
@@ -349,3 +354,57 @@ class TestRouteCheck(object):
             route_check.mitigate_installed_not_offloaded_frr_routes(namespace, missed_frr_rt, rt_appl)
         # Verify that the stdout are suppressed in this function
         assert not mock_stdout.getvalue()
+
+    @pytest.mark.parametrize("test_num", ["0", "2", "4", "5", "6", "8", "10", "11", "12", "13", "16", "17", "18", "21",
+                                          "24", "25", "27", "28", "29", "30", "31", "32"])
+    def test_route_check_daemon(self, mock_dbs, tmp_path, test_num):
+        self.init()
+        ct_data = copy.deepcopy(TEST_DATA[test_num])
+        ct_data[ARGS] += " -d -g 0"
+        set_test_case_data(ct_data)
+        with patch('route_check.ROUTE_CHECK_STATUS_FILE', str(tmp_path / "status.json")):
+            self.run_test(ct_data)
+
+            with patch('sys.argv', ["route_check", "--status"]), \
+                 patch('sys.stdout', new_callable=StringIO):
+                ret, res = route_check.main()
+            self.assert_results(ct_data, ret, res)
+
+    def test_route_index_grace(self, mock_dbs):
+        self.init()
+        ct_data = TEST_DATA['2']
+        set_test_case_data(ct_data)
+        init_db_conns(ct_data[NAMESPACE])
+
+        idx = route_check.RouteIndex(DEFAULTNS, grace_secs=60)
+        idx.drain()
+        assert idx.out_of_sync
+        # Not reported until out of sync past the grace window
+        assert idx.check() == {}
+        assert idx.get_status()["results"] == {}
+
+        idx.grace_secs = 0
+        assert idx.check() == ct_data[RESULT][DEFAULTNS]
+
+    def test_route_index_filters_changed(self, mock_dbs):
+        self.init()
+        ct_data = TEST_DATA['2']
+        set_test_case_data(ct_data)
+        init_db_conns(ct_data[NAMESPACE])
+
+        idx = route_check.RouteIndex(DEFAULTNS, grace_secs=0)
+        idx.drain()
+        idx.check()
+        idx.ignored.add("10.10.196.12/31")
+        assert idx.drain() == 0
+        assert "10.10.196.12/31" in idx.ignored
+
+        # An update of a table read by the filters drops what they justified
+        neigh_subs = idx.filter_subscribers[route_check.FILTER_APPL_TABLES.index('NEIGH_TABLE')]
+        neigh_subs.set_keys.append("Vlan1000:192.168.0.2")
+        assert idx.drain() == 1
+        assert not idx.ignored
+
+    def test_route_status_no_daemon(self, tmp_path):
+        with patch('route_check.ROUTE_CHECK_STATUS_FILE', str(tmp_path / "status.json")):
+            assert route_check.show_status() == (-1, None)
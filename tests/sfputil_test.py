@@ -1,5 +1,6 @@
 import sys
 import os
+import time
 from unittest import mock
 from unittest.mock import MagicMock, patch
 
@@ -1367,6 +1368,238 @@ EEPROM hexdump for port Ethernet4
         assert result.output == 'This functionality is not applicable for RJ45 port Ethernet0.\n'
         assert result.exit_code == EXIT_FAIL
 
+    @patch('sfputil.main.platform_sfputil',
+           MagicMock(is_logical_port=lambda port: port in ('Ethernet0', 'Ethernet4', 'Ethernet8')))
+    @patch('sfputil.main.logical_port_to_physical_port_index', MagicMock(side_effect=lambda port: int(port[8:])))
+    @patch('sfputil.main.is_port_type_rj45', MagicMock(return_value=False))
+    @patch('sfputil.main.is_sfp_present', MagicMock(side_effect=lambda port: port != 'Ethernet8'))
+    @patch('sfputil.main.load_bus_groups', MagicMock(return_value=[[0, 4]]))
+    def test_firmware_download_multi_port(self, tmp_path):
+        image_file = tmp_path / "firmware.bin"
+        image_file.write_bytes(b'\x01' * 1024)
+        downloads = {}
+
+        def download_firmware(port_name, filepath, image, progress):
+            downloads[port_name] = bytes(image)
+            progress(len(image))
+            return 1 if port_name == 'Ethernet0' else 2
+
+        runner = CliRunner()
+        with patch('sfputil.main.download_firmware', download_firmware):
+            result = runner.invoke(sfputil.cli.commands['firmware'].commands['download'],
+                                   ["Ethernet0-8", str(image_file)])
+        assert result.exit_code == EXIT_FAIL
+        assert downloads == {'Ethernet0': b'\x01' * 1024, 'Ethernet4': b'\x01' * 1024}
+        assert 'Ethernet8: SFP EEPROM not detected, skipping' in result.output
+        assert 'Ethernet0: Downloaded 100%' in result.output
+        assert 'Ethernet0  OK' in result.output
+        assert 'Ethernet4  Failed, status 2' in result.output
+
+    @patch('sfputil.main.logical_port_to_physical_port_index', MagicMock(side_effect=lambda port: int(port[8:])))
+    def test_parse_firmware_ports(self):
+        platform_sfputil = MagicMock(is_logical_port=lambda port: port in ('Ethernet0', 'Ethernet4'))
+        with patch('sfputil.main.platform_sfputil', platform_sfputil):
+            assert sfputil.parse_firmware_ports('Ethernet0') is None
+            assert sfputil.parse_firmware_ports('Ethernet4,Ethernet0') == ['Ethernet0', 'Ethernet4']
+            assert sfputil.parse_firmware_ports('Ethernet0-10') == ['Ethernet0', 'Ethernet4']
+            with pytest.raises(SystemExit) as e:
+                sfputil.parse_firmware_ports('Ethernet0,Ethernet2')
+            assert e.value.code == ERROR_INVALID_PORT
+
+    @patch('sfputil.main.platform_sfputil',
+           MagicMock(is_logical_port=lambda port: port in ('Ethernet0', 'Ethernet2', 'Ethernet4', 'Ethernet6')))
+    @patch('sfputil.main.logical_port_to_physical_port_index', MagicMock(return_value=1))
+    @patch('sfputil.main.is_port_type_rj45', MagicMock(return_value=False))
+    @patch('sfputil.main.is_sfp_present', MagicMock(return_value=True))
+    @patch('sfputil.main.load_bus_groups', MagicMock(return_value=[]))
+    def test_firmware_upgrade_breakout_ports(self, tmp_path):
+        image_file = tmp_path / "firmware.bin"
+        image_file.write_bytes(b'\x01' * 1024)
+        upgrade_firmware = MagicMock(return_value=1)
+
+        runner = CliRunner()
+        with patch('sfputil.main.upgrade_firmware', upgrade_firmware):
+            result = runner.invoke(sfputil.cli.commands['firmware'].commands['upgrade'],
+                                   ["Ethernet0-6", str(image_file)])
+        # The 4 subports of the 4x breakout share the transceiver, upgraded once
+        assert result.exit_code == 0
+        assert upgrade_firmware.call_count == 1
+        assert upgrade_firmware.call_args[0][0] == 'Ethernet0'
+
+    def test_bus_worker_pool_serial(self):
+        from sfputil.bus_workers import BusWorkerPool
+        physical_ports = {'Ethernet0': 1, 'Ethernet4': 2, 'Ethernet8': 3}
+        # Without bus groups, the ports are handled one after the other unless max_workers is given
+        pool = BusWorkerPool([])
+        assert pool.group(list(physical_ports), physical_ports.get) == [['Ethernet0', 'Ethernet4', 'Ethernet8']]
+        pool = BusWorkerPool([], max_workers=2)
+        assert pool.group(list(physical_ports), physical_ports.get) == [['Ethernet0'], ['Ethernet4'], ['Ethernet8']]
+        pool = BusWorkerPool([[1, 3]])
+        assert pool.group(list(physical_ports), physical_ports.get) == [['Ethernet0', 'Ethernet8'], ['Ethernet4']]
+
+    def test_bus_worker_pool(self):
+        from sfputil.bus_workers import BusWorkerPool
+        physical_ports = {'Ethernet0': 1, 'Ethernet4': 2, 'Ethernet8': 3, 'Ethernet12': 4}
+        pool = BusWorkerPool([[1, 3]], max_workers=4)
+        groups = pool.group(list(physical_ports), physical_ports.get)
+        assert groups == [['Ethernet0', 'Ethernet8'], ['Ethernet4'], ['Ethernet12']]
+
+        def func(port):
+            if port == 'Ethernet8':
+                sys.exit(EXIT_FAIL)
+            return port
+
+        results = pool.run(func, list(physical_ports), physical_ports.get)
+        assert list(results) == list(physical_ports)
+        assert results['Ethernet0'].value == 'Ethernet0'
+        assert not results['Ethernet8'].ok
+        assert results['Ethernet8'].error.code == EXIT_FAIL
+        assert results['Ethernet12'].ok
+
+    def test_bus_worker_pool_timeout(self):
+        import threading
+        from sfputil.bus_workers import BusWorkerPool
+        physical_ports = {'Ethernet0': 1, 'Ethernet4': 2, 'Ethernet8': 3, 'Ethernet12': 4, 'Ethernet16': 5}
+        pool = BusWorkerPool([[1, 3]], max_workers=1)
+        stuck = threading.Event()
+
+        def func(port):
+            if port == 'Ethernet0':
+                stuck.wait(5)
+            return port
+
+        try:
+            results = pool.run(func, list(physical_ports), physical_ports.get, timeout=0.2)
+        finally:
+            stuck.set()
+        assert results['Ethernet0'].timed_out
+        # The other port of the bus is skipped, the other buses are handled by a new worker
+        assert results['Ethernet8'].timed_out
+        assert str(results['Ethernet8'].error) == "Skipped, another port of the bus timed out"
+        for port in ('Ethernet4', 'Ethernet12', 'Ethernet16'):
+            assert results[port].ok and results[port].value == port
+
+    def test_bus_worker_pool_serial_timeout(self):
+        import threading
+        from sfputil.bus_workers import BusWorkerPool
+        physical_ports = {'Ethernet0': 1, 'Ethernet4': 2, 'Ethernet8': 3}
+        pool = BusWorkerPool([])
+        stuck = threading.Event()
+
+        def func(port):
+            if port == 'Ethernet4':
+                stuck.wait(5)
+            return port
+
+        try:
+            results = pool.run(func, list(physical_ports), physical_ports.get, timeout=0.2)
+        finally:
+            stuck.set()
+        # Without bus groups, only the stuck port times out and the ports after it are still read
+        assert results['Ethernet4'].timed_out
+        assert str(results['Ethernet4'].error) == "Timed out after 0.2s"
+        for port in ('Ethernet0', 'Ethernet8'):
+            assert results[port].ok and results[port].value == port
+
+    def test_eeprom_cache(self, tmp_path):
+        from sfputil.eeprom_cache import EepromCache
+        mock_sfp = MagicMock()
+        mock_sfp.read_eeprom = MagicMock(side_effect=lambda offset, size: bytearray(range(size)))
+        cache = EepromCache(60, str(tmp_path))
+
+        assert cache.read_eeprom(mock_sfp, 1, 128, 128) == bytearray(range(128))
+        assert cache.read_eeprom(mock_sfp, 1, 128, 128) == bytearray(range(128))
+        assert mock_sfp.read_eeprom.call_count == 1
+        # Other pages and ports are read from the transceiver
+        cache.read_eeprom(mock_sfp, 1, 256, 128)
+        cache.read_eeprom(mock_sfp, 2, 128, 128)
+        assert mock_sfp.read_eeprom.call_count == 3
+
+        cache.remove(1)
+        cache.read_eeprom(mock_sfp, 1, 128, 128)
+        assert mock_sfp.read_eeprom.call_count == 4
+
+        # Expired pages are read again
+        with patch('sfputil.eeprom_cache.time.time', MagicMock(return_value=time.time() + 61)):
+            cache.read_eeprom(mock_sfp, 1, 128, 128)
+        assert mock_sfp.read_eeprom.call_count == 5
+
+        # Failed reads are not cached
+        mock_sfp.read_eeprom = MagicMock(return_value=None)
+        assert cache.read_eeprom(mock_sfp, 3, 0, 128) is None
+        assert cache.read_eeprom(mock_sfp, 3, 0, 128) is None
+        assert mock_sfp.read_eeprom.call_count == 2
+
+    def test_eeprom_cache_get_existing(self, tmp_path):
+        from sfputil.eeprom_cache import EepromCache
+        from utilities_common.cli import UserCache
+        with patch.object(UserCache, 'CACHE_DIR', str(tmp_path)):
+            # The cache directory is not created by write-eeprom
+            assert EepromCache.get_existing() is None
+            assert not os.listdir(str(tmp_path))
+            cache = EepromCache(60)
+            assert EepromCache.get_existing().cache_dir == cache.cache_dir
+
+    @patch('sfputil.main.platform_chassis')
+    @patch('sfputil.main.platform_sfputil')
+    @patch('sfputil.main.logical_port_name_to_physical_port_list', MagicMock(side_effect=lambda port: [int(port[8:])]))
+    @patch('sfputil.main.load_bus_groups', MagicMock(return_value=[[0, 4]]))
+    def test_show_presence_all_ports(self, mock_sfputil, mock_chassis):
+        import threading
+        mock_sfputil.logical = ['Ethernet8', 'Ethernet4', 'Ethernet0', 'Ethernet12']
+        stuck = threading.Event()
+
+        def get_sfp(physical_port):
+            mock_sfp = MagicMock()
+            if physical_port == 0:
+                mock_sfp.get_presence = MagicMock(side_effect=lambda: stuck.wait(5))
+            else:
+                mock_sfp.get_presence = MagicMock(return_value=physical_port != 8)
+            return mock_sfp
+
+        mock_chassis.get_sfp = MagicMock(side_effect=get_sfp)
+        runner = CliRunner()
+        try:
+            result = runner.invoke(sfputil.cli.commands['show'].commands['presence'], ["--timeout", "1"])
+        finally:
+            stuck.set()
+        assert result.exit_code == 0
+        expected_output = """Port        Presence
+----------  ------------------------------------------
+Ethernet0   Timed out after 1s
+Ethernet4   Skipped, another port of the bus timed out
+Ethernet8   Not present
+Ethernet12  Present
+"""
+        assert result.output == expected_output
+
+    @patch('sfputil.main.platform_chassis')
+    @patch('sfputil.main.logical_port_to_physical_port_index', MagicMock(return_value=1))
+    @patch('sfputil.main.platform_sfputil', MagicMock(is_logical_port=MagicMock(return_value=1)))
+    @patch('sfputil.main.is_port_type_rj45', MagicMock(return_value=False))
+    def test_show_eeprom_hexdump_cache(self, mock_chassis, tmp_path):
+        from sfputil.eeprom_cache import EepromCache
+        mock_sfp = MagicMock()
+        mock_api = MagicMock()
+        mock_chassis.get_sfp = MagicMock(return_value=mock_sfp)
+        mock_sfp.get_presence.return_value = True
+        mock_sfp.get_xcvr_api = MagicMock(return_value=mock_api)
+        mock_sfp.read_eeprom = MagicMock(side_effect=lambda offset, size: bytearray(size))
+
+        runner = CliRunner()
+        with patch('sfputil.main.EepromCache', lambda ttl: EepromCache(ttl, str(tmp_path))), \
+                patch('sfputil.main.isinstance', MagicMock(side_effect=[True, True])):
+            result = runner.invoke(sfputil.cli.commands['show'].commands['eeprom-hexdump'],
+                                   ["-p", "Ethernet0", "-n", "0", "--cache-ttl", "60"])
+            assert result.exit_code == 0
+            output = result.output
+            result = runner.invoke(sfputil.cli.commands['show'].commands['eeprom-hexdump'],
+                                   ["-p", "Ethernet0", "-n", "0", "--cache-ttl", "60"])
+        assert result.exit_code == 0
+        assert result.output == output
+        # Lower and upper page 0h are read once
+        assert mock_sfp.read_eeprom.call_count == 2
+
     @patch('sfputil.main.is_sfp_present', MagicMock(return_value=True))
     @patch('sfputil.main.is_port_type_rj45', MagicMock(return_value=False))
     @patch('sfputil.main.run_firmware', MagicMock(return_value=1))
@@ -29,3 +29,28 @@ class TestUtilitiesDb(object):
         mock_multi_asic.is_multi_asic.assert_called()
         mock_sonic_db_config.isGlobalInit.assert_not_called()
         mock_sonic_db_config.initializeGlobalConfig.assert_not_called()
+
+    @mock.patch('utilities_common.db.ConfigDBConnector')
+    @mock.patch('utilities_common.db.multi_asic')
+    def test_utilities_db_lazy_connect(self, mock_multi_asic, mock_config_db_connector):
+        mock_multi_asic.is_multi_asic.return_value = False
+        db = Db()
+        mock_config_db_connector.assert_not_called()
+        assert db.cfgdb is db.cfgdb_clients['']
+        mock_config_db_connector.return_value.connect.assert_called_once()
+        assert list(db.cfgdb_clients) == ['']
+        assert len(db.connections) == 1
+
+    @mock.patch('utilities_common.db.multi_asic_ns_choices', return_value=['asic0', 'asic1'])
+    @mock.patch('utilities_common.db.SonicDBConfig')
+    @mock.patch('utilities_common.db.multi_asic')
+    def test_utilities_db_lazy_connect_multi_asic(self, mock_multi_asic, mock_sonic_db_config, mock_ns_choices):
+        mock_multi_asic.is_multi_asic.return_value = True
+        db = Db()
+        assert list(db.cfgdb_clients) == ['', 'asic0', 'asic1']
+        mock_multi_asic.connect_config_db_for_ns.assert_not_called()
+        mock_multi_asic.connect_to_all_dbs_for_ns.assert_not_called()
+        assert db.cfgdb_clients['asic1'] is mock_multi_asic.connect_config_db_for_ns.return_value
+        assert db.cfgdb_clients['asic1'] is db.cfgdb_clients['asic1']
+        mock_multi_asic.connect_config_db_for_ns.assert_called_once_with('asic1')
+        mock_multi_asic.connect_to_all_dbs_for_ns.assert_not_called()
@@ -1,6 +1,8 @@
+import contextlib
 import ipaddress
 import json
 import re
+import subprocess
 import sys
 
 import click
@@ -241,6 +243,16 @@ def run_bgp_command(vtysh_cmd, bgp_namespace=multi_asic.DEFAULT_NAMESPACE,
     return output
 
 
+def route_nexthops_to_alias(info, iface_alias_converter):
+    """Replace the interface names of the nexthops of the route entries info with their aliases"""
+    for entry in info:
+        for nexthop in entry.get('nexthops', []):
+            if 'interfaceName' in nexthop:
+                alias = iface_alias_converter.name_to_alias(nexthop['interfaceName'])
+                if alias is not None:
+                    nexthop['interfaceName'] = alias
+
+
 def run_bgp_show_command(vtysh_cmd, bgp_namespace=multi_asic.DEFAULT_NAMESPACE, exit_on_fail=True):
     output = run_bgp_command(vtysh_cmd, bgp_namespace, constants.RVTYSH_COMMAND, exit_on_fail)
     # handle the the alias mode in the following code
@@ -249,19 +261,34 @@ def run_bgp_show_command(vtysh_cmd, bgp_namespace=multi_asic.DEFAULT_NAMESPACE,
             iface_alias_converter = clicommon.InterfaceAliasConverter()
             route_info =json.loads(output)
             for route, info in route_info.items():
-                for i in range(0, len(info)):
-                    if 'nexthops' in info[i]:
-                        for j in range(0, len(info[i]['nexthops'])):
-                            intf_name = ""
-                            if 'interfaceName' in info[i]['nexthops'][j]:
-                                intf_name  = info[i]['nexthops'][j]['interfaceName']
-                                alias = iface_alias_converter.name_to_alias(intf_name)
-                                if alias is not None:
-                                    info[i]['nexthops'][j]['interfaceName'] = alias 
+                route_nexthops_to_alias(info, iface_alias_converter)
             output= json.dumps(route_info)
     return output
 
 
+@contextlib.contextmanager
+def open_bgp_show_command(vtysh_cmd, bgp_namespace=multi_asic.DEFAULT_NAMESPACE):
+    """
+    Run a vtysh show command whose output is read while it is produced, so that
+    large outputs like the JSON route tables can be parsed incrementally
+    instead of being held in memory.
+    Yields the Popen of the command: its stdout is a binary stream supporting
+    peek(), and its returncode is set when the context exits.
+    """
+    bgp_instance_id = []
+    if bgp_namespace is not multi_asic.DEFAULT_NAMESPACE:
+        bgp_instance_id = ['-n', str(multi_asic.get_asic_id_from_name(bgp_namespace))]
+
+    cmd = ['sudo', constants.RVTYSH_COMMAND] + bgp_instance_id + ['-c', vtysh_cmd]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    try:
+        yield proc
+    finally:
+        # vtysh gets a SIGPIPE if its output was not read to the end
+        proc.stdout.close()
+        proc.wait()
+
+
 def get_bgp_summary_from_all_bgp_instances(af, namespace, display, vrf):
 
     device = multi_asic_util.MultiAsic(display, namespace)
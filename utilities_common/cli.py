@@ -1,5 +1,10 @@
+import codecs
 import configparser
+import contextlib
 import datetime
+import importlib
+import io
+import locale
 import os
 import re
 import subprocess
@@ -11,11 +16,21 @@ import json
 import lazy_object_proxy
 import netaddr
 
+from collections.abc import MutableMapping
 from natsort import natsorted
 from sonic_py_common import multi_asic
 from utilities_common.db import Db
 from utilities_common.general import load_db_config
 VLAN_SUB_INTERFACE_SEPARATOR = '.'
+# Maximum size of the blocks of output read by run_command_in_alias_mode
+ALIAS_MODE_READ_SIZE = 64 * 1024
+# Modules of the stat tools whose main function is called in-process by
+# run_command, rather than run by their script in a new Python interpreter
+STAT_COMMAND_MODULES = {
+    'pfcstat': 'utilities_common.pfcstat',
+    'portstat': 'utilities_common.portstat',
+    'queuestat': 'utilities_common.queuestat',
+}
 
 pass_db = click.make_pass_decorator(Db, ensure=True)
 
@@ -126,6 +141,108 @@ class AliasedGroup(click.Group):
         ctx.fail('Too many matches: %s' % ', '.join(sorted(matches)))
 
 
+class LazyCommands(MutableMapping):
+    """{name: command} mapping of a click group, which imports the command of
+       a manifest entry "module:attribute" on its first access only.
+       The plugins of the group are loaded when a name is looked up which is
+       neither a command nor in the manifest, or when all the names are listed.
+    """
+    def __init__(self, manifest=None, commands=None):
+        self.manifest = dict(manifest or {})
+        self.commands = dict(commands or {})
+        self.plugins_loader = None
+
+    def add_lazy(self, name, target):
+        self.manifest[name] = target
+
+    def set_plugins_loader(self, load):
+        self.plugins_loader = load
+
+    def load_plugins(self):
+        load, self.plugins_loader = self.plugins_loader, None
+        if load is not None:
+            load()
+
+    def __getitem__(self, name):
+        if name not in self.commands:
+            if name not in self.manifest:
+                self.load_plugins()
+                if name not in self.commands:
+                    raise KeyError(name)
+            else:
+                module_name, attr = self.manifest[name].split(':')
+                self.commands[name] = getattr(importlib.import_module(module_name), attr)
+        return self.commands[name]
+
+    def __setitem__(self, name, command):
+        self.manifest.pop(name, None)
+        self.commands[name] = command
+
+    def __delitem__(self, name):
+        if name in self.commands:
+            del self.commands[name]
+        else:
+            del self.manifest[name]
+
+    def __contains__(self, name):
+        return name in self.commands or name in self.manifest
+
+    def __iter__(self):
+        self.load_plugins()
+        return iter(list(self.commands) + [name for name in self.manifest if name not in self.commands])
+
+    def __len__(self):
+        self.load_plugins()
+        return len(self.commands) + len(self.manifest)
+
+
+class LazyGroupMixin(object):
+    """Mixin of the click groups whose subcommands are imported when invoked only.
+       lazy_commands is the manifest {name: "module:attribute"} of the subcommands
+       defined in other modules.
+    """
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commands = LazyCommands(lazy_commands, self.commands)
+
+    def add_lazy_command(self, name, target):
+        self.commands.add_lazy(name, target)
+
+    def add_lazy_plugins(self, load):
+        """Defer loading the plugins of the group, load() registers them"""
+        self.commands.set_plugins_loader(load)
+
+    def get_command(self, ctx, cmd_name):
+        rv = super().get_command(ctx, cmd_name)
+        # Plugins may add subcommands to the groups
+        if isinstance(rv, click.Group):
+            self.commands.load_plugins()
+        return rv
+
+
+class LazyAliasedGroup(LazyGroupMixin, AliasedGroup):
+    pass
+
+
+class LazyAbbreviationGroup(LazyGroupMixin, AbbreviationGroup):
+    pass
+
+
+def lazy_module_getattr(module_name, lazy_commands):
+    """Return the module __getattr__ of the module defining a lazy group, which
+       imports the modules of the manifest entries "module:attribute" on first use,
+       so that they stay reachable as attributes of that module
+    """
+    package = module_name.rpartition('.')[0]
+    modules = {target.split(':')[0] for target in lazy_commands}
+
+    def __getattr__(name):
+        if '{}.{}'.format(package, name) in modules:
+            return importlib.import_module('{}.{}'.format(package, name))
+        raise AttributeError("module '{}' has no attribute '{}'".format(module_name, name))
+    return __getattr__
+
+
 class InterfaceAliasConverter(object):
     """Class which handles conversion between interface name and alias"""
 
@@ -198,6 +315,78 @@ class InterfaceAliasConverter(object):
 iface_alias_converter = lazy_object_proxy.Proxy(lambda: InterfaceAliasConverter())
 
 
+class AliasTranslator(object):
+    """
+    Translation of SONiC interface names into vendor aliases in the output of
+    the commands run in alias mode.
+    The name to alias map and the aliases padded to the width of the alias
+    columns are built once, and whole blocks of output are translated with a
+    single compiled pattern rather than one pattern per port.
+    """
+
+    # A word at the start of a line or after whitespace, followed by the end
+    # of a line, whitespace, or a comma and whitespace
+    WORD_PATTERN = re.compile(r'(?<!\S)[^\s,]+(?=,?\s|$)', re.MULTILINE)
+
+    def __init__(self, converter):
+        self.alias_max_length = converter.alias_max_length
+        self.aliases = {}
+        for port_name, port in converter.port_dict.items():
+            if port.get('alias'):
+                self.aliases[port_name] = port['alias']
+        self.padded_aliases = {port_name: alias.rjust(self.alias_max_length)
+                               for port_name, alias in self.aliases.items()}
+
+    def name_to_alias(self, interface_name):
+        """Same as InterfaceAliasConverter.name_to_alias, with a lookup of the port"""
+        if interface_name is None:
+            return None
+        port_name, separator, vlan_id = interface_name.partition(VLAN_SUB_INTERFACE_SEPARATOR)
+        return self.aliases.get(port_name, port_name) + separator + vlan_id
+
+    def translate_rows(self, rows, index=0):
+        """
+        Structured output: replace the interface names in the column index of
+        table rows with their aliases, for the tools to print aliases directly
+        instead of having their text output translated
+        :return list of the translated rows, as lists
+        """
+        return [list(row[:index]) + [self.name_to_alias(row[index])] + list(row[index + 1:]) for row in rows]
+
+    def _word_to_alias(self, match):
+        word = match.group(0)
+        return self.aliases.get(word, word)
+
+    def translate(self, text):
+        """Replace the port names which are words of text with their aliases"""
+        return self.WORD_PATTERN.sub(self._word_to_alias, text)
+
+    def translate_column(self, line, index):
+        """
+        Replace the port name in the column index of a table line with its
+        alias, right aligned to the width of the aliases. The dashes under the
+        header of the column are extended to that width.
+        """
+        if line.startswith("---"):
+            word = line.split()
+            dword = word[index]
+            if (len(dword) > self.alias_max_length):
+                dword = dword[:len(dword) - self.alias_max_length]
+            word[index] = dword.rjust(self.alias_max_length, '-')
+            line = '  ' .join(word)
+
+        word = line.split()
+        if word:
+            interface_name = word[index].replace(':', '')
+            if interface_name in self.padded_aliases:
+                line = line.replace(interface_name, self.padded_aliases[interface_name], 1)
+        return line
+
+
+# Lazy global instance of the alias translator, built once per process
+iface_alias_translator = lazy_object_proxy.Proxy(lambda: AliasTranslator(iface_alias_converter))
+
+
 def get_interface_naming_mode():
     mode = os.getenv('SONIC_CLI_IFACE_MODE')
     if mode is None:
@@ -587,36 +776,103 @@ def print_output_in_alias_mode(output, index):
     """Convert and print all instances of SONiC interface
        name to vendor-sepecific interface aliases.
     """
+    click.echo(iface_alias_translator.translate_column(output, index).rstrip('\n'))
+
+
+def get_alias_mode_line_translator(command_str):
+    """
+    Get the function translating a line of the output of command_str in alias
+    mode, with the column of the interface names and the headers to align for it
+    :return function of a line returning it translated, or None if the output
+            gets the default conversion
+    """
+    def column(index, headers=(), lstrip=True):
+        headers = [(header, header.rjust(iface_alias_translator.alias_max_length)) for header in headers]
+
+        def translate_line(output):
+            if lstrip:
+                output = output.lstrip()
+            for header, aligned_header in headers:
+                if output.startswith(header):
+                    output = output.replace(header, aligned_header)
+                    break
+            return iface_alias_translator.translate_column(output, index)
+        return translate_line
+
+    if command_str.startswith("portstat"):
+        """Show interface counters"""
+        return column(0, ["IFACE"])
+
+    elif command_str.startswith("intfstat"):
+        """Show RIF counters"""
+        return column(0, ["IFACE"])
+
+    elif command_str == "pfcstat":
+        """Show pfc counters"""
+        return column(0, ["Port Tx", "Port Rx"])
+
+    elif (command_str.startswith("sudo sfputil show eeprom")):
+        """Show interface transceiver eeprom"""
+        return column(0, lstrip=False)
+
+    elif (command_str.startswith("sudo sfputil show")):
+        """Show interface transceiver lpmode,
+           presence
+        """
+        return column(0, ["Port"])
+
+    elif command_str == "sudo lldpshow":
+        """Show lldp table"""
+        return column(0, ["LocalPort"])
+
+    elif command_str.startswith("queuestat"):
+        """Show queue counters"""
+        return column(0, ["Port"])
+
+    elif command_str == "fdbshow":
+        """Show mac"""
+        def translate_fdb_line(output):
+            output = output.lstrip()
+            if output.startswith("No."):
+                output = "  " + output
+                output = re.sub(
+                            'Type', '      Type', output)
+            elif output[:1].isdigit():
+                output = "    " + output
+            return iface_alias_translator.translate_column(output, 3)
+        return translate_fdb_line
+
+    elif command_str.startswith("nbrshow"):
+        """Show arp"""
+        def translate_arp_line(output):
+            output = output.lstrip()
+            if "Vlan" in output:
+                output = output.replace('Vlan', '  Vlan')
+            return iface_alias_translator.translate_column(output, 2)
+        return translate_arp_line
+
+    elif command_str.startswith("sudo ipintutil"):
+        """Show ip(v6) int"""
+        return column(0, ["Interface"])
+
+    """
+    Default command conversion
+    Search for port names either at the start of a line or preceded immediately by
+    whitespace and followed immediately by either the end of a line or whitespace
+    or a comma followed by whitespace
+    """
+    return None
 
-    alias_name = ""
-    interface_name = ""
-
-    # Adjust tabulation width to length of alias name
-    if output.startswith("---"):
-        word = output.split()
-        dword = word[index]
-        if (len(dword) > iface_alias_converter.alias_max_length):
-            dword = dword[:len(dword) - iface_alias_converter.alias_max_length]
-        underline = dword.rjust(iface_alias_converter.alias_max_length,
-                                '-')
-        word[index] = underline
-        output = '  ' .join(word)
-
-    # Replace SONiC interface name with vendor alias
-    word = output.split()
-    if word:
-        interface_name = word[index]
-        interface_name = interface_name.replace(':', '')
-    for port_name in natsorted(list(iface_alias_converter.port_dict.keys())):
-        if interface_name == port_name:
-            alias_name = iface_alias_converter.port_dict[port_name]['alias']
-    if alias_name:
-        if len(alias_name) < iface_alias_converter.alias_max_length:
-            alias_name = alias_name.rjust(
-                                iface_alias_converter.alias_max_length)
-        output = output.replace(interface_name, alias_name, 1)
-
-    click.echo(output.rstrip('\n'))
+
+def echo_in_alias_mode(text, translate_line):
+    """Print complete lines of output with the SONiC interface names translated"""
+    if not text.endswith('\n'):
+        text += '\n'
+    if translate_line is None:
+        click.echo(iface_alias_translator.translate(text), nl=False)
+    else:
+        click.echo(''.join(translate_line(line + '\n').rstrip('\n') + '\n'
+                           for line in text[:-1].split('\n')), nl=False)
 
 
 def run_command_in_alias_mode(command, shell=False):
@@ -627,119 +883,69 @@ def run_command_in_alias_mode(command, shell=False):
         command_str = ' '.join(command)
     else:
         command_str = command
-    process = subprocess.Popen(command, text=True, shell=shell, stdout=subprocess.PIPE)
+    translate_line = get_alias_mode_line_translator(command_str)
+
+    result = None if shell else call_stat_command(command)
+    if result is not None:
+        output, rc = result
+        if output:
+            echo_in_alias_mode(output, translate_line)
+        if rc != 0:
+            sys.exit(rc)
+        return
+
+    process = subprocess.Popen(command, shell=shell, stdout=subprocess.PIPE)
 
+    # The output is translated by blocks of complete lines, as it is produced
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(locale.getpreferredencoding(False))(), translate=True)
+    pending = ''
     while True:
-        output = process.stdout.readline()
-        if output == '' and process.poll() is not None:
+        data = process.stdout.read1(ALIAS_MODE_READ_SIZE)
+        text = pending + decoder.decode(data, final=not data)
+        pending = ''
+        if data:
+            end = text.rfind('\n') + 1
+            text, pending = text[:end], text[end:]
+        if text:
+            echo_in_alias_mode(text, translate_line)
+        if not data:
             break
 
-        if output:
-            index = 1
-            raw_output = output
-            output = output.lstrip()
+    rc = process.wait()
+    if rc != 0:
+        sys.exit(rc)
+
 
-            if command_str.startswith("portstat"):
-                """Show interface counters"""
-                index = 0
-                if output.startswith("IFACE"):
-                    output = output.replace("IFACE", "IFACE".rjust(
-                               iface_alias_converter.alias_max_length))
-                print_output_in_alias_mode(output, index)
-
-            elif command_str.startswith("intfstat"):
-                """Show RIF counters"""
-                index = 0
-                if output.startswith("IFACE"):
-                    output = output.replace("IFACE", "IFACE".rjust(
-                               iface_alias_converter.alias_max_length))
-                print_output_in_alias_mode(output, index)
-
-            elif command_str == "pfcstat":
-                """Show pfc counters"""
-                index = 0
-                if output.startswith("Port Tx"):
-                    output = output.replace("Port Tx", "Port Tx".rjust(
-                                iface_alias_converter.alias_max_length))
-
-                elif output.startswith("Port Rx"):
-                    output = output.replace("Port Rx", "Port Rx".rjust(
-                                iface_alias_converter.alias_max_length))
-                print_output_in_alias_mode(output, index)
-
-            elif (command_str.startswith("sudo sfputil show eeprom")):
-                """Show interface transceiver eeprom"""
-                index = 0
-                print_output_in_alias_mode(raw_output, index)
-
-            elif (command_str.startswith("sudo sfputil show")):
-                """Show interface transceiver lpmode,
-                   presence
-                """
-                index = 0
-                if output.startswith("Port"):
-                    output = output.replace("Port", "Port".rjust(
-                               iface_alias_converter.alias_max_length))
-                print_output_in_alias_mode(output, index)
-
-            elif command_str == "sudo lldpshow":
-                """Show lldp table"""
-                index = 0
-                if output.startswith("LocalPort"):
-                    output = output.replace("LocalPort", "LocalPort".rjust(
-                               iface_alias_converter.alias_max_length))
-                print_output_in_alias_mode(output, index)
-
-            elif command_str.startswith("queuestat"):
-                """Show queue counters"""
-                index = 0
-                if output.startswith("Port"):
-                    output = output.replace("Port", "Port".rjust(
-                               iface_alias_converter.alias_max_length))
-                print_output_in_alias_mode(output, index)
-
-            elif command_str == "fdbshow":
-                """Show mac"""
-                index = 3
-                if output.startswith("No."):
-                    output = "  " + output
-                    output = re.sub(
-                                'Type', '      Type', output)
-                elif output[0].isdigit():
-                    output = "    " + output
-                print_output_in_alias_mode(output, index)
-
-            elif command_str.startswith("nbrshow"):
-                """Show arp"""
-                index = 2
-                if "Vlan" in output:
-                    output = output.replace('Vlan', '  Vlan')
-                print_output_in_alias_mode(output, index)
-            elif command_str.startswith("sudo ipintutil"):
-                """Show ip(v6) int"""
-                index = 0
-                if output.startswith("Interface"):
-                    output = output.replace("Interface", "Interface".rjust(
-                        iface_alias_converter.alias_max_length))
-                print_output_in_alias_mode(output, index)
+def call_stat_command(command):
+    """
+    Call the main function of a stat tool like portstat in-process, with the
+    arguments of command, instead of forking a new Python interpreter which
+    imports the same modules and connects to the databases again.
+    :return (output, returncode) of the tool, or None if command has to be run
+            as a subprocess
+    """
+    if not command or command[0] not in STAT_COMMAND_MODULES:
+        return None
+    # The scripts install the mock databases of the unit tests themselves
+    if os.environ.get("UTILITIES_UNIT_TESTING") == "2":
+        return None
 
+    module = importlib.import_module(STAT_COMMAND_MODULES[command[0]])
+    output = io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(output):
+        try:
+            module.main(command[1:], prog_name=command[0])
+        except SystemExit as e:
+            if e.code is None:
+                returncode = 0
+            elif isinstance(e.code, int):
+                returncode = e.code
             else:
-                """
-                Default command conversion
-                Search for port names either at the start of a line or preceded immediately by
-                whitespace and followed immediately by either the end of a line or whitespace
-                or a comma followed by whitespace
-                """
-                converted_output = raw_output
-                for port_name in iface_alias_converter.port_dict:
-                    converted_output = re.sub(r"(^|\s){}($|,{{0,1}}\s)".format(port_name),
-                                              r"\1{}\2".format(iface_alias_converter.name_to_alias(port_name)),
-                                              converted_output)
-                click.echo(converted_output.rstrip('\n'))
-
-    rc = process.poll()
-    if rc != 0:
-        sys.exit(rc)
+                click.echo(e.code, err=True)
+                returncode = 1
+    return output.getvalue(), returncode
 
 
 def run_command(command, display_cmd=False, ignore_error=False, return_cmd=False, interactive_mode=False, shell=False):
@@ -770,6 +976,17 @@ def run_command(command, display_cmd=False, ignore_error=False, return_cmd=False
             "show ip|ipv6 route", command_str)):
         return run_command_in_alias_mode(command, shell=shell)
 
+    result = None if shell or interactive_mode else call_stat_command(command)
+    if result is not None:
+        if return_cmd:
+            return result
+        out, returncode = result
+        if len(out) > 0:
+            click.echo(out.rstrip('\n'))
+        if returncode != 0 and not ignore_error:
+            sys.exit(returncode)
+        return
+
     proc = subprocess.Popen(command, shell=shell, text=True, stdout=subprocess.PIPE)
 
     if return_cmd:
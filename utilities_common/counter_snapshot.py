@@ -0,0 +1,230 @@
+"""
+Compact binary snapshots of counters, used as the baselines saved by the
+clear commands of the *stat tools.
+
+A snapshot holds {object: row} entries, a row being the counters of the object
+either as a dict or as a list/tuple (e.g. a namedtuple), along with scalar
+entries such as 'time'. It is saved as:
+
+    magic | header length | JSON header | uint64 columns | uint8 kind columns
+
+The header holds the object names, the counter (column) names and the scalar
+entries. Each counter is a fixed-width column indexed by the position of the
+object in the header, so loading a snapshot only parses the header and maps
+the file; rows are decoded on access only. Values which are not unsigned
+integers (e.g. 'N/A') are kept in the header and flagged in the kind column.
+"""
+
+import array
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping
+
+from utilities_common.cli import json_serial
+
+MAGIC = b'CNTSNAP1'
+HEADER_LEN = struct.Struct('<I')
+ALIGNMENT = 8
+UINT64_MAX = (1 << 64) - 1
+
+# Kinds of the values stored in the columns
+ABSENT = 0
+INT_STR = 1  # Unsigned integer as a decimal string, as counters are stored in COUNTERS_DB
+INT = 2
+OTHER = 3  # Any other value, stored in the header
+
+
+def _is_row(value):
+    return isinstance(value, (Mapping, list, tuple))
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _encode(value, others):
+    if isinstance(value, str):
+        if value.isascii() and value.isdigit() and (value == '0' or value[0] != '0'):
+            number = int(value)
+            if number <= UINT64_MAX:
+                return INT_STR, number
+    elif type(value) is int and 0 <= value <= UINT64_MAX:
+        return INT, value
+    others.append(value)
+    return OTHER, len(others) - 1
+
+
+def dump(cnstat_dict, path):
+    """
+    Save cnstat_dict as a snapshot in path.
+    The snapshot is written to a temporary file renamed to path, so readers
+    never see a partially written snapshot.
+    """
+    names = []
+    rows = []
+    scalars = {}
+    for key, value in cnstat_dict.items():
+        if _is_row(value):
+            names.append(key)
+            rows.append(value)
+        else:
+            scalars[key] = value
+
+    columns = {}
+    list_rows = []
+    for index, row in enumerate(rows):
+        if isinstance(row, Mapping):
+            fields = row.keys()
+        else:
+            fields = range(len(row))
+            list_rows.append(index)
+        for field in fields:
+            if field not in columns:
+                columns[field] = len(columns)
+
+    count = len(rows)
+    values = [array.array('Q', bytes(8 * count)) for _ in columns]
+    kinds = [array.array('B', bytes(count)) for _ in columns]
+    others = []
+    for index, row in enumerate(rows):
+        items = row.items() if isinstance(row, Mapping) else enumerate(row)
+        for field, value in items:
+            column = columns[field]
+            kinds[column][index], values[column][index] = _encode(value, others)
+
+    header = json.dumps({
+        'names': [list(name) if isinstance(name, tuple) else name for name in names],
+        'columns': list(columns),
+        'lists': list_rows,
+        'scalars': scalars,
+        'others': others,
+    }, default=json_serial).encode()
+
+    prefix = MAGIC + HEADER_LEN.pack(len(header)) + header
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(prefix)
+            f.write(bytes(_align(len(prefix)) - len(prefix)))
+            for column in values:
+                column.tofile(f)
+            for column in kinds:
+                column.tofile(f)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load(path):
+    """
+    Load the snapshot saved in path.
+    :return CounterSnapshot, or the dict of a JSON baseline saved by a previous version
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            f.seek(0)
+            return json.load(f)
+        return CounterSnapshot(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class CounterSnapshot(Mapping):
+    """
+    Read-only {object: row} mapping over a snapshot file, the same as the dict
+    the snapshot was saved from after a JSON round trip (tuples become lists).
+    """
+    def __init__(self, buf):
+        start = len(MAGIC) + HEADER_LEN.size
+        header_len, = HEADER_LEN.unpack_from(buf, len(MAGIC))
+        header = json.loads(buf[start:start + header_len])
+
+        self.names = [tuple(name) if isinstance(name, list) else name for name in header['names']]
+        self.index = {name: index for index, name in enumerate(self.names)}
+        self.columns = {column: index for index, column in enumerate(header['columns'])}
+        self.list_rows = set(header['lists'])
+        self.scalars = header['scalars']
+        self.others = header['others']
+        self.rows = {}
+
+        count = len(self.names)
+        view = memoryview(buf)
+        offset = _align(start + header_len)
+        self.values = []
+        for _ in self.columns:
+            self.values.append(view[offset:offset + 8 * count].cast('Q'))
+            offset += 8 * count
+        self.kinds = []
+        for _ in self.columns:
+            self.kinds.append(view[offset:offset + count])
+            offset += count
+
+    def _value(self, column, index):
+        kind = self.kinds[column][index]
+        if kind == INT_STR:
+            return str(self.values[column][index])
+        if kind == INT:
+            return self.values[column][index]
+        return self.others[self.values[column][index]]
+
+    def row(self, index):
+        """Decode the row of the object at index"""
+        if index not in self.rows:
+            fields = [(field, column) for field, column in self.columns.items()
+                      if self.kinds[column][index] != ABSENT]
+            if index in self.list_rows:
+                row = [self._value(column, index) for field, column in sorted(fields)]
+            else:
+                row = {field: self._value(column, index) for field, column in fields}
+            self.rows[index] = row
+        return self.rows[index]
+
+    def column(self, field, names, default=0):
+        """
+        Get the values of counter field for the objects names at once.
+        :return list of values in the order of names, default for the objects
+                without the counter and for the values which are not integers
+        """
+        column = self.columns.get(field)
+        if column is None:
+            return [default] * len(names)
+        values = self.values[column]
+        kinds = self.kinds[column]
+        result = []
+        for name in names:
+            index = self.index.get(name)
+            if index is None or kinds[index] not in (INT_STR, INT):
+                result.append(default)
+            else:
+                result.append(values[index])
+        return result
+
+    def __getitem__(self, key):
+        if key in self.scalars:
+            return self.scalars[key]
+        return self.row(self.index[key])
+
+    def __contains__(self, key):
+        return key in self.scalars or key in self.index
+
+    def __iter__(self):
+        yield from self.scalars
+        yield from self.names
+
+    def __len__(self):
+        return len(self.scalars) + len(self.names)
+
+
+def column(baseline, field, names, default=0):
+    """
+    Get the values of counter field for the objects names of baseline, either
+    a CounterSnapshot or a dict of rows.
+    """
+    if isinstance(baseline, CounterSnapshot):
+        return baseline.column(field, names, default)
+    return [baseline.get(name, {}).get(field, default) for name in names]
@@ -1,21 +1,108 @@
+import atexit
+import os
+import sys
+import threading
+import time
+from collections.abc import MutableMapping
+
 from sonic_py_common import multi_asic, device_info
 from swsscommon.swsscommon import ConfigDBConnector, ConfigDBPipeConnector, SonicV2Connector, SonicDBConfig
 from utilities_common import constants
 from utilities_common.multi_asic import multi_asic_ns_choices
 
+# Set to print the database connections made by the command when it exits
+DB_DEBUG_ENV = 'SONIC_CLI_DB_DEBUG'
+
+
+class LazyClients(MutableMapping):
+    """
+    {namespace: connector} mapping which connects the connector of a namespace
+    on its first access only
+    """
+    def __init__(self, namespaces, connect):
+        self.namespaces = list(namespaces)
+        self.connect = connect
+        self.clients = {}
+        self.lock = threading.Lock()
+
+    def __getitem__(self, namespace):
+        if namespace not in self.clients:
+            if namespace not in self.namespaces:
+                raise KeyError(namespace)
+            with self.lock:
+                if namespace not in self.clients:
+                    self.clients[namespace] = self.connect(namespace)
+        return self.clients[namespace]
+
+    def __setitem__(self, namespace, client):
+        if namespace not in self.namespaces:
+            self.namespaces.append(namespace)
+        self.clients[namespace] = client
+
+    def __delitem__(self, namespace):
+        self.namespaces.remove(namespace)
+        self.clients.pop(namespace, None)
+
+    def __iter__(self):
+        return iter(list(self.namespaces))
+
+    def __len__(self):
+        return len(self.namespaces)
+
+    def __contains__(self, namespace):
+        return namespace in self.namespaces
+
 
 class Db(object):
+    """
+    Database connectors of the CLI. The connectors are created on their first
+    access, so a command connects only the databases it uses.
+    """
+    LAZY_ATTRS = ('cfgdb', 'cfgdb_pipe', 'db', 'db_list')
+
     def __init__(self):
-        self.cfgdb_clients = {}
-        self.db_clients = {}
-        self.cfgdb = ConfigDBConnector()
-        self.cfgdb.connect()
-        self.cfgdb_pipe = ConfigDBPipeConnector()
-        self.cfgdb_pipe.connect()
-        self.db = SonicV2Connector(host="127.0.0.1")
+        self.connections = []
+        namespaces = [constants.DEFAULT_NAMESPACE]
+        if multi_asic.is_multi_asic():
+            if not SonicDBConfig.isGlobalInit():
+                SonicDBConfig.initializeGlobalConfig()
+            self.ns_list = multi_asic_ns_choices()
+            namespaces.extend(self.ns_list)
+
+        self.cfgdb_clients = LazyClients(namespaces, self.connect_cfgdb)
+        self.db_clients = LazyClients(namespaces, self.connect_db)
+
+        if os.environ.get(DB_DEBUG_ENV):
+            atexit.register(self.print_connections)
+
+    def __getattr__(self, name):
+        # Only called for the attributes which are not set yet
+        if name not in Db.LAZY_ATTRS:
+            raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+        if name == 'cfgdb':
+            self.cfgdb = self.timed_connect('CONFIG_DB', self.new_cfgdb, ConfigDBConnector)
+        elif name == 'cfgdb_pipe':
+            self.cfgdb_pipe = self.timed_connect('CONFIG_DB (pipe)', self.new_cfgdb, ConfigDBPipeConnector)
+        else:
+            self.db = self.timed_connect('all databases', self.new_db)
+        return self.__dict__[name]
+
+    def timed_connect(self, name, connect, *args):
+        start = time.monotonic()
+        connector = connect(*args)
+        self.connections.append((name, time.monotonic() - start))
+        return connector
+
+    def new_cfgdb(self, connector_class):
+        cfgdb = connector_class()
+        cfgdb.connect()
+        return cfgdb
+
+    def new_db(self):
+        db = SonicV2Connector(host="127.0.0.1")
 
         # Skip connecting to chassis databases in line cards
-        self.db_list = list(self.db.get_db_list())
+        self.db_list = list(db.get_db_list())
         if not device_info.is_supervisor():
             try:
                 self.db_list.remove('CHASSIS_APP_DB')
@@ -24,20 +111,27 @@ class Db(object):
                 pass
 
         for db_id in self.db_list:
-            self.db.connect(db_id)
+            db.connect(db_id)
+        return db
 
-        self.cfgdb_clients[constants.DEFAULT_NAMESPACE] = self.cfgdb
-        self.db_clients[constants.DEFAULT_NAMESPACE] = self.db
+    def connect_cfgdb(self, namespace):
+        if namespace == constants.DEFAULT_NAMESPACE:
+            return self.cfgdb
+        return self.timed_connect('CONFIG_DB of ' + namespace, multi_asic.connect_config_db_for_ns, namespace)
 
-        if multi_asic.is_multi_asic():
-            if not SonicDBConfig.isGlobalInit():
-                SonicDBConfig.initializeGlobalConfig()
-            self.ns_list = multi_asic_ns_choices()
-            for ns in self.ns_list:
-                self.cfgdb_clients[ns] = (
-                    multi_asic.connect_config_db_for_ns(ns)
-                )
-                self.db_clients[ns] = multi_asic.connect_to_all_dbs_for_ns(ns)
+    def connect_db(self, namespace):
+        if namespace == constants.DEFAULT_NAMESPACE:
+            return self.db
+        return self.timed_connect('all databases of ' + namespace, multi_asic.connect_to_all_dbs_for_ns, namespace)
+
+    def print_connections(self):
+        """
+        Print the database connections made so far and their latency
+        """
+        total = sum(elapsed for _, elapsed in self.connections)
+        print("{} database connections in {:.1f} ms".format(len(self.connections), total * 1000), file=sys.stderr)
+        for name, elapsed in self.connections:
+            print("  {:<40} {:8.1f} ms".format(name, elapsed * 1000), file=sys.stderr)
 
     def get_data(self, table, key):
         data = self.cfgdb.get_table(table)
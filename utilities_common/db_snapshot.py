@@ -0,0 +1,161 @@
+"""
+In-memory snapshot of a SONiC database.
+
+A DBSnapshot loads all the hashes of a database with a few pipelined round
+trips, and then stands in for the ConfigDBConnector connected to it: the
+ConfigDBConnector entry API (get_entry, set_entry, get_table, ...) and the
+SonicV2Connector field API (get, set, keys, ...) are served from memory.
+commit() writes the changes back in a single MULTI/EXEC transaction, so that a
+series of updates reaches the database entirely or not at all.
+
+The snapshot assumes it is the only writer of the database until it is
+committed: changes made to the same keys by other clients are overwritten.
+"""
+
+import copy
+import fnmatch
+
+from utilities_common import redis_pipeline
+
+
+class DBSnapshot(object):
+    def __init__(self, db, db_name):
+        """
+        :param db: ConfigDBConnector connected to db_name
+        """
+        self.db = db
+        self.db_name = db_name
+        self.separator = db.get_db_separator(db_name)
+        keys = redis_pipeline.get_pipeline_client(db, db_name).keys('*')
+        self.data = redis_pipeline.hgetall_hashes(db, db_name, keys)
+        self.committed = copy.deepcopy(self.data)
+
+    def __getattr__(self, name):
+        # Database names and separators, e.g. CONFIG_DB or KEY_SEPARATOR
+        if name.isupper():
+            return getattr(self.db, name)
+        raise AttributeError(name)
+
+    def check_db(self, db_name):
+        if db_name != self.db_name:
+            raise ValueError("Snapshot of {} used for {}".format(self.db_name, db_name))
+
+    # SonicV2Connector API
+
+    def get_db_separator(self, db_name):
+        return self.db.get_db_separator(db_name)
+
+    def keys(self, db_name, pattern='*', *args, **kwargs):
+        self.check_db(db_name)
+        return [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+
+    def exists(self, db_name, key):
+        self.check_db(db_name)
+        return key in self.data
+
+    def hexists(self, db_name, key, field):
+        self.check_db(db_name)
+        return field in self.data.get(key, {})
+
+    def get(self, db_name, key, field, *args, **kwargs):
+        self.check_db(db_name)
+        return self.data.get(key, {}).get(field)
+
+    def get_all(self, db_name, key, *args, **kwargs):
+        self.check_db(db_name)
+        return dict(self.data.get(key, {}))
+
+    def set(self, db_name, key, field, value, *args, **kwargs):
+        self.check_db(db_name)
+        self.data.setdefault(key, {})[field] = str(value)
+
+    def delete(self, db_name, key, *args, **kwargs):
+        self.check_db(db_name)
+        return 1 if self.data.pop(key, None) is not None else 0
+
+    # ConfigDBConnector API
+
+    def get_hash_key(self, table, key):
+        return '{}{}{}'.format(table.upper(), self.separator, self.db.serialize_key(key))
+
+    def get_table_hash_keys(self, table):
+        prefix = table.upper() + self.separator
+        return [hash_key for hash_key in self.data if hash_key.startswith(prefix)]
+
+    def get_entry(self, table, key):
+        return self.db.raw_to_typed(self.data.get(self.get_hash_key(table, key), {}))
+
+    def get_keys(self, table, split=True):
+        keys = []
+        for hash_key in self.get_table_hash_keys(table):
+            if split:
+                keys.append(self.db.deserialize_key(hash_key.split(self.separator, 1)[1]))
+            else:
+                keys.append(hash_key)
+        return keys
+
+    def get_table(self, table):
+        data = {}
+        for hash_key in self.get_table_hash_keys(table):
+            data[self.db.deserialize_key(hash_key.split(self.separator, 1)[1])] = \
+                self.db.raw_to_typed(self.data[hash_key])
+        return data
+
+    def set_entry(self, table, key, data):
+        """Write an entry, removing the fields which are not in data"""
+        hash_key = self.get_hash_key(table, key)
+        if data is None:
+            self.data.pop(hash_key, None)
+            return
+
+        original = self.get_entry(table, key)
+        fvs = self.data.setdefault(hash_key, {})
+        fvs.update(self.db.typed_to_raw(data))
+        for field in original:
+            if field not in data:
+                if isinstance(original[field], list):
+                    field += '@'
+                fvs.pop(self.db.serialize_key(field), None)
+        if not fvs:
+            del self.data[hash_key]
+
+    def mod_entry(self, table, key, data):
+        """Write the fields of an entry, keeping the fields which are not in data"""
+        hash_key = self.get_hash_key(table, key)
+        if data is None:
+            self.data.pop(hash_key, None)
+        else:
+            self.data.setdefault(hash_key, {}).update(self.db.typed_to_raw(data))
+
+    def delete_table(self, table):
+        for hash_key in self.get_table_hash_keys(table):
+            del self.data[hash_key]
+
+    def get_changed_keys(self):
+        return sorted(key for key in set(self.data) | set(self.committed)
+                      if self.data.get(key) != self.committed.get(key))
+
+    def commit(self):
+        """
+        Write the changes made since the snapshot was loaded or last committed,
+        in a single transaction
+        :return number of keys changed
+        """
+        changed_keys = self.get_changed_keys()
+        if changed_keys:
+            pipe = redis_pipeline.get_pipeline_client(self.db, self.db_name).pipeline(transaction=True)
+            for key in changed_keys:
+                fvs = self.data.get(key)
+                committed_fvs = self.committed.get(key, {})
+                if not fvs:
+                    pipe.delete(key)
+                    continue
+                removed_fields = [field for field in committed_fvs if field not in fvs]
+                if removed_fields:
+                    pipe.hdel(key, *removed_fields)
+                for field, value in fvs.items():
+                    if committed_fvs.get(field) != value:
+                        pipe.hset(key, field, value)
+            pipe.execute()
+        self.committed = copy.deepcopy(self.data)
+        return len(changed_keys)
@@ -1,4 +1,7 @@
+import argparse
 import datetime
+import os
+import sys
 import time
 import re
 from collections import OrderedDict, namedtuple
@@ -8,8 +11,11 @@ from sonic_py_common import multi_asic
 from sonic_py_common import device_info
 from swsscommon.swsscommon import SonicV2Connector, CounterTable, PortCounter
 
-from utilities_common import constants
+from utilities_common import constants, counter_snapshot
+from utilities_common.cli import UserCache
+from utilities_common.intf_filter import parse_interface_in_filter
 import utilities_common.multi_asic as multi_asic_util
+from utilities_common.redis_pipeline import get_pipeline_client, hgetall_bulk, delete_bulk
 from utilities_common.netstat import ns_diff, table_as_json, format_brate, format_prate, \
                                      format_util, format_number_with_comma, format_util_directly, \
                                      format_fec_ber, format_fec_flr, format_fec_flr_predicted
@@ -141,6 +147,8 @@ RATES_TABLE_PREFIX = "RATES:"
 COUNTER_TABLE_PREFIX = "COUNTERS:"
 COUNTERS_PORT_NAME_MAP = "COUNTERS_PORT_NAME_MAP"
 
+GB_COUNTERS_DB = "GB_COUNTERS_DB"
+
 PORT_STATUS_TABLE_PREFIX = "PORT_TABLE:"
 PORT_STATE_TABLE_PREFIX = "PORT_TABLE|"
 PORT_OPER_STATUS_FIELD = "oper_status"
@@ -157,6 +165,15 @@ LINECARD_PORT_STAT_TABLE = 'LINECARD_PORT_STAT_TABLE'
 LINECARD_PORT_STAT_MARK_TABLE = 'LINECARD_PORT_STAT_MARK_TABLE'
 CHASSIS_MIDPLANE_INFO_TABLE = 'CHASSIS_MIDPLANE_TABLE'
 
+# Max time to wait for all the linecards to publish their counters
+LINECARD_COUNTER_PULL_TIMEOUT = 2
+LINECARD_COUNTER_POLL_INTERVAL = 0.1
+
+linecard_port_stat_fields = ("rx_ok", "rx_bps", "rx_pps", "rx_util", "rx_err", "rx_drop", "rx_ovr",
+                             "tx_ok", "tx_bps", "tx_pps", "tx_util", "tx_err", "tx_drop", "tx_ovr",
+                             "fec_pre_ber", "fec_post_ber", "fec_pre_ber_max", "fec_flr",
+                             "fec_flr_predicted", "fec_flr_r_squared", "fec_max_t")
+
 
 def intfsorted(intf_list):
     """
@@ -190,6 +207,7 @@ class Portstat(object):
             self.db = SonicV2Connector(use_unix_socket_path=False)
             self.db.connect(self.db.CHASSIS_STATE_DB, False)
         self.db_clients = {}
+        self.gearbox_configured = {}
         self.sorted = natsorted
 
     def get_cnstat_dict(self):
@@ -207,12 +225,46 @@ class Portstat(object):
             self.collect_stat()
         return self.cnstat_dict, self.ratestat_dict
 
+    def clear_lc_stat(self):
+        """
+            Delete the stale counter records published by the linecards.
+        """
+        keys = self.db.keys(self.db.CHASSIS_STATE_DB, LINECARD_PORT_STAT_TABLE + "*") or []
+        keys += self.db.keys(self.db.CHASSIS_STATE_DB, LINECARD_PORT_STAT_MARK_TABLE + "*") or []
+        if keys:
+            delete_bulk(self.db, self.db.CHASSIS_STATE_DB, keys)
+
+    def wait_lc_stat(self, lc_count):
+        """
+            Wait until lc_count linecards have marked their counters published,
+            waking up on the keyspace notifications of the mark table, or
+            polling if they are not delivered.
+            Returns the names of the linecards which have published.
+        """
+        pubsub = get_pipeline_client(self.db, self.db.CHASSIS_STATE_DB).pubsub()
+        pubsub.psubscribe("__keyspace@{}__:{}*".format(self.db.get_dbid(self.db.CHASSIS_STATE_DB),
+                                                       LINECARD_PORT_STAT_MARK_TABLE))
+
+        # Notify the Linecards to publish their counter values instantly
+        self.db.set(self.db.CHASSIS_STATE_DB, "GET_LINECARD_COUNTER|pull", "enable", "true")
+
+        deadline = time.time() + LINECARD_COUNTER_PULL_TIMEOUT
+        try:
+            while True:
+                linecard_names = self.db.keys(self.db.CHASSIS_STATE_DB, LINECARD_PORT_STAT_MARK_TABLE + "*") or []
+                timeout = deadline - time.time()
+                if len(linecard_names) >= lc_count or timeout <= 0:
+                    return linecard_names
+                if not pubsub.get_message(timeout=min(timeout, LINECARD_COUNTER_POLL_INTERVAL)):
+                    time.sleep(min(timeout, LINECARD_COUNTER_POLL_INTERVAL))
+        finally:
+            pubsub.punsubscribe()
+
     def collect_stat_from_lc(self):
         # Retrieve the current counter values from all LCs
 
         # Clear stale records
-        self.db.delete_all_by_pattern(self.db.CHASSIS_STATE_DB, LINECARD_PORT_STAT_TABLE + "*")
-        self.db.delete_all_by_pattern(self.db.CHASSIS_STATE_DB, LINECARD_PORT_STAT_MARK_TABLE + "*")
+        self.clear_lc_stat()
 
         # Check how many linecards are connected
         tempdb = SonicV2Connector(use_unix_socket_path=False)
@@ -229,12 +281,8 @@ class Portstat(object):
                 if linecard_status == "True":
                     lc_count += 1
 
-        # Notify the Linecards to publish their counter values instantly
-        self.db.set(self.db.CHASSIS_STATE_DB, "GET_LINECARD_COUNTER|pull", "enable", "true")
-        time.sleep(2)
-
         # Check if all LCs have published counters
-        linecard_names = self.db.keys(self.db.CHASSIS_STATE_DB, LINECARD_PORT_STAT_MARK_TABLE + "*")
+        linecard_names = self.wait_lc_stat(lc_count)
         linecard_port_aliases = self.db.keys(self.db.CHASSIS_STATE_DB, LINECARD_PORT_STAT_TABLE + "*")
         if not linecard_port_aliases:
             # LC has not published it's Counter which could be due to chassis_port_counter_monitor.service not running
@@ -250,34 +298,19 @@ class Portstat(object):
         ratestat_dict = OrderedDict()
 
         # Get the counter values from CHASSIS_STATE_DB
-        for key in linecard_port_aliases:
-            rx_ok = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_ok")
-            rx_bps = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_bps")
-            rx_pps = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_pps")
-            rx_util = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_util")
-            rx_err = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_err")
-            rx_drop = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_drop")
-            rx_ovr = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_ovr")
-            tx_ok = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_ok")
-            tx_bps = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_bps")
-            tx_pps = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_pps")
-            tx_util = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_util")
-            tx_err = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_err")
-            tx_drop = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_drop")
-            tx_ovr = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_ovr")
-            fec_pre_ber = self.db.get(self.db.CHASSIS_STATE_DB, key, "fec_pre_ber")
-            fec_post_ber = self.db.get(self.db.CHASSIS_STATE_DB, key, "fec_post_ber")
-            fec_pre_ber_max = self.db.get(self.db.CHASSIS_STATE_DB, key, "fec_pre_ber_max")
-            fec_flr = self.db.get(self.db.CHASSIS_STATE_DB, key, "fec_flr")
-            fec_flr_predicted = self.db.get(self.db.CHASSIS_STATE_DB, key, "fec_flr_predicted")
-            fec_flr_r_squared = self.db.get(self.db.CHASSIS_STATE_DB, key, "fec_flr_r_squared")
-            fec_max_t = self.db.get(self.db.CHASSIS_STATE_DB, key, "fec_max_t")
+        fvs_list = hgetall_bulk(self.db, self.db.CHASSIS_STATE_DB, linecard_port_aliases)
+        for key, fvs in zip(linecard_port_aliases, fvs_list):
+            stat = {field: fvs.get(field) for field in linecard_port_stat_fields}
             port_alias = key.split("|")[-1]
-            cnstat_dict[port_alias] = NStats._make([rx_ok, rx_err, rx_drop, rx_ovr, tx_ok, tx_err, tx_drop, tx_ovr] +
+            cnstat_dict[port_alias] = NStats._make([stat["rx_ok"], stat["rx_err"], stat["rx_drop"], stat["rx_ovr"],
+                                                    stat["tx_ok"], stat["tx_err"], stat["tx_drop"], stat["tx_ovr"]] +
                                                    [STATUS_NA] * (len(NStats._fields) - 8))._asdict()
-            ratestat_dict[port_alias] = RateStats._make([rx_bps, rx_pps, rx_util, tx_bps,
-                                                        tx_pps, tx_util, fec_pre_ber, fec_post_ber, fec_pre_ber_max,
-                                                        fec_flr, fec_flr_predicted, fec_flr_r_squared, fec_max_t])
+            ratestat_dict[port_alias] = RateStats._make([stat["rx_bps"], stat["rx_pps"], stat["rx_util"],
+                                                        stat["tx_bps"], stat["tx_pps"], stat["tx_util"],
+                                                        stat["fec_pre_ber"], stat["fec_post_ber"],
+                                                        stat["fec_pre_ber_max"], stat["fec_flr"],
+                                                        stat["fec_flr_predicted"], stat["fec_flr_r_squared"],
+                                                        stat["fec_max_t"]])
         self.cnstat_dict.update(cnstat_dict)
         self.ratestat_dict.update(ratestat_dict)
 
@@ -335,15 +368,15 @@ class Portstat(object):
     def get_cnstat(self):
         """
             Get the counters info from database.
+            The counter and rate hashes of all the ports are fetched in
+            pipelined batches rather than a round trip per port and field.
         """
-        def get_counters(port):
+        def get_counters(fvs):
             """
-                Get the counters from specific table.
+                Get the counters from the fields of the counter table.
             """
             fields = ["0"] * len(counter_bucket_dict)
 
-            _, fvs = counter_table.get(PortCounter(), port)
-            fvs = dict(fvs)
             for pos, cntr_list in counter_bucket_dict.items():
                 for counter_name in cntr_list:
                     if counter_name not in fvs:
@@ -354,14 +387,13 @@ class Portstat(object):
             cntr = NStats._make(fields)._asdict()
             return cntr
 
-        def get_rates(table_id):
+        def get_rates(fvs):
             """
-                Get the rates from specific table.
+                Get the rates from the fields of the rates table.
             """
             fields = ["0", "0", "0", "0", "0", "0", "0", "0", "0", "0", "0", "0", "0"]
             for pos, name in enumerate(rates_key_list):
-                full_table_id = RATES_TABLE_PREFIX + table_id
-                counter_data = self.db.get(self.db.COUNTERS_DB, full_table_id, name)
+                counter_data = fvs.get(name)
                 if counter_data is None:
                     fields[pos] = STATUS_NA
                 elif fields[pos] != STATUS_NA:
@@ -378,14 +410,39 @@ class Portstat(object):
         counter_table = CounterTable(self.db.get_redis_client(self.db.COUNTERS_DB))
         if counter_port_name_map is None:
             return cnstat_dict, ratestat_dict
-        for port in self.sorted(counter_port_name_map):
-            port_name = port.split(":")[0]
-            if self.multi_asic.skip_display(constants.PORT_OBJ, port_name):
-                continue
-            cnstat_dict[port] = get_counters(port)
-            ratestat_dict[port] = get_rates(counter_port_name_map[port])
+        ports = [port for port in self.sorted(counter_port_name_map)
+                 if not self.multi_asic.skip_display(constants.PORT_OBJ, port.split(":")[0])]
+
+        rates_keys = [RATES_TABLE_PREFIX + counter_port_name_map[port] for port in ports]
+        if self.is_gearbox_configured():
+            # Gearbox port counters are merged from the PHY counters by CounterTable
+            counters = [dict(counter_table.get(PortCounter(), port)[1]) for port in ports]
+            rates = hgetall_bulk(self.db, self.db.COUNTERS_DB, rates_keys)
+        else:
+            counters_keys = [COUNTER_TABLE_PREFIX + counter_port_name_map[port] for port in ports]
+            fvs_list = hgetall_bulk(self.db, self.db.COUNTERS_DB, counters_keys + rates_keys)
+            counters, rates = fvs_list[:len(ports)], fvs_list[len(ports):]
+
+        for port, counter_fvs, rates_fvs in zip(ports, counters, rates):
+            cnstat_dict[port] = get_counters(counter_fvs)
+            ratestat_dict[port] = get_rates(rates_fvs)
         return cnstat_dict, ratestat_dict
 
+    def is_gearbox_configured(self):
+        """
+            Check if gearbox ports are configured in the current namespace,
+            i.e. if the gearbox counters have a port name map.
+            Checked once per namespace, with a single EXISTS.
+        """
+        namespace = self.db.namespace
+        if namespace not in self.gearbox_configured:
+            configured = False
+            if GB_COUNTERS_DB in self.db.get_db_list():
+                self.db.connect(GB_COUNTERS_DB)
+                configured = bool(self.db.exists(GB_COUNTERS_DB, COUNTERS_PORT_NAME_MAP))
+            self.gearbox_configured[namespace] = configured
+        return self.gearbox_configured[namespace]
+
     def get_port_speed(self, port_name):
         """
             Get the port speed
@@ -757,3 +814,137 @@ class Portstat(object):
             return
         elif (multi_asic.is_multi_asic() or device_info.is_packet_chassis()) and not use_json:
             print("\nReminder: Please execute 'show interface counters -d all' to include internal links\n")
+
+
+def main(args=None, prog_name=None):
+    parser = argparse.ArgumentParser(prog=prog_name, description='Display the ports state and counters',
+                                     formatter_class=argparse.RawTextHelpFormatter,
+                                     epilog="""
+Port state: (U)-Up (D)-Down (X)-Disabled
+Examples:
+  portstat -c -t test
+  portstat -t test
+  portstat -d -t test
+  portstat -e
+  portstat
+  portstat -r
+  portstat -R
+  portstat -a
+  portstat -p 20
+  portstat -l -i Ethernet4,Ethernet8,Ethernet12-20,PortChannel100-102
+""")
+
+    parser.add_argument('-a', '--all', action='store_true', help='Display all the stats counters')
+    parser.add_argument('-c', '--clear', action='store_true', help='Copy & clear stats')
+    parser.add_argument('-d', '--delete', action='store_true',
+                        help='Delete saved stats, either the uid or the specified tag')
+    parser.add_argument('-D', '--delete-all', action='store_true', help='Delete all saved stats')
+    parser.add_argument('-e', '--errors', action='store_true', help='Display interface errors')
+    parser.add_argument('-f', '--fec-stats', action='store_true', help='Display FEC related statistics')
+    parser.add_argument('-fh', '--fec_hist', action='store_true', help='Display FEC histogram')
+    parser.add_argument('-j', '--json', action='store_true', help='Display in JSON format')
+    parser.add_argument('-r', '--raw', action='store_true', help='Raw stats (unmodified output of netstat)')
+    parser.add_argument('-R', '--rate', action='store_true', help='Display interface rates')
+    parser.add_argument('-T', '--trim', action='store_true', help='Display trimming related statistics')
+    parser.add_argument('-t', '--tag', type=str, help='Save stats with name TAG', default=None)
+    parser.add_argument('-p', '--period', type=int, help='Display stats over a specified period (in seconds).',
+                        default=0)
+    parser.add_argument('-i', '--interface', type=str, help='Display stats for interface lists.', default=None)
+    parser.add_argument('-s', '--show', default=constants.DISPLAY_EXTERNAL,
+                        help='Display all interfaces or only external interfaces')
+    parser.add_argument('-n', '--namespace', default=None, help='Display interfaces for specific namespace')
+    parser.add_argument('-v', '--version', action='version', version='%(prog)s 1.0')
+    parser.add_argument('-l', '--detail', action='store_true', help='Display detailed statistics.')
+    parser.add_argument('-nz', '--non_zero', action='store_true', help='Display only non-zero counters')
+    args = parser.parse_args(args)
+
+    save_fresh_stats = args.clear
+    delete_saved_stats = args.delete
+    delete_all_stats = args.delete_all
+    errors_only = args.errors
+    fec_stats_only = args.fec_stats
+    fec_hist_only = args.fec_hist
+    rates_only = args.rate
+    use_json = args.json
+    raw_stats = args.raw
+    trim_stats_only = args.trim
+    tag_name = args.tag
+    wait_time_in_seconds = args.period
+    print_all = args.all
+    intf_fs = args.interface
+    namespace = args.namespace
+    display_option = args.show
+    detail = args.detail
+    nonzero = args.non_zero
+
+    cache = UserCache('portstat', tag=tag_name)
+
+    cnstat_file = "portstat"
+    cnstat_dir = cache.get_directory()
+    cnstat_fqn_file = cnstat_dir + "/" + cnstat_file
+
+    if delete_all_stats:
+        cache.remove_all()
+
+    if delete_saved_stats:
+        cache.remove()
+
+    intf_list = parse_interface_in_filter(intf_fs)
+
+    # When saving counters to the file, save counters
+    # for all ports(Internal and External)
+    if save_fresh_stats:
+        namespace = None
+        display_option = constants.DISPLAY_ALL
+
+    portstat = Portstat(namespace, display_option)
+    cnstat_dict, ratestat_dict = portstat.get_cnstat_dict()
+
+    # Now decide what information to display
+    if raw_stats:
+        portstat.cnstat_diff_print(cnstat_dict, {}, ratestat_dict, intf_list,
+                                   use_json, print_all, errors_only,
+                                   fec_stats_only, rates_only,
+                                   trim_stats_only, fec_hist_only)
+        sys.exit(0)
+
+    if save_fresh_stats:
+        try:
+            counter_snapshot.dump(cnstat_dict, cnstat_fqn_file)
+        except IOError as e:
+            sys.exit(e.errno)
+        else:
+            print("Cleared counters")
+            sys.exit(0)
+
+    if wait_time_in_seconds == 0:
+        cnstat_cached_dict = OrderedDict()
+        if os.path.isfile(cnstat_fqn_file):
+            try:
+                cnstat_cached_dict = counter_snapshot.load(cnstat_fqn_file)
+                if not detail:
+                    print("Last cached time was " + str(cnstat_cached_dict.get('time')))
+                portstat.cnstat_diff_print(cnstat_dict, cnstat_cached_dict, ratestat_dict,
+                                           intf_list, use_json, print_all, errors_only,
+                                           fec_stats_only, rates_only, trim_stats_only,
+                                           fec_hist_only, detail, nonzero)
+            except IOError as e:
+                print(e.errno, e)
+        else:
+            if tag_name:
+                print("\nFile '%s' does not exist" % cnstat_fqn_file)
+                print("Did you run 'portstat -c -t %s' to record the counters via tag %s?\n" % (tag_name, tag_name))
+            else:
+                portstat.cnstat_diff_print(cnstat_dict, {}, ratestat_dict, intf_list,
+                                           use_json, print_all, errors_only,
+                                           fec_stats_only, rates_only, trim_stats_only,
+                                           fec_hist_only, detail, nonzero)
+    else:
+        # wait for the specified time and then gather the new stats and output the difference.
+        time.sleep(wait_time_in_seconds)
+        print("The rates are calculated within %s seconds period" % wait_time_in_seconds)
+        cnstat_new_dict, ratestat_new_dict = portstat.get_cnstat_dict()
+        portstat.cnstat_diff_print(cnstat_new_dict, cnstat_dict, ratestat_new_dict,
+                                   intf_list, use_json, print_all, errors_only,
+                                   fec_stats_only, rates_only, trim_stats_only,
+                                   fec_hist_only, detail, nonzero)
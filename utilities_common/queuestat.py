@@ -0,0 +1,826 @@
+import json
+import click
+import datetime
+import os.path
+import sys
+
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from natsort import natsorted
+from tabulate import tabulate
+from sonic_py_common import multi_asic, device_info
+from redis import exceptions
+from swsscommon import swsscommon
+from swsscommon.swsscommon import SonicV2Connector
+from utilities_common.cli import UserCache, json_dump
+from utilities_common import constants, counter_snapshot
+from utilities_common.netstat import ns_diff, STATUS_NA
+from utilities_common.redis_pipeline import hgetall_bulk
+import utilities_common.multi_asic as multi_asic_util
+
+QueueStats = namedtuple(
+    "QueueStats", "queueindex, queuetype, "
+    "totalpacket, totalbytes, droppacket, dropbytes, "
+    "trimpkt, trimsentpkt, trimdroppkt"
+)
+VoqStats = namedtuple(
+    "VoqStats", "queueindex, queuetype, "
+    "totalpacket, totalbytes, droppacket, dropbytes, "
+    "creditWDpkts"
+)
+
+std_header = [
+    'Port', 'TxQ',
+    'Counter/pkts', 'Counter/bytes', 'Drop/pkts', 'Drop/bytes'
+]
+all_header = [
+    'Port', 'TxQ',
+    'Counter/pkts', 'Counter/bytes', 'Drop/pkts', 'Drop/bytes',
+    'Trim/pkts', 'TrimSent/pkts', 'TrimDrop/pkts'
+]
+trim_header = [
+    'Port', 'TxQ',
+    'Trim/pkts', 'TrimSent/pkts', 'TrimDrop/pkts'
+]
+voq_header = [
+    'Port', 'Voq',
+    'Counter/pkts', 'Counter/bytes', 'Drop/pkts', 'Drop/bytes',
+    'Credit-WD-Del/pkts'
+]
+
+counter_bucket_dict = {
+    'SAI_QUEUE_STAT_PACKETS': 2,
+    'SAI_QUEUE_STAT_BYTES': 3,
+    'SAI_QUEUE_STAT_DROPPED_PACKETS': 4,
+    'SAI_QUEUE_STAT_DROPPED_BYTES': 5,
+}
+trim_counter_bucket_dict = {
+    'SAI_QUEUE_STAT_TRIM_PACKETS': 6,
+    'SAI_QUEUE_STAT_TX_TRIM_PACKETS': 7,
+    'SAI_QUEUE_STAT_DROPPED_TRIM_PACKETS': 8,
+}
+voq_counter_bucket_dict = {
+    'SAI_QUEUE_STAT_CREDIT_WD_DELETED_PACKETS': 6
+}
+
+QUEUE_TYPE_MC = 'MC'
+QUEUE_TYPE_UC = 'UC'
+QUEUE_TYPE_ALL = 'ALL'
+QUEUE_TYPE_VOQ = 'VOQ'
+SAI_QUEUE_TYPE_MULTICAST = "SAI_QUEUE_TYPE_MULTICAST"
+SAI_QUEUE_TYPE_UNICAST = "SAI_QUEUE_TYPE_UNICAST"
+SAI_QUEUE_TYPE_UNICAST_VOQ = "SAI_QUEUE_TYPE_UNICAST_VOQ"
+SAI_QUEUE_TYPE_ALL = "SAI_QUEUE_TYPE_ALL"
+
+COUNTER_TABLE_PREFIX = "COUNTERS:"
+COUNTERS_PORT_NAME_MAP = "COUNTERS_PORT_NAME_MAP"
+COUNTERS_SYSTEM_PORT_NAME_MAP = "COUNTERS_SYSTEM_PORT_NAME_MAP"
+COUNTERS_QUEUE_NAME_MAP = "COUNTERS_QUEUE_NAME_MAP"
+COUNTERS_VOQ_NAME_MAP = "COUNTERS_VOQ_NAME_MAP"
+COUNTERS_QUEUE_TYPE_MAP = "COUNTERS_QUEUE_TYPE_MAP"
+COUNTERS_QUEUE_INDEX_MAP = "COUNTERS_QUEUE_INDEX_MAP"
+COUNTERS_QUEUE_PORT_MAP = "COUNTERS_QUEUE_PORT_MAP"
+
+# Upper bound of the namespaces collected concurrently
+MAX_NAMESPACE_WORKERS = 8
+# Ports whose queue counters are fetched together when streaming the output
+PORT_FETCH_BATCH_SIZE = 64
+
+cnstat_dir = 'N/A'
+cnstat_fqn_file = 'N/A'
+
+
+def get_redis_ips(db):
+    db.connect(db.STATE_DB)
+    redis_ips = []
+    chassis_midplane_table = db.keys(db.STATE_DB, "CHASSIS_MIDPLANE_TABLE*")
+    lc_metadata = []
+    for lc in chassis_midplane_table:
+        lc_metadata.append(db.get_all(db.STATE_DB, lc))
+
+    db.connect(db.CHASSIS_STATE_DB)
+    for lc in lc_metadata:
+        # skip if LC is offline
+        if lc['access'] == "False":
+            continue
+
+        slot_id = int(lc['ip_address'].split(".")[2]) - 1
+        num_asics = db.get(db.CHASSIS_STATE_DB, f"CHASSIS_MODULE_TABLE|LINE-CARD{slot_id}", 'num_asics')
+
+        # Skip if pmon hasn't started on LC yet
+        if num_asics is None:
+            continue
+
+        # No namespace in single ASIC LC
+        if num_asics == "1":
+            redis_ips.append(lc['ip_address'])
+        else:
+            prefix, _ = lc['ip_address'].rsplit(".", maxsplit=1)
+            for i in range(int(num_asics)):
+                prefix, _, _ = lc['ip_address'].rpartition(".")
+                redis_ips.append(f"{prefix}.{10+i}")
+
+    return redis_ips
+
+
+def build_json(port, cnstat, all=False, trim=False, voq=False):
+    def ports_stats(k):
+        p = {}
+        if voq:
+            p[k[1]] = {
+                "totalpacket": k[2],
+                "totalbytes": k[3],
+                "droppacket": k[4],
+                "dropbytes": k[5],
+                "creditWDPkts": k[6]
+            }
+        else:
+            if all:  # All statistics
+                p[k[1]] = {
+                    "totalpacket": k[2],
+                    "totalbytes": k[3],
+                    "droppacket": k[4],
+                    "dropbytes": k[5],
+                    "trimpacket": k[6],
+                    "trimsentpacket": k[7],
+                    "trimdroppacket": k[8],
+                }
+            elif trim:  # Packet Trimming related statistics
+                p[k[1]] = {
+                    "trimpacket": k[2],
+                    "trimsentpacket": k[3],
+                    "trimdroppacket": k[4],
+                }
+            else:  # Generic statistics
+                p[k[1]] = {
+                    "totalpacket": k[2],
+                    "totalbytes": k[3],
+                    "droppacket": k[4],
+                    "dropbytes": k[5],
+                }
+        return p
+
+    out = {}
+    for k in cnstat:
+        out.update(ports_stats(k))
+    return out
+
+
+class JsonStreamWriter(object):
+    """
+    Write a JSON object to stdout one top level key at a time, so the whole
+    output doesn't have to be kept in memory. Keys must be written in sorted
+    order for the output to be identical to json_dump().
+    """
+    def __init__(self):
+        self.count = 0
+
+    def write(self, key, value):
+        sys.stdout.write('{\n' if self.count == 0 else ',\n')
+        sys.stdout.write('  ' + json.dumps(key, ensure_ascii=False) + ': ' +
+                         json_dump(value).replace('\n', '\n  '))
+        self.count += 1
+
+    def close(self):
+        sys.stdout.write('{}\n' if self.count == 0 else '\n}\n')
+        sys.stdout.flush()
+
+
+def collect_queuestat(ns, db, voq, trim, all_):
+    """
+    Build the Queuestat of the namespace and fetch all its queue counters.
+    """
+    queuestat = Queuestat(ns, db, all_, trim, voq)
+    queuestat.fetch_all_counters()
+    return queuestat
+
+
+def run_queuestat(save_fresh_stats, port_to_show_stats, json_opt, non_zero, ns, db, voq, trim, all_, queuestat=None):
+    if queuestat is None:
+        queuestat = Queuestat(ns, db, all_, trim, voq)
+    if save_fresh_stats:
+        queuestat.save_fresh_stats()
+        return
+
+    if port_to_show_stats is not None:
+        queuestat.get_print_port_stat(port_to_show_stats, json_opt, non_zero)
+    else:
+        queuestat.get_print_all_stat(json_opt, non_zero)
+
+
+class QueuestatWrapper(object):
+    """A wrapper to execute queuestat cmd over the correct namespaces"""
+    def __init__(self, namespace, all, trim, voq):
+        self.namespace = namespace
+        self.all = all
+        self.trim = trim
+        self.voq = voq
+
+        # Initialize the multi-asic namespace
+        self.multi_asic = multi_asic_util.MultiAsic(constants.DISPLAY_ALL, namespace_option=namespace)
+        self.db = None
+
+    @multi_asic_util.run_on_multi_asic
+    def run(self, save_fresh_stats, port_to_show_stats, json_opt, non_zero):
+        run_queuestat(save_fresh_stats, port_to_show_stats, json_opt, non_zero,
+                      self.multi_asic.current_namespace, self.db, self.voq, self.trim, self.all)
+
+    def run_concurrently(self, save_fresh_stats, port_to_show_stats, json_opt, non_zero):
+        """
+        Collect the counters of all the namespaces concurrently, then print
+        them namespace by namespace in the same order as run() does.
+        """
+        ns_list = self.multi_asic.get_ns_list_based_on_options()
+        if len(ns_list) <= 1:
+            self.run(save_fresh_stats, port_to_show_stats, json_opt, non_zero)
+            return
+
+        def collect(ns):
+            db = multi_asic.connect_to_all_dbs_for_ns(ns)
+            return collect_queuestat(ns, db, self.voq, self.trim, self.all)
+
+        with ThreadPoolExecutor(max_workers=min(len(ns_list), MAX_NAMESPACE_WORKERS)) as executor:
+            futures = [executor.submit(collect, ns) for ns in ns_list]
+
+        for ns, future in zip(ns_list, futures):
+            self.multi_asic.current_namespace = ns
+            queuestat = future.result()
+            run_queuestat(save_fresh_stats, port_to_show_stats, json_opt, non_zero,
+                          ns, queuestat.db, self.voq, self.trim, self.all, queuestat)
+
+
+class Queuestat(object):
+    def __init__(self, namespace, db, all=False, trim=False, voq=False):
+        self.db = db
+        self.all = all
+        self.trim = trim
+        self.voq = voq
+        self.voq_stats = {}
+        self.queue_counters = {}
+        self.all_counters_fetched = False
+        self.namespace = namespace
+        if namespace is None:
+            self.db = SonicV2Connector(use_unix_socket_path=False)
+            self.db.connect(self.db.COUNTERS_DB)
+        self.namespace_str = f" for {namespace}" if namespace else ''
+        self.cached_stats = None
+        self.cached_stats_saved = False
+        self.cached_port_queues = {}
+
+        def get_queue_port(table_id):
+            port_table_id = self.queue_port_map.get(table_id)
+            if port_table_id is None:
+                print(f"Port is not available{self.namespace_str}!", table_id)
+                sys.exit(1)
+
+            return port_table_id
+
+        # Get all ports
+        if voq:
+            # counter_port_name_map is assigned later for supervisor as a list
+            self.counter_port_name_map = [] if device_info.is_supervisor() else \
+                self.db.get_all(self.db.COUNTERS_DB, COUNTERS_SYSTEM_PORT_NAME_MAP)
+        else:
+            self.counter_port_name_map = self.db.get_all(self.db.COUNTERS_DB, COUNTERS_PORT_NAME_MAP)
+
+        if self.counter_port_name_map is None:
+            print(f"COUNTERS_PORT_NAME_MAP is empty{self.namespace_str}!")
+            sys.exit(1)
+
+        self.port_queues_map = {}
+        self.port_name_map = {}
+
+        for port in self.counter_port_name_map:
+            self.port_queues_map[port] = {}
+            self.port_name_map[self.counter_port_name_map[port]] = port
+
+        if self.voq:
+            self.counter_bucket_dict = {**counter_bucket_dict, **voq_counter_bucket_dict}
+        else:
+            self.counter_bucket_dict = {**counter_bucket_dict, **trim_counter_bucket_dict}
+
+        if device_info.is_supervisor():
+            self.aggregate_voq_stats()
+            self.counter_port_name_map = self.voq_stats.keys()
+            return
+
+        counter_queue_name_map = None
+        # Get Queues for each port
+        if voq:
+            counter_queue_name_map = self.db.get_all(self.db.COUNTERS_DB, COUNTERS_VOQ_NAME_MAP)
+        else:
+            counter_queue_name_map = self.db.get_all(self.db.COUNTERS_DB, COUNTERS_QUEUE_NAME_MAP)
+
+        if counter_queue_name_map is None:
+            print(f"COUNTERS_QUEUE_NAME_MAP is empty{self.namespace_str}!")
+            sys.exit(1)
+
+        # Load the queue maps once instead of looking up every queue
+        self.queue_port_map = self.db.get_all(self.db.COUNTERS_DB, COUNTERS_QUEUE_PORT_MAP) or {}
+        self.queue_index_map = self.db.get_all(self.db.COUNTERS_DB, COUNTERS_QUEUE_INDEX_MAP) or {}
+        self.queue_type_map = self.db.get_all(self.db.COUNTERS_DB, COUNTERS_QUEUE_TYPE_MAP) or {}
+
+        for queue in counter_queue_name_map:
+            port = self.port_name_map[get_queue_port(counter_queue_name_map[queue])]
+            self.port_queues_map[port][queue] = counter_queue_name_map[queue]
+
+    def aggregate_voq_stats(self):
+        redis_ips = get_redis_ips(self.db)
+        self.voq_stats = {}
+
+        for ip in redis_ips:
+            asic_counters_db = swsscommon.DBConnector(swsscommon.COUNTERS_DB, ip, 6379, 0)
+            try:
+                counters_voq_name_map = asic_counters_db.hgetall(COUNTERS_VOQ_NAME_MAP)
+                if counters_voq_name_map is None:
+                    continue
+                for voq in counters_voq_name_map:
+                    # key LINECARD|ASIC|EthernetXXX:INDEX
+                    sysPort, idx = voq.split(":")
+                    oid = counters_voq_name_map[voq]
+                    counters = asic_counters_db.hgetall("COUNTERS:"+oid) or {}
+                    for counter_name in self.counter_bucket_dict:
+                        self.voq_stats.setdefault(sysPort, {}).setdefault(idx, {}).setdefault(counter_name, 0)
+                        counter_data = counters.get(counter_name)
+                        if counter_data is not None:
+                            self.voq_stats[sysPort][idx][counter_name] += int(counter_data)
+
+            except exceptions.ConnectionError:
+                # Skip further operations for this redis-instance
+                continue
+
+    def get_aggregate_port_stats(self, port):
+        # Build a dictionary of stats
+        cnstat_dict = OrderedDict()
+        cnstat_dict['time'] = datetime.datetime.now()
+        for idx in sorted(self.voq_stats[port].keys()):
+            fields = ["0"]*len(voq_header)
+            fields[0] = idx
+            fields[1] = QUEUE_TYPE_VOQ
+            for counter_name, pos in self.counter_bucket_dict.items():
+                fields[pos] = str(self.voq_stats[port][idx][counter_name])
+            cntr = VoqStats._make(fields)._asdict()
+            cnstat_dict[port+":"+idx] = cntr
+        return cnstat_dict
+
+    def fetch_counters(self, table_ids):
+        """
+            Fetch the counter hashes of the queues not fetched yet with
+            pipelined HGETALLs.
+        """
+        table_ids = [table_id for table_id in table_ids if table_id not in self.queue_counters]
+        counters = hgetall_bulk(self.db, self.db.COUNTERS_DB,
+                                [COUNTER_TABLE_PREFIX + table_id for table_id in table_ids])
+        self.queue_counters.update(zip(table_ids, counters))
+
+    def fetch_all_counters(self):
+        """
+            Fetch the counter hashes of the queues of all ports in one pass.
+        """
+        if device_info.is_supervisor():
+            return
+        self.fetch_counters([table_id for queue_map in self.port_queues_map.values()
+                             for table_id in queue_map.values()])
+        self.all_counters_fetched = True
+
+    def fetch_port_batch_counters(self, ports):
+        """
+            Fetch the counter hashes of the queues of a batch of ports, in
+            place of the ones of the previous batch, so only a batch is kept
+            in memory. Nothing to do if all the counters were fetched already.
+        """
+        if device_info.is_supervisor() or self.all_counters_fetched:
+            return
+        self.queue_counters = {}
+        self.fetch_counters([table_id for port in ports for table_id in self.port_queues_map[port].values()])
+
+    def iter_port_batches(self, ports):
+        """
+            Iterate over the ports, fetching their queue counters batch by batch.
+        """
+        for start in range(0, len(ports), PORT_FETCH_BATCH_SIZE):
+            batch = ports[start:start + PORT_FETCH_BATCH_SIZE]
+            self.fetch_port_batch_counters(batch)
+            yield from batch
+
+    def get_cnstat(self, queue_map):
+        """
+            Get the counters info from database.
+        """
+        def get_counters(table_id):
+            """
+                Get the counters from specific table.
+            """
+            def get_queue_index(table_id):
+                queue_index = self.queue_index_map.get(table_id)
+                if queue_index is None:
+                    print(f"Queue index is not available{self.namespace_str}!", table_id)
+                    sys.exit(1)
+
+                return queue_index
+
+            def get_queue_type(table_id):
+                queue_type = self.queue_type_map.get(table_id)
+                if queue_type is None:
+                    print(f"Queue Type is not available{self.namespace_str}!", table_id)
+                    sys.exit(1)
+                elif queue_type == SAI_QUEUE_TYPE_MULTICAST:
+                    return QUEUE_TYPE_MC
+                elif queue_type == SAI_QUEUE_TYPE_UNICAST:
+                    return QUEUE_TYPE_UC
+                elif queue_type == SAI_QUEUE_TYPE_UNICAST_VOQ:
+                    return QUEUE_TYPE_VOQ
+                elif queue_type == SAI_QUEUE_TYPE_ALL:
+                    return QUEUE_TYPE_ALL
+                else:
+                    print(f"Queue Type is invalid{self.namespace_str}:", table_id, queue_type)
+                    sys.exit(1)
+
+            counter_dict = {**self.counter_bucket_dict}
+            fields = [get_queue_index(table_id), get_queue_type(table_id)]
+
+            # Layout is per QueueStats/VoqStats type definition
+            fields.extend(["0"]*len(counter_dict))
+
+            counters = self.queue_counters[table_id]
+            for counter_name, pos in counter_dict.items():
+                counter_data = counters.get(counter_name)
+                if counter_data is None:
+                    fields[pos] = STATUS_NA
+                elif fields[pos] != STATUS_NA:
+                    fields[pos] = str(int(counter_data))
+
+            if self.voq:
+                cntr = VoqStats._make(fields)._asdict()
+            else:
+                cntr = QueueStats._make(fields)._asdict()
+            return cntr
+
+        # Build a dictionary of the stats
+        cnstat_dict = OrderedDict()
+        cnstat_dict['time'] = datetime.datetime.now()
+        if queue_map is None:
+            return cnstat_dict
+        self.fetch_counters(queue_map.values())
+        for queue in natsorted(queue_map):
+            cnstat_dict[queue] = get_counters(queue_map[queue])
+        return cnstat_dict
+
+    def cnstat_print(self, port, cnstat_dict, json_opt, non_zero):
+        """
+        Print the cnstat. If JSON option is True, return data in
+        JSON format.
+        """
+        table = []
+        json_output = {port: {}}
+
+        for key, data in cnstat_dict.items():
+            if key == 'time':
+                if json_opt:
+                    json_output[port][key] = data
+                continue
+            if self.voq:
+                if not non_zero or data['totalpacket'] != '0' or data['totalbytes'] != '0' or \
+                        data['droppacket'] != '0' or data['dropbytes'] != '0' or data['creditWDpkts'] != '0':
+                    table.append((port, data['queuetype'] + str(data['queueindex']),
+                                  data['totalpacket'], data['totalbytes'],
+                                  data['droppacket'], data['dropbytes'], data['creditWDpkts']))
+            else:
+                queuetag = data['queuetype'] + str(data['queueindex'])
+
+                if self.all:  # All statistics
+                    if not non_zero or \
+                            data['totalpacket'] != '0' or data['totalbytes'] != '0' or \
+                            data['droppacket'] != '0' or data['dropbytes'] != '0' or \
+                            data['trimpkt'] != '0' or data['trimsentpkt'] != '0' or data['trimdroppkt'] != '0':
+                        table.append((
+                            port, queuetag,
+                            data['totalpacket'], data['totalbytes'],
+                            data['droppacket'], data['dropbytes'],
+                            data['trimpkt'], data['trimsentpkt'], data['trimdroppkt']
+                        ))
+                elif self.trim:  # Packet Trimming related statistics
+                    if not non_zero or \
+                            data['trimpkt'] != '0' or data['trimsentpkt'] != '0' or data['trimdroppkt'] != '0':
+                        table.append((
+                            port, queuetag,
+                            data['trimpkt'], data['trimsentpkt'], data['trimdroppkt']
+                        ))
+                else:  # Generic statistics
+                    if not non_zero or \
+                            data['totalpacket'] != '0' or data['totalbytes'] != '0' or \
+                            data['droppacket'] != '0' or data['dropbytes'] != '0':
+                        table.append((
+                            port, queuetag,
+                            data['totalpacket'], data['totalbytes'],
+                            data['droppacket'], data['dropbytes']
+                        ))
+
+        if json_opt:
+            json_output[port].update(build_json(port, table, self.all, self.trim, self.voq))
+            return json_output
+        else:
+            if self.voq:
+                hdr = voq_header
+            elif self.all:
+                hdr = all_header
+            elif self.trim:
+                hdr = trim_header
+            else:
+                hdr = std_header
+
+            if table:
+                if not device_info.is_supervisor():
+                    print(f"For namespace {self.namespace}:")
+                print(tabulate(table, hdr, tablefmt='simple', stralign='right'))
+                print()
+
+    def cnstat_diff_print(self, port, cnstat_new_dict, cnstat_old_dict, json_opt, non_zero):
+        """
+        Print the difference between two cnstat results. If JSON
+        option is True, return data in JSON format.
+        """
+        table = []
+        json_output = {port: {}}
+
+        for key, cntr in cnstat_new_dict.items():
+            if key == 'time':
+                if json_opt:
+                    json_output[port][key] = cntr
+                continue
+            old_cntr = None
+            if key in cnstat_old_dict:
+                old_cntr = cnstat_old_dict.get(key)
+            if old_cntr is not None:
+                if self.voq:
+                    if not non_zero or ns_diff(cntr['totalpacket'], old_cntr['totalpacket']) != '0' or \
+                            ns_diff(cntr['totalbytes'], old_cntr['totalbytes']) != '0' or \
+                            ns_diff(cntr['droppacket'], old_cntr['droppacket']) != '0' or \
+                            ns_diff(cntr['dropbytes'], old_cntr['dropbytes']) != '0' or \
+                            ns_diff(cntr['creditWDpkts'], old_cntr['creditWDpkts']) != '0':
+                        table.append((port, cntr['queuetype'] + str(cntr['queueindex']),
+                                      ns_diff(cntr['totalpacket'], old_cntr['totalpacket']),
+                                      ns_diff(cntr['totalbytes'], old_cntr['totalbytes']),
+                                      ns_diff(cntr['droppacket'], old_cntr['droppacket']),
+                                      ns_diff(cntr['dropbytes'], old_cntr['dropbytes']),
+                                      ns_diff(cntr['creditWDpkts'], old_cntr['creditWDpkts'])))
+                else:
+                    queuetag = cntr['queuetype'] + str(cntr['queueindex'])
+
+                    if self.all:  # All statistics
+                        totalpacket = ns_diff(cntr['totalpacket'], old_cntr['totalpacket'])
+                        totalbytes = ns_diff(cntr['totalbytes'], old_cntr['totalbytes'])
+                        droppacket = ns_diff(cntr['droppacket'], old_cntr['droppacket'])
+                        dropbytes = ns_diff(cntr['dropbytes'], old_cntr['dropbytes'])
+                        trimpkt = ns_diff(cntr['trimpkt'], old_cntr['trimpkt'])
+                        trimsentpkt = ns_diff(cntr['trimsentpkt'], old_cntr['trimsentpkt'])
+                        trimdroppkt = ns_diff(cntr['trimdroppkt'], old_cntr['trimdroppkt'])
+
+                        if not non_zero or \
+                                totalpacket != '0' or totalbytes != '0' or \
+                                droppacket != '0' or dropbytes != '0' or \
+                                trimpkt != '0' or trimsentpkt != '0' or trimdroppkt != '0':
+                            table.append((
+                                port, queuetag,
+                                totalpacket, totalbytes,
+                                droppacket, dropbytes,
+                                trimpkt, trimsentpkt, trimdroppkt
+                            ))
+                    elif self.trim:  # Packet Trimming related statistics
+                        trimpkt = ns_diff(cntr['trimpkt'], old_cntr['trimpkt'])
+                        trimsentpkt = ns_diff(cntr['trimsentpkt'], old_cntr['trimsentpkt'])
+                        trimdroppkt = ns_diff(cntr['trimdroppkt'], old_cntr['trimdroppkt'])
+
+                        if not non_zero or \
+                                trimpkt != '0' or trimsentpkt != '0' or trimdroppkt != '0':
+                            table.append((
+                                port, queuetag,
+                                trimpkt, trimsentpkt, trimdroppkt
+                            ))
+                    else:  # Generic statistics
+                        totalpacket = ns_diff(cntr['totalpacket'], old_cntr['totalpacket'])
+                        totalbytes = ns_diff(cntr['totalbytes'], old_cntr['totalbytes'])
+                        droppacket = ns_diff(cntr['droppacket'], old_cntr['droppacket'])
+                        dropbytes = ns_diff(cntr['dropbytes'], old_cntr['dropbytes'])
+
+                        if not non_zero or \
+                                totalpacket != '0' or totalbytes != '0' or \
+                                droppacket != '0' or dropbytes != '0':
+                            table.append((
+                                port, queuetag,
+                                totalpacket, totalbytes,
+                                droppacket, dropbytes
+                            ))
+        if json_opt:
+            json_output[port].update(build_json(port, table, self.all, self.trim, self.voq))
+            return json_output
+        else:
+            if self.voq:
+                hdr = voq_header
+            elif self.all:
+                hdr = all_header
+            elif self.trim:
+                hdr = trim_header
+            else:
+                hdr = std_header
+
+            if table:
+                print(port + f" Last cached time{self.namespace_str} was " + str(cnstat_old_dict.get('time')))
+                print(tabulate(table, hdr, tablefmt='simple', stralign='right'))
+                print()
+
+    def get_print_all_stat(self, json_opt, non_zero):
+        """
+        Get stat for each port
+        If JSON option is True, print data in JSON format for all ports,
+        streaming it port by port
+        """
+        if json_opt:
+            # json_dump() sorts the keys, keep the same port order
+            json_writer = JsonStreamWriter()
+            ports = sorted(self.counter_port_name_map)
+        else:
+            ports = natsorted(self.counter_port_name_map)
+
+        for port in self.iter_port_batches(ports):
+            port_output = {}
+            if self.voq and device_info.is_supervisor():
+                cnstat_dict = self.get_aggregate_port_stats(port)
+            else:
+                cnstat_dict = self.get_cnstat(self.port_queues_map[port])
+
+            cnstat_cached_dict = self.get_cached_stats(port)
+            if cnstat_cached_dict is not None:
+                if json_opt:
+                    port_output = self.cnstat_diff_print(port, cnstat_dict, cnstat_cached_dict,
+                                                         json_opt, non_zero)[port]
+                else:
+                    self.cnstat_diff_print(port, cnstat_dict, cnstat_cached_dict, json_opt, non_zero)
+            else:
+                if json_opt:
+                    port_output = self.cnstat_print(port, cnstat_dict, json_opt, non_zero)[port]
+                else:
+                    self.cnstat_print(port, cnstat_dict, json_opt, non_zero)
+
+            if json_opt:
+                json_writer.write(port, port_output)
+
+        if json_opt:
+            json_writer.close()
+
+    def get_print_port_stat(self, port, json_opt, non_zero):
+        """
+        Get stat for the port
+        If JSON option is True  print data in JSON format
+        """
+        if port not in self.port_queues_map and port not in self.voq_stats:
+            print("Port doesn't exist!", port)
+            sys.exit(1)
+
+        # Get stat for the port queried
+
+        if self.voq and device_info.is_supervisor():
+            cnstat_dict = self.get_aggregate_port_stats(port)
+        else:
+            cnstat_dict = self.get_cnstat(self.port_queues_map[port])
+        json_output = {}
+        json_output[port] = {}
+        cnstat_cached_dict = self.get_cached_stats(port)
+        if cnstat_cached_dict is not None:
+            if json_opt:
+                json_output[port].update({"cached_time": cnstat_cached_dict.get('time')})
+                json_output.update(self.cnstat_diff_print(port, cnstat_dict, cnstat_cached_dict, json_opt, non_zero))
+            else:
+                print(f"Last cached time{self.namespace_str} was " + str(cnstat_cached_dict.get('time')))
+                self.cnstat_diff_print(port, cnstat_dict, cnstat_cached_dict, json_opt, non_zero)
+        else:
+            if json_opt:
+                json_output.update(self.cnstat_print(port, cnstat_dict, json_opt, non_zero))
+            else:
+                self.cnstat_print(port, cnstat_dict, json_opt, non_zero)
+
+        if json_opt:
+            print(json_dump(json_output))
+
+    def get_cache_file(self):
+        """
+        Get the file of the counters saved for all the ports of the namespace
+        """
+        if self.namespace:
+            return cnstat_fqn_file + '-' + self.namespace
+        return cnstat_fqn_file
+
+    def get_port_cache_file(self, port):
+        """
+        Get the file of the counters of the port saved by the previous versions,
+        which saved one JSON file per port
+        """
+        cache_ns = ''
+        if self.voq and self.namespace is not None:
+            cache_ns = '-' + self.namespace + '-'
+        return cnstat_fqn_file + cache_ns + port
+
+    def get_cached_stats(self, port):
+        """
+        Get the counters of the port saved by the last clear, falling back to
+        the file of the port saved by a previous version if the counters of the
+        namespace were never saved
+        :return {'time': saved time, queue: counters}, None if no counters were saved
+        """
+        if self.cached_stats is None:
+            self.cached_stats = {}
+            cache_file = self.get_cache_file()
+            if os.path.isfile(cache_file):
+                self.cached_stats_saved = True
+                try:
+                    self.cached_stats = counter_snapshot.load(cache_file)
+                except IOError as e:
+                    print(e.errno, e)
+                for name in self.cached_stats:
+                    if isinstance(name, tuple):
+                        self.cached_port_queues.setdefault(name[0], []).append(name)
+
+        if port not in self.cached_port_queues:
+            port_cache_file = self.get_port_cache_file(port)
+            if self.cached_stats_saved or not os.path.isfile(port_cache_file):
+                return None
+            try:
+                return counter_snapshot.load(port_cache_file)
+            except IOError as e:
+                print(e.errno, e)
+                return None
+        cnstat_cached_dict = OrderedDict()
+        cnstat_cached_dict['time'] = self.cached_stats.get('time')
+        for name in self.cached_port_queues[port]:
+            cnstat_cached_dict[name[1]] = self.cached_stats[name]
+        return cnstat_cached_dict
+
+    def save_fresh_stats(self):
+        # Get stat for each port and save them all at once
+        ports = natsorted(self.counter_port_name_map)
+        cnstat_dict = OrderedDict()
+        cnstat_dict['time'] = datetime.datetime.now()
+        for port in self.iter_port_batches(ports):
+            if device_info.is_supervisor():
+                port_cnstat_dict = self.get_aggregate_port_stats(port)
+            else:
+                port_cnstat_dict = self.get_cnstat(self.port_queues_map[port])
+            for queue, cntr in port_cnstat_dict.items():
+                if queue != 'time':
+                    cnstat_dict[(port, queue)] = cntr
+        try:
+            counter_snapshot.dump(cnstat_dict, self.get_cache_file())
+        except IOError as e:
+            print(e.errno, e)
+            sys.exit(e.errno)
+        for port in ports:
+            print("Clear and update saved counters for " + port)
+
+
+@click.command()
+@click.option('-p', '--port', type=str, help='Show the queue counters for just one port', default=None)
+@click.option('-c', '--clear', is_flag=True, default=False, help='Clear previous stats and save new ones')
+@click.option('-d', '--delete', is_flag=True, default=False, help='Delete saved stats')
+@click.option('-j', '--json_opt', '--json', is_flag=True, default=False,
+              help='Print in JSON format, streamed port by port')
+@click.option('-a', '--all', is_flag=True, default=False, help='Display all the stats counters')
+@click.option('-T', '--trim', is_flag=True, default=False, help='Display trimming related statistics')
+@click.option('-V', '--voq', is_flag=True, default=False, help='display voq stats')
+@click.option('-nz', '--non_zero', is_flag=True, default=False, help='Display non-zero queue counters')
+@click.option('-n', '--namespace', type=click.Choice(multi_asic.get_namespace_list()),
+              help='Display queuecounters for a specific namespace name or skip for all', default=None)
+@click.version_option(version='1.0')
+def main(port, clear, delete, json_opt, all, trim, voq, non_zero, namespace):
+    """
+    Examples:
+      queuestat
+      queuestat -p Ethernet0
+      queuestat -c
+      queuestat -d
+      queuestat -p Ethernet0 -n asic0
+      queuestat -V --json
+    """
+
+    global cnstat_dir
+    global cnstat_fqn_file
+
+    save_fresh_stats = clear
+    delete_stats = delete
+
+    port_to_show_stats = port
+
+    cache = UserCache('queuestat')
+
+    cnstat_dir = cache.get_directory()
+    cnstat_fqn_file = os.path.join(cnstat_dir, 'queuestat')
+
+    if delete_stats:
+        cache.remove()
+
+    if device_info.is_supervisor() and namespace is None:
+        run_queuestat(save_fresh_stats, port_to_show_stats, json_opt, non_zero, namespace, None, voq, trim, all)
+    else:
+        queuestat_wrapper = QueuestatWrapper(namespace, all, trim, voq)
+        queuestat_wrapper.run_concurrently(save_fresh_stats, port_to_show_stats, json_opt, non_zero)
+
+    sys.exit(0)
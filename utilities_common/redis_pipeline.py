@@ -0,0 +1,138 @@
+"""
+Pipelined bulk access to the SONiC databases.
+
+The swsscommon connectors issue one redis round trip per command, which
+adds up when a CLI reads a hash per port or per queue. The helpers below
+batch the commands into redis pipelines instead.
+"""
+
+import os
+
+import redis
+from swsscommon.swsscommon import SonicDBConfig
+
+PIPELINE_BATCH_SIZE = 1000
+
+_pipeline_clients = {}
+
+
+def get_pipeline_client(db, db_name):
+    """
+    Get a redis client supporting pipelines for the db_name database the
+    SonicV2Connector db is connected to.
+    swsscommon connectors do not expose pipelines, so a redis-py client is
+    opened on the same redis instance and cached for reuse. Connectors whose
+    client already supports pipelines (e.g. in unit tests) are used as is.
+    """
+    client = db.get_redis_client(db_name)
+    if hasattr(client, 'pipeline'):
+        return client
+
+    namespace = db.namespace
+    if (namespace, db_name) not in _pipeline_clients:
+        sock = SonicDBConfig.getDbSock(db_name, namespace)
+        if sock and os.path.exists(sock):
+            client = redis.Redis(unix_socket_path=sock,
+                                 db=SonicDBConfig.getDbId(db_name, namespace),
+                                 decode_responses=True)
+        else:
+            client = redis.Redis(host=SonicDBConfig.getDbHostname(db_name, namespace),
+                                 port=SonicDBConfig.getDbPort(db_name, namespace),
+                                 db=SonicDBConfig.getDbId(db_name, namespace),
+                                 decode_responses=True)
+        _pipeline_clients[(namespace, db_name)] = client
+    return _pipeline_clients[(namespace, db_name)]
+
+
+def _run_bulk(db, db_name, keys, command, *args, batch_size=PIPELINE_BATCH_SIZE):
+    client = get_pipeline_client(db, db_name)
+    results = []
+    for start in range(0, len(keys), batch_size):
+        pipe = client.pipeline(transaction=False)
+        for key in keys[start:start + batch_size]:
+            getattr(pipe, command)(key, *args)
+        results.extend(pipe.execute())
+    return results
+
+
+def hgetall_bulk(db, db_name, keys, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Get all the fields of the hashes keys with pipelined HGETALLs.
+    :return list of dicts in the order of keys, empty for missing keys
+    """
+    return [fvs if fvs else {} for fvs in _run_bulk(db, db_name, keys, 'hgetall', batch_size=batch_size)]
+
+
+def hget_bulk(db, db_name, keys, field, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Get field of the hashes keys with pipelined HGETs.
+    :return list of values in the order of keys, None for missing ones
+    """
+    return _run_bulk(db, db_name, keys, 'hget', field, batch_size=batch_size)
+
+
+def delete_bulk(db, db_name, keys, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Delete keys with pipelined DELs.
+    :return number of keys deleted
+    """
+    return sum(_run_bulk(db, db_name, keys, 'delete', batch_size=batch_size))
+
+
+def hgetall_hashes(db, db_name, keys, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Get all the fields of the keys which are hashes with pipelined HGETALLs.
+    The other keys, like the CONFIG_DB_INITIALIZED flag, are skipped.
+    :return dict of the fields of the hashes by key
+    """
+    client = get_pipeline_client(db, db_name)
+    hashes = {}
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start:start + batch_size]
+        pipe = client.pipeline(transaction=False)
+        for key in batch:
+            pipe.hgetall(key)
+        if isinstance(client, redis.Redis):
+            # Errors of the keys of another type are returned in place of their fields
+            results = pipe.execute(raise_on_error=False)
+        else:
+            results = pipe.execute()
+        for key, fvs in zip(batch, results):
+            if isinstance(fvs, dict) and fvs:
+                hashes[key] = fvs
+    return hashes
+
+
+def update_table_bulk(db, db_name, table, current, new):
+    """
+    Update the entries of a table of the ConfigDBConnector db from their
+    current content to the new one in a single MULTI/EXEC transaction.
+    Only the entries which differ are written: the entries missing from new
+    are deleted, the fields of the others are written with HSETs and the fields
+    they no longer have are removed with HDELs, without deleting the entries.
+    :param current: dict of the typed entries of the table by key, as read from db
+    :param new: dict of the typed entries to write by key
+    :return number of entries written or deleted
+    """
+    separator = db.get_db_separator(db_name)
+    pipe = get_pipeline_client(db, db_name).pipeline(transaction=True)
+    changed = 0
+    for key in list(current) + [key for key in new if key not in current]:
+        current_fvs = db.typed_to_raw(current[key]) if key in current else None
+        new_fvs = db.typed_to_raw(new[key]) if new.get(key) is not None else None
+        if current_fvs == new_fvs:
+            continue
+
+        changed += 1
+        hash_key = '{}{}{}'.format(table.upper(), separator, db.serialize_key(key))
+        if new_fvs is None:
+            pipe.delete(hash_key)
+            continue
+        removed_fields = [field for field in current_fvs or {} if field not in new_fvs]
+        if removed_fields:
+            pipe.hdel(hash_key, *removed_fields)
+        for field, value in new_fvs.items():
+            pipe.hset(hash_key, field, value)
+    if changed:
+        pipe.execute()
+    return changed